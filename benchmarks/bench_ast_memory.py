@@ -0,0 +1,80 @@
+"""
+Memoria del árbol de parseo frente al AST compacto.
+
+Mide con tracemalloc los bytes retenidos por el árbol de parseo de ANTLR y
+por el AST obtenido con el lowering, y el pico de memoria de la generación
+de TAC en cada modo (TREE_PARSE mantiene vivo el árbol de parseo durante el
+visitor; TREE_AST lo libera antes).
+
+Uso:
+    python -m benchmarks.bench_ast_memory [--lines 50000]
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+
+from antlr4 import InputStream
+
+from benchmarks.synthetic import generate_program
+from compiler.pipeline import lex, parse_tokens, generate_tac, TREE_PARSE, TREE_AST
+from compiler.syntax_tree.lowering import lower_program
+
+
+def retained_bytes(build):
+    """Bytes que siguen asignados tras construir el objeto retornado por build()"""
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, size
+
+
+def codegen_time(source: str, tree_mode: str) -> float:
+    """Tiempo de generación de TAC (incluye el lowering en modo AST)"""
+    parse_result = parse_tokens(lex(InputStream(source)))
+    gc.collect()
+    start = time.perf_counter()
+    generate_tac(parse_result, tree_mode)
+    return time.perf_counter() - start
+
+
+def codegen_peak(source: str, tree_mode: str) -> int:
+    """Pico de memoria (bytes) de parseo + generación de TAC"""
+    stream = lex(InputStream(source))
+    gc.collect()
+    tracemalloc.start()
+    parse_result = parse_tokens(stream)
+    generate_tac(parse_result, tree_mode)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--lines", type=int, default=50000)
+    args = parser.parse_args()
+
+    source = generate_program(args.lines)
+    print(f"Programa sintético: {source.count(chr(10))} líneas\n")
+
+    stream = lex(InputStream(source))
+    parse_result, tree_bytes = retained_bytes(lambda: parse_tokens(stream))
+    _, ast_bytes = retained_bytes(lambda: lower_program(parse_result.tree))
+    print(f"Árbol de parseo: {tree_bytes / 2**20:8.1f} MiB")
+    print(f"AST compacto:    {ast_bytes / 2**20:8.1f} MiB ({tree_bytes / ast_bytes:.1f}x menos)\n")
+    del parse_result
+
+    print(f"{'Modo':12} | {'Pico (MiB)':>10} | {'TAC (s)':>8}")
+    print("-" * 36)
+    for tree_mode in (TREE_PARSE, TREE_AST):
+        elapsed = codegen_time(source, tree_mode)
+        peak = codegen_peak(source, tree_mode)
+        print(f"{tree_mode:12} | {peak / 2**20:10.1f} | {elapsed:8.2f}")
+
+
+if __name__ == '__main__':
+    main()
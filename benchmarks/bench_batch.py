@@ -0,0 +1,61 @@
+"""
+Compilación por lotes frente a un proceso de Driver.py por archivo.
+
+Genera N programas sintéticos en un directorio temporal y compila el
+conjunto de tres formas: un proceso `Driver.py` por archivo (lo que hace
+hoy el job nocturno), compile_batch en un solo proceso y compile_batch
+con un pool de procesos. Reporta archivos por segundo.
+
+Uso:
+    python -m benchmarks.bench_batch [--files 40] [--lines 200] [--jobs N]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import generate_program
+from compiler.batch import compile_batch
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DRIVER = os.path.join(ROOT_DIR, "program", "Driver.py")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=40)
+    parser.add_argument("--lines", type=int, default=200)
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    source_dir = tempfile.mkdtemp()
+    paths = []
+    for i in range(args.files):
+        path = os.path.join(source_dir, f"gen_{i:04}.cps")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(generate_program(args.lines + i))
+        paths.append(path)
+
+    start = time.perf_counter()
+    for path in paths:
+        subprocess.run([sys.executable, DRIVER, path], check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    per_process = time.perf_counter() - start
+
+    serial = compile_batch(paths, jobs=1)
+    pooled = compile_batch(paths, jobs=args.jobs)
+    assert not serial.failures and not pooled.failures
+
+    print(f"{args.files} archivos de ~{args.lines} líneas\n")
+    print(f"{'Modo':32} | {'Tiempo (s)':>10} | {'Archivos/s':>10}")
+    print("-" * 58)
+    print(f"{'Driver.py por archivo':32} | {per_process:10.3f} | {args.files / per_process:10.1f}")
+    print(f"{'compile_batch, 1 proceso':32} | {serial.wall_time:10.3f} | {serial.files_per_second:10.1f}")
+    label = f"compile_batch, {pooled.jobs} procesos"
+    print(f"{label:32} | {pooled.wall_time:10.3f} | {pooled.files_per_second:10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Construcción del CFG sobre funciones grandes.
+
+Genera el TAC de programas con una sola función de tamaño creciente y mide
+el tiempo de build_cfg, del orden inverso de post-orden y de los
+dominadores y bucles de la función; el tiempo por tripleto debe mantenerse
+constante (construcción lineal).
+
+Uso:
+    python -m benchmarks.bench_cfg [--lines 5000 10000 20000]
+"""
+import argparse
+import time
+
+from antlr4 import InputStream
+
+from benchmarks.synthetic import generate_function_program
+from compiler.ir.cfg import build_cfg
+from compiler.ir.dominators import loop_forest
+from compiler.pipeline import lex, parse_tokens, generate_tac, TREE_AST
+
+
+def _best_of(repeat, func, *args):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def _rpo(cfg):
+    for function in cfg.functions:
+        function._rpo = None   # se cachea: medir el cálculo, no la caché
+    return [len(function.reverse_postorder) for function in cfg.functions]
+
+
+def _loops(cfg):
+    return [len(loop_forest(cfg, function)) for function in cfg.functions]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--lines", type=int, nargs="+", default=[5000, 10000, 20000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'Líneas':>8} | {'Tripletos':>10} | {'Bloques':>8} | {'Aristas':>8} | "
+          f"{'CFG (s)':>8} | {'RPO (s)':>8} | {'Bucles':>7} | {'Dom (s)':>8} | {'µs/tripleto':>11}")
+    print("-" * 101)
+    for lines in args.lines:
+        source = generate_function_program(lines)
+        triplets = generate_tac(parse_tokens(lex(InputStream(source))), TREE_AST).get_triplets()
+        cfg, build_time = _best_of(args.repeat, build_cfg, triplets)
+        _, rpo_time = _best_of(args.repeat, _rpo, cfg)
+        loops, dom_time = _best_of(args.repeat, _loops, cfg)
+        print(f"{lines:8} | {len(triplets):10} | {len(cfg):8} | {cfg.edge_count():8} | "
+              f"{build_time:8.4f} | {rpo_time:8.4f} | {sum(loops):7} | {dom_time:8.4f} | "
+              f"{build_time / len(triplets) * 1e6:11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Colapso de cadenas de precedencia de un solo hijo.
+
+Sobre un programa dominado por expresiones mide:
+- cuántos contextos del árbol de parseo son niveles de precedencia que sólo
+  reenvían a su único hijo,
+- las llamadas a métodos del visitor TAC y el tiempo de generación con el
+  recorrido nivel por nivel (collapse_chains=False) y con el colapso,
+- la memoria del árbol de parseo frente al AST, que no guarda esos niveles.
+
+Uso:
+    python -m benchmarks.bench_chain_collapse [--lines 20000] [--repeat 3]
+"""
+import argparse
+import sys
+import time
+
+from antlr4 import InputStream
+
+from benchmarks.bench_ast_memory import retained_bytes
+from benchmarks.synthetic import generate_expression_program
+from compiler.pipeline import (
+    lex, parse_tokens, CompiscriptParser, CompiscriptVisitor, CompiscriptTACVisitor
+)
+from compiler.syntax_tree import visitors
+from compiler.syntax_tree.lowering import lower_program
+
+
+def count_contexts(tree):
+    """Retorna (contextos de regla, contextos de paso con un solo hijo)"""
+    total = chain = 0
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        children = getattr(node, 'children', None)
+        if children is None:
+            continue
+        total += 1
+        if len(children) == 1 and type(node).__name__[:-7] in visitors._CHAIN_RULES:
+            chain += 1
+        stack.extend(children)
+    return total, chain
+
+
+def count_visitor_calls(tree, collapse_chains: bool) -> int:
+    """Llamadas a funciones de visitors.py durante una generación de TAC"""
+    visitor = CompiscriptTACVisitor(CompiscriptParser, CompiscriptVisitor, collapse_chains)
+    code = {visitors.__file__}
+    calls = 0
+
+    def profile(frame, event, arg):
+        nonlocal calls
+        if event == 'call' and frame.f_code.co_filename in code:
+            calls += 1
+
+    sys.setprofile(profile)
+    try:
+        visitor.visit(tree)
+    finally:
+        sys.setprofile(None)
+    return calls
+
+
+def time_codegen(tree, collapse_chains: bool, repeat: int) -> float:
+    """Mejor tiempo de `repeat` generaciones de TAC (visitor nuevo cada vez)"""
+    best = float('inf')
+    for _ in range(repeat):
+        visitor = CompiscriptTACVisitor(CompiscriptParser, CompiscriptVisitor, collapse_chains)
+        start = time.perf_counter()
+        visitor.visit(tree)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--lines", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    source = generate_expression_program(args.lines)
+    print(f"Programa sintético: {source.count(chr(10))} líneas\n")
+
+    stream = lex(InputStream(source))
+    parse_result, tree_bytes = retained_bytes(lambda: parse_tokens(stream))
+    tree = parse_result.tree
+
+    total, chain = count_contexts(tree)
+    print(f"Contextos de regla:       {total:10,}")
+    print(f"Niveles de paso (1 hijo): {chain:10,} ({chain / total:.0%})\n")
+
+    print(f"{'Recorrido':18} | {'Llamadas':>12} | {'TAC (s)':>8}")
+    print("-" * 46)
+    results = {}
+    for label, collapse in (("nivel por nivel", False), ("colapsado", True)):
+        calls = count_visitor_calls(tree, collapse)
+        elapsed = time_codegen(tree, collapse, args.repeat)
+        results[collapse] = (calls, elapsed)
+        print(f"{label:18} | {calls:12,} | {elapsed:8.2f}")
+    (full_calls, full_time), (fast_calls, fast_time) = results[False], results[True]
+    print(f"\nLlamadas: {1 - fast_calls / full_calls:.0%} menos, speedup {full_time / fast_time:.2f}x\n")
+
+    _, ast_bytes = retained_bytes(lambda: lower_program(tree))
+    print(f"Árbol de parseo: {tree_bytes / 2**20:8.1f} MiB")
+    print(f"AST compacto:    {ast_bytes / 2**20:8.1f} MiB ({tree_bytes / ast_bytes:.1f}x menos)")
+
+
+if __name__ == '__main__':
+    main()
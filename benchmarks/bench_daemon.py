@@ -0,0 +1,70 @@
+"""
+Latencia de Driver.py frente al cliente del daemon de compilación.
+
+Ejecuta varias veces `python program/Driver.py FILE` (un proceso nuevo por
+compilación) y `python program/client.py FILE` contra un daemon ya
+iniciado, y reporta el tiempo de pared por compilación. La primera
+petición al daemon llena las cachés DFA; se reporta por separado.
+
+Uso:
+    python -m benchmarks.bench_daemon [--file program/program.cps] [--runs 5]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DRIVER = os.path.join(ROOT_DIR, "program", "Driver.py")
+CLIENT = os.path.join(ROOT_DIR, "program", "client.py")
+
+
+def run(cmd) -> float:
+    start = time.perf_counter()
+    subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def wait_for_socket(path: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while not os.path.exists(path):
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"El daemon no creó {path}")
+        time.sleep(0.05)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--file", default=os.path.join(ROOT_DIR, "program", "program.cps"))
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    driver_times = [run([sys.executable, DRIVER, args.file]) for _ in range(args.runs)]
+
+    socket_path = os.path.join(tempfile.mkdtemp(), "bench.sock")
+    daemon = subprocess.Popen([sys.executable, DRIVER, "--daemon", "--socket", socket_path],
+                              stdout=subprocess.DEVNULL)
+    try:
+        wait_for_socket(socket_path)
+        client = [sys.executable, CLIENT, args.file, "--socket", socket_path]
+        first = run(client)
+        client_times = [run(client) for _ in range(args.runs)]
+    finally:
+        subprocess.run([sys.executable, CLIENT, "--stop", "--socket", socket_path])
+        daemon.wait(timeout=10)
+
+    driver = sum(driver_times) / len(driver_times)
+    warm = sum(client_times) / len(client_times)
+    print(f"Archivo: {args.file}\n")
+    print(f"{'Modo':26} | {'Tiempo (s)':>10}")
+    print("-" * 40)
+    print(f"{'Driver.py (proceso nuevo)':26} | {driver:10.3f}")
+    print(f"{'daemon, 1ra petición':26} | {first:10.3f}")
+    print(f"{'daemon, cachés calientes':26} | {warm:10.3f}")
+    print(f"\nSpeedup: {driver / warm:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
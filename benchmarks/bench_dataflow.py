@@ -0,0 +1,78 @@
+"""
+Análisis de flujo de datos sobre funciones grandes.
+
+Resuelve variables vivas, definiciones que alcanzan y expresiones
+disponibles sobre una función sintética con miles de temporales, con los
+bitsets como int de Python y (si NumPy está instalado) como palabras uint64.
+Reporta el tiempo de cada análisis y las visitas de bloque hasta el punto
+fijo.
+
+Uso:
+    python -m benchmarks.bench_dataflow [--lines 2000 5000 10000]
+"""
+import argparse
+import time
+
+from antlr4 import InputStream
+
+from benchmarks.synthetic import generate_function_program
+from compiler.ir.cfg import build_cfg
+from compiler.ir.dataflow import (
+    AvailableExpressions, Liveness, ReachingDefinitions, IntBitsets, NumpyBitsets
+)
+from compiler.pipeline import lex, parse_tokens, generate_tac, TREE_AST
+
+ANALYSES = [("vivas", Liveness), ("definiciones", ReachingDefinitions),
+            ("expresiones", AvailableExpressions)]
+
+
+def _backends():
+    backends = [IntBitsets.name]
+    try:
+        import numpy  # noqa: F401
+        backends.append(NumpyBitsets.name)
+    except ImportError:
+        print("NumPy no está instalado: sólo se mide el backend int\n")
+    return backends
+
+
+def _best_of(repeat, func, *args):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def _run(analysis, cfg, function, backend):
+    return analysis(cfg, function, backend).solve()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--lines", type=int, nargs="+", default=[2000, 5000, 10000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    backends = _backends()
+
+    print(f"{'Líneas':>8} | {'Bloques':>8} | {'Análisis':>12} | {'Universo':>9} | "
+          f"{'Visitas':>8} | " + " | ".join(f"{name + ' (s)':>11}" for name in backends))
+    print("-" * (64 + 14 * len(backends)))
+    for lines in args.lines:
+        source = generate_function_program(lines)
+        triplets = generate_tac(parse_tokens(lex(InputStream(source))), TREE_AST).get_triplets()
+        cfg = build_cfg(triplets)
+        function = cfg.function_named("FUNC_0")
+        for name, analysis in ANALYSES:
+            times = []
+            for backend in backends:
+                result, elapsed = _best_of(args.repeat, _run, analysis, cfg, function, backend)
+                times.append(elapsed)
+            print(f"{lines:8} | {len(function.blocks):8} | {name:>12} | "
+                  f"{len(result.problem.universe):9} | {result.iterations:8} | "
+                  + " | ".join(f"{t:11.4f}" for t in times))
+
+
+if __name__ == "__main__":
+    main()
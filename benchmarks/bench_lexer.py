@@ -0,0 +1,51 @@
+"""
+Throughput del lexer de ANTLR frente al lexer rápido.
+
+Tokeniza el mismo programa sintético con ambos lexers (stream completo,
+como en la fase léxica del pipeline) y reporta tokens por segundo.
+
+Uso:
+    python -m benchmarks.bench_lexer [--lines 50000] [--repeat 3]
+"""
+import argparse
+import time
+
+from antlr4 import InputStream
+
+from benchmarks.synthetic import generate_program
+from compiler.pipeline import lex, LEXER_ANTLR, LEXER_FAST
+
+
+def time_lex(source: str, lexer_mode: str, repeat: int):
+    """Mejor tiempo de `repeat` tokenizaciones y número de tokens"""
+    best = float('inf')
+    count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        stream = lex(InputStream(source), lexer_mode)
+        best = min(best, time.perf_counter() - start)
+        count = len(stream.tokens)
+    return best, count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--lines", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    source = generate_program(args.lines)
+    print(f"Programa sintético: {source.count(chr(10))} líneas\n")
+
+    print(f"{'Lexer':8} | {'Tiempo (s)':>10} | {'Tokens/s':>12}")
+    print("-" * 36)
+    times = {}
+    for lexer_mode in (LEXER_ANTLR, LEXER_FAST):
+        elapsed, count = time_lex(source, lexer_mode, args.repeat)
+        times[lexer_mode] = elapsed
+        print(f"{lexer_mode:8} | {elapsed:10.3f} | {count / elapsed:12,.0f}")
+    print(f"\nSpeedup: {times[LEXER_ANTLR] / times[LEXER_FAST]:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,171 @@
+"""
+Instrucciones ejecutadas (conteo dinámico) antes y después de las pasadas
+sobre bucles.
+
+El TAC del visitor no se puede ejecutar tal cual (cada lectura de una
+variable usa un temporal nuevo que nadie asigna), así que los núcleos son
+listados con la misma forma que emiten visitWhileStatement y
+visitForStatement (constante de la condición dentro del bucle, dirección
+base + índice * tamaño en cada acceso) pero que leen sus variables. Cada
+pasada se aplica al listado original y se ejecuta con el intérprete de
+tripletos; se reportan los tripletos, los pasos ejecutados antes y
+después, los saltos tomados y las multiplicaciones ejecutadas después, y
+el tiempo de la pasada.
+
+Después se mide cómo escala cada pasada con muchos bucles seguidos en la
+misma región (--loops, duplicando): el tiempo por bucle debe quedar
+parejo. Si en alguna pasada de --check crece más de --max-growth veces
+entre el tamaño menor y el mayor, la pasada está recorriendo toda la
+región por cada bucle y el benchmark termina con error. invariantes no se
+revisa por defecto: sus definiciones que llegan son bitsets del ancho de
+la región, así que su costo por bucle crece con ella.
+
+Uso:
+    python -m benchmarks.bench_loops [--iterations 200] [--loops 50] [--doublings 4]
+                                     [--check inducción,saltos,rotación]
+"""
+import argparse
+import time
+
+from compiler.ir.interpreter import run_tac
+from compiler.ir.tac_reader import read_tac
+from compiler.optimizer import (
+    hoist_loop_invariants, reduce_induction_variables, rotate_loops, thread_jumps
+)
+
+PASSES = [
+    ("invariantes", hoist_loop_invariants),
+    ("inducción", reduce_induction_variables),
+    ("saltos", thread_jumps),
+    ("rotación", rotate_loops),
+]
+
+
+def _while_sum(n: int) -> str:
+    """while (i < n) { s = s + a[i]; i = i + 1; } con a en G[0]"""
+    return (f"i = mov 0\ns = mov 0\nw = mov 4\nLOOP_START_0:\nt0 = mov {n}\nL1 = blt i, t0\n"
+            "LOOP_END_2 = jmp\nL1:\nt1 = mul i, w\nt2 = add 100, t1\nt3 = mul 0, w\n"
+            "t4 = add t2, t3\ns = add s, t4\nt5 = mov 1\nt6 = add i, t5\ni = mov t6\n"
+            "LOOP_START_0 = jmp\nLOOP_END_2:\nprint s\n")
+
+
+def _array_pair(n: int) -> str:
+    """for (i) s = s + &a[i] + &b[i], con las direcciones de gen_effective_address"""
+    return (f"i = mov 0\ns = mov 0\nLOOP_START_0:\nt0 = mov {n}\nL1 = blt i, t0\nLOOP_END_2 = jmp\n"
+            "L1:\nt1 = mul i, 4\nt2 = add 100, t1\nt3 = mul i, 4\nt4 = add 900, t3\nt5 = add t2, t4\n"
+            "s = add s, t5\nt6 = mov 1\nt7 = add i, t6\ni = mov t7\nLOOP_START_0 = jmp\n"
+            "LOOP_END_2:\nprint s\n")
+
+
+def _nested_matrix(n: int) -> str:
+    """for (i) for (j) s = s + m[i][j], con m de n columnas"""
+    return (f"i = mov 0\ns = mov 0\ncols = mov {n}\nLOOP_START_0:\nt0 = mov 16\nL1 = blt i, t0\n"
+            "LOOP_END_2 = jmp\nL1:\nj = mov 0\nLOOP_START_3:\nL4 = blt j, cols\nLOOP_END_5 = jmp\n"
+            "L4:\nt1 = mul i, cols\nt2 = mov 4\nt3 = mul t1, t2\nt4 = add 200, t3\nt5 = mul j, t2\n"
+            "t6 = add t4, t5\ns = add s, t6\nt7 = mov 1\nj = add j, t7\nLOOP_START_3 = jmp\n"
+            "LOOP_END_5:\nt8 = mov 1\ni = add i, t8\nLOOP_START_0 = jmp\nLOOP_END_2:\nprint s\n")
+
+
+def _conditional(n: int) -> str:
+    """while con un if en el cuerpo y una expresión sobre variables fijas"""
+    return (f"i = mov 0\nk = mov 7\nlimit = mov {n}\nodd = mov 0\nLOOP_START_0:\nL1 = blt i, limit\n"
+            "LOOP_END_2 = jmp\nL1:\nt0 = mod i, 2\nt1 = mov 1\nIF_TRUE_3 = beq t0, t1\n"
+            "IF_END_4 = jmp\nIF_TRUE_3:\nt2 = mul k, 3\nt3 = add t2, limit\nodd = add odd, t3\n"
+            "IF_END_4:\nt4 = mov 1\ni = add i, t4\nLOOP_START_0 = jmp\nLOOP_END_2:\nprint odd\n")
+
+
+def _do_while(n: int) -> str:
+    """do { s = s + base * 2; i = i + 1; } while (i < n)"""
+    return (f"i = mov 0\ns = mov 0\nbase = mov 9\nLOOP_START_0:\nt0 = mov 2\nt1 = mul base, t0\n"
+            f"s = add s, t1\nt2 = mov 1\ni = add i, t2\nt3 = mov {n}\nLOOP_START_0 = blt i, t3\n"
+            "LOOP_END_1:\nprint s\n")
+
+
+def _many_loops(count: int) -> str:
+    """
+    count bucles como _array_pair uno tras otro, con etiquetas e índice
+    propios (con un mismo i, las definiciones que llegan a cada bucle
+    crecen con la región)
+    """
+    parts = ["s = mov 0\n"]
+    for k in range(count):
+        parts.append(f"i{k} = mov 0\nLOOP_START_{k}_0:\nt{k}_0 = mov 8\nL{k}_1 = blt i{k}, t{k}_0\n"
+                     f"LOOP_END_{k}_2 = jmp\nL{k}_1:\nt{k}_1 = mul i{k}, 4\nt{k}_2 = add 100, t{k}_1\n"
+                     f"s = add s, t{k}_2\ni{k} = add i{k}, 1\nLOOP_START_{k}_0 = jmp\nLOOP_END_{k}_2:\n")
+    parts.append("print s\n")
+    return "".join(parts)
+
+
+def _scaling(loops: int, doublings: int, max_growth: float, checked):
+    """Tiempo por bucle de cada pasada con loops, 2 * loops, ... bucles"""
+    print()
+    print(f"{'Pasada':>12} | {'Bucles':>6} | {'Tripletos':>9} | {'Tiempo (s)':>10} | "
+          f"{'Por bucle (ms)':>14} | {'Crecimiento':>11}")
+    print("-" * 78)
+    failed = []
+    for pass_name, optimize in PASSES:
+        first = None
+        for step in range(doublings + 1):
+            count = loops << step
+            triplets = read_tac(_many_loops(count))
+            elapsed = min(_timed(optimize, triplets) for _ in range(3))
+            per_loop = elapsed / count
+            if first is None:
+                first = per_loop
+            growth = per_loop / first
+            print(f"{pass_name:>12} | {count:6} | {len(triplets):9} | {elapsed:10.4f} | "
+                  f"{per_loop * 1000:14.4f} | {growth:10.2f}x")
+        if pass_name in checked and growth > max_growth:
+            failed.append(pass_name)
+    if failed:
+        raise SystemExit(f"El tiempo por bucle crece con la región: {', '.join(failed)}")
+
+
+def _timed(optimize, triplets) -> float:
+    start = time.perf_counter()
+    optimize(triplets)
+    return time.perf_counter() - start
+
+
+KERNELS = [
+    ("while", _while_sum),
+    ("arreglo", _array_pair),
+    ("anidado", _nested_matrix),
+    ("condicional", _conditional),
+    ("do-while", _do_while),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--loops", type=int, default=50)
+    parser.add_argument("--doublings", type=int, default=4)
+    parser.add_argument("--max-growth", type=float, default=3.0)
+    parser.add_argument("--check", default="inducción,saltos,rotación")
+    args = parser.parse_args()
+
+    print(f"{'Núcleo':>12} | {'Pasada':>12} | {'Tripletos':>9} | {'Después':>8} | "
+          f"{'Pasos':>8} | {'Después':>8} | {'Reducción':>9} | {'Tomados':>7} | {'mul':>6} | "
+          f"{'Tiempo (s)':>10}")
+    print("-" * 117)
+    for name, kernel in KERNELS:
+        triplets = read_tac(kernel(args.iterations))
+        before = run_tac(triplets, max_steps=100_000_000)
+        for pass_name, optimize in PASSES:
+            start = time.perf_counter()
+            result = optimize(triplets)
+            elapsed = time.perf_counter() - start
+            after = run_tac(result.triplets, max_steps=100_000_000)
+            if after.output != before.output:
+                raise SystemExit(f"{name}/{pass_name}: la salida cambió")
+            reduction = 1 - after.steps / before.steps
+            print(f"{name:>12} | {pass_name:>12} | {result.before:9} | {result.after:8} | "
+                  f"{before.steps:8} | {after.steps:8} | {reduction:9.1%} | {after.taken:7} | "
+                  f"{after.counts['mul']:6} | {elapsed:10.4f}")
+
+    _scaling(args.loops, args.doublings, args.max_growth, args.check.split(","))
+
+
+if __name__ == "__main__":
+    main()
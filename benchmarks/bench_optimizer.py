@@ -0,0 +1,104 @@
+"""
+Efecto de cada pasada de optimización sobre programas de prueba.
+
+Genera el TAC de program/program.cps, de los programas sintéticos (o de
+los archivos .cps indicados) y aplica cada pasada por separado al listado
+del visitor. Reporta los tripletos antes y después, los eliminados, las
+instrucciones MIPS que emite el MIPSTranslator antes y después (y cuántas
+son copias entre registros, `addu rX, rY, $zero`), y el tiempo de la
+pasada.
+
+Uso:
+    python -m benchmarks.bench_optimizer [--lines 2000] [archivo.cps ...]
+"""
+import argparse
+import os
+import time
+
+from antlr4 import FileStream, InputStream
+
+from benchmarks.synthetic import (
+    generate_expression_program, generate_function_program, generate_program
+)
+from compiler.codegen.mips_translator import MIPSTranslator
+from compiler.optimizer import (
+    eliminate_common_subexpressions, eliminate_dead_code, fold_constants, hoist_loop_invariants,
+    propagate_copies, reduce_induction_variables, rotate_loops, thread_jumps
+)
+from compiler.pipeline import lex, parse_tokens, generate_tac, TREE_AST
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PASSES = [
+    ("constantes", fold_constants),
+    ("copias", propagate_copies),
+    ("muerto", eliminate_dead_code),
+    ("subexpr", eliminate_common_subexpressions),
+    ("invariantes", hoist_loop_invariants),
+    ("inducción", reduce_induction_variables),
+    ("saltos", thread_jumps),
+    ("rotación", rotate_loops),
+]
+
+
+def _programs(args):
+    if args.files:
+        return [(os.path.basename(path), FileStream(path, encoding="utf-8")) for path in args.files]
+    return [
+        ("program.cps", FileStream(os.path.join(ROOT_DIR, "program", "program.cps"), encoding="utf-8")),
+        ("sentencias", InputStream(generate_program(args.lines))),
+        ("expresiones", InputStream(generate_expression_program(args.lines))),
+        ("función", InputStream(generate_function_program(args.lines))),
+    ]
+
+
+def _is_move(instruction) -> bool:
+    return instruction.opcode == "addu" and instruction.args[-1] == "$zero" \
+        and instruction.args[1].startswith("$t")
+
+
+def mips_count(triplets):
+    """
+    Instrucciones MIPS emitidas (sin contar etiquetas) y cuántas son copias
+    entre registros. El traductor todavía no soporta el array_set de dos
+    operandos del visitor: esos tripletos no suman
+    """
+    translator = MIPSTranslator()
+    count = moves = 0
+    for triplet in triplets:
+        try:
+            instructions = translator.translate(triplet)
+        except AttributeError:
+            continue
+        for instruction in instructions:
+            if instruction.opcode and not instruction.opcode.endswith(":"):
+                count += 1
+                moves += _is_move(instruction)
+    return count, moves
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("files", nargs="*")
+    parser.add_argument("--lines", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'Programa':>12} | {'Pasada':>12} | {'Tripletos':>9} | {'Después':>8} | "
+          f"{'Eliminados':>10} | {'MIPS':>7} | {'Después':>8} | {'Copias':>7} | {'Después':>8} | "
+          f"{'Tiempo (s)':>10}")
+    print("-" * 124)
+    for name, stream in _programs(args):
+        triplets = generate_tac(parse_tokens(lex(stream)), TREE_AST).get_triplets()
+        mips, moves = mips_count(triplets)
+        for pass_name, optimize in PASSES:
+            start = time.perf_counter()
+            result = optimize(triplets)
+            elapsed = time.perf_counter() - start
+            mips_after, moves_after = mips_count(result.triplets)
+            print(f"{name:>12} | {pass_name:>12} | {result.before:9} | {result.after:8} | "
+                  f"{result.removed:10} | {mips:7} | {mips_after:8} | {moves:7} | {moves_after:8} | "
+                  f"{elapsed:10.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Throughput de CompiscriptParser frente al parser Pratt.
+
+Parsea el mismo stream de tokens (del lexer rápido, para medir sólo la fase
+sintáctica) con CompiscriptParser.program() en modo two-stage y LL, y con
+PrattParser, que además ya entrega el AST compacto. Reporta líneas por
+segundo; para ANTLR también se mide el lowering al AST, que es lo que el
+parser Pratt ahorra en modo --tree ast.
+
+Uso:
+    python -m benchmarks.bench_parser [--lines 20000] [--repeat 3]
+"""
+import argparse
+import time
+
+from antlr4 import InputStream
+
+from benchmarks.synthetic import generate_program
+from compiler.pipeline import (
+    lex, parse_tokens, LEXER_FAST, PARSE_MODE_TWO_STAGE, PARSE_MODE_LL, PARSE_MODE_PRATT
+)
+from compiler.syntax_tree.lowering import lower_program
+
+
+def time_parse(source: str, mode: str, repeat: int):
+    """Mejores tiempos de `repeat` parseos: (parseo, lowering al AST)"""
+    best_parse = best_lower = float('inf')
+    for _ in range(repeat):
+        stream = lex(InputStream(source), LEXER_FAST)
+        start = time.perf_counter()
+        result = parse_tokens(stream, mode)
+        best_parse = min(best_parse, time.perf_counter() - start)
+        assert result.syntax_errors == 0
+
+        if mode == PARSE_MODE_PRATT:
+            best_lower = 0.0
+            continue
+        start = time.perf_counter()
+        lower_program(result.tree, release=True)
+        best_lower = min(best_lower, time.perf_counter() - start)
+    return best_parse, best_lower
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--lines", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    source = generate_program(args.lines)
+    lines = source.count('\n')
+    print(f"Programa sintético: {lines} líneas\n")
+
+    print(f"{'Parser':10} | {'Parseo (s)':>10} | {'Líneas/s':>10} | {'+ AST (s)':>9} | {'Líneas/s':>10}")
+    print("-" * 62)
+    totals = {}
+    for mode in (PARSE_MODE_TWO_STAGE, PARSE_MODE_LL, PARSE_MODE_PRATT):
+        parse, lower = time_parse(source, mode, args.repeat)
+        totals[mode] = parse + lower
+        print(f"{mode:10} | {parse:10.3f} | {lines / parse:10,.0f} | "
+              f"{parse + lower:9.3f} | {lines / (parse + lower):10,.0f}")
+    print(f"\nSpeedup hasta el AST frente a two-stage: "
+          f"{totals[PARSE_MODE_TWO_STAGE] / totals[PARSE_MODE_PRATT]:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""
+Construcción y destrucción de la forma SSA sobre funciones grandes.
+
+Pasa a SSA una función sintética con miles de temporales y la vuelve a
+sacar, comprobando que la ida y vuelta devuelve el listado original.
+Reporta el tiempo de cada dirección, las PHI colocadas y el costo por
+tripleto.
+
+Uso:
+    python -m benchmarks.bench_ssa [--lines 2000 5000 10000]
+"""
+import argparse
+import time
+
+from antlr4 import InputStream
+
+from benchmarks.synthetic import generate_function_program
+from compiler.ir.ssa import from_ssa, to_ssa
+from compiler.pipeline import lex, parse_tokens, generate_tac, TREE_AST
+
+
+def _best_of(repeat, func, *args):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--lines", type=int, nargs="+", default=[2000, 5000, 10000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'Líneas':>8} | {'Tripletos':>10} | {'PHI':>6} | {'to_ssa (s)':>11} | "
+          f"{'from_ssa (s)':>12} | {'µs/tripleto':>11} | {'Idéntico':>8}")
+    print("-" * 86)
+    for lines in args.lines:
+        source = generate_function_program(lines)
+        triplets = generate_tac(parse_tokens(lex(InputStream(source))), TREE_AST).get_triplets()
+        ssa, construct = _best_of(args.repeat, to_ssa, triplets)
+        result, destruct = _best_of(args.repeat, from_ssa, ssa)
+        same = [str(t) for t in result] == [str(t) for t in triplets]
+        per_triplet = (construct + destruct) / len(triplets) * 1e6
+        print(f"{lines:8} | {len(triplets):10} | {ssa.phi_count:6} | {construct:11.4f} | "
+              f"{destruct:12.4f} | {per_triplet:11.1f} | {'sí' if same else 'no':>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Lectura del TAC en texto.
+
+Escribe el listado de un programa sintético (con los índices de línea del
+Driver) y mide el throughput de read_tac y de iter_functions, junto con la
+memoria máxima de cada uno: read_tac retiene la tabla completa e
+iter_functions sólo la función en curso.
+
+Uso:
+    python -m benchmarks.bench_tac_reader [--lines 20000]
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from antlr4 import InputStream
+
+from benchmarks.synthetic import generate_program
+from compiler.ir.tac_reader import iter_functions, load_tac
+from compiler.pipeline import lex, parse_tokens, generate_tac, TREE_AST
+
+
+def _stream(path):
+    chunks = triplets = 0
+    with open(path, encoding='utf-8') as f:
+        for chunk in iter_functions(f):
+            chunks += 1
+            triplets += len(chunk.table)
+    return chunks, triplets
+
+
+def _measure(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--lines", type=int, default=20000)
+    args = parser.parse_args()
+
+    source = generate_program(args.lines)
+    triplets = generate_tac(parse_tokens(lex(InputStream(source))), TREE_AST).get_triplets()
+    path = os.path.join(tempfile.mkdtemp(), "bench.tac")
+    with open(path, "w", encoding='utf-8') as f:
+        for i, triplet in enumerate(triplets):
+            f.write(f"{i:3}: {triplet}\n")
+    size = os.path.getsize(path) / 2**20
+
+    table, read_time, read_peak = _measure(load_tac, path)
+    assert [str(t) for t in table] == [str(t) for t in triplets]
+    (chunks, count), stream_time, stream_peak = _measure(_stream, path)
+    assert count == len(triplets)
+
+    print(f"Programa sintético: {args.lines} líneas, {len(triplets)} tripletos, "
+          f"listado de {size:.2f} MiB, {chunks} chunks\n")
+    print(f"{'Lector':16} | {'Tiempo (s)':>10} | {'MiB/s':>8} | {'Tripletos/s':>12} | {'Pico (MiB)':>10}")
+    print("-" * 70)
+    for name, elapsed, peak in (("read_tac", read_time, read_peak),
+                                ("iter_functions", stream_time, stream_peak)):
+        print(f"{name:16} | {elapsed:10.4f} | {size / elapsed:8.2f} | "
+              f"{len(triplets) / elapsed:12.0f} | {peak / 2**20:10.2f}")
+
+
+if __name__ == "__main__":
+    main()
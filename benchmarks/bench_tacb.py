@@ -0,0 +1,63 @@
+"""
+Formato .tacb frente al listado de texto y a recompilar.
+
+Para un programa sintético reporta el tamaño del .tacb y del listado de
+tripletos en texto, el tiempo de escritura, el tiempo de cargar el archivo
+y leer un tripleto (carga perezosa con mmap), el de materializar todos los
+tripletos y el de volver a compilar desde el fuente.
+
+Uso:
+    python -m benchmarks.bench_tacb [--lines 20000]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from antlr4 import InputStream
+
+from benchmarks.synthetic import generate_program
+from compiler.ir import tacb
+from compiler.pipeline import lex, parse_tokens, generate_tac, TREE_AST
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--lines", type=int, default=20000)
+    args = parser.parse_args()
+
+    source = generate_program(args.lines)
+    start = time.perf_counter()
+    visitor = generate_tac(parse_tokens(lex(InputStream(source))), TREE_AST)
+    compile_time = time.perf_counter() - start
+    triplets = visitor.get_triplets()
+
+    path = os.path.join(tempfile.mkdtemp(), "bench.tacb")
+    start = time.perf_counter()
+    tacb.save_visitor(path, visitor)
+    save_time = time.perf_counter() - start
+    listing = "".join(f"{i:3}: {t}\n" for i, t in enumerate(triplets)).encode("utf-8")
+
+    start = time.perf_counter()
+    with tacb.load(path) as loaded:
+        loaded.triplets[len(triplets) // 2]
+        first_time = time.perf_counter() - start
+    start = time.perf_counter()
+    with tacb.load(path) as loaded:
+        all_triplets = list(loaded.triplets)
+        full_time = time.perf_counter() - start
+    assert [str(t) for t in all_triplets] == [str(t) for t in triplets]
+
+    print(f"Programa sintético: {args.lines} líneas, {len(triplets)} tripletos\n")
+    print(f"Listado de texto:  {len(listing) / 2**20:8.2f} MiB")
+    print(f".tacb:             {os.path.getsize(path) / 2**20:8.2f} MiB\n")
+    print(f"{'Operación':36} | {'Tiempo (s)':>10}")
+    print("-" * 50)
+    print(f"{'compilar desde el fuente':36} | {compile_time:10.4f}")
+    print(f"{'guardar .tacb':36} | {save_time:10.4f}")
+    print(f"{'cargar .tacb y leer un tripleto':36} | {first_time:10.4f}")
+    print(f"{'cargar .tacb y materializar todo':36} | {full_time:10.4f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Memoria de TripletTable frente a CompactTripletTable.
+
+Genera el TAC de un programa sintético y lo vuelve a cargar en cada tipo de
+tabla para medir con tracemalloc los bytes retenidos por la tabla. Los
+operandos se internan antes (como en el emitter) y no cuentan para ninguna.
+También reporta el pico de memoria y el tiempo de generación de TAC del
+pipeline con y sin compact_ir.
+
+Uso:
+    python -m benchmarks.bench_triplet_memory [--lines 50000]
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+
+from antlr4 import InputStream
+
+from benchmarks.synthetic import generate_program
+from compiler.ir.compact_table import CompactTripletTable
+from compiler.ir.triplet import OperandFactory, Triplet, TripletTable
+from compiler.pipeline import lex, parse_tokens, generate_tac, TREE_AST
+
+
+def intern_rows(triplets):
+    """(op, arg1, arg2, result, comment) con operandos internados, como los deja el emitter"""
+    operands = OperandFactory()
+
+    def copy(operand):
+        return None if operand is None else operands.get(operand.value, operand.type)
+
+    return [(t.op, copy(t.arg1), copy(t.arg2), copy(t.result), t.comment) for t in triplets]
+
+
+def table_bytes(table_class, rows) -> int:
+    """Bytes retenidos por una tabla con los tripletos dados (sin los operandos compartidos)"""
+    gc.collect()
+    tracemalloc.start()
+    table = table_class()
+    for row in rows:
+        table.add(Triplet(*row))
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del table
+    return size
+
+
+def pipeline_run(source: str, compact_ir: bool):
+    """Pico de memoria (bytes) y tiempo de generación de TAC"""
+    stream = lex(InputStream(source))
+    parse_result = parse_tokens(stream)
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    visitor = generate_tac(parse_result, TREE_AST, compact_ir)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(visitor.emitter.table), peak, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--lines", type=int, default=50000)
+    args = parser.parse_args()
+
+    source = generate_program(args.lines)
+    triplets = generate_tac(parse_tokens(lex(InputStream(source))), TREE_AST).get_triplets()
+    print(f"Programa sintético: {source.count(chr(10))} líneas, {len(triplets)} tripletos\n")
+
+    rows = intern_rows(triplets)
+    list_bytes = table_bytes(TripletTable, rows)
+    compact_bytes = table_bytes(CompactTripletTable, rows)
+    print(f"{'Tabla':20} | {'MiB':>8} | {'Bytes/tripleto':>14}")
+    print("-" * 48)
+    for name, size in (("TripletTable", list_bytes), ("CompactTripletTable", compact_bytes)):
+        print(f"{name:20} | {size / 2**20:8.1f} | {size / len(triplets):14.1f}")
+    print(f"\nReducción: {list_bytes / compact_bytes:.1f}x\n")
+
+    print(f"{'Pipeline (ast)':20} | {'Pico (MiB)':>10} | {'TAC (s)':>8}")
+    print("-" * 46)
+    for label, compact_ir in (("lista", False), ("compact_ir", True)):
+        _, peak, elapsed = pipeline_run(source, compact_ir)
+        print(f"{label:20} | {peak / 2**20:10.1f} | {elapsed:8.2f}")
+
+
+if __name__ == '__main__':
+    main()
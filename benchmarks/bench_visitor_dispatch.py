@@ -0,0 +1,100 @@
+"""
+Micro-benchmark del despacho de CompiscriptTACVisitor.
+
+Compara el despacho original (nombre de método con f-string + getattr por
+nodo, hasattr(child, 'accept') por hijo) contra la tabla de despacho por
+clase de contexto. Reporta nodos visitados por segundo sobre un programa
+sintético.
+
+Uso:
+    python -m benchmarks.bench_visitor_dispatch [--lines 50000] [--repeat 3]
+"""
+import argparse
+import time
+
+from antlr4 import InputStream
+
+from benchmarks.synthetic import generate_program
+from compiler.pipeline import (
+    lex, parse_tokens, CompiscriptParser, CompiscriptVisitor, CompiscriptTACVisitor
+)
+
+
+class LegacyDispatchVisitor(CompiscriptTACVisitor):
+    """Visitor con el despacho anterior, sólo para comparación"""
+
+    def visit(self, ctx):
+        if ctx is None:
+            return None
+        class_name = ctx.__class__.__name__
+        visitor = getattr(self, f'visit{class_name[:-7]}', None)
+        if visitor:
+            return visitor(ctx)
+        return self.visitChildren(ctx)
+
+    def visitChildren(self, ctx):
+        if ctx is None:
+            return None
+        if not hasattr(ctx, 'children') or ctx.children is None:
+            return None
+        result = None
+        for child in ctx.children:
+            if hasattr(child, 'accept'):
+                child_result = self.visit(child)
+                if child_result is not None:
+                    result = child_result
+        return result
+
+
+def count_nodes(tree) -> int:
+    """Cuenta nodos del árbol (reglas y terminales)"""
+    count = 0
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        count += 1
+        children = getattr(node, 'children', None)
+        if children:
+            stack.extend(children)
+    return count
+
+
+def time_visit(visitor_class, tree, repeat: int) -> float:
+    """Mejor tiempo de `repeat` visitas completas (visitor nuevo cada vez)"""
+    best = float('inf')
+    for _ in range(repeat):
+        visitor = visitor_class(CompiscriptParser, CompiscriptVisitor)
+        start = time.perf_counter()
+        visitor.visit(tree)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--lines", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    source = generate_program(args.lines)
+    print(f"Programa sintético: {source.count(chr(10))} líneas")
+
+    start = time.perf_counter()
+    tree = parse_tokens(lex(InputStream(source))).tree
+    print(f"Front-end (lex + parse): {time.perf_counter() - start:.2f}s")
+
+    nodes = count_nodes(tree)
+    print(f"Nodos del árbol: {nodes}\n")
+
+    legacy = time_visit(LegacyDispatchVisitor, tree, args.repeat)
+    table = time_visit(CompiscriptTACVisitor, tree, args.repeat)
+
+    print(f"{'Despacho':20} | {'Tiempo (s)':>10} | {'Nodos/s':>12}")
+    print("-" * 50)
+    print(f"{'getattr (anterior)':20} | {legacy:10.3f} | {nodes / legacy:12,.0f}")
+    print(f"{'tabla por clase':20} | {table:10.3f} | {nodes / table:12,.0f}")
+    print(f"\nSpeedup: {legacy / table:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+Generador de programas Compiscript sintéticos para benchmarks.
+
+Los programas sólo usan construcciones que el visitor TAC soporta
+(declaraciones, aritmética, if/else, while, for, funciones y print),
+de modo que sirven tanto para medir el front-end como la generación de TAC.
+"""
+from typing import List
+
+
+def _function_chunk(n: int) -> List[str]:
+    return [
+        f"function f{n}(a: integer, b: integer): integer {{",
+        f"  let r{n}: integer = a * {n % 7 + 1} + b - {n % 5};",
+        f"  if (r{n} > {n % 11}) {{",
+        f"    r{n} = r{n} - 1;",
+        "  }",
+        f"  return r{n};",
+        "}",
+    ]
+
+
+def _statement_chunk(n: int) -> List[str]:
+    return [
+        f"let x{n}: integer = {n} * 3 + {n % 13} - 2 * ({n % 17} + 1);",
+        f"let y{n}: integer = x{n} + {n % 9} * 4;",
+        f"if (x{n} > y{n}) {{",
+        f"  print(x{n});",
+        "} else {",
+        f"  print(y{n} + 1);",
+        "}",
+        f"while (x{n} < {n % 23 + 10}) {{",
+        f"  x{n} = x{n} + 1;",
+        "}",
+        f"for (let i{n}: integer = 0; i{n} < 3; i{n} = i{n} + 1) {{",
+        f"  y{n} = y{n} * 2 % 7;",
+        "}",
+    ]
+
+
+def generate_program(target_lines: int = 50000) -> str:
+    """
+    Genera un programa de aproximadamente `target_lines` líneas (se completa
+    el último bloque para que el programa sea sintácticamente válido).
+
+    Alterna bloques de sentencias de nivel superior con declaraciones de
+    funciones y llamadas a ellas.
+    """
+    lines: List[str] = []
+    n = 0
+    while len(lines) < target_lines:
+        lines.extend(_statement_chunk(n))
+        if n % 4 == 0:
+            lines.extend(_function_chunk(n))
+            lines.append(f"let c{n}: integer = f{n}({n}, {n % 3});")
+        n += 1
+    return "\n".join(lines) + "\n"
+
+
+def _expression_chunk(n: int) -> List[str]:
+    return [
+        f"let e{n}: integer = ({n} + {n % 7}) * ({n % 5} - 3) / 2 + {n % 11} % 4 - 1;",
+        f"let g{n}: integer = e{n} * e{n} + {n % 3} * (e{n} - {n % 13}) - e{n} / 3;",
+        f"let h{n}: boolean = e{n} < g{n} && g{n} != {n % 17} || !(e{n} >= 10);",
+        f"e{n} = (e{n} + g{n}) * (g{n} - e{n}) % ({n % 19} + 1);",
+        f"print(e{n} + g{n} * 2 - (e{n} - g{n}) / 3);",
+    ]
+
+
+def generate_expression_program(target_lines: int = 50000) -> str:
+    """
+    Genera un programa de aproximadamente `target_lines` líneas dominado por
+    expresiones aritméticas y lógicas largas, donde la mayor parte del árbol
+    de parseo son niveles de precedencia.
+    """
+    lines: List[str] = []
+    n = 0
+    while len(lines) < target_lines:
+        lines.extend(_expression_chunk(n))
+        n += 1
+    return "\n".join(lines) + "\n"
+
+
+def generate_function_program(target_lines: int = 50000) -> str:
+    """
+    Genera un programa con una sola función de aproximadamente
+    `target_lines` líneas (los bloques de sentencias de generate_program
+    dentro del cuerpo), para medir análisis y pasadas por función.
+    """
+    lines: List[str] = ["function big(p: integer): integer {"]
+    n = 0
+    while len(lines) < target_lines:
+        lines.extend("  " + line for line in _statement_chunk(n))
+        n += 1
+    lines.extend(["  return p;", "}", "let r: integer = big(1);"])
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,240 @@
+"""
+Compilación por lotes de muchos archivos .cps.
+
+Los archivos se reparten entre procesos de un ProcessPoolExecutor. Cada
+worker importa el pipeline una sola vez y compila un programa pequeño al
+iniciar, de modo que las cachés DFA de ANTLR y las tablas de despacho del
+visitor ya están calientes cuando llega el primer archivo real; las
+compilaciones siguientes del mismo worker las reutilizan.
+
+Con un nivel de optimización distinto de O0 cada worker pasa el TAC por
+el PassManager de ese nivel antes de escribirlo; el reporte de pasadas de
+cada archivo vuelve en su FileResult.
+
+Los resultados se devuelven en el mismo orden que los archivos de entrada
+(executor.map conserva el orden), sin importar qué worker termine primero.
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional, Tuple
+
+from compiler.optimizer.manager import OPT_LEVELS, OPT_O0
+from compiler.pipeline import (
+    compile_source, LEXER_ANTLR, PARSE_MODE_TWO_STAGE, TREE_PARSE
+)
+
+
+SOURCE_EXTENSION = ".cps"
+
+# Programa de calentamiento: recorre declaraciones, expresiones, control de
+# flujo, funciones y clases para poblar las cachés de predicción
+_WARMUP_PROGRAM = """
+let a: integer = 1 + 2 * 3;
+let s: string = "x";
+let arr: integer[] = [1, 2];
+function f(p: integer): integer { return p - 1; }
+class C { let v: integer; }
+let c = new C();
+c.v = f(a);
+if (a < 3 && a != 2 || !true) { print(a); } else { print(s); }
+while (a > 0) { a = a - 1; }
+for (let i: integer = 0; i < 2; i = i + 1) { print(arr[i]); }
+"""
+
+
+@dataclass
+class FileResult:
+    """Resultado de compilar un archivo (sin los tripletos, para no serializarlos entre procesos)"""
+    path: str
+    success: bool
+    errors: List[str] = field(default_factory=list)
+    token_count: int = 0
+    triplet_count: int = 0
+    elapsed: float = 0.0
+    parse_path: str = ""
+    output_path: Optional[str] = None
+    optimization: Optional[dict] = None
+
+    def __str__(self) -> str:
+        status = "OK" if self.success else "ERROR"
+        detail = f"{self.triplet_count} tripletos" if self.success else "; ".join(self.errors)
+        return f"{status:5} {self.elapsed:8.4f}s  {self.path}  ({detail})"
+
+
+@dataclass
+class BatchResult:
+    """Resultados por archivo, en el orden de entrada, y el tiempo de pared total"""
+    results: List[FileResult]
+    wall_time: float
+    jobs: int
+
+    @property
+    def failures(self) -> List[FileResult]:
+        return [r for r in self.results if not r.success]
+
+    @property
+    def files_per_second(self) -> float:
+        return len(self.results) / self.wall_time if self.wall_time > 0 else 0.0
+
+    def summary(self) -> str:
+        return (f"{len(self.results)} archivos, {len(self.failures)} con errores, "
+                f"{self.wall_time:.3f}s con {self.jobs} procesos "
+                f"({self.files_per_second:.1f} archivos/s)")
+
+
+def _collect(paths: Iterable[str]) -> List[Tuple[str, str]]:
+    """Cada archivo con su ruta relativa al directorio dado (o su nombre, si se dio el archivo)"""
+    sources = []
+    for path in paths:
+        if os.path.isdir(path):
+            found = []
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                found.extend(os.path.join(root, name) for name in files
+                             if name.endswith(SOURCE_EXTENSION))
+            sources.extend((source, os.path.relpath(source, path)) for source in sorted(found))
+        else:
+            sources.append((path, os.path.basename(path)))
+    return sources
+
+
+def collect_sources(paths: Iterable[str]) -> List[str]:
+    """
+    Expande directorios a sus archivos .cps (recursivo, en orden
+    alfabético); los archivos se mantienen en el orden dado.
+    """
+    return [source for source, _ in _collect(paths)]
+
+
+def output_names(paths: Iterable[str]) -> List[str]:
+    """
+    Ruta relativa del .tac de cada archivo de collect_sources(paths): la
+    del archivo dentro del directorio dado (`sub/x.cps` -> `sub/x.tac`) o
+    su nombre si se dio el archivo directamente.
+
+    Raises:
+        ValueError: si dos archivos terminarían en el mismo .tac
+    """
+    names = []
+    owners = {}
+    for source, relative in _collect(paths):
+        name = os.path.splitext(relative)[0] + ".tac"
+        key = os.path.normcase(os.path.normpath(name))
+        if key in owners:
+            raise ValueError(f"'{owners[key]}' y '{source}' escribirían el mismo archivo '{name}'")
+        owners[key] = source
+        names.append(name)
+    return names
+
+
+# Configuración del worker (se fija en _init_worker)
+_worker_options = {
+    "lexer_mode": LEXER_ANTLR,
+    "parse_mode": PARSE_MODE_TWO_STAGE,
+    "tree_mode": TREE_PARSE,
+    "output_dir": None,
+    "opt_level": OPT_O0,
+    "track_memory": False,
+}
+
+
+def _init_worker(lexer_mode: str, parse_mode: str, tree_mode: str, output_dir: Optional[str],
+                 opt_level: str = OPT_O0, track_memory: bool = False):
+    _worker_options.update(lexer_mode=lexer_mode, parse_mode=parse_mode,
+                           tree_mode=tree_mode, output_dir=output_dir, opt_level=opt_level,
+                           track_memory=track_memory)
+    compile_source(_WARMUP_PROGRAM, parse_mode, tree_mode, lexer_mode, opt_level=opt_level)
+
+
+def compile_file(path: str, output_name: Optional[str] = None) -> FileResult:
+    """
+    Compila un archivo con la configuración del worker. El TAC se escribe
+    en `<output_dir>/<output_name>` (por defecto, `<nombre>.tac`).
+    """
+    start = time.perf_counter()
+    try:
+        with open(path, encoding='utf-8') as f:
+            source = f.read()
+    except OSError as e:
+        return FileResult(path, False, [f"{type(e).__name__}: {e}"],
+                          elapsed=time.perf_counter() - start)
+
+    result = compile_source(source, _worker_options["parse_mode"],
+                            _worker_options["tree_mode"], _worker_options["lexer_mode"],
+                            opt_level=_worker_options["opt_level"],
+                            track_memory=_worker_options["track_memory"])
+    output_path = None
+    if result['success'] and _worker_options["output_dir"] is not None:
+        if output_name is None:
+            output_name = os.path.splitext(os.path.basename(path))[0] + ".tac"
+        output_path = os.path.join(_worker_options["output_dir"], output_name)
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        with open(output_path, "w", encoding='utf-8') as f:
+            for i, triplet in enumerate(result['triplets']):
+                f.write(f"{i:3}: {triplet}\n")
+
+    return FileResult(
+        path=path,
+        success=result['success'],
+        errors=result['errors'],
+        token_count=result.get('token_count', 0),
+        triplet_count=len(result['triplets']),
+        elapsed=time.perf_counter() - start,
+        parse_path=(result['parse'] or {}).get('path', ""),
+        output_path=output_path,
+        optimization=result.get('optimization'),
+    )
+
+
+def compile_batch(paths: Iterable[str],
+                  jobs: Optional[int] = None,
+                  lexer_mode: str = LEXER_ANTLR,
+                  parse_mode: str = PARSE_MODE_TWO_STAGE,
+                  tree_mode: str = TREE_PARSE,
+                  output_dir: Optional[str] = None,
+                  chunksize: int = 4,
+                  opt_level: str = OPT_O0,
+                  track_memory: bool = False) -> BatchResult:
+    """
+    Compila todos los archivos (o directorios) de `paths`.
+
+    Args:
+        jobs: Número de procesos (None: os.cpu_count()). Con jobs=1 se
+            compila en el proceso actual, sin pool.
+        output_dir: Si se indica, escribe el TAC de cada archivo compilado
+            en `<output_dir>/<ruta relativa>.tac` (ver output_names)
+        chunksize: Archivos enviados a un worker por tarea
+        opt_level: Nivel de optimización de cada archivo (uno de OPT_LEVELS)
+        track_memory: Medir el pico de memoria de cada pasada en los reportes
+            (hace más lenta la optimización)
+
+    Returns:
+        BatchResult con un FileResult por archivo en el orden de entrada
+
+    Raises:
+        ValueError: con output_dir, si dos archivos terminarían en el mismo
+            .tac, o si opt_level no es un nivel conocido
+    """
+    if opt_level not in OPT_LEVELS:
+        raise ValueError(f"Nivel de optimización desconocido: '{opt_level}'")
+    paths = list(paths)
+    sources = collect_sources(paths)
+    names = output_names(paths) if output_dir is not None else [None] * len(sources)
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    jobs = max(1, min(jobs, len(sources) or 1))
+    if output_dir is not None:
+        os.makedirs(output_dir, exist_ok=True)
+
+    initargs = (lexer_mode, parse_mode, tree_mode, output_dir, opt_level, track_memory)
+    start = time.perf_counter()
+    if jobs == 1:
+        _init_worker(*initargs)
+        results = [compile_file(path, name) for path, name in zip(sources, names)]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                 initargs=initargs) as executor:
+            results = list(executor.map(compile_file, sources, names, chunksize=chunksize))
+    return BatchResult(results, time.perf_counter() - start, jobs)
@@ -1349,6 +1349,15 @@ class MIPSTranslator:
 
         return instructions
 
+    def translate_program(self, triplets) -> str:
+        """
+        Traduce y emite todos los tripletos (lista, TripletTable o la tabla
+        de un .tacb cargado) y retorna el código assembly.
+        """
+        for triplet in triplets:
+            self.emit_instructions(self.translate(triplet))
+        return self.get_assembly()
+
     def emit(self, instruction: MIPSInstruction):
         """Emite una instrucción MIPS"""
         self.instructions.append(instruction)
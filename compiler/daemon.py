@@ -0,0 +1,162 @@
+"""
+Daemon de compilación sobre un socket Unix.
+
+Un proceso mantiene el pipeline caliente (módulos de ANTLR importados, ATN
+deserializado y las cachés DFA de predicción, que son atributos de clase de
+CompiscriptLexer/CompiscriptParser y por eso se comparten entre todas las
+compilaciones del proceso) y atiende peticiones de un cliente liviano.
+
+Protocolo: una conexión por petición. El cliente envía un objeto JSON y
+cierra su lado de escritura; el daemon responde con otro objeto JSON y
+cierra la conexión.
+
+    petición:  {"argv": [...], "cwd": "/ruta"}  o  {"command": "shutdown"}
+    respuesta: {"exit_code": 0, "stdout": "...", "stderr": "..."}
+
+Las peticiones se atienden de una en una: cada compilación redirige
+sys.stdout/sys.stderr y cambia el directorio de trabajo del proceso.
+
+Este módulo sólo usa la biblioteca estándar para que el cliente arranque
+rápido; el handler que compila lo pasa quien inicia el daemon.
+"""
+import contextlib
+import io
+import json
+import os
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+import traceback
+from typing import Callable, Dict, List
+
+DEFAULT_SOCKET = os.path.join(tempfile.gettempdir(), f"compiscript-{os.getuid()}.sock")
+
+COMMAND_SHUTDOWN = "shutdown"
+
+
+def _recv_all(sock: socket.socket) -> bytes:
+    chunks = []
+    while True:
+        chunk = sock.recv(65536)
+        if not chunk:
+            return b"".join(chunks)
+        chunks.append(chunk)
+
+
+def run_captured(handler: Callable[[List[str]], int], argv: List[str], cwd: str) -> Dict:
+    """
+    Ejecuta handler(argv) en `cwd` capturando stdout y stderr.
+
+    SystemExit (argparse, sys.exit) se convierte en el código de salida y
+    una excepción no capturada en código 1 con su traceback en stderr,
+    igual que al ejecutar el script directamente.
+    """
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    previous_cwd = os.getcwd()
+    try:
+        os.chdir(cwd)
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            try:
+                exit_code = handler(argv)
+            except SystemExit as e:
+                if e.code is None:
+                    exit_code = 0
+                elif isinstance(e.code, int):
+                    exit_code = e.code
+                else:
+                    print(e.code, file=sys.stderr)
+                    exit_code = 1
+            except Exception:
+                traceback.print_exc()
+                exit_code = 1
+    finally:
+        os.chdir(previous_cwd)
+    return {
+        "exit_code": exit_code or 0,
+        "stdout": stdout.getvalue(),
+        "stderr": stderr.getvalue(),
+    }
+
+
+class CompileServer(socketserver.UnixStreamServer):
+    """Servidor secuencial: una petición a la vez sobre el pipeline caliente"""
+
+    def __init__(self, socket_path: str, handler: Callable[[List[str]], int]):
+        self.compile_handler = handler
+        self.requests_served = 0
+        super().__init__(socket_path, _RequestHandler)
+
+
+class _RequestHandler(socketserver.BaseRequestHandler):
+
+    def handle(self):
+        server: CompileServer = self.server
+        data = _recv_all(self.request)
+        if not data:
+            # Conexión de sondeo (_remove_stale_socket): no espera respuesta
+            return
+        try:
+            message = json.loads(data.decode('utf-8'))
+        except ValueError as e:
+            self._reply({"exit_code": 1, "stdout": "", "stderr": f"Petición inválida: {e}\n"})
+            return
+
+        if message.get("command") == COMMAND_SHUTDOWN:
+            self._reply({"exit_code": 0, "stdout": "", "stderr": ""})
+            # shutdown() espera a que termine serve_forever: se pide desde otro hilo
+            threading.Thread(target=server.shutdown, daemon=True).start()
+            return
+
+        response = run_captured(server.compile_handler, message["argv"], message.get("cwd", os.getcwd()))
+        server.requests_served += 1
+        self._reply(response)
+
+    def _reply(self, response: Dict):
+        self.request.sendall(json.dumps(response).encode('utf-8'))
+
+
+def _remove_stale_socket(socket_path: str):
+    """Borra el socket de un daemon que ya no está corriendo"""
+    if not os.path.exists(socket_path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(socket_path)
+    except OSError:
+        os.unlink(socket_path)
+        return
+    finally:
+        probe.close()
+    raise RuntimeError(f"Ya hay un daemon escuchando en {socket_path}")
+
+
+def serve(handler: Callable[[List[str]], int], socket_path: str = DEFAULT_SOCKET):
+    """Atiende peticiones hasta recibir COMMAND_SHUTDOWN"""
+    _remove_stale_socket(socket_path)
+    with CompileServer(socket_path, handler) as server:
+        try:
+            server.serve_forever()
+        finally:
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)
+
+
+def send_request(message: Dict, socket_path: str = DEFAULT_SOCKET) -> Dict:
+    """Envía una petición al daemon y retorna la respuesta"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        sock.sendall(json.dumps(message).encode('utf-8'))
+        sock.shutdown(socket.SHUT_WR)
+        return json.loads(_recv_all(sock).decode('utf-8'))
+
+
+def compile_remote(argv: List[str], socket_path: str = DEFAULT_SOCKET) -> Dict:
+    """Compila con el daemon como si se ejecutara `Driver.py argv[1:]` en el cwd actual"""
+    return send_request({"argv": argv, "cwd": os.getcwd()}, socket_path)
+
+
+def shutdown_remote(socket_path: str = DEFAULT_SOCKET) -> Dict:
+    return send_request({"command": COMMAND_SHUTDOWN}, socket_path)
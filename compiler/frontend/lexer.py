@@ -0,0 +1,202 @@
+"""
+Lexer rápido para Compiscript.
+
+Alternativa a CompiscriptLexer (simulador ATN de ANTLR, un carácter a la
+vez): toda la entrada se recorre con una sola expresión regular compilada y
+el tipo de cada token sale de tablas construidas a partir de los nombres
+literales del lexer generado, de modo que los tipos coinciden siempre con
+los de la gramática. Implementa la interfaz TokenSource, así que el
+CommonTokenStream resultante lo consume CompiscriptParser sin cambios.
+
+Reproduce también el comportamiento de ANTLR ante errores léxicos: mismo
+mensaje "token recognition error", misma posición y mismos caracteres
+descartados.
+"""
+import os
+import re
+import sys
+from typing import Dict, Iterator, List
+
+from antlr4 import InputStream
+from antlr4.CommonTokenFactory import CommonTokenFactory
+from antlr4.Lexer import TokenSource
+from antlr4.Token import CommonToken, Token
+from antlr4.error.ErrorListener import ConsoleErrorListener, ProxyErrorListener
+
+# El lexer generado se importa como módulo de primer nivel, igual que en el pipeline
+grammar_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                           'program', 'grammar', 'gen')
+if grammar_dir not in sys.path:
+    sys.path.insert(0, grammar_dir)
+
+from CompiscriptLexer import CompiscriptLexer
+
+
+def _build_tables():
+    """Separa los tokens implícitos de la gramática en palabras clave y operadores"""
+    keywords: Dict[str, int] = {}
+    operators: Dict[str, int] = {}
+    for ttype, name in enumerate(CompiscriptLexer.literalNames):
+        if not name.startswith("'"):
+            continue
+        text = name[1:-1]
+        if text[0].isalpha():
+            keywords[text] = ttype
+        else:
+            operators[text] = ttype
+    return keywords, operators
+
+
+_KEYWORDS, _OPERATORS = _build_tables()
+# Texto -> tipo para todos los tokens implícitos (una palabra clave nunca
+# coincide con un operador, así que basta una sola tabla)
+LITERAL_TYPES = {**_KEYWORDS, **_OPERATORS}
+
+# Cada coincidencia consume primero lo que ANTLR descarta (WS, COMMENT,
+# MULTILINE_COMMENT) y luego un token, identificado por m.lastindex; al
+# final de la entrada no hay grupo. El orden respeta la coincidencia más
+# larga de ANTLR: comentarios antes que '/', y operadores de dos caracteres
+# antes que los de uno.
+_WORD, _INTEGER, _STRING, _OPERATOR, _ERROR = range(1, 6)
+
+_TOKEN_RE = re.compile(
+    r"(?:[ \t\r\n]+|//[^\r\n]*|/\*.*?\*/)*"
+    r"(?:([a-zA-Z_][a-zA-Z0-9_]*)"
+    r"|([0-9]+)"
+    r"|(\"[^\"\r\n]*\")"
+    r"|(" + "|".join(re.escape(op) for op in sorted(_OPERATORS, key=len, reverse=True)) + ")"
+    r"|(.)"
+    r"|\Z)",
+    re.DOTALL,
+)
+
+# Prefijos que ANTLR empieza a reconocer pero que no forman un token solos:
+# el error abarca hasta el primer carácter que no puede continuarlos.
+_PARTIAL_RE = {
+    '"': re.compile(r'"[^"\r\n]*'),
+    '|': re.compile(r'\|'),
+    '&': re.compile(r'&'),
+}
+
+_ERROR_DISPLAY = {'\n': '\\n', '\t': '\\t', '\r': '\\r'}
+
+
+class _Token(CommonToken):
+    """CommonToken con todos sus campos asignados en una sola llamada"""
+
+    def __init__(self, source, type, start, stop, line, column, text):
+        self.source = source
+        self.type = type
+        self.channel = Token.DEFAULT_CHANNEL
+        self.start = start
+        self.stop = stop
+        self.tokenIndex = -1
+        self.line = line
+        self.column = column
+        self._text = text
+
+
+class FastCompiscriptLexer(TokenSource):
+    """
+    TokenSource con los mismos tokens (tipo, texto, línea, columna, índices)
+    que CompiscriptLexer para cualquier entrada.
+    """
+
+    def __init__(self, input_stream: InputStream):
+        self._input = input_stream
+        self._factory = CommonTokenFactory.DEFAULT
+        self._tokenFactorySourcePair = (self, input_stream)
+        self._listeners: List = [ConsoleErrorListener.INSTANCE]
+        # Posición del próximo token (línea desde 1, columna desde 0)
+        self.line = 1
+        self.column = 0
+        # nextToken() de TokenSource es directamente el __next__ del generador
+        self.nextToken = self._scan(input_stream.strdata).__next__
+
+    # ========== INTERFAZ TokenSource ==========
+
+    def getInputStream(self) -> InputStream:
+        return self._input
+
+    def getSourceName(self) -> str:
+        return self._input.getSourceName()
+
+    @property
+    def inputStream(self) -> InputStream:
+        return self._input
+
+    # ========== ERRORES ==========
+
+    def addErrorListener(self, listener):
+        self._listeners.append(listener)
+
+    def removeErrorListeners(self):
+        self._listeners = []
+
+    def getErrorListenerDispatch(self):
+        return ProxyErrorListener(self._listeners)
+
+    def _report_error(self, text: str):
+        display = "".join(_ERROR_DISPLAY.get(c, c) for c in text)
+        msg = f"token recognition error at: '{display}'"
+        self.getErrorListenerDispatch().syntaxError(self, None, self.line, self.column, msg, None)
+
+    # ========== ESCANEO ==========
+
+    def _scan(self, data: str) -> Iterator[Token]:
+        source = self._tokenFactorySourcePair
+        types = LITERAL_TYPES
+        identifier = CompiscriptLexer.Identifier
+        literal = CompiscriptLexer.Literal
+        size = len(data)
+        line = 1
+        line_start = 0
+        pos = 0
+
+        while pos is not None:
+            # Tras un error léxico el recorrido se reanuda en `resume`
+            resume = None
+            for m in _TOKEN_RE.finditer(data, pos):
+                kind = m.lastindex
+                start = m.start(kind) if kind else size
+                # Saltos de línea en lo descartado antes del token
+                skip_start = m.start()
+                if skip_start != start:
+                    newlines = data.count('\n', skip_start, start)
+                    if newlines:
+                        line += newlines
+                        line_start = data.rindex('\n', 0, start) + 1
+                if kind is None:
+                    break
+
+                text = m.group(kind)
+                ttype = types.get(text)
+                if ttype is None and kind == _WORD:
+                    ttype = identifier
+                elif ttype is None and kind != _ERROR:
+                    ttype = literal
+                elif ttype is None:
+                    self.line = line
+                    self.column = start - line_start
+                    # Igual que Lexer.notifyListeners + recover de ANTLR: se
+                    # reporta desde el inicio hasta el carácter que falló
+                    # (inclusive) y se descarta ese carácter.
+                    partial = _PARTIAL_RE.get(text)
+                    failed = partial.match(data, start).end() if partial else start
+                    self._report_error(data[start:failed + 1])
+                    if failed < size:
+                        skipped = data.count('\n', start, failed + 1)
+                        if skipped:
+                            line += skipped
+                            line_start = data.rindex('\n', start, failed + 1) + 1
+                        resume = failed + 1
+                    break
+
+                yield _Token(source, ttype, start, start + len(text) - 1, line, start - line_start, text)
+            pos = resume
+
+        self.line = line
+        self.column = size - line_start
+        eof = _Token(source, Token.EOF, size, size - 1, line, size - line_start, "<EOF>")
+        while True:
+            yield eof
@@ -0,0 +1,601 @@
+"""
+Parser descendente recursivo para Compiscript.
+
+Alternativa a CompiscriptParser sin predicción ATN: cada sentencia se elige
+por su primer token y las expresiones binarias se resuelven por precedence
+climbing. Construye directamente el AST compacto de ast_nodes, el mismo
+(incluidas las líneas) que produce el lowering del árbol de ANTLR, así que
+el TAC generado es idéntico.
+
+Las ambigüedades de la gramática se resuelven igual que ANTLR:
+- `x = expr;` es una assignment (Assign), no una expressionStatement.
+- Una sentencia que puede partirse como `expr '.' Identifier '=' expr ';'`
+  es una asignación a propiedad (PropertyAssign), en el último punto de
+  corte posible.
+- `lhs.prop = valor` dentro de una expresión es un AssignExpr sobre el
+  acceso completo (nunca se produce PropertyAssignExpr).
+
+No hay recuperación de errores: el primer error de sintaxis se reporta con
+el formato de ConsoleErrorListener y el parseo se detiene.
+"""
+import sys
+from typing import List, Optional, Tuple
+
+from antlr4.Token import Token
+from antlr4.error.ErrorListener import ConsoleErrorListener
+
+from compiler.errors import ErrorCollector, ErrorType
+from compiler.frontend.lexer import LITERAL_TYPES
+from compiler.syntax_tree import ast_nodes as ast
+
+# compiler.frontend.lexer ya agregó la gramática generada al sys.path
+from CompiscriptLexer import CompiscriptLexer
+
+
+_IDENTIFIER = CompiscriptLexer.Identifier
+_LITERAL = CompiscriptLexer.Literal
+_EOF = Token.EOF
+
+_SEMI = LITERAL_TYPES[';']
+_COLON = LITERAL_TYPES[':']
+_COMMA = LITERAL_TYPES[',']
+_DOT = LITERAL_TYPES['.']
+_ASSIGN = LITERAL_TYPES['=']
+_QUESTION = LITERAL_TYPES['?']
+_LPAREN = LITERAL_TYPES['(']
+_RPAREN = LITERAL_TYPES[')']
+_LBRACE = LITERAL_TYPES['{']
+_RBRACE = LITERAL_TYPES['}']
+_LBRACKET = LITERAL_TYPES['[']
+_RBRACKET = LITERAL_TYPES[']']
+_MINUS = LITERAL_TYPES['-']
+_NOT = LITERAL_TYPES['!']
+
+_LET = LITERAL_TYPES['let']
+_VAR = LITERAL_TYPES['var']
+_CONST = LITERAL_TYPES['const']
+_FUNCTION = LITERAL_TYPES['function']
+_CLASS = LITERAL_TYPES['class']
+_ELSE = LITERAL_TYPES['else']
+_WHILE = LITERAL_TYPES['while']
+_IN = LITERAL_TYPES['in']
+_CATCH = LITERAL_TYPES['catch']
+_CASE = LITERAL_TYPES['case']
+_DEFAULT = LITERAL_TYPES['default']
+_NEW = LITERAL_TYPES['new']
+_THIS = LITERAL_TYPES['this']
+_NULL = LITERAL_TYPES['null']
+_TRUE = LITERAL_TYPES['true']
+_FALSE = LITERAL_TYPES['false']
+
+_BASE_TYPES = frozenset({LITERAL_TYPES['boolean'], LITERAL_TYPES['integer'],
+                         LITERAL_TYPES['string'], _IDENTIFIER})
+
+# Tokens con los que empieza un leftHandSide (primaryAtom)
+_LHS_START = frozenset({_IDENTIFIER, _NEW, _THIS})
+
+# Operadores binarios: tipo de token -> (precedencia, clase de nodo).
+# Un nivel por regla de la gramática, de logicalOrExpr a multiplicativeExpr.
+_BINARY_OPS = {}
+for _prec, (_ops, _node_class) in enumerate([
+    (('||',), ast.Logical),
+    (('&&',), ast.Logical),
+    (('==', '!='), ast.Compare),
+    (('<', '<=', '>', '>='), ast.Compare),
+    (('+', '-'), ast.Binary),
+    (('*', '/', '%'), ast.Binary),
+], start=1):
+    for _op in _ops:
+        _BINARY_OPS[LITERAL_TYPES[_op]] = (_prec, _node_class)
+
+
+class _ParseError(Exception):
+    """Interrumpe el parseo tras reportar un error de sintaxis"""
+
+
+class PrattParser:
+    """
+    Parser de Compiscript sobre la lista de tokens de un CommonTokenStream
+    ya llenado (de cualquiera de los dos lexers).
+
+    Expone getNumberOfSyntaxErrors() y los listeners de error igual que un
+    parser de ANTLR, para usarse en ParseResult.
+    """
+
+    def __init__(self, tokens: List[Token]):
+        self._tokens = tokens
+        self._types = [t.type for t in tokens]
+        self._pos = 0
+        self.errors = ErrorCollector()
+        self._listeners = [ConsoleErrorListener.INSTANCE]
+
+    def parse_program(self) -> Optional[ast.Program]:
+        """Retorna el ast.Program, o None si hubo un error de sintaxis"""
+        try:
+            return self._program()
+        except _ParseError:
+            return None
+
+    # ========== ERRORES ==========
+
+    def addErrorListener(self, listener):
+        self._listeners.append(listener)
+
+    def removeErrorListeners(self):
+        self._listeners = []
+
+    def getNumberOfSyntaxErrors(self) -> int:
+        return self.errors.get_error_count()
+
+    def _error(self, msg: str):
+        token = self._tokens[self._pos]
+        self.errors.add_error(msg, token.line, token.column, ErrorType.SYNTAX)
+        for listener in self._listeners:
+            listener.syntaxError(self, token, token.line, token.column, msg, None)
+        raise _ParseError(msg)
+
+    def _unexpected(self):
+        self._error(f"no viable alternative at input {self._display()}")
+
+    def _display(self) -> str:
+        text = self._tokens[self._pos].text
+        return "'" + text.replace('\n', '\\n').replace('\r', '\\r').replace('\t', '\\t') + "'"
+
+    # ========== TOKENS ==========
+
+    def _advance(self) -> Token:
+        token = self._tokens[self._pos]
+        self._pos += 1
+        return token
+
+    def _expect(self, ttype: int) -> Token:
+        if self._types[self._pos] != ttype:
+            expected = CompiscriptLexer.literalNames[ttype] if ttype != _IDENTIFIER else 'Identifier'
+            self._error(f"mismatched input {self._display()} expecting {expected}")
+        token = self._tokens[self._pos]
+        self._pos += 1
+        return token
+
+    def _accept(self, ttype: int) -> bool:
+        if self._types[self._pos] == ttype:
+            self._pos += 1
+            return True
+        return False
+
+    def _identifier(self) -> str:
+        return sys.intern(self._expect(_IDENTIFIER).text)
+
+    # ========== SENTENCIAS ==========
+
+    def _program(self) -> ast.Program:
+        line = self._tokens[0].line
+        statements = []
+        while self._types[self._pos] != _EOF:
+            statements.append(self._statement())
+        return ast.Program(tuple(statements), line)
+
+    def _statement(self) -> ast.Node:
+        ttype = self._types[self._pos]
+        method = self._statement_table.get(ttype)
+        if method is not None:
+            return method(self)
+        return self._assignment(allow_expression=True)
+
+    def _statements_until(self, *stops: int) -> tuple:
+        statements = []
+        types = self._types
+        while types[self._pos] not in stops and types[self._pos] != _EOF:
+            statements.append(self._statement())
+        return tuple(statements)
+
+    def _block(self) -> ast.Block:
+        line = self._expect(_LBRACE).line
+        statements = self._statements_until(_RBRACE)
+        self._expect(_RBRACE)
+        return ast.Block(statements, line)
+
+    def _type(self) -> Tuple[str, int]:
+        """type: baseType ('[' ']')* -> (tipo base, dimensiones)"""
+        if self._types[self._pos] not in _BASE_TYPES:
+            self._unexpected()
+        base = sys.intern(self._advance().text)
+        dims = 0
+        while self._accept(_LBRACKET):
+            self._expect(_RBRACKET)
+            dims += 1
+        return base, dims
+
+    def _type_text(self) -> str:
+        base, dims = self._type()
+        return sys.intern(base + "[]" * dims) if dims else base
+
+    def _variable_declaration(self) -> ast.VarDecl:
+        line = self._advance().line  # 'let' | 'var'
+        name = self._identifier()
+        type_name = None
+        array_dims = 0
+        if self._accept(_COLON):
+            type_name, array_dims = self._type()
+        init = None
+        if self._accept(_ASSIGN):
+            init = self._expression()
+        self._expect(_SEMI)
+        return ast.VarDecl(name, type_name, array_dims, init, line)
+
+    def _constant_declaration(self) -> ast.ConstDecl:
+        line = self._advance().line
+        name = self._identifier()
+        type_text = self._type_text() if self._accept(_COLON) else None
+        self._expect(_ASSIGN)
+        value = self._expression()
+        self._expect(_SEMI)
+        return ast.ConstDecl(name, type_text, value, line)
+
+    def _assignment(self, allow_expression: bool) -> ast.Node:
+        """
+        assignment, o expressionStatement si allow_expression.
+
+        `Identifier '=' expression ';'` gana sobre la expresión. Para
+        `expression '.' Identifier '=' expression ';'` la expresión se parsea
+        completa y el corte se busca después (ver _split_property_assign).
+        """
+        token = self._tokens[self._pos]
+        line = token.line
+        if token.type == _IDENTIFIER and self._types[self._pos + 1] == _ASSIGN:
+            self._pos += 2
+            value = self._expression()
+            self._expect(_SEMI)
+            return ast.Assign(sys.intern(token.text), value, line)
+
+        expr = self._expression()
+        if self._types[self._pos] == _DOT:
+            # El objeto no es un leftHandSide (p.ej. '(a).b = 1'), así que
+            # la expresión se detuvo justo antes del punto
+            self._pos += 1
+            name = self._identifier()
+            self._expect(_ASSIGN)
+            value = self._expression()
+            self._expect(_SEMI)
+            return ast.PropertyAssign(expr, name, value, line)
+
+        split = _split_property_assign(expr, line)
+        if split is not None:
+            self._expect(_SEMI)
+            return split
+        if not allow_expression:
+            self._expect(_DOT)
+        self._expect(_SEMI)
+        return ast.ExprStmt(expr, line)
+
+    def _function_declaration(self) -> ast.FunctionDecl:
+        line = self._advance().line
+        name = self._identifier()
+        self._expect(_LPAREN)
+        params = []
+        if self._types[self._pos] != _RPAREN:
+            params.append(self._parameter())
+            while self._accept(_COMMA):
+                params.append(self._parameter())
+        self._expect(_RPAREN)
+        return_type = self._type_text() if self._accept(_COLON) else None
+        return ast.FunctionDecl(name, tuple(params), return_type, self._block(), line)
+
+    def _parameter(self) -> ast.Param:
+        token = self._expect(_IDENTIFIER)
+        type_text = self._type_text() if self._accept(_COLON) else None
+        return ast.Param(sys.intern(token.text), type_text, token.line)
+
+    def _class_declaration(self) -> ast.ClassDecl:
+        line = self._advance().line
+        name = self._identifier()
+        parent = self._identifier() if self._accept(_COLON) else None
+        self._expect(_LBRACE)
+        members = []
+        while True:
+            ttype = self._types[self._pos]
+            if ttype == _FUNCTION:
+                members.append(self._function_declaration())
+            elif ttype == _LET or ttype == _VAR:
+                members.append(self._variable_declaration())
+            elif ttype == _CONST:
+                members.append(self._constant_declaration())
+            else:
+                break
+        self._expect(_RBRACE)
+        return ast.ClassDecl(name, parent, tuple(members), line)
+
+    def _print_statement(self) -> ast.Print:
+        line = self._advance().line
+        self._expect(_LPAREN)
+        expr = self._expression()
+        self._expect(_RPAREN)
+        self._expect(_SEMI)
+        return ast.Print(expr, line)
+
+    def _condition(self) -> ast.Node:
+        """'(' expression ')'"""
+        self._expect(_LPAREN)
+        expr = self._expression()
+        self._expect(_RPAREN)
+        return expr
+
+    def _if_statement(self) -> ast.If:
+        line = self._advance().line
+        cond = self._condition()
+        then_block = self._block()
+        else_block = self._block() if self._accept(_ELSE) else None
+        return ast.If(cond, then_block, else_block, line)
+
+    def _while_statement(self) -> ast.While:
+        line = self._advance().line
+        cond = self._condition()
+        return ast.While(cond, self._block(), line)
+
+    def _do_while_statement(self) -> ast.DoWhile:
+        line = self._advance().line
+        body = self._block()
+        self._expect(_WHILE)
+        cond = self._condition()
+        self._expect(_SEMI)
+        return ast.DoWhile(body, cond, line)
+
+    def _for_statement(self) -> ast.For:
+        line = self._advance().line
+        self._expect(_LPAREN)
+        ttype = self._types[self._pos]
+        if ttype == _LET or ttype == _VAR:
+            init = self._variable_declaration()
+        elif ttype == _SEMI:
+            self._pos += 1
+            init = None
+        else:
+            init = self._assignment(allow_expression=False)
+        cond = None
+        if self._types[self._pos] != _SEMI:
+            cond = self._expression()
+        self._expect(_SEMI)
+        update = None
+        if self._types[self._pos] != _RPAREN:
+            update = self._expression()
+        self._expect(_RPAREN)
+        return ast.For(init, cond, update, self._block(), line)
+
+    def _foreach_statement(self) -> ast.Foreach:
+        line = self._advance().line
+        self._expect(_LPAREN)
+        name = self._identifier()
+        self._expect(_IN)
+        iterable = self._expression()
+        self._expect(_RPAREN)
+        return ast.Foreach(name, iterable, self._block(), line)
+
+    def _break_statement(self) -> ast.Break:
+        line = self._advance().line
+        self._expect(_SEMI)
+        return ast.Break(line)
+
+    def _continue_statement(self) -> ast.Continue:
+        line = self._advance().line
+        self._expect(_SEMI)
+        return ast.Continue(line)
+
+    def _return_statement(self) -> ast.Return:
+        line = self._advance().line
+        value = None
+        if self._types[self._pos] != _SEMI:
+            value = self._expression()
+        self._expect(_SEMI)
+        return ast.Return(value, line)
+
+    def _try_catch_statement(self) -> ast.TryCatch:
+        line = self._advance().line
+        try_block = self._block()
+        self._expect(_CATCH)
+        self._expect(_LPAREN)
+        error_name = self._identifier()
+        self._expect(_RPAREN)
+        return ast.TryCatch(try_block, error_name, self._block(), line)
+
+    def _switch_statement(self) -> ast.Switch:
+        line = self._advance().line
+        subject = self._condition()
+        self._expect(_LBRACE)
+        cases = []
+        while self._types[self._pos] == _CASE:
+            case_line = self._advance().line
+            value = self._expression()
+            self._expect(_COLON)
+            cases.append(ast.SwitchCase(value, self._statements_until(_CASE, _DEFAULT, _RBRACE), case_line))
+        default = None
+        if self._accept(_DEFAULT):
+            self._expect(_COLON)
+            default = self._statements_until(_RBRACE)
+        self._expect(_RBRACE)
+        return ast.Switch(subject, tuple(cases), default, line)
+
+    _statement_table = {
+        _LET: _variable_declaration,
+        _VAR: _variable_declaration,
+        _CONST: _constant_declaration,
+        _FUNCTION: _function_declaration,
+        _CLASS: _class_declaration,
+        LITERAL_TYPES['print']: _print_statement,
+        _LBRACE: _block,
+        LITERAL_TYPES['if']: _if_statement,
+        _WHILE: _while_statement,
+        LITERAL_TYPES['do']: _do_while_statement,
+        LITERAL_TYPES['for']: _for_statement,
+        LITERAL_TYPES['foreach']: _foreach_statement,
+        LITERAL_TYPES['try']: _try_catch_statement,
+        LITERAL_TYPES['switch']: _switch_statement,
+        LITERAL_TYPES['break']: _break_statement,
+        LITERAL_TYPES['continue']: _continue_statement,
+        LITERAL_TYPES['return']: _return_statement,
+    }
+
+    # ========== EXPRESIONES ==========
+
+    def _expression(self) -> ast.Node:
+        """expression / assignmentExpr"""
+        token = self._tokens[self._pos]
+        if token.type not in _LHS_START:
+            return self._conditional(self._unary(), token.line)
+
+        lhs = self._left_hand_side()
+        if self._types[self._pos] == _ASSIGN:
+            self._pos += 1
+            return ast.AssignExpr(lhs, self._expression(), token.line)
+        # El leftHandSide ya parseado es el primer operando de la expresión
+        return self._conditional(lhs, token.line)
+
+    def _conditional(self, first: ast.Node, line: int) -> ast.Node:
+        """logicalOrExpr ('?' expression ':' expression)? con su primer operando ya parseado"""
+        cond = self._binary(1, first, line)
+        if self._types[self._pos] != _QUESTION:
+            return cond
+        self._pos += 1
+        then_expr = self._expression()
+        self._expect(_COLON)
+        return ast.Conditional(cond, then_expr, self._expression(), line)
+
+    def _binary(self, min_prec: int, left: ast.Node, line: int) -> ast.Node:
+        """
+        Precedence climbing desde logicalOrExpr hasta multiplicativeExpr.
+        `line` es la del primer token de la cadena, como en el lowering.
+        """
+        types = self._types
+        tokens = self._tokens
+        while True:
+            info = _BINARY_OPS.get(types[self._pos])
+            if info is None or info[0] < min_prec:
+                return left
+            prec, node_class = info
+            op = sys.intern(tokens[self._pos].text)
+            self._pos += 1
+            right_line = tokens[self._pos].line
+            right = self._binary(prec + 1, self._unary(), right_line)
+            left = node_class(op, left, right, line)
+
+    def _unary(self) -> ast.Node:
+        ttype = self._types[self._pos]
+        if ttype == _MINUS or ttype == _NOT:
+            token = self._advance()
+            return ast.Unary(sys.intern(token.text), self._unary(), token.line)
+        return self._primary()
+
+    def _primary(self) -> ast.Node:
+        ttype = self._types[self._pos]
+        if ttype in _LHS_START:
+            return self._left_hand_side()
+        if ttype == _LPAREN:
+            self._pos += 1
+            expr = self._expression()
+            self._expect(_RPAREN)
+            return expr
+        if ttype == _LITERAL:
+            token = self._advance()
+            text = token.text
+            if text.startswith('"'):
+                return ast.Literal(ast.LITERAL_STRING, text[1:-1], text, token.line)
+            return ast.Literal(ast.LITERAL_INT, int(text), text, token.line)
+        if ttype == _NULL:
+            return ast.Literal(ast.LITERAL_NULL, None, self._tokens[self._pos].text, self._advance().line)
+        if ttype == _TRUE:
+            return ast.Literal(ast.LITERAL_TRUE, True, self._tokens[self._pos].text, self._advance().line)
+        if ttype == _FALSE:
+            return ast.Literal(ast.LITERAL_FALSE, False, self._tokens[self._pos].text, self._advance().line)
+        if ttype == _LBRACKET:
+            line = self._advance().line
+            elements = self._arguments(_RBRACKET)
+            self._expect(_RBRACKET)
+            return ast.ArrayLiteral(elements, line)
+        self._unexpected()
+
+    def _arguments(self, closing: int) -> tuple:
+        """(expression (',' expression)*)? hasta `closing` (sin consumirlo)"""
+        if self._types[self._pos] == closing:
+            return ()
+        args = [self._expression()]
+        while self._accept(_COMMA):
+            args.append(self._expression())
+        return tuple(args)
+
+    def _left_hand_side(self) -> ast.Node:
+        """primaryAtom suffixOp*"""
+        token = self._advance()
+        ttype = token.type
+        if ttype == _IDENTIFIER:
+            atom = ast.Name(sys.intern(token.text), token.line)
+        elif ttype == _NEW:
+            class_name = self._identifier()
+            self._expect(_LPAREN)
+            args = self._arguments(_RPAREN)
+            self._expect(_RPAREN)
+            atom = ast.New(class_name, args, token.line)
+        else:
+            atom = ast.This(token.line)
+
+        suffixes = []
+        types = self._types
+        while True:
+            ttype = types[self._pos]
+            if ttype == _LPAREN:
+                line = self._advance().line
+                args = self._arguments(_RPAREN)
+                self._expect(_RPAREN)
+                suffixes.append(ast.Call(args, line))
+            elif ttype == _LBRACKET:
+                line = self._advance().line
+                index = self._expression()
+                self._expect(_RBRACKET)
+                suffixes.append(ast.Index(index, line))
+            elif ttype == _DOT:
+                line = self._advance().line
+                suffixes.append(ast.Member(self._identifier(), line))
+            else:
+                break
+        if not suffixes:
+            return atom
+        return ast.Access(atom, tuple(suffixes), token.line)
+
+
+def _split_property_assign(expr: ast.Node, line: int) -> Optional[ast.PropertyAssign]:
+    """
+    Busca el último corte `objeto '.' Identifier '=' valor` de una sentencia.
+
+    Con la expresión ya parseada, los cortes posibles son los AssignExpr
+    cuyo destino termina en `.Identifier` y que están en el borde derecho
+    de la expresión (bajando por AssignExpr.value y Conditional.else_expr).
+    ANTLR elige el más profundo: el objeto es la expresión con ese AssignExpr
+    reemplazado por su destino sin el último acceso.
+    """
+    parent = None
+    target = None
+    node = expr
+    prev = None
+    while True:
+        if isinstance(node, ast.AssignExpr):
+            access = node.target
+            if isinstance(access, ast.Access) and isinstance(access.suffixes[-1], ast.Member):
+                parent, target = prev, node
+            prev, node = node, node.value
+        elif isinstance(node, ast.Conditional):
+            prev, node = node, node.else_expr
+        else:
+            break
+    if target is None:
+        return None
+
+    access = target.target
+    if len(access.suffixes) > 1:
+        obj = ast.Access(access.atom, access.suffixes[:-1], access.line)
+    else:
+        obj = access.atom
+    if parent is None:
+        expr = obj
+    elif isinstance(parent, ast.AssignExpr):
+        parent.value = obj
+    else:
+        parent.else_expr = obj
+    return ast.PropertyAssign(expr, access.suffixes[-1].name, target.value, line)
+
@@ -0,0 +1,112 @@
+"""
+Análisis del CFG calculados una sola vez por listado.
+
+FlowAnalysis guarda el CFG, el árbol de dominadores, los bucles y las
+variables vivas de cada función, y los construye la primera vez que
+alguien los pide. La
+profundidad de bucle de cada tripleto se precalcula en un arreglo, así que
+loop_depth(i) es O(1); la usan las pasadas sobre bucles y sirve para pesar
+los spills del asignador de registros (un uso dentro de un bucle de
+profundidad d cuenta como ~10^d usos).
+
+Si una pasada modifica los tripletos, debe llamar a invalidate() (o crear
+otro FlowAnalysis) antes de volver a consultar.
+"""
+from array import array
+from typing import Dict, Iterable, Optional, Tuple
+
+from .cfg import ControlFlowGraph, FunctionCFG
+from .dataflow import DataflowResult, Liveness
+from .dominators import DominatorTree, Loop, LoopForest
+from .triplet import Triplet
+
+
+class FlowAnalysis:
+    """
+    Caché de análisis de un listado de tripletos.
+
+    Atributos:
+        triplets: Los tripletos (lista)
+    """
+
+    def __init__(self, triplets: Iterable[Triplet] = (), cfg: Optional[ControlFlowGraph] = None):
+        self._cfg = cfg
+        self.triplets = cfg.triplets if cfg is not None else (
+            triplets if isinstance(triplets, list) else list(triplets))
+        self._dominators: Dict[int, DominatorTree] = {}
+        self._loops: Dict[int, LoopForest] = {}
+        self._liveness: Dict[int, Tuple[Liveness, DataflowResult]] = {}
+        self._triplet_depth: Optional[array] = None
+
+    @property
+    def cfg(self) -> ControlFlowGraph:
+        if self._cfg is None:
+            self._cfg = ControlFlowGraph(self.triplets)
+        return self._cfg
+
+    def invalidate(self):
+        """Descarta todo lo calculado (los tripletos cambiaron)"""
+        self._cfg = None
+        self._dominators.clear()
+        self._loops.clear()
+        self._liveness.clear()
+        self._triplet_depth = None
+
+    def _function(self, function: Optional[FunctionCFG]) -> FunctionCFG:
+        return function if function is not None else self.cfg.main
+
+    def dominators(self, function: Optional[FunctionCFG] = None) -> DominatorTree:
+        function = self._function(function)
+        tree = self._dominators.get(function.index)
+        if tree is None:
+            tree = self._dominators[function.index] = DominatorTree(self.cfg, function)
+        return tree
+
+    def loops(self, function: Optional[FunctionCFG] = None) -> LoopForest:
+        function = self._function(function)
+        forest = self._loops.get(function.index)
+        if forest is None:
+            forest = self._loops[function.index] = LoopForest(self.dominators(function))
+        return forest
+
+    def liveness(self, function: Optional[FunctionCFG] = None) -> Tuple[Liveness, DataflowResult]:
+        """Problema de variables vivas (todas las variables con nombre) y su solución"""
+        function = self._function(function)
+        solved = self._liveness.get(function.index)
+        if solved is None:
+            problem = Liveness(self.cfg, function)
+            solved = self._liveness[function.index] = (problem, problem.solve())
+        return solved
+
+    # ========== CONSULTAS POR TRIPLETO ==========
+
+    def _depths(self) -> array:
+        """Profundidad de bucle de cada tripleto (todas las funciones)"""
+        cfg = self.cfg
+        depths = array('B', bytes(len(cfg.triplets)))
+        for function in cfg.functions:
+            forest = self.loops(function)
+            if not forest.loops:
+                continue
+            for b in function.blocks:
+                depth = forest.depth(b)
+                if depth:
+                    block = cfg.blocks[b]
+                    depths[block.start:block.end] = array('B', [min(depth, 255)]) * len(block)
+        return depths
+
+    def loop_depth(self, triplet_index: int) -> int:
+        """Profundidad de bucle del tripleto (0 fuera de todo bucle)"""
+        if self._triplet_depth is None:
+            self._triplet_depth = self._depths()
+        return self._triplet_depth[triplet_index]
+
+    def loop_of(self, triplet_index: int) -> Optional[Loop]:
+        """Bucle más interno que contiene al tripleto"""
+        cfg = self.cfg
+        block = cfg.block_of(triplet_index)
+        return self.loops(cfg.function_of(block)).loop_of(block.index)
+
+    def spill_weight(self, triplet_index: int) -> int:
+        """Peso de un uso en el tripleto para elegir qué derramar"""
+        return 10 ** self.loop_depth(triplet_index)
@@ -0,0 +1,330 @@
+"""
+Bloques básicos y grafo de flujo de control (CFG) sobre los tripletos.
+
+Un bloque básico es un rango [start, end) de tripletos consecutivos. Empieza
+un bloque nuevo:
+
+- el primer tripleto y cada LABEL
+- el tripleto siguiente a un salto (Triplet.is_jump), RETURN o EndFunc
+- el inicio de una función: la etiqueta que precede a BeginFunc (o el propio
+  BeginFunc si no la tiene)
+
+Cada función (etiqueta + BeginFunc ... EndFunc) es una región con su propio
+subgrafo (FunctionCFG); el código global, que el visitor intercala entre
+las funciones, forma la región `main`. El código global que sigue a una
+función continúa el de antes de ella, y lo mismo el de una función que
+contiene a otra: la caída (fall-through) de un bloque va al siguiente bloque
+de su región, no al siguiente del listado.
+
+Sucesores del último tripleto de cada bloque:
+
+- JMP: el bloque de su etiqueta
+- salto condicional: el bloque de su etiqueta y el siguiente de la región
+  (si es el último bloque de la región, sólo su etiqueta; el bloque es
+  además una salida de la región, ver FunctionCFG.exits)
+- RETURN, EndFunc: ninguno
+- cualquier otro: el siguiente bloque de la región
+
+Los destinos se resuelven con un índice etiqueta -> bloque. Un salto sin
+destino (pendiente de backpatch, p. ej. un break fuera de un bucle que el
+visitor no baja) o con una etiqueta de otra región no tiene a dónde ir; se
+registra en `unresolved` y se trata como si cayera al bloque siguiente, para
+que ninguna pasada dé por inalcanzable el código que le sigue.
+
+Todo se construye en tiempo lineal en el número de tripletos, sin
+recursión (el orden inverso de post-orden usa una pila explícita).
+"""
+from array import array
+from typing import Dict, Iterable, List, Optional
+
+from .triplet import OpCode, Triplet
+
+
+# Tuplas y no sets: la pertenencia compara por identidad sin pasar por
+# Enum.__hash__, que está escrito en Python
+_JUMPS = (OpCode.JMP, OpCode.BEQ, OpCode.BNE, OpCode.BLT, OpCode.BLE,
+          OpCode.BGT, OpCode.BGE, OpCode.BZ, OpCode.BNZ)
+
+_CONDITIONAL_JUMPS = _JUMPS[1:]
+
+# Instrucciones tras las que empieza un bloque nuevo
+_TERMINATORS = _JUMPS + (OpCode.RETURN, OpCode.EXIT)
+
+
+class BasicBlock:
+    """Rango [start, end) de tripletos con sus aristas (índices de bloque)"""
+    __slots__ = ('index', 'start', 'end', 'function', 'label', 'succs', 'preds', '_code')
+
+    def __init__(self, index: int, start: int, end: int, function: int,
+                 label: Optional[str], code: List[Triplet]):
+        self.index = index
+        self.start = start
+        self.end = end
+        self.function = function
+        self.label = label
+        self.succs: List[int] = []
+        self.preds: List[int] = []
+        self._code = code
+
+    @property
+    def triplets(self) -> List[Triplet]:
+        return self._code[self.start:self.end]
+
+    @property
+    def last(self) -> Triplet:
+        """Último tripleto del bloque (el salto, si lo hay)"""
+        return self._code[self.end - 1]
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+    def __iter__(self):
+        code = self._code
+        for i in range(self.start, self.end):
+            yield code[i]
+
+    def __repr__(self) -> str:
+        return f"BasicBlock(B{self.index}, [{self.start}, {self.end}), succs={self.succs})"
+
+
+class FunctionCFG:
+    """
+    Subgrafo de una función o del código global.
+
+    name es la etiqueta de la función (None para main, "" si BeginFunc no
+    tiene etiqueta), entry el bloque de entrada y blocks los bloques de la
+    región en orden del listado.
+    """
+
+    def __init__(self, index: int, name: Optional[str], cfg: 'ControlFlowGraph'):
+        self.index = index
+        self.name = name
+        self.entry: Optional[int] = None
+        self.blocks: List[int] = []
+        self._cfg = cfg
+        self._rpo: Optional[List[int]] = None
+
+    @property
+    def is_main(self) -> bool:
+        return self.name is None
+
+    @property
+    def reverse_postorder(self) -> List[int]:
+        """Bloques alcanzables desde la entrada en orden inverso de post-orden"""
+        if self._rpo is None:
+            self._rpo = _reverse_postorder(self._cfg.blocks, self.entry)
+        return self._rpo
+
+    @property
+    def exits(self) -> List[int]:
+        """
+        Bloques por los que se sale de la región: los que no tienen
+        sucesores (RETURN, EndFunc o fin del código) y el último bloque si
+        termina con un salto condicional, que sigue de largo cuando no salta
+        """
+        blocks = self._cfg.blocks
+        exits = [b for b in self.blocks if not blocks[b].succs]
+        if self.blocks:
+            last = self.blocks[-1]
+            if blocks[last].succs and blocks[last].last.op in _CONDITIONAL_JUMPS:
+                exits.append(last)
+        return exits
+
+    def reachable(self) -> List[bool]:
+        """reachable[b] para cada bloque del CFG (False fuera de la función)"""
+        mask = [False] * len(self._cfg.blocks)
+        for b in self.reverse_postorder:
+            mask[b] = True
+        return mask
+
+    def __repr__(self) -> str:
+        return f"FunctionCFG({self.name or 'main'}, {len(self.blocks)} bloques)"
+
+
+def _reverse_postorder(blocks: List[BasicBlock], entry: Optional[int]) -> List[int]:
+    if entry is None:
+        return []
+    visited = bytearray(len(blocks))
+    visited[entry] = 1
+    postorder = []
+    stack = [(entry, 0)]
+    while stack:
+        block, i = stack[-1]
+        succs = blocks[block].succs
+        if i < len(succs):
+            stack[-1] = (block, i + 1)
+            succ = succs[i]
+            if not visited[succ]:
+                visited[succ] = 1
+                stack.append((succ, 0))
+        else:
+            stack.pop()
+            postorder.append(block)
+    postorder.reverse()
+    return postorder
+
+
+class ControlFlowGraph:
+    """
+    Bloques básicos de un listado de tripletos y sus funciones.
+
+    Atributos:
+        triplets: Los tripletos (lista; una tabla se materializa una vez)
+        blocks: Todos los bloques, en orden del listado
+        functions: Regiones; functions[0] es main
+        label_block: Etiqueta -> índice del bloque que empieza con ella
+        unresolved: Índices de los saltos sin destino conocido
+    """
+
+    def __init__(self, triplets: Iterable[Triplet]):
+        self.triplets: List[Triplet] = triplets if isinstance(triplets, list) else list(triplets)
+        self.blocks: List[BasicBlock] = []
+        self.functions: List[FunctionCFG] = [FunctionCFG(0, None, self)]
+        self.label_block: Dict[str, int] = {}
+        self.unresolved: List[int] = []
+        # Bloque de cada tripleto
+        self._block_of = array('i')
+        self._build()
+
+    # ========== CONSTRUCCIÓN ==========
+
+    def _build(self):
+        code = self.triplets
+        n = len(code)
+        blocks = self.blocks
+        functions = self.functions
+        block_of = self._block_of
+        label_block = self.label_block
+
+        region_stack = [0]
+        block = None
+        block_index = -1
+        start_next = True
+        LABEL, ENTER, EXIT = OpCode.LABEL, OpCode.ENTER, OpCode.EXIT
+
+        for i in range(n):
+            triplet = code[i]
+            op = triplet.op
+            new_block = start_next
+            if op is LABEL or op is ENTER:
+                if op is LABEL:
+                    new_block = True
+                    starts_function = i + 1 < n and code[i + 1].op is ENTER
+                else:
+                    starts_function = i == 0 or code[i - 1].op is not LABEL
+                    new_block = new_block or starts_function
+                if starts_function:
+                    name = str(triplet.arg1.value) if op is LABEL else ""
+                    function = FunctionCFG(len(functions), name, self)
+                    functions.append(function)
+                    region_stack.append(function.index)
+
+            if new_block:
+                if block is not None:
+                    block.end = i
+                label = str(triplet.arg1.value) if op is LABEL else None
+                region = region_stack[-1]
+                block_index = len(blocks)
+                block = BasicBlock(block_index, i, i + 1, region, label, code)
+                blocks.append(block)
+                function = functions[region]
+                if function.entry is None:
+                    function.entry = block_index
+                function.blocks.append(block_index)
+                if label is not None:
+                    label_block.setdefault(label, block_index)
+            block_of.append(block_index)
+
+            start_next = op in _TERMINATORS
+            if op is EXIT and len(region_stack) > 1:
+                region_stack.pop()
+
+        if block is not None:
+            block.end = n
+
+        for function in functions:
+            self._connect(function)
+
+    def _target(self, triplet: Triplet, function: int) -> Optional[int]:
+        result = triplet.result
+        if result is None:
+            return None
+        target = self.label_block.get(str(result.value))
+        if target is None or self.blocks[target].function != function:
+            return None
+        return target
+
+    def _connect(self, function: FunctionCFG):
+        blocks = self.blocks
+        region = function.blocks
+        for k, b in enumerate(region):
+            block = blocks[b]
+            last = block.last
+            op = last.op
+            fallthrough = region[k + 1] if k + 1 < len(region) else None
+
+            if op in _JUMPS:
+                target = self._target(last, function.index)
+                if target is None:
+                    self.unresolved.append(block.end - 1)
+                    succs = [fallthrough]
+                elif op == OpCode.JMP:
+                    succs = [target]
+                else:
+                    succs = [target, fallthrough]
+            elif op == OpCode.RETURN or op == OpCode.EXIT:
+                succs = []
+            else:
+                succs = [fallthrough]
+
+            for succ in succs:
+                if succ is not None and succ not in block.succs:
+                    block.succs.append(succ)
+                    blocks[succ].preds.append(b)
+
+    # ========== CONSULTAS ==========
+
+    @property
+    def main(self) -> FunctionCFG:
+        return self.functions[0]
+
+    def block_of(self, triplet_index: int) -> BasicBlock:
+        """Bloque que contiene al tripleto `triplet_index`"""
+        return self.blocks[self._block_of[triplet_index]]
+
+    def function_of(self, block: BasicBlock) -> FunctionCFG:
+        return self.functions[block.function]
+
+    def function_named(self, name: str) -> Optional[FunctionCFG]:
+        """Región de la función cuya etiqueta es `name` (p. ej. "FUNC_0")"""
+        for function in self.functions:
+            if function.name == name:
+                return function
+        return None
+
+    def edge_count(self) -> int:
+        return sum(len(block.succs) for block in self.blocks)
+
+    def __len__(self) -> int:
+        return len(self.blocks)
+
+    def __iter__(self):
+        return iter(self.blocks)
+
+    def __str__(self) -> str:
+        lines = []
+        for function in self.functions:
+            lines.append(f"== {function.name or 'main'} ==")
+            for b in function.blocks:
+                block = self.blocks[b]
+                succs = ", ".join(f"B{s}" for s in block.succs) or "-"
+                lines.append(f"B{b} [{block.start}, {block.end}) -> {succs}")
+        return "\n".join(lines)
+
+
+def build_cfg(triplets: Iterable[Triplet]) -> ControlFlowGraph:
+    """
+    Construye el CFG de una lista de tripletos, TripletTable,
+    CompactTripletTable o la tabla de un .tacb cargado.
+    """
+    return ControlFlowGraph(triplets)
@@ -0,0 +1,160 @@
+"""
+Tabla de tripletos compacta (struct-of-arrays).
+
+TripletTable guarda un objeto Triplet por instrucción, cada uno con su
+__dict__ y hasta tres Operand con el suyo. CompactTripletTable guarda lo
+mismo en buffers `array` paralelos:
+
+    ops[i]                      índice del OpCode
+    kinds[slot][i]              tipo del operando (0 = sin operando)
+    ids[slot][i]                índice del valor en la tabla de valores
+
+con slot 0/1/2 = arg1/arg2/result. Los valores de los operandos (nombres de
+temporales, variables, etiquetas, constantes) se internan en una tabla
+lateral, así que cada tripleto ocupa 16 bytes más lo que aporte de valores
+nuevos. Los comentarios, casi siempre None, van en un diccionario aparte.
+
+La interfaz es la de TripletTable (add, get, size, clear, to_list,
+iteración e índices); get y la iteración materializan objetos Triplet
+nuevos, por lo que los cambios deben hacerse con set_result (backpatch) y
+no modificando el tripleto retornado.
+"""
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+from .triplet import OpCode, Operand, Triplet
+
+
+_OPCODES: Tuple[OpCode, ...] = tuple(OpCode)
+_OPCODE_INDEX: Dict[OpCode, int] = {op: i for i, op in enumerate(_OPCODES)}
+
+NO_OPERAND = 0
+
+
+class CompactTripletTable:
+
+    def __init__(self):
+        self.ops = array('B')
+        self.kinds = (array('B'), array('B'), array('B'))
+        self.ids = (array('i'), array('i'), array('i'))
+        self.comments: Dict[int, str] = {}
+
+        # Tipos de operando: el índice 0 se reserva para "sin operando"
+        self.kind_names: List[Optional[str]] = [None]
+        self._kind_index: Dict[str, int] = {}
+
+        # Valores internados. Los str (casi todos: temporales, variables,
+        # etiquetas) son su propia clave; el resto lleva la clase para que
+        # 1, 1.0 y True no se confundan
+        self.values: list = []
+        self._value_index: Dict[object, int] = {}
+
+        self.next_id = 0
+
+    # ========== INTERNADO ==========
+
+    def _kind_id(self, operand_type: str) -> int:
+        kind = self._kind_index.get(operand_type)
+        if kind is None:
+            kind = len(self.kind_names)
+            self.kind_names.append(operand_type)
+            self._kind_index[operand_type] = kind
+        return kind
+
+    def _value_id(self, value) -> int:
+        key = value if value.__class__ is str else (value.__class__, value)
+        value_id = self._value_index.get(key)
+        if value_id is None:
+            value_id = len(self.values)
+            self.values.append(value)
+            self._value_index[key] = value_id
+        return value_id
+
+    def _store(self, slot: int, operand: Optional[Operand]):
+        if operand is None:
+            self.kinds[slot].append(NO_OPERAND)
+            self.ids[slot].append(0)
+        else:
+            self.kinds[slot].append(self._kind_id(operand.type))
+            self.ids[slot].append(self._value_id(operand.value))
+
+    def _operand(self, slot: int, index: int) -> Optional[Operand]:
+        kind = self.kinds[slot][index]
+        if kind == NO_OPERAND:
+            return None
+        return Operand(self.values[self.ids[slot][index]], self.kind_names[kind])
+
+    # ========== INTERFAZ DE TripletTable ==========
+
+    def add(self, triplet: Triplet) -> int:
+        index = self.next_id
+        self.ops.append(_OPCODE_INDEX[triplet.op])
+        self._store(0, triplet.arg1)
+        self._store(1, triplet.arg2)
+        self._store(2, triplet.result)
+        if triplet.comment is not None:
+            self.comments[index] = triplet.comment
+        triplet.id = index
+        self.next_id += 1
+        return index
+
+    def get(self, index: int) -> Optional[Triplet]:
+        if 0 <= index < len(self.ops):
+            triplet = Triplet(_OPCODES[self.ops[index]],
+                              self._operand(0, index),
+                              self._operand(1, index),
+                              self._operand(2, index),
+                              self.comments.get(index))
+            triplet.id = index
+            return triplet
+        return None
+
+    def set_result(self, index: int, operand: Optional[Operand]):
+        """Reemplaza el resultado del tripleto `index` (backpatch de saltos)"""
+        if operand is None:
+            self.kinds[2][index] = NO_OPERAND
+            self.ids[2][index] = 0
+        else:
+            self.kinds[2][index] = self._kind_id(operand.type)
+            self.ids[2][index] = self._value_id(operand.value)
+
+    def opcode(self, index: int) -> OpCode:
+        """OpCode del tripleto sin materializarlo"""
+        return _OPCODES[self.ops[index]]
+
+    def size(self) -> int:
+        return len(self.ops)
+
+    def clear(self):
+        self.__init__()
+
+    def to_list(self) -> List[dict]:
+        return [triplet.to_dict() for triplet in self]
+
+    @property
+    def triplets(self) -> List[Triplet]:
+        """Lista materializada (copia) para quien espera TripletTable.triplets"""
+        return list(self)
+
+    def memory_usage(self) -> int:
+        """Bytes de los buffers de la tabla (sin contar los valores internados)"""
+        buffers = (self.ops,) + self.kinds + self.ids
+        return sum(buf.itemsize * len(buf) for buf in buffers)
+
+    def __len__(self) -> int:
+        return len(self.ops)
+
+    def __iter__(self):
+        get = self.get
+        for index in range(len(self.ops)):
+            yield get(index)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.get(i) for i in range(*index.indices(len(self.ops)))]
+        if index < 0:
+            index += len(self.ops)
+        triplet = self.get(index)
+        if triplet is None:
+            raise IndexError("índice de tripleto fuera de rango")
+        return triplet
@@ -0,0 +1,647 @@
+"""
+Análisis de flujo de datos sobre el CFG de los tripletos.
+
+Un problema (DataflowProblem) define la dirección, el operador de
+encuentro (unión o intersección), el valor de frontera y la función de
+transferencia de cada bloque; la de los problemas de vectores de bits es
+`gen | (x & ~kill)`. solve() lo resuelve con una lista de trabajo
+ordenada por el orden inverso de post-orden (hacia adelante) o por el
+post-orden (hacia atrás), de modo que casi todos los problemas convergen
+en dos o tres pasadas.
+
+Los conjuntos son bitsets densos sobre un Universe (elemento -> bit):
+
+- IntBitsets: un int de Python por conjunto (por defecto)
+- NumpyBitsets: arreglos de palabras uint64; necesita NumPy. Cada
+  operación cuesta O(universo / 64) sin importar cuántos bits hay
+  encendidos, así que sólo compensa con conjuntos densos; con los del
+  visitor (benchmarks/bench_dataflow.py) el int es más rápido
+
+Clientes incluidos: Liveness (variables vivas), ReachingDefinitions,
+AvailableExpressions y AvailableCopies. Todos trabajan sobre una función del CFG
+(FunctionCFG) y sólo sobre sus bloques alcanzables.
+"""
+import heapq
+from typing import Dict, Hashable, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .cfg import ControlFlowGraph, FunctionCFG
+from .defuse import (
+    defined_name, is_memory_name, is_variable, used_names, PURE_OPS
+)
+from .triplet import OpCode, Triplet
+
+
+FORWARD = "forward"
+BACKWARD = "backward"
+
+UNION = "union"
+INTERSECTION = "intersection"
+
+
+# ========== BITSETS ==========
+
+class IntBitsets:
+    """Conjuntos como int de Python: el bit i representa al elemento i"""
+    name = "int"
+
+    def __init__(self, size: int):
+        self.size = size
+        self._full = (1 << size) - 1
+
+    def empty(self) -> int:
+        return 0
+
+    def full(self) -> int:
+        return self._full
+
+    def from_indices(self, indices: Iterable[int]) -> int:
+        value = 0
+        for i in indices:
+            value |= 1 << i
+        return value
+
+    def union(self, a: int, b: int) -> int:
+        return a | b
+
+    def intersection(self, a: int, b: int) -> int:
+        return a & b
+
+    def difference(self, a: int, b: int) -> int:
+        return a & ~b
+
+    def transfer(self, gen: int, kill: int, value: int) -> int:
+        return gen | (value & ~kill)
+
+    def equal(self, a: int, b: int) -> bool:
+        return a == b
+
+    def contains(self, value: int, i: int) -> bool:
+        return (value >> i) & 1 == 1
+
+    def count(self, value: int) -> int:
+        return value.bit_count()
+
+    def members(self, value: int) -> Iterator[int]:
+        while value:
+            low = value & -value
+            yield low.bit_length() - 1
+            value ^= low
+
+
+class NumpyBitsets:
+    """
+    Conjuntos como arreglos de palabras uint64 (bits empaquetados). Las
+    operaciones no modifican sus argumentos.
+    """
+    name = "numpy"
+
+    def __init__(self, size: int):
+        try:
+            import numpy
+        except ImportError as e:
+            raise ImportError("NumpyBitsets necesita NumPy (pip install numpy)") from e
+        self.np = numpy
+        self.size = size
+        self.words = (size + 63) // 64
+        self._empty = numpy.zeros(self.words, dtype=numpy.uint64)
+        self._empty.flags.writeable = False
+        full = numpy.full(self.words, numpy.iinfo(numpy.uint64).max, dtype=numpy.uint64)
+        if size % 64:
+            full[-1] = numpy.uint64((1 << (size % 64)) - 1)
+        full.flags.writeable = False
+        self._full = full
+
+    def empty(self):
+        return self._empty
+
+    def full(self):
+        return self._full
+
+    def from_indices(self, indices: Iterable[int]):
+        np = self.np
+        indices = np.fromiter(indices, dtype=np.int64)
+        value = np.zeros(self.words, dtype=np.uint64)
+        if len(indices):
+            bits = np.left_shift(np.uint64(1), (indices & 63).astype(np.uint64))
+            np.bitwise_or.at(value, indices >> 6, bits)
+        return value
+
+    def union(self, a, b):
+        return a | b
+
+    def intersection(self, a, b):
+        return a & b
+
+    def difference(self, a, b):
+        return a & ~b
+
+    def transfer(self, gen, kill, value):
+        return gen | (value & ~kill)
+
+    def equal(self, a, b) -> bool:
+        return self.np.array_equal(a, b)
+
+    def contains(self, value, i: int) -> bool:
+        return bool((int(value[i >> 6]) >> (i & 63)) & 1)
+
+    def count(self, value) -> int:
+        return int(self.np.unpackbits(value.view(self.np.uint8)).sum())
+
+    def members(self, value) -> Iterator[int]:
+        np = self.np
+        bits = np.unpackbits(value.view(np.uint8), bitorder='little')
+        return iter(np.flatnonzero(bits).tolist())
+
+
+BITSETS = {IntBitsets.name: IntBitsets, NumpyBitsets.name: NumpyBitsets}
+
+
+def make_bitsets(size: int, backend: str = IntBitsets.name):
+    """Operaciones de bitsets para un universo de `size` elementos"""
+    if backend not in BITSETS:
+        raise ValueError(f"Backend de bitsets desconocido: {backend}")
+    return BITSETS[backend](size)
+
+
+class Universe:
+    """Elementos de un análisis y su posición en los bitsets"""
+
+    def __init__(self, items: Iterable[Hashable] = ()):
+        self.items: List[Hashable] = []
+        self.index: Dict[Hashable, int] = {}
+        for item in items:
+            self.add(item)
+
+    def add(self, item: Hashable) -> int:
+        i = self.index.get(item)
+        if i is None:
+            i = len(self.items)
+            self.items.append(item)
+            self.index[item] = i
+        return i
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __contains__(self, item) -> bool:
+        return item in self.index
+
+
+# ========== MOTOR ==========
+
+class DataflowProblem:
+    """
+    Problema de flujo de datos sobre una función del CFG.
+
+    Las subclases llenan `universe` y, para problemas de vectores de bits,
+    `gen`/`kill` por bloque (llamando a `_bitsets()` al final); los demás
+    sobrescriben transfer().
+    """
+    direction = FORWARD
+    meet = UNION
+
+    def __init__(self, cfg: ControlFlowGraph, function: Optional[FunctionCFG] = None,
+                 backend: str = IntBitsets.name):
+        self.cfg = cfg
+        self.function = function if function is not None else cfg.main
+        self.backend = backend
+        self.universe = Universe()
+        self.sets = None
+        self.gen: Dict[int, object] = {}
+        self.kill: Dict[int, object] = {}
+
+    def _bitsets(self, gen: Dict[int, Iterable[int]], kill: Dict[int, Iterable[int]]):
+        """Crea los bitsets una vez conocido el universo"""
+        self.sets = make_bitsets(len(self.universe), self.backend)
+        self.gen = {b: self.sets.from_indices(indices) for b, indices in gen.items()}
+        self.kill = {b: self.sets.from_indices(indices) for b, indices in kill.items()}
+
+    def boundary(self):
+        """Valor en la entrada (adelante) o en las salidas (atrás)"""
+        return self.sets.empty()
+
+    def initial(self):
+        """Valor inicial del resto de los bloques"""
+        return self.sets.empty() if self.meet == UNION else self.sets.full()
+
+    def transfer(self, block: int, value):
+        return self.sets.transfer(self.gen[block], self.kill[block], value)
+
+    def solve(self) -> 'DataflowResult':
+        return solve(self)
+
+
+class DataflowResult:
+    """
+    Valores al inicio (block_in) y al final (block_out) de cada bloque
+    alcanzable, sin importar la dirección del problema.
+    """
+
+    def __init__(self, problem: DataflowProblem, block_in: Dict[int, object],
+                 block_out: Dict[int, object], iterations: int):
+        self.problem = problem
+        self.block_in = block_in
+        self.block_out = block_out
+        self.iterations = iterations
+
+    def items(self, value) -> List[Hashable]:
+        """Elementos del universo presentes en un bitset"""
+        items = self.problem.universe.items
+        return [items[i] for i in self.problem.sets.members(value)]
+
+    def in_items(self, block: int) -> List[Hashable]:
+        return self.items(self.block_in[block])
+
+    def out_items(self, block: int) -> List[Hashable]:
+        return self.items(self.block_out[block])
+
+
+def solve(problem: DataflowProblem) -> DataflowResult:
+    """Itera la lista de trabajo hasta el punto fijo"""
+    cfg = problem.cfg
+    blocks = cfg.blocks
+    sets = problem.sets
+    meet = sets.union if problem.meet == UNION else sets.intersection
+    rpo = problem.function.reverse_postorder
+    in_function = set(rpo)
+
+    if problem.direction == FORWARD:
+        order = rpo
+        sources = {b: [p for p in blocks[b].preds if p in in_function] for b in rpo}
+        targets = {b: blocks[b].succs for b in rpo}
+        start = {problem.function.entry}
+    else:
+        order = rpo[::-1]
+        sources = {b: blocks[b].succs for b in rpo}
+        targets = {b: [p for p in blocks[b].preds if p in in_function] for b in rpo}
+        # Las salidas incluyen el último bloque si su salto condicional puede
+        # seguir de largo: tiene sucesores pero también sale de la región
+        start = set(problem.function.exits)
+
+    # before: valor antes de aplicar la transferencia; after: después
+    initial = problem.initial()
+    boundary = problem.boundary()
+    after = {b: initial for b in order}
+    before: Dict[int, object] = {}
+
+    # Lista de trabajo por pasadas en el orden de recorrido: un bloque que
+    # vuelve a entrar por una arista hacia atrás espera a la pasada
+    # siguiente. El orden inverso de post-orden puede dejar el cuerpo de un
+    # bucle después del resto de la función; propagar cada arista hacia
+    # atrás en el acto recorrería el resto una vez por bucle.
+    position = {b: i for i, b in enumerate(order)}
+    pending = list(range(len(order)))
+    next_pass: List[int] = []
+    queued = set(order)
+    iterations = 0
+
+    while pending:
+        current = heapq.heappop(pending)
+        b = order[current]
+        queued.discard(b)
+        iterations += 1
+
+        value = boundary if b in start else None
+        for s in sources[b]:
+            value = after[s] if value is None else meet(value, after[s])
+        if value is None:
+            value = initial
+        before[b] = value
+
+        new_after = problem.transfer(b, value)
+        if not sets.equal(new_after, after[b]):
+            after[b] = new_after
+            for t in targets[b]:
+                if t not in queued:
+                    queued.add(t)
+                    k = position[t]
+                    heapq.heappush(pending if k > current else next_pass, k)
+        if not pending:
+            pending, next_pass = next_pass, pending
+
+    if problem.direction == FORWARD:
+        return DataflowResult(problem, before, after, iterations)
+    return DataflowResult(problem, after, before, iterations)
+
+
+# ========== CLIENTES ==========
+
+class Liveness(DataflowProblem):
+    """
+    Variables vivas (hacia atrás, unión). Una variable está viva si algún
+    camino la lee antes de volver a escribirla.
+
+    Las variables en memoria están vivas al salir de la función y en cada
+    llamada (la función llamada puede leerlas). Por defecto lo están todas
+    las variables con nombre; `memory` restringe el conjunto (p. ej. a las
+    que comparten varias funciones).
+    """
+    direction = BACKWARD
+    meet = UNION
+
+    def __init__(self, cfg: ControlFlowGraph, function: Optional[FunctionCFG] = None,
+                 backend: str = IntBitsets.name, memory: Optional[Set[str]] = None):
+        super().__init__(cfg, function, backend)
+        universe = self.universe
+        code = cfg.triplets
+        blocks = cfg.blocks
+
+        for b in self.function.blocks:
+            block = blocks[b]
+            for i in range(block.start, block.end):
+                triplet = code[i]
+                for name in used_names(triplet):
+                    universe.add(name)
+                name = defined_name(triplet)
+                if name is not None:
+                    universe.add(name)
+        index = universe.index
+        if memory is None:
+            self.memory = [index[name] for name in universe.items if is_memory_name(name)]
+        else:
+            self.memory = [index[name] for name in universe.items if name in memory]
+
+        gen: Dict[int, Set[int]] = {}
+        kill: Dict[int, Set[int]] = {}
+        effects: Dict[int, Tuple[List[int], List[int]]] = {}
+        for b in self.function.blocks:
+            block = blocks[b]
+            block_gen: Set[int] = set()
+            block_kill: Set[int] = set()
+            for i in range(block.end - 1, block.start - 1, -1):
+                defined, used = effects[i] = self.effects(code[i])
+                block_gen.difference_update(defined)
+                block_kill.update(defined)
+                block_gen.update(used)
+            gen[b] = block_gen
+            kill[b] = block_kill
+        self._bitsets(gen, kill)
+        self._memory_set = self.sets.from_indices(self.memory)
+        # Bitsets (definidos, leídos) de cada tripleto, para recorrer bloques
+        from_indices = self.sets.from_indices
+        self._triplet_sets = {i: (from_indices(defined), from_indices(used))
+                              for i, (defined, used) in effects.items()}
+
+    def effects(self, triplet: Triplet) -> Tuple[List[int], List[int]]:
+        """(bits definidos, bits leídos) por un tripleto"""
+        index = self.universe.index
+        name = defined_name(triplet)
+        defined = [index[name]] if name is not None else []
+        used = [index[n] for n in used_names(triplet)]
+        if triplet.op is OpCode.CALL:
+            used.extend(self.memory)
+        return defined, used
+
+    def boundary(self):
+        return self._memory_set
+
+    def live_before(self, i: int, live):
+        """Variables vivas antes del tripleto i, dadas las vivas después"""
+        defined, used = self._triplet_sets[i]
+        return self.sets.union(self.sets.difference(live, defined), used)
+
+    def live_after(self, result: DataflowResult, block: int) -> List[object]:
+        """
+        Bitset de variables vivas después de cada tripleto del bloque
+        (live_after[k] corresponde al tripleto block.start + k).
+        """
+        start, end = self.cfg.blocks[block].start, self.cfg.blocks[block].end
+        live = result.block_out[block]
+        values = [None] * (end - start)
+        for i in range(end - 1, start - 1, -1):
+            values[i - start] = live
+            live = self.live_before(i, live)
+        return values
+
+
+class ReachingDefinitions(DataflowProblem):
+    """
+    Definiciones que alcanzan cada punto (hacia adelante, unión). El
+    universo son los índices de los tripletos que definen una variable.
+
+    Una llamada puede escribir cualquier variable con nombre: cuenta como
+    una definición de todas ellas (su índice también está en el universo y
+    `clobbers` lo marca) y mata las definiciones anteriores de esas
+    variables.
+    """
+    direction = FORWARD
+    meet = UNION
+
+    def __init__(self, cfg: ControlFlowGraph, function: Optional[FunctionCFG] = None,
+                 backend: str = IntBitsets.name):
+        super().__init__(cfg, function, backend)
+        universe = self.universe
+        code = cfg.triplets
+        blocks = cfg.blocks
+
+        # Variable -> bits de sus definiciones; las llamadas van aparte
+        self.definitions: Dict[str, List[int]] = {}
+        self.clobbers: Set[int] = set()
+        for b in self.function.blocks:
+            block = blocks[b]
+            for i in range(block.start, block.end):
+                triplet = code[i]
+                name = defined_name(triplet)
+                if name is not None:
+                    self.definitions.setdefault(name, []).append(universe.add(i))
+                if triplet.op is OpCode.CALL:
+                    self.clobbers.add(universe.add(i))
+
+        memory_defs = set(self.clobbers)
+        for name, bits in self.definitions.items():
+            if is_memory_name(name):
+                memory_defs.update(bits)
+
+        gen: Dict[int, Set[int]] = {}
+        kill: Dict[int, Set[int]] = {}
+        for b in self.function.blocks:
+            block = blocks[b]
+            block_gen: Set[int] = set()
+            block_kill: Set[int] = set()
+            for i in range(block.start, block.end):
+                triplet = code[i]
+                name = defined_name(triplet)
+                if triplet.op is OpCode.CALL:
+                    killed = memory_defs.union(self.definitions.get(name, ()))
+                elif name is not None:
+                    killed = self.definitions[name]
+                else:
+                    continue
+                bit = universe.index[i]
+                block_gen.difference_update(killed)
+                block_kill.update(killed)
+                block_gen.add(bit)
+            gen[b] = block_gen
+            kill[b] = block_kill - block_gen
+        self._bitsets(gen, kill)
+
+    def reaching(self, result: DataflowResult, block: int, name: str) -> List[int]:
+        """
+        Índices de los tripletos cuyas definiciones de `name` llegan al
+        inicio del bloque (incluye las llamadas si `name` está en memoria)
+        """
+        value = result.block_in[block]
+        sets = self.sets
+        bits = list(self.definitions.get(name, ()))
+        if is_memory_name(name):
+            bits.extend(self.clobbers)
+        items = self.universe.items
+        return sorted(items[bit] for bit in bits if sets.contains(value, bit))
+
+
+def expression_key(triplet: Triplet) -> Optional[Tuple]:
+    """(op, arg1, arg2) de una operación pura sobre variables o constantes"""
+    if triplet.op not in PURE_OPS:
+        return None
+    arg1, arg2 = triplet.arg1, triplet.arg2
+    if arg1 is None:
+        return None
+    return (triplet.op.value, str(arg1), str(arg2) if arg2 is not None else None)
+
+
+class AvailableExpressions(DataflowProblem):
+    """
+    Expresiones disponibles (hacia adelante, intersección): calculadas en
+    todos los caminos y sin que cambie ninguno de sus operandos desde
+    entonces. Una llamada mata las expresiones que leen variables con nombre.
+    """
+    direction = FORWARD
+    meet = INTERSECTION
+
+    def __init__(self, cfg: ControlFlowGraph, function: Optional[FunctionCFG] = None,
+                 backend: str = IntBitsets.name):
+        super().__init__(cfg, function, backend)
+        universe = self.universe
+        code = cfg.triplets
+        blocks = cfg.blocks
+
+        # Variable -> bits de las expresiones que la leen
+        readers: Dict[str, Set[int]] = {}
+        for b in self.function.blocks:
+            block = blocks[b]
+            for i in range(block.start, block.end):
+                triplet = code[i]
+                key = expression_key(triplet)
+                if key is None:
+                    continue
+                bit = universe.add(key)
+                for operand in (triplet.arg1, triplet.arg2):
+                    if is_variable(operand):
+                        readers.setdefault(operand.value, set()).add(bit)
+        self.readers = readers
+        memory_readers: Set[int] = set()
+        for name, bits in readers.items():
+            if is_memory_name(name):
+                memory_readers.update(bits)
+
+        gen: Dict[int, Set[int]] = {}
+        kill: Dict[int, Set[int]] = {}
+        for b in self.function.blocks:
+            block = blocks[b]
+            block_gen: Set[int] = set()
+            block_kill: Set[int] = set()
+            for i in range(block.start, block.end):
+                triplet = code[i]
+                key = expression_key(triplet)
+                if key is not None:
+                    block_gen.add(universe.index[key])
+                name = defined_name(triplet)
+                killed = readers.get(name, ()) if name is not None else ()
+                if triplet.op is OpCode.CALL:
+                    killed = memory_readers
+                block_gen.difference_update(killed)
+                block_kill.update(killed)
+            gen[b] = block_gen
+            kill[b] = block_kill - block_gen
+        self._bitsets(gen, kill)
+
+    def boundary(self):
+        return self.sets.empty()
+
+
+def copy_key(triplet: Triplet) -> Optional[Tuple[str, str]]:
+    """(destino, origen) de una copia `x = mov y` entre variables distintas"""
+    if triplet.op is not OpCode.MOV or not is_variable(triplet.arg1) \
+            or not is_variable(triplet.result):
+        return None
+    target, source = triplet.result.value, triplet.arg1.value
+    return (target, source) if target != source else None
+
+
+class AvailableCopies(DataflowProblem):
+    """
+    Copias disponibles (hacia adelante, intersección): `x = mov y` llega por
+    todos los caminos sin que se reasigne x ni y, así que x puede leerse
+    como y. Una llamada mata las copias en que participa una variable con
+    nombre.
+    """
+    direction = FORWARD
+    meet = INTERSECTION
+
+    def __init__(self, cfg: ControlFlowGraph, function: Optional[FunctionCFG] = None,
+                 backend: str = IntBitsets.name):
+        super().__init__(cfg, function, backend)
+        universe = self.universe
+        code = cfg.triplets
+        blocks = cfg.blocks
+
+        # Variable -> bits de las copias en que participa (destino u origen)
+        involving: Dict[str, Set[int]] = {}
+        for b in self.function.blocks:
+            block = blocks[b]
+            for i in range(block.start, block.end):
+                key = copy_key(code[i])
+                if key is None:
+                    continue
+                bit = universe.add(key)
+                for name in key:
+                    involving.setdefault(name, set()).add(bit)
+        self.involving = involving
+        memory_copies: Set[int] = set()
+        for name, bits in involving.items():
+            if is_memory_name(name):
+                memory_copies.update(bits)
+
+        gen: Dict[int, Set[int]] = {}
+        kill: Dict[int, Set[int]] = {}
+        for b in self.function.blocks:
+            block = blocks[b]
+            block_gen: Set[int] = set()
+            block_kill: Set[int] = set()
+            for i in range(block.start, block.end):
+                triplet = code[i]
+                name = defined_name(triplet)
+                killed = involving.get(name, ()) if name is not None else ()
+                if triplet.op is OpCode.CALL:
+                    killed = memory_copies.union(killed)
+                block_gen.difference_update(killed)
+                block_kill.update(killed)
+                key = copy_key(triplet)
+                if key is not None:
+                    block_gen.add(universe.index[key])
+            gen[b] = block_gen
+            kill[b] = block_kill - block_gen
+        self._bitsets(gen, kill)
+
+    def boundary(self):
+        return self.sets.empty()
+
+
+def liveness(cfg: ControlFlowGraph, function: Optional[FunctionCFG] = None,
+             backend: str = IntBitsets.name) -> DataflowResult:
+    return Liveness(cfg, function, backend).solve()
+
+
+def reaching_definitions(cfg: ControlFlowGraph, function: Optional[FunctionCFG] = None,
+                         backend: str = IntBitsets.name) -> DataflowResult:
+    return ReachingDefinitions(cfg, function, backend).solve()
+
+
+def available_expressions(cfg: ControlFlowGraph, function: Optional[FunctionCFG] = None,
+                          backend: str = IntBitsets.name) -> DataflowResult:
+    return AvailableExpressions(cfg, function, backend).solve()
+
+
+def available_copies(cfg: ControlFlowGraph, function: Optional[FunctionCFG] = None,
+                     backend: str = IntBitsets.name) -> DataflowResult:
+    return AvailableCopies(cfg, function, backend).solve()
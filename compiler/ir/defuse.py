@@ -0,0 +1,118 @@
+"""
+Usos y definiciones de variables en los tripletos.
+
+Las variables de los análisis son los operandos `temp` y `var` con nombre;
+se identifican por el nombre (el visitor usa ambos tipos para un mismo tN).
+No son variables las etiquetas, constantes, el nombre de la función en CALL
+ni el nombre del campo en GET_FIELD/SET_FIELD.
+
+Casi todas las instrucciones leen arg1/arg2 y escriben result. Las
+excepciones:
+
+- saltos: result es la etiqueta de destino
+- ARRAY_SET, SET_FIELD, STORE: escriben memoria; result (cuando lo usan)
+  es el valor que se guarda, es decir, una lectura
+- CALL: arg1 es la función y arg2 el número de argumentos
+- PHI (sólo en forma SSA): lee los valores de `incoming`
+
+Las variables con nombre (no tN) viven en memoria: una llamada puede
+leerlas o escribirlas y siguen vivas al salir de la función.
+"""
+import re
+from typing import List, Optional, Tuple
+
+from .triplet import OpCode, Operand, Triplet
+
+
+JUMP_OPS = (OpCode.JMP, OpCode.BEQ, OpCode.BNE, OpCode.BLT, OpCode.BLE,
+            OpCode.BGT, OpCode.BGE, OpCode.BZ, OpCode.BNZ)
+
+# Escriben memoria: el resultado es una lectura
+STORE_OPS = (OpCode.ARRAY_SET, OpCode.SET_FIELD, OpCode.STORE)
+
+# Sin resultado que sea una variable definida
+_NO_DEFINITION = JUMP_OPS + STORE_OPS + (OpCode.LABEL, OpCode.ENTER, OpCode.EXIT,
+                                         OpCode.PARAM, OpCode.PRINT, OpCode.RETURN)
+
+# Instrucciones que no se pueden eliminar aunque su resultado no se use
+SIDE_EFFECT_OPS = JUMP_OPS + STORE_OPS + (
+    OpCode.LABEL, OpCode.ENTER, OpCode.EXIT, OpCode.CALL, OpCode.PARAM,
+    OpCode.RETURN, OpCode.PRINT, OpCode.NEW_OBJ, OpCode.ARRAY_ALLOC, OpCode.NOP,
+)
+
+# Operaciones puras de uno o dos operandos (candidatas a expresiones)
+PURE_OPS = (OpCode.ADD, OpCode.SUB, OpCode.MUL, OpCode.DIV, OpCode.MOD, OpCode.NEG,
+            OpCode.AND, OpCode.OR, OpCode.NOT,
+            OpCode.EQ, OpCode.NE, OpCode.LT, OpCode.LE, OpCode.GT, OpCode.GE)
+
+# tN, o tN.k para las versiones SSA
+_TEMP_NAME = re.compile(r"t\d+(\.\d+)?")
+
+_NO_SLOTS: Tuple[str, ...] = ()
+_ARG_SLOTS = ('arg1', 'arg2')
+_STORE_SLOTS = ('arg1', 'arg2', 'result')
+
+
+def is_variable(operand: Optional[Operand]) -> bool:
+    """True para temporales y variables con nombre"""
+    return (operand is not None and (operand.type == "temp" or operand.type == "var")
+            and operand.value.__class__ is str and operand.value != "")
+
+
+def is_temp_name(name: str) -> bool:
+    """Nombres tN de temporales (sin importar el tipo del operando)"""
+    return _TEMP_NAME.fullmatch(name) is not None
+
+
+def is_memory_name(name: str) -> bool:
+    """Variables con nombre: viven en memoria, no en un registro"""
+    return not is_temp_name(name)
+
+
+def use_slots(triplet: Triplet) -> Tuple[str, ...]:
+    """Campos del tripleto que pueden leer una variable (PHI no tiene)"""
+    op = triplet.op
+    if op is OpCode.LABEL or op is OpCode.ENTER or op is OpCode.EXIT or op is OpCode.CALL \
+            or op is OpCode.PHI:
+        return _NO_SLOTS
+    if op is OpCode.GET_FIELD:
+        return ('arg1',)
+    if op is OpCode.SET_FIELD:
+        return ('arg1', 'result')
+    if op in STORE_OPS:
+        return _STORE_SLOTS
+    return _ARG_SLOTS
+
+
+def used_operands(triplet: Triplet) -> List[Operand]:
+    """Operandos variables que lee el tripleto, en orden arg1, arg2, result"""
+    if triplet.op is OpCode.PHI:
+        return [value for _, value in triplet.incoming if is_variable(value)]
+    operands = [getattr(triplet, slot) for slot in use_slots(triplet)]
+    return [operand for operand in operands if is_variable(operand)]
+
+
+def used_names(triplet: Triplet) -> List[str]:
+    return [operand.value for operand in used_operands(triplet)]
+
+
+def defined_operand(triplet: Triplet) -> Optional[Operand]:
+    """Variable que escribe el tripleto, o None"""
+    if triplet.op in _NO_DEFINITION:
+        return None
+    result = triplet.result
+    return result if is_variable(result) else None
+
+
+def defined_name(triplet: Triplet) -> Optional[str]:
+    result = defined_operand(triplet)
+    return result.value if result is not None else None
+
+
+def has_side_effects(triplet: Triplet) -> bool:
+    """True si el tripleto hace algo además de escribir su resultado"""
+    return triplet.op in SIDE_EFFECT_OPS
+
+
+def is_pure(triplet: Triplet) -> bool:
+    return triplet.op in PURE_OPS
@@ -0,0 +1,310 @@
+"""
+Dominadores, fronteras de dominancia y bucles naturales de una función.
+
+El bloque a domina a b si todo camino desde la entrada hasta b pasa por a.
+DominatorTree calcula el dominador inmediato de cada bloque alcanzable con
+el algoritmo iterativo de Cooper, Harvey y Kennedy ("A Simple, Fast
+Dominance Algorithm"): recorre los bloques en orden inverso de post-orden
+intersecando los dominadores de los predecesores hasta el punto fijo, casi
+siempre en dos pasadas. Con la numeración pre/post del árbol, dominates()
+responde en O(1).
+
+LoopForest encuentra los bucles naturales: una arista b -> h es de retorno
+si h domina a b, y el bucle de la cabecera h son los bloques que llegan a
+alguna de sus aristas de retorno sin pasar por h. Las aristas que vuelven
+hacia atrás sin que su destino las domine (flujo irreducible; el visitor no
+lo genera) quedan en `irreducible` y no forman bucles.
+
+Las etiquetas LOOP_START_/LOOP_END_ del LabelGenerator no se usan: los
+bucles salen del grafo.
+"""
+from typing import Dict, List, Optional, Set
+
+from .cfg import ControlFlowGraph, FunctionCFG
+
+
+class DominatorTree:
+    """
+    Árbol de dominadores de una función (sólo bloques alcanzables).
+
+    Atributos:
+        function: La función analizada
+        order: Bloques en orden inverso de post-orden
+        children: Bloque -> hijos en el árbol
+    """
+
+    def __init__(self, cfg: ControlFlowGraph, function: Optional[FunctionCFG] = None):
+        self.cfg = cfg
+        self.function = function if function is not None else cfg.main
+        self.order: List[int] = self.function.reverse_postorder
+        n = len(cfg.blocks)
+        # Posición en el orden inverso de post-orden (-1: no alcanzable)
+        self._position = [-1] * n
+        for i, b in enumerate(self.order):
+            self._position[b] = i
+        self._idom = [-1] * n
+        self.children: Dict[int, List[int]] = {b: [] for b in self.order}
+        self._pre = [-1] * n
+        self._post = [-1] * n
+        self._frontiers: Optional[Dict[int, Set[int]]] = None
+        if self.order:
+            self._compute()
+            self._number()
+
+    def _compute(self):
+        blocks = self.cfg.blocks
+        position = self._position
+        idom = self._idom
+        entry = self.order[0]
+        idom[entry] = entry
+
+        def intersect(a: int, b: int) -> int:
+            while a != b:
+                while position[a] > position[b]:
+                    a = idom[a]
+                while position[b] > position[a]:
+                    b = idom[b]
+            return a
+
+        changed = True
+        while changed:
+            changed = False
+            for b in self.order[1:]:
+                new_idom = -1
+                for p in blocks[b].preds:
+                    if idom[p] == -1:
+                        continue
+                    new_idom = p if new_idom == -1 else intersect(p, new_idom)
+                if idom[b] != new_idom:
+                    idom[b] = new_idom
+                    changed = True
+
+        for b in self.order[1:]:
+            self.children[idom[b]].append(b)
+
+    def _number(self):
+        """Numeración pre/post del árbol, con una pila explícita"""
+        pre, post = self._pre, self._post
+        counter = 0
+        stack = [(self.order[0], 0)]
+        pre[self.order[0]] = counter
+        while stack:
+            b, i = stack[-1]
+            children = self.children[b]
+            if i < len(children):
+                stack[-1] = (b, i + 1)
+                counter += 1
+                pre[children[i]] = counter
+                stack.append((children[i], 0))
+            else:
+                stack.pop()
+                counter += 1
+                post[b] = counter
+
+    # ========== CONSULTAS ==========
+
+    @property
+    def root(self) -> Optional[int]:
+        return self.order[0] if self.order else None
+
+    def is_reachable(self, block: int) -> bool:
+        return self._position[block] != -1
+
+    def immediate_dominator(self, block: int) -> Optional[int]:
+        """Dominador inmediato (None para la entrada y los no alcanzables)"""
+        idom = self._idom[block]
+        if idom == -1 or idom == block:
+            return None
+        return idom
+
+    def dominates(self, a: int, b: int) -> bool:
+        """True si a domina a b (todo bloque alcanzable se domina a sí mismo)"""
+        pre = self._pre
+        if pre[a] == -1 or pre[b] == -1:
+            return False
+        return pre[a] <= pre[b] and self._post[b] <= self._post[a]
+
+    def strictly_dominates(self, a: int, b: int) -> bool:
+        return a != b and self.dominates(a, b)
+
+    def dominators(self, block: int) -> List[int]:
+        """Dominadores de `block`, desde él hasta la entrada"""
+        if not self.is_reachable(block):
+            return []
+        chain = [block]
+        idom = self.immediate_dominator(block)
+        while idom is not None:
+            chain.append(idom)
+            idom = self.immediate_dominator(idom)
+        return chain
+
+    def preorder(self) -> List[int]:
+        """Bloques en pre-orden del árbol (cada dominador antes que sus dominados)"""
+        return sorted(self.order, key=self._pre.__getitem__)
+
+    def frontier(self, block: int) -> Set[int]:
+        """
+        Frontera de dominancia: bloques donde deja de dominar `block` (un
+        predecesor suyo está dominado por `block`, pero ellos no
+        estrictamente). Se calculan todas la primera vez.
+        """
+        if self._frontiers is None:
+            self._frontiers = self._compute_frontiers()
+        return self._frontiers.get(block, set())
+
+    def _compute_frontiers(self) -> Dict[int, Set[int]]:
+        blocks = self.cfg.blocks
+        idom = self._idom
+        entry = self.order[0]
+        frontiers: Dict[int, Set[int]] = {b: set() for b in self.order}
+        for b in self.order:
+            preds = [p for p in blocks[b].preds if idom[p] != -1]
+            # La entrada tiene además la arista implícita desde fuera
+            if len(preds) < 2 and not (b == entry and preds):
+                continue
+            stop = idom[b] if b != entry else -1
+            for p in preds:
+                runner = p
+                while runner != stop:
+                    frontiers[runner].add(b)
+                    if runner == entry:
+                        break
+                    runner = idom[runner]
+        return frontiers
+
+
+class Loop:
+    """
+    Bucle natural.
+
+    Atributos:
+        header: Bloque cabecera (domina a todo el bucle)
+        latches: Bloques con una arista de retorno a la cabecera
+        blocks: Bloques del bucle (incluye los de los bucles internos)
+        parent: Bucle que lo contiene inmediatamente
+        children: Bucles contenidos inmediatamente
+        depth: Profundidad de anidamiento (1 para los externos)
+    """
+
+    def __init__(self, header: int):
+        self.header = header
+        self.latches: List[int] = []
+        self.blocks: Set[int] = {header}
+        self.parent: Optional['Loop'] = None
+        self.children: List['Loop'] = []
+        self.depth = 1
+
+    def __contains__(self, block: int) -> bool:
+        return block in self.blocks
+
+    def __len__(self) -> int:
+        return len(self.blocks)
+
+    def exits(self, cfg: ControlFlowGraph) -> List[int]:
+        """Bloques fuera del bucle a los que salta algún bloque del bucle"""
+        targets = set()
+        for b in self.blocks:
+            for s in cfg.blocks[b].succs:
+                if s not in self.blocks:
+                    targets.add(s)
+        return sorted(targets)
+
+    def __repr__(self) -> str:
+        return f"Loop(B{self.header}, {len(self.blocks)} bloques, depth={self.depth})"
+
+
+class LoopForest:
+    """
+    Bucles naturales de una función y su anidamiento.
+
+    Atributos:
+        loops: Bucles ordenados por la posición de su cabecera
+        roots: Bucles externos
+        irreducible: Aristas (origen, destino) hacia atrás que no son de retorno
+    """
+
+    def __init__(self, dominators: DominatorTree):
+        self.dominators = dominators
+        cfg = dominators.cfg
+        blocks = cfg.blocks
+        self.loops: List[Loop] = []
+        self.roots: List[Loop] = []
+        self.irreducible: List[tuple] = []
+        # Bucle más interno de cada bloque del CFG
+        self._innermost: List[Optional[Loop]] = [None] * len(blocks)
+
+        position = {b: i for i, b in enumerate(dominators.order)}
+        by_header: Dict[int, Loop] = {}
+        for b in dominators.order:
+            for s in blocks[b].succs:
+                if position[s] > position[b]:
+                    continue
+                if dominators.dominates(s, b):
+                    loop = by_header.get(s)
+                    if loop is None:
+                        loop = by_header[s] = Loop(s)
+                    loop.latches.append(b)
+                else:
+                    self.irreducible.append((b, s))
+
+        for loop in by_header.values():
+            self._collect_body(loop)
+
+        # De mayor a menor: cada bloque termina asignado a su bucle más
+        # interno y el padre de un bucle es el que tenía su cabecera
+        for loop in sorted(by_header.values(), key=len, reverse=True):
+            parent = self._innermost[loop.header]
+            if parent is not None:
+                loop.parent = parent
+                loop.depth = parent.depth + 1
+                parent.children.append(loop)
+            else:
+                self.roots.append(loop)
+            for b in loop.blocks:
+                self._innermost[b] = loop
+
+        self.loops = sorted(by_header.values(), key=lambda loop: position[loop.header])
+        self.roots.sort(key=lambda loop: position[loop.header])
+        for loop in self.loops:
+            loop.children.sort(key=lambda child: position[child.header])
+
+    def _collect_body(self, loop: Loop):
+        """Bloques que llegan a un latch sin pasar por la cabecera"""
+        blocks = self.dominators.cfg.blocks
+        dominators = self.dominators
+        body = loop.blocks
+        stack = [latch for latch in loop.latches if latch not in body]
+        body.update(stack)
+        while stack:
+            b = stack.pop()
+            for p in blocks[b].preds:
+                if p not in body and dominators.is_reachable(p):
+                    body.add(p)
+                    stack.append(p)
+
+    def loop_of(self, block: int) -> Optional[Loop]:
+        """Bucle más interno que contiene a `block`, o None"""
+        return self._innermost[block]
+
+    def depth(self, block: int) -> int:
+        """Profundidad de anidamiento de `block` (0 fuera de todo bucle)"""
+        loop = self._innermost[block]
+        return loop.depth if loop is not None else 0
+
+    def is_header(self, block: int) -> bool:
+        loop = self._innermost[block]
+        return loop is not None and loop.header == block
+
+    def __len__(self) -> int:
+        return len(self.loops)
+
+    def __iter__(self):
+        return iter(self.loops)
+
+
+def dominator_tree(cfg: ControlFlowGraph, function: Optional[FunctionCFG] = None) -> DominatorTree:
+    return DominatorTree(cfg, function)
+
+
+def loop_forest(cfg: ControlFlowGraph, function: Optional[FunctionCFG] = None) -> LoopForest:
+    return LoopForest(DominatorTree(cfg, function))
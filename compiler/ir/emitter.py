@@ -1,7 +1,8 @@
 from typing import List, Dict, Optional, Union, Set
-from .triplet import Triplet, TripletTable, OpCode, Operand
+from .triplet import Triplet, TripletTable, OpCode, Operand, OperandFactory
 from .triplet import temp_operand, var_operand, const_operand, label_operand, func_operand
 from .temp_pool import ScopedTemporaryManager
+from .compact_table import CompactTripletTable
 
 
 class LabelGenerator:
@@ -55,8 +56,11 @@ class BackpatchList:
 
 class TripletEmitter:
     
-    def __init__(self):
-        self.table = TripletTable()
+    def __init__(self, compact: bool = False):
+        # compact=True: tabla struct-of-arrays (ver compact_table.py)
+        self.table = CompactTripletTable() if compact else TripletTable()
+        # Una instancia de Operand por (tipo, valor) en todo el programa
+        self.operands = OperandFactory()
         self.label_gen = LabelGenerator()
         self.temp_manager = ScopedTemporaryManager()
         self.pending_patches: Dict[str, List[int]] = {}
@@ -72,34 +76,34 @@ class TripletEmitter:
             arg2: Optional[Union[str, int, float, bool, Operand]] = None,
             result: Optional[Union[str, Operand]] = None,
             comment: Optional[str] = None) -> int:
-        if arg1 is not None and not isinstance(arg1, Operand):
-            if isinstance(arg1, (int, float, bool)):
-                arg1 = const_operand(arg1)
-            else:
-                arg1 = var_operand(str(arg1))
+        operands = self.operands
+        if arg1 is not None:
+            arg1 = operands.coerce(arg1)
         
-        if arg2 is not None and not isinstance(arg2, Operand):
-            if isinstance(arg2, (int, float, bool)):
-                arg2 = const_operand(arg2)
-            else:
-                arg2 = var_operand(str(arg2))
+        if arg2 is not None:
+            arg2 = operands.coerce(arg2)
         
-        if result is not None and not isinstance(result, Operand):
-            result = var_operand(str(result))
+        if result is not None:
+            if isinstance(result, Operand):
+                result = operands.intern(result)
+            else:
+                result = operands.var(str(result))
         
         triplet = Triplet(op, arg1, arg2, result, None)
         return self.table.add(triplet)
     
     def emit_label(self, label_name: str) -> int:
-        return self.emit(OpCode.LABEL, label_operand(label_name))
+        return self.emit(OpCode.LABEL, self.operands.label(label_name))
     
     def emit_jump(self, label_name: str) -> int:
-        return self.emit(OpCode.JMP, None, None, label_operand(label_name))
+        # Sin etiqueta ("") el destino queda pendiente de backpatch
+        result_arg = self.operands.label(label_name) if label_name else None
+        return self.emit(OpCode.JMP, None, None, result_arg)
     
     def emit_conditional_jump(self, op: OpCode, arg1: Union[str, Operand], 
                             arg2: Optional[Union[str, Operand]] = None,
                             label_name: Optional[str] = None) -> int:
-        result_arg = label_operand(label_name) if label_name else None
+        result_arg = self.operands.label(label_name) if label_name else None
         return self.emit(op, arg1, arg2, result_arg)
     
     def emit_binary_op(self, op: OpCode, left: Union[str, Operand], 
@@ -108,7 +112,7 @@ class TripletEmitter:
         if result is None:
             result = self.temp_manager.new_temp()
         
-        self.emit(op, left, right, temp_operand(result))
+        self.emit(op, left, right, self.operands.temp(result))
         return result
     
     def emit_unary_op(self, op: OpCode, operand: Union[str, Operand],
@@ -116,11 +120,11 @@ class TripletEmitter:
         if result is None:
             result = self.temp_manager.new_temp()
         
-        self.emit(op, operand, None, temp_operand(result))
+        self.emit(op, operand, None, self.operands.temp(result))
         return result
     
     def emit_assignment(self, target: str, source: Union[str, Operand]) -> int:
-        return self.emit(OpCode.MOV, source, None, var_operand(target))
+        return self.emit(OpCode.MOV, source, None, self.operands.var(target))
     
     def new_label(self, label_type: str = 'general') -> str:
         return self.label_gen.new_label(label_type)
@@ -130,10 +134,9 @@ class TripletEmitter:
     
     def backpatch(self, patch_list: BackpatchList, label_name: str):
         for triplet_index in patch_list.get_patches():
-            if 0 <= triplet_index < len(self.table.triplets):
-                triplet = self.table.triplets[triplet_index]
-                if triplet.is_jump() and triplet.result is None:
-                    triplet.result = label_operand(label_name)
+            triplet = self.table.get(triplet_index)
+            if triplet is not None and triplet.is_jump() and triplet.result is None:
+                self.table.set_result(triplet_index, self.operands.label(label_name))
     
     def make_list(self, triplet_index: int) -> BackpatchList:
         bp_list = BackpatchList()
@@ -180,11 +183,11 @@ class TripletEmitter:
         
         func_label = self.new_label('func_start')
         self.emit_label(func_label)
-        self.emit(OpCode.ENTER, func_operand(func_name), const_operand(len(params)))
+        self.emit(OpCode.ENTER, self.operands.func(func_name), self.operands.const(len(params)))
     
     def exit_function(self):
         if self.current_function:
-            self.emit(OpCode.EXIT, func_operand(self.current_function))
+            self.emit(OpCode.EXIT, self.operands.func(self.current_function))
             self.current_function = None
     
     def emit_return(self, value: Optional[Union[str, Operand]] = None) -> int:
@@ -198,8 +201,8 @@ class TripletEmitter:
         if result is None:
             result = self.new_temp()
         
-        self.emit(OpCode.CALL, func_operand(func_name), const_operand(len(args)), 
-                 temp_operand(result))
+        self.emit(OpCode.CALL, self.operands.func(func_name), self.operands.const(len(args)), 
+                 self.operands.temp(result))
         return result
     
     
@@ -209,7 +212,7 @@ class TripletEmitter:
         if result is None:
             result = self.new_temp()
         
-        self.emit(OpCode.ARRAY_GET, array, index, temp_operand(result))
+        self.emit(OpCode.ARRAY_GET, array, index, self.operands.temp(result))
         return result
     
     def emit_array_assignment(self, array: Union[str, Operand],
@@ -223,23 +226,24 @@ class TripletEmitter:
         if result is None:
             result = self.new_temp()
         
-        self.emit(OpCode.GET_FIELD, obj, var_operand(field), temp_operand(result))
+        self.emit(OpCode.GET_FIELD, obj, self.operands.var(field), self.operands.temp(result))
         return result
     
     def emit_field_assignment(self, obj: Union[str, Operand],
                             field: str,
                             value: Union[str, Operand]) -> int:
-        return self.emit(OpCode.SET_FIELD, obj, var_operand(field), value)
+        return self.emit(OpCode.SET_FIELD, obj, self.operands.var(field), value)
     
     
     def get_current_index(self) -> int:
-        return len(self.table.triplets)
+        return len(self.table)
     
     def finish_expression(self, result_temp: Optional[str] = None) -> str:
         return self.temp_manager.finish_expression(result_temp)
     
     def clear(self):
         self.table.clear()
+        self.operands = OperandFactory()
         self.label_gen.reset()
         self.temp_manager.clear()
         self.temp_manager.pool.next_temp_id = 0  
@@ -254,7 +258,7 @@ class TripletEmitter:
     
     def get_stats(self) -> dict:
         return {
-            "triplets_count": len(self.table.triplets),
+            "triplets_count": len(self.table),
             "labels_generated": self.label_gen.next_label_id,
             "temp_stats": self.temp_manager.get_stats(),
             "current_function": self.current_function,
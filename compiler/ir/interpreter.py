@@ -0,0 +1,239 @@
+"""
+Intérprete de tripletos para pruebas y mediciones.
+
+Ejecuta una región del CFG (el código global o una función) siguiendo sus
+aristas: aritmética, lógica, comparaciones, copias, saltos, print y PHI de
+la forma SSA. No ejecuta llamadas, arreglos ni objetos (el TAC no dice qué
+etiqueta corresponde a cada función ni cómo se pasan los parámetros); si
+encuentra uno lanza TacRuntimeError.
+
+Sirve para comprobar que una transformación conserva la salida de un
+programa y para contar las instrucciones ejecutadas (conteo dinámico) antes
+y después de optimizar. Una variable leída antes de asignarse vale 0.
+"""
+from collections import Counter
+from typing import Dict, List, Optional
+
+from .cfg import ControlFlowGraph
+from .triplet import OpCode, Operand, Triplet
+
+
+class TacRuntimeError(RuntimeError):
+    """Error al ejecutar un tripleto"""
+    pass
+
+
+class ExecutionResult:
+    """
+    Resultado de una ejecución.
+
+    Atributos:
+        output: Líneas impresas por print
+        steps: Tripletos ejecutados (sin contar etiquetas ni PHI)
+        counts: Tripletos ejecutados por opcode (valor del OpCode)
+        values: Valor final de cada variable
+        taken: Saltos tomados (los jmp y los condicionales que se cumplieron)
+    """
+
+    def __init__(self, output: List[str], steps: int, counts: Counter, values: Dict[str, object],
+                 taken: int = 0):
+        self.output = output
+        self.steps = steps
+        self.counts = counts
+        self.values = values
+        self.taken = taken
+
+    def __repr__(self) -> str:
+        return f"ExecutionResult({len(self.output)} líneas, {self.steps} pasos)"
+
+
+def constant_value(value):
+    """Valor de una constante (el visitor guarda los literales como texto)"""
+    if value.__class__ is not str:
+        return value
+    if value == "true":
+        return True
+    if value == "false":
+        return False
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        return value[1:-1]
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+def format_value(value) -> str:
+    """Texto de un valor, como lo escribe el visitor (true/false)"""
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    return str(value)
+
+
+def _divide(a, b):
+    if b == 0:
+        raise TacRuntimeError("División entre cero")
+    if isinstance(a, int) and isinstance(b, int):
+        quotient = abs(a) // abs(b)
+        return quotient if (a < 0) == (b < 0) else -quotient
+    return a / b
+
+
+def _modulo(a, b):
+    if b == 0:
+        raise TacRuntimeError("Módulo entre cero")
+    return a - b * _divide(a, b) if isinstance(a, int) and isinstance(b, int) else a % b
+
+
+def _add(a, b):
+    if isinstance(a, str) or isinstance(b, str):
+        return format_value(a) + format_value(b)
+    return a + b
+
+
+BINARY_OPS = {
+    OpCode.ADD: _add,
+    OpCode.SUB: lambda a, b: a - b,
+    OpCode.MUL: lambda a, b: a * b,
+    OpCode.DIV: _divide,
+    OpCode.MOD: _modulo,
+    OpCode.AND: lambda a, b: bool(a) and bool(b),
+    OpCode.OR: lambda a, b: bool(a) or bool(b),
+    OpCode.EQ: lambda a, b: a == b,
+    OpCode.NE: lambda a, b: a != b,
+    OpCode.LT: lambda a, b: a < b,
+    OpCode.LE: lambda a, b: a <= b,
+    OpCode.GT: lambda a, b: a > b,
+    OpCode.GE: lambda a, b: a >= b,
+}
+
+BRANCH_CONDITIONS = {
+    OpCode.BEQ: lambda a, b: a == b,
+    OpCode.BNE: lambda a, b: a != b,
+    OpCode.BLT: lambda a, b: a < b,
+    OpCode.BLE: lambda a, b: a <= b,
+    OpCode.BGT: lambda a, b: a > b,
+    OpCode.BGE: lambda a, b: a >= b,
+    OpCode.BZ: lambda a, b: not a,
+    OpCode.BNZ: lambda a, b: bool(a),
+}
+
+_SKIP = (OpCode.LABEL, OpCode.ENTER, OpCode.NOP)
+
+
+class TacInterpreter:
+    """Ejecuta una región de un CFG"""
+
+    def __init__(self, cfg: ControlFlowGraph, max_steps: int = 1_000_000):
+        self.cfg = cfg
+        self.max_steps = max_steps
+        # Siguiente bloque de la región (caída) de cada bloque
+        self._next: Dict[int, Optional[int]] = {}
+        for function in cfg.functions:
+            region = function.blocks
+            for k, b in enumerate(region):
+                self._next[b] = region[k + 1] if k + 1 < len(region) else None
+
+    def run(self, function: Optional[str] = None,
+            values: Optional[Dict[str, object]] = None) -> ExecutionResult:
+        """
+        Ejecuta el código global (function=None) o la función con esa
+        etiqueta, con `values` como valores iniciales de las variables.
+        """
+        cfg = self.cfg
+        region = cfg.main if function is None else cfg.function_named(function)
+        if region is None:
+            raise TacRuntimeError(f"Función desconocida: {function}")
+        env: Dict[str, object] = dict(values or {})
+        output: List[str] = []
+        counts: Counter = Counter()
+        steps = 0
+        taken = 0
+
+        def value(operand: Operand):
+            if operand.type == "const":
+                return constant_value(operand.value)
+            return env.get(operand.value, 0)
+
+        block = region.entry
+        previous: Optional[int] = None
+        while block is not None:
+            code = cfg.blocks[block]
+            next_block = self._next[block]
+            phis = []
+            for triplet in code:
+                op = triplet.op
+                if op is OpCode.PHI:
+                    phis.append(triplet)
+                    continue
+                if phis:
+                    self._run_phis(phis, previous, env, value)
+                    phis = []
+                if op in _SKIP:
+                    continue
+
+                steps += 1
+                counts[op.value] += 1
+                if steps > self.max_steps:
+                    raise TacRuntimeError(f"Se excedió el límite de {self.max_steps} pasos")
+
+                if op in BINARY_OPS:
+                    env[triplet.result.value] = BINARY_OPS[op](value(triplet.arg1), value(triplet.arg2))
+                elif op is OpCode.MOV or op is OpCode.CAST:
+                    env[triplet.result.value] = value(triplet.arg1)
+                elif op is OpCode.NEG:
+                    env[triplet.result.value] = -value(triplet.arg1)
+                elif op is OpCode.NOT:
+                    env[triplet.result.value] = not value(triplet.arg1)
+                elif op is OpCode.PRINT:
+                    output.append(format_value(value(triplet.arg1)))
+                elif op is OpCode.JMP:
+                    next_block = self._jump(triplet, block, next_block)
+                    taken += 1
+                elif op in BRANCH_CONDITIONS:
+                    b = value(triplet.arg2) if triplet.arg2 is not None else None
+                    if BRANCH_CONDITIONS[op](value(triplet.arg1), b):
+                        next_block = self._jump(triplet, block, next_block)
+                        taken += 1
+                elif op is OpCode.RETURN or op is OpCode.EXIT:
+                    next_block = None
+                    break
+                else:
+                    raise TacRuntimeError(f"Operación no soportada por el intérprete: {triplet}")
+            if phis:
+                self._run_phis(phis, previous, env, value)
+            previous = block
+            block = next_block
+
+        return ExecutionResult(output, steps, counts, env, taken)
+
+    def _jump(self, triplet: Triplet, block: int, fallthrough: Optional[int]) -> Optional[int]:
+        """Bloque destino (un salto sin destino cae, como en el CFG)"""
+        if triplet.result is None:
+            return fallthrough
+        target = self.cfg.label_block.get(str(triplet.result.value))
+        if target is None or self.cfg.blocks[target].function != self.cfg.blocks[block].function:
+            return fallthrough
+        return target
+
+    def _run_phis(self, phis: List[Triplet], previous: Optional[int], env, value):
+        """Las PHI de un bloque se evalúan en paralelo con el bloque de origen"""
+        label = self.cfg.blocks[previous].label if previous is not None else None
+        results = []
+        for phi in phis:
+            incoming = phi.value_from(label) if label is not None else None
+            results.append((phi.result.value, value(incoming) if incoming is not None else 0))
+        for name, result in results:
+            env[name] = result
+
+
+def run_tac(triplets, function: Optional[str] = None, values: Optional[Dict[str, object]] = None,
+            max_steps: int = 1_000_000) -> ExecutionResult:
+    """Construye el CFG de `triplets` y ejecuta una región"""
+    return TacInterpreter(ControlFlowGraph(triplets), max_steps).run(function, values)
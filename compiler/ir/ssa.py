@@ -0,0 +1,579 @@
+"""
+Forma SSA (asignación única estática) de los tripletos.
+
+to_ssa() da a cada definición de una variable un nombre propio (versión):
+`x.1`, `x.2`, ... y `t5.1`, ... ; la versión 0 es el nombre original y
+representa el valor con que la variable entra a la función (un parámetro, o
+nada si se lee antes de asignarse). Donde se juntan caminos con versiones
+distintas se coloca una PHI (la clase Phi, op OpCode.PHI) después de la
+etiqueta del bloque, en la frontera de dominancia iterada de las
+definiciones y sólo si la variable está viva ahí (SSA podada). El renombrado
+recorre el árbol de dominadores con una pila explícita.
+
+Cada entrada de una PHI es (etiqueta del predecesor, valor); los
+predecesores sin etiqueta reciben una nueva (SSA_n). Los nombres y
+etiquetas nuevas hacen que el listado siga siendo texto TAC legible.
+
+Qué se versiona:
+
+- todos los temporales tN (nunca pasan de una función a otra)
+- las variables con nombre que sólo aparecen en una región; las que
+  aparecen en varias (globales, o variables de una función que usa una
+  función anidada) viven en memoria: una llamada puede leerlas o
+  escribirlas, así que conservan su nombre
+
+from_ssa() deshace la forma SSA para el back-end: cada PHI se convierte en
+copias al final de sus predecesores. Las copias de una arista son
+paralelas y se secuencializan (un ciclo como a <- b, b <- a usa un
+temporal nuevo). Si una arista sale de un salto condicional, sus copias van
+en un bloque propio para no ejecutarse en el otro camino. Después, las
+versiones de cada variable vuelven a su nombre original si sus rangos de
+vida no se solapan, que es lo normal salvo que una pasada haya movido
+código; por eso from_ssa(to_ssa(t)) devuelve el listado original.
+
+Ambas direcciones son lineales en la práctica: fronteras de dominancia,
+variables vivas y un par de recorridos del listado.
+"""
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from .cfg import ControlFlowGraph
+from .dataflow import Liveness
+from .defuse import (
+    JUMP_OPS, defined_name, defined_operand, is_temp_name, is_variable, use_slots, used_names
+)
+from .dominators import DominatorTree
+from .triplet import OpCode, Operand, OperandFactory, Triplet
+
+
+SSA_LABEL_PREFIX = "SSA_"
+
+_TEMP_NUMBER = re.compile(r"t(\d+)")
+
+
+class Phi(Triplet):
+    """
+    result = phi [valor, etiqueta], ...
+
+    incoming es una lista de (etiqueta del predecesor, valor); arg1 y arg2
+    no se usan.
+    """
+    __slots__ = ('incoming',)
+
+    def __init__(self, result: Operand, incoming: Optional[List[Tuple[Operand, Operand]]] = None):
+        super().__init__(OpCode.PHI, result=result)
+        self.incoming: List[Tuple[Operand, Operand]] = incoming if incoming is not None else []
+
+    def value_from(self, label: str) -> Optional[Operand]:
+        """Valor que llega desde el predecesor con esa etiqueta"""
+        for pred, value in self.incoming:
+            if pred.value == label:
+                return value
+        return None
+
+    def __str__(self) -> str:
+        args = ", ".join(f"[{value}, {pred}]" for pred, value in self.incoming)
+        return f"{self.result} = phi {args}"
+
+    def __repr__(self) -> str:
+        return f"Phi({self.result}, {self.incoming})"
+
+
+def version_name(name: str, version: int) -> str:
+    return name if version == 0 else f"{name}.{version}"
+
+
+def base_name(name: str) -> str:
+    """Nombre original de una versión (`x.3` -> `x`)"""
+    head, dot, tail = name.rpartition(".")
+    return head if dot and tail.isdigit() else name
+
+
+def shared_names(cfg: ControlFlowGraph) -> Set[str]:
+    """Variables con nombre (no tN) que aparecen en más de una región"""
+    region_of: Dict[str, int] = {}
+    shared: Set[str] = set()
+    for block in cfg.blocks:
+        region = block.function
+        for triplet in block:
+            names = used_names(triplet)
+            name = defined_name(triplet)
+            if name is not None:
+                names.append(name)
+            for name in names:
+                if is_temp_name(name):
+                    continue
+                base = base_name(name)
+                if region_of.setdefault(base, region) != region:
+                    shared.add(base)
+    return shared
+
+
+class _LabelNames:
+    """Etiquetas SSA_n que no están en el listado"""
+
+    def __init__(self, existing: Iterable[str]):
+        self.existing = set(existing)
+        self.counter = 0
+
+    def next(self) -> str:
+        while True:
+            name = f"{SSA_LABEL_PREFIX}{self.counter}"
+            self.counter += 1
+            if name not in self.existing:
+                self.existing.add(name)
+                return name
+
+
+def _copy(triplet: Triplet) -> Triplet:
+    return Triplet(triplet.op, triplet.arg1, triplet.arg2, triplet.result, triplet.comment)
+
+
+def _prefix_length(block) -> int:
+    """Etiqueta y BeginFunc al inicio del bloque: las PHI van después"""
+    code = block.triplets
+    k = 0
+    if k < len(code) and code[k].op is OpCode.LABEL:
+        k += 1
+    if k < len(code) and code[k].op is OpCode.ENTER:
+        k += 1
+    return k
+
+
+# ========== CONSTRUCCIÓN ==========
+
+class SSAForm:
+    """
+    Listado en forma SSA.
+
+    Atributos:
+        triplets: Tripletos con las PHI
+        shared: Variables que quedaron en memoria (sin versiones)
+        phi_count: PHI colocadas
+        versions: Versiones creadas (sin contar la 0)
+    """
+
+    def __init__(self, triplets: List[Triplet], shared: Set[str], phi_count: int, versions: int):
+        self.triplets = triplets
+        self.shared = shared
+        self.phi_count = phi_count
+        self.versions = versions
+
+    def __len__(self) -> int:
+        return len(self.triplets)
+
+    def __iter__(self):
+        return iter(self.triplets)
+
+    def __str__(self) -> str:
+        return "\n".join(str(t) for t in self.triplets)
+
+
+class _Builder:
+    def __init__(self, triplets: Iterable[Triplet]):
+        self.cfg = ControlFlowGraph(triplets)
+        if any(t.op is OpCode.PHI for t in self.cfg.triplets):
+            raise ValueError("El listado ya está en forma SSA")
+        self.shared = shared_names(self.cfg)
+        self.operands = OperandFactory()
+        self.labels = _LabelNames(self.cfg.label_block)
+        self.counters: Dict[str, int] = {}
+        self.versions = 0
+        # Bloque -> PHI; bloque -> etiqueta nueva
+        self.phis: Dict[int, List[Phi]] = {}
+        self.new_labels: Dict[int, str] = {}
+        # Bloque -> tripletos renombrados (los no alcanzables no cambian)
+        self.code: Dict[int, List[Triplet]] = {}
+
+    def is_local(self, name: str) -> bool:
+        return is_temp_name(name) or name not in self.shared
+
+    def kind(self, name: str) -> str:
+        return "temp" if is_temp_name(name) else "var"
+
+    def new_version(self, name: str) -> str:
+        version = self.counters.get(name, 0) + 1
+        self.counters[name] = version
+        self.versions += 1
+        return version_name(name, version)
+
+    def label_of(self, b: int) -> str:
+        label = self.cfg.blocks[b].label
+        if label is None:
+            label = self.new_labels.get(b)
+            if label is None:
+                label = self.new_labels[b] = self.labels.next()
+        return label
+
+    def build(self) -> SSAForm:
+        for function in self.cfg.functions:
+            if function.entry is not None:
+                self._function(function)
+        return SSAForm(self._listing(), self.shared,
+                       sum(len(phis) for phis in self.phis.values()), self.versions)
+
+    def _function(self, function):
+        cfg = self.cfg
+        blocks = cfg.blocks
+        code = cfg.triplets
+        dominators = DominatorTree(cfg, function)
+        liveness = Liveness(cfg, function, memory=self.shared)
+        live = liveness.solve()
+        index = liveness.universe.index
+        sets = liveness.sets
+
+        # Bloques que definen cada variable local
+        def_blocks: Dict[str, List[int]] = {}
+        for b in dominators.order:
+            block = blocks[b]
+            for i in range(block.start, block.end):
+                name = defined_name(code[i])
+                if name is not None and self.is_local(name):
+                    places = def_blocks.setdefault(name, [])
+                    if not places or places[-1] != b:
+                        places.append(b)
+
+        # PHI en la frontera de dominancia iterada, donde la variable está viva
+        for name, places in def_blocks.items():
+            bit = index[name]
+            has_phi: Set[int] = set()
+            pending = list(places)
+            queued = set(places)
+            while pending:
+                b = pending.pop()
+                for d in dominators.frontier(b):
+                    if d in has_phi or not sets.contains(live.block_in[d], bit):
+                        continue
+                    has_phi.add(d)
+                    self.phis.setdefault(d, []).append(
+                        Phi(self.operands.get(name, self.kind(name))))
+                    if d not in queued:
+                        queued.add(d)
+                        pending.append(d)
+
+        self._rename(dominators)
+
+    def _rename(self, dominators: DominatorTree):
+        cfg = self.cfg
+        blocks = cfg.blocks
+        code = cfg.triplets
+        operands = self.operands
+        stacks: Dict[str, List[str]] = {}
+
+        def current(name: str) -> str:
+            stack = stacks.get(name)
+            return stack[-1] if stack else name
+
+        # (bloque, nombres a desapilar); None marca la salida del bloque
+        work: List[Tuple[int, Optional[List[str]]]] = [(dominators.root, None)]
+        while work:
+            b, pushed = work.pop()
+            if pushed is not None:
+                for name in pushed:
+                    stacks[name].pop()
+                continue
+
+            pushed = []
+            for phi in self.phis.get(b, ()):
+                name = phi.result.value
+                version = self.new_version(name)
+                phi.result = operands.get(version, phi.result.type)
+                stacks.setdefault(name, []).append(version)
+                pushed.append(name)
+
+            block = blocks[b]
+            renamed = []
+            for i in range(block.start, block.end):
+                triplet = code[i]
+                copy = _copy(triplet)
+                for slot in use_slots(triplet):
+                    operand = getattr(triplet, slot)
+                    if is_variable(operand) and self.is_local(operand.value):
+                        setattr(copy, slot, operands.get(current(operand.value), operand.type))
+                result = defined_operand(triplet)
+                if result is not None and self.is_local(result.value):
+                    name = result.value
+                    version = self.new_version(name)
+                    copy.result = operands.get(version, result.type)
+                    stacks.setdefault(name, []).append(version)
+                    pushed.append(name)
+                renamed.append(copy)
+            self.code[b] = renamed
+
+            label = None
+            for s in block.succs:
+                phis = self.phis.get(s)
+                if not phis:
+                    continue
+                if label is None:
+                    label = operands.label(self.label_of(b))
+                for phi in phis:
+                    name = base_name(phi.result.value)
+                    phi.incoming.append((label, operands.get(current(name), self.kind(name))))
+
+            work.append((b, pushed))
+            for child in reversed(dominators.children[b]):
+                work.append((child, None))
+
+    def _listing(self) -> List[Triplet]:
+        output: List[Triplet] = []
+        for block in self.cfg.blocks:
+            code = self.code.get(block.index)
+            if code is None:
+                code = [_copy(t) for t in block]
+            label = self.new_labels.get(block.index)
+            if label is not None:
+                output.append(Triplet(OpCode.LABEL, self.operands.label(label)))
+            k = _prefix_length(block)
+            output.extend(code[:k])
+            output.extend(self.phis.get(block.index, ()))
+            output.extend(code[k:])
+        return output
+
+
+def to_ssa(triplets: Iterable[Triplet]) -> SSAForm:
+    """Convierte un listado (todas sus funciones) a forma SSA"""
+    return _Builder(triplets).build()
+
+
+# ========== DESTRUCCIÓN ==========
+
+Copy = Tuple[Operand, Operand]   # (destino, origen)
+
+
+class _Destructor:
+    def __init__(self, triplets: Iterable[Triplet]):
+        self.cfg = ControlFlowGraph(triplets)
+        self.labels = _LabelNames(self.cfg.label_block)
+        self.operands = OperandFactory()
+        # Los temporales para romper ciclos empiezan después del mayor tN
+        self.first_temp = 1 + max((int(m.group(1)) for m in (
+            _TEMP_NUMBER.fullmatch(base_name(name)) for name in self._names()) if m), default=-1)
+        self.next_temp = self.first_temp
+        # Siguiente bloque de la región de cada bloque
+        self.fallthrough: Dict[int, Optional[int]] = {}
+        for function in self.cfg.functions:
+            region = function.blocks
+            for k, b in enumerate(region):
+                self.fallthrough[b] = region[k + 1] if k + 1 < len(region) else None
+        self.edge_copies = self._phi_copies()
+
+    def _names(self) -> Iterable[str]:
+        for triplet in self.cfg.triplets:
+            yield from used_names(triplet)
+            name = defined_name(triplet)
+            if name is not None:
+                yield name
+
+    def _phi_copies(self) -> Dict[Tuple[int, int], List[Copy]]:
+        """(predecesor, bloque) -> copias paralelas de las PHI del bloque"""
+        cfg = self.cfg
+        copies: Dict[Tuple[int, int], List[Copy]] = {}
+        for block in cfg.blocks:
+            phis = [t for t in block if t.op is OpCode.PHI]
+            if not phis:
+                continue
+            for p in block.preds:
+                label = cfg.blocks[p].label
+                if label is None:
+                    continue
+                edge = copies.setdefault((p, block.index), [])
+                for phi in phis:
+                    value = phi.value_from(label)
+                    if value is not None:
+                        edge.append((phi.result, value))
+        return copies
+
+    def destruct(self) -> List[Triplet]:
+        # Primero con todas las versiones para ver cuáles se solapan
+        listing = self._place_copies(lambda operand: operand)
+        interfering = self._interference(listing)
+
+        def rename(operand: Operand) -> Operand:
+            if not is_variable(operand):
+                return operand
+            base = base_name(operand.value)
+            if base == operand.value or base in interfering:
+                return operand
+            return self.operands.get(base, operand.type)
+
+        self.labels = _LabelNames(self.cfg.label_block)
+        self.next_temp = self.first_temp
+        return _drop_unused_ssa_labels(self._place_copies(rename))
+
+    # ----- colocación de copias -----
+
+    def _place_copies(self, rename) -> List[Triplet]:
+        cfg = self.cfg
+        output: List[Triplet] = []
+        need_label: Dict[int, str] = {}
+
+        def renamed_copy(triplet: Triplet) -> Triplet:
+            copy = _copy(triplet)
+            for slot in use_slots(triplet):
+                operand = getattr(triplet, slot)
+                if operand is not None:
+                    setattr(copy, slot, rename(operand))
+            if defined_operand(triplet) is not None:
+                copy.result = rename(triplet.result)
+            return copy
+
+        def label_for(b: int) -> Operand:
+            label = cfg.blocks[b].label or need_label.get(b)
+            if label is None:
+                label = need_label[b] = self.labels.next()
+            return self.operands.label(label)
+
+        for block in cfg.blocks:
+            b = block.index
+            if b in need_label:
+                output.append(Triplet(OpCode.LABEL, self.operands.label(need_label[b])))
+            code = [renamed_copy(t) for t in block if t.op is not OpCode.PHI]
+            last = code[-1] if code else None
+            op = last.op if last is not None else None
+            fall = self.fallthrough[b]
+            succs = block.succs
+
+            if not any((b, s) in self.edge_copies for s in succs):
+                output.extend(code)
+                continue
+
+            def moves(s: Optional[int]) -> List[Triplet]:
+                if s is None:
+                    return []
+                pairs = [(rename(dst), rename(src)) for dst, src in self.edge_copies.get((b, s), ())]
+                return self._sequentialize(pairs)
+
+            if op in JUMP_OPS and op is not OpCode.JMP and last.result is not None \
+                    and str(last.result.value) in cfg.label_block \
+                    and cfg.label_block[str(last.result.value)] in succs:
+                target = cfg.label_block[str(last.result.value)]
+                to_target, to_fall = moves(target), moves(fall)
+                if not to_target:
+                    output.extend(code)
+                    output.extend(to_fall)
+                    continue
+                # El camino del salto pasa por un bloque nuevo con sus copias
+                split = self.operands.label(self.labels.next())
+                branch = _copy(last)
+                branch.result = split
+                output.extend(code[:-1])
+                output.append(branch)
+                output.extend(to_fall)
+                if fall is not None:
+                    output.append(Triplet(OpCode.JMP, result=label_for(fall)))
+                output.append(Triplet(OpCode.LABEL, split))
+                output.extend(to_target)
+                output.append(Triplet(OpCode.JMP, result=self.operands.label(str(last.result.value))))
+            elif op is OpCode.JMP:
+                output.extend(code[:-1])
+                output.extend(moves(succs[0]))
+                output.append(last)
+            else:
+                output.extend(code)
+                output.extend(moves(succs[0]))
+        return output
+
+    def _sequentialize(self, copies: List[Copy]) -> List[Triplet]:
+        """Ordena copias paralelas; rompe los ciclos con un temporal nuevo"""
+        pending: Dict[str, Copy] = {}
+        for dst, src in copies:
+            if not (is_variable(src) and src.value == dst.value):
+                pending[dst.value] = (dst, src)
+        readers: Dict[str, int] = {}
+        for dst, src in pending.values():
+            if is_variable(src):
+                readers[src.value] = readers.get(src.value, 0) + 1
+
+        moves: List[Triplet] = []
+        ready = [name for name in pending if readers.get(name, 0) == 0]
+        while pending:
+            while ready:
+                dst, src = pending.pop(ready.pop())
+                moves.append(Triplet(OpCode.MOV, src, None, dst))
+                if is_variable(src) and src.value in readers:
+                    readers[src.value] -= 1
+                    if readers[src.value] == 0 and src.value in pending:
+                        ready.append(src.value)
+            if pending:
+                # Sólo quedan ciclos: se guarda un destino y se redirige a quien lo lee
+                name = next(iter(pending))
+                dst = pending[name][0]
+                temp = self.operands.temp(f"t{self.next_temp}")
+                self.next_temp += 1
+                moves.append(Triplet(OpCode.MOV, dst, None, temp))
+                for other, (other_dst, other_src) in pending.items():
+                    if is_variable(other_src) and other_src.value == name:
+                        pending[other] = (other_dst, temp)
+                readers[name] = 0
+                ready.append(name)
+        return moves
+
+    # ----- interferencia -----
+
+    def _interference(self, listing: List[Triplet]) -> Set[str]:
+        """
+        Variables (nombre base) con dos versiones vivas a la vez. Una copia
+        no hace interferir su destino con su origen.
+        """
+        cfg = ControlFlowGraph(listing)
+        shared = shared_names(cfg)
+        code = cfg.triplets
+
+        # Sólo pueden interferir las variables con más de una versión
+        names_of: Dict[str, Set[str]] = {}
+        for triplet in code:
+            name = defined_name(triplet)
+            if name is not None:
+                names_of.setdefault(base_name(name), set()).add(name)
+            for name in used_names(triplet):
+                names_of.setdefault(base_name(name), set()).add(name)
+        candidates = {name for names in names_of.values() if len(names) > 1 for name in names}
+
+        interfering: Set[str] = set()
+        for function in cfg.functions:
+            if function.entry is None:
+                continue
+            problem = Liveness(cfg, function, memory=shared)
+            result = problem.solve()
+            sets, index = problem.sets, problem.universe.index
+            mask = sets.from_indices(index[name] for name in candidates if name in index)
+            for b in function.reverse_postorder:
+                block = cfg.blocks[b]
+                live: Dict[str, Set[str]] = {}
+                for name in result.items(sets.intersection(result.block_out[b], mask)):
+                    live.setdefault(base_name(name), set()).add(name)
+                for i in range(block.end - 1, block.start - 1, -1):
+                    triplet = code[i]
+                    name = defined_name(triplet)
+                    if name is not None and name in candidates:
+                        base = base_name(name)
+                        versions = live.get(base)
+                        if versions:
+                            source = triplet.arg1.value if triplet.op is OpCode.MOV \
+                                and is_variable(triplet.arg1) else None
+                            if any(v != name and v != source for v in versions):
+                                interfering.add(base)
+                            versions.discard(name)
+                    for used in used_names(triplet):
+                        if used in candidates:
+                            live.setdefault(base_name(used), set()).add(used)
+        return interfering
+
+
+def _drop_unused_ssa_labels(triplets: List[Triplet]) -> List[Triplet]:
+    """Quita las etiquetas SSA_n a las que ya no salta nadie"""
+    targets = {str(t.result.value) for t in triplets
+               if t.op in JUMP_OPS and t.result is not None}
+    return [t for t in triplets
+            if not (t.op is OpCode.LABEL and str(t.arg1.value).startswith(SSA_LABEL_PREFIX)
+                    and str(t.arg1.value) not in targets)]
+
+
+def from_ssa(ssa: Union[SSAForm, Iterable[Triplet]]) -> List[Triplet]:
+    """
+    Sale de la forma SSA: tripletos sin PHI que el MIPSTranslator puede
+    traducir.
+    """
+    triplets = ssa.triplets if isinstance(ssa, SSAForm) else ssa
+    return _Destructor(triplets).destruct()
@@ -0,0 +1,295 @@
+"""
+Lector del TAC en texto.
+
+Reconstruye tripletos a partir del listado que produce Triplet.__str__ (la
+sección de tripletos del Driver, los `.tac` de `--batch --output-dir` o un
+archivo con un tripleto por línea):
+
+    FUNC_0:                       LABEL
+    BeginFunc 36;                 ENTER
+    EndFunc;                      EXIT
+    t3 = add t1, t2               [resultado = ]op [arg1[, arg2]]
+
+Las líneas pueden llevar el prefijo de índice del Driver ("  7: "); las
+líneas vacías se ignoran.
+
+El texto no guarda el tipo de los operandos, así que se infiere:
+
+- etiqueta: el argumento de LABEL y el destino de los saltos (también el
+  destino vacío " = jmp" de listados generados antes de corregir el
+  backpatch; un salto pendiente se imprime "jmp" y queda sin resultado)
+- función: el primer argumento de CALL, y el de BeginFunc si no es número
+- constante: enteros y flotantes (como int/float), strings entre comillas,
+  True/False (bool) y los literales true/false/null (como str)
+- temporal: nombres tN; el visitor emite como `var` los temporales de
+  algunas posiciones (argumentos de los saltos condicionales, NEG, NOT,
+  RETURN, el índice de los arreglos, ...) y se respeta para que el backend
+  genere lo mismo
+- variable: cualquier otro nombre
+
+Se pierde lo que el texto no imprime: el argumento de EndFunc, el segundo
+argumento de BeginFunc y los comentarios de los tripletos. Tampoco se
+distingue `x = mov tN` con tN temporal o `var` (el visitor usa ambos según
+la expresión); se lee como temporal. Para conservar el TAC exacto está el
+formato binario .tacb.
+
+iter_functions() lee el listado como stream y entrega una función (o un
+tramo de código global) a la vez, para procesar listados grandes sin
+cargarlos enteros.
+"""
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, Optional
+
+from .triplet import OpCode, Operand, OperandFactory, Triplet, TripletTable
+
+
+class TacSyntaxError(ValueError):
+    """Línea de TAC que no se puede interpretar"""
+
+    def __init__(self, message: str, line_number: Optional[int] = None):
+        if line_number is not None:
+            message = f"línea {line_number}: {message}"
+        super().__init__(message)
+        self.line_number = line_number
+
+
+_OPCODES = {op.value: op for op in OpCode}
+
+_JUMPS = frozenset((OpCode.JMP, OpCode.BEQ, OpCode.BNE, OpCode.BLT, OpCode.BLE,
+                    OpCode.BGT, OpCode.BGE, OpCode.BZ, OpCode.BNZ))
+
+# Operaciones en las que el visitor emite los temporales como `var`, por
+# posición (arg1, arg2, result)
+_TEMP_AS_VAR = (
+    _JUMPS | {OpCode.NEG, OpCode.NOT, OpCode.RETURN, OpCode.SET_FIELD},
+    _JUMPS | {OpCode.ARRAY_SET},
+    frozenset((OpCode.NEG, OpCode.NOT, OpCode.ARRAY_ALLOC, OpCode.SET_FIELD)),
+)
+
+_INDEX_PREFIX = re.compile(r"\s*\d+: ")
+_TEMP_NAME = re.compile(r"t\d+")
+_INT = re.compile(r"-?\d+")
+_FLOAT = re.compile(r"-?(?:\d+\.\d*|\.\d+)(?:[eE][-+]?\d+)?|-?\d+[eE][-+]?\d+")
+
+_LITERALS = {"True": True, "False": False}
+_KEYWORD_CONSTANTS = frozenset(("true", "false", "null"))
+
+
+def _split_args(text: str):
+    """Separa "a, b" respetando las comas dentro de strings"""
+    if '"' not in text:
+        return text.split(", ", 1)
+    in_string = False
+    escaped = False
+    for i, char in enumerate(text):
+        if escaped:
+            escaped = False
+        elif char == '\\':
+            escaped = in_string
+        elif char == '"':
+            in_string = not in_string
+        elif char == ',' and not in_string and text.startswith(", ", i):
+            return [text[:i], text[i + 2:]]
+    return [text]
+
+
+class TacReader:
+    """
+    Convierte líneas de TAC en tripletos. Los operandos se internan en un
+    OperandFactory propio, igual que los que crea TripletEmitter.
+    """
+
+    def __init__(self):
+        self.operands = OperandFactory()
+        # Texto -> operando con el tipo que no depende de la posición
+        self._parsed: Dict[str, Operand] = {}
+
+    def _classify(self, text: str) -> Operand:
+        operands = self.operands
+        if _TEMP_NAME.fullmatch(text):
+            return operands.temp(text)
+        if text.startswith('"') or text in _KEYWORD_CONSTANTS:
+            return operands.const(text)
+        if text in _LITERALS:
+            return operands.const(_LITERALS[text])
+        if text == "-":
+            return operands.get(None, "const")
+        if _INT.fullmatch(text):
+            return operands.const(int(text))
+        if _FLOAT.fullmatch(text):
+            return operands.const(float(text))
+        return operands.var(text)
+
+    def operand(self, text: str, op: OpCode, slot: int) -> Operand:
+        """Operando con el tipo inferido para la posición (op, slot)"""
+        operand = self._parsed.get(text)
+        if operand is None:
+            operand = self._parsed[text] = self._classify(text)
+        if operand.type == "temp":
+            if op in _TEMP_AS_VAR[slot]:
+                return self.operands.var(text)
+        elif operand.type == "var" and op == OpCode.CALL and slot == 0:
+            return self.operands.func(text)
+        return operand
+
+    def parse_line(self, line: str, line_number: Optional[int] = None) -> Optional[Triplet]:
+        """Tripleto de una línea, o None si la línea está vacía"""
+        text = line.strip()
+        if not text:
+            return None
+        prefix = _INDEX_PREFIX.match(text)
+        if prefix:
+            text = text[prefix.end():]
+
+        if text == "EndFunc;":
+            return Triplet(OpCode.EXIT)
+        if text.startswith("BeginFunc ") and text.endswith(";"):
+            value = text[10:-1]
+            arg1 = (self.operands.const(int(value)) if _INT.fullmatch(value)
+                    else self.operands.func(value))
+            return Triplet(OpCode.ENTER, arg1)
+        if text.endswith(":") and " " not in text:
+            return Triplet(OpCode.LABEL, self.operands.label(text[:-1]))
+
+        # [resultado = ]op [arg1[, arg2]]; el resultado puede ser vacío
+        result_text = None
+        if text.startswith("= "):
+            result_text, text = "", text[2:]
+        else:
+            head, sep, rest = text.partition(" = ")
+            if sep and " " not in head and '"' not in head:
+                result_text, text = head, rest
+
+        name, _, args_text = text.partition(" ")
+        op = _OPCODES.get(name)
+        if op is None or op in (OpCode.ENTER, OpCode.EXIT):
+            raise TacSyntaxError(f"operación desconocida '{name}'", line_number)
+
+        args = _split_args(args_text) if args_text else []
+        arg1 = self.operand(args[0], op, 0) if args else None
+        arg2 = self.operand(args[1], op, 1) if len(args) > 1 else None
+        result = None
+        if result_text is not None:
+            if op in _JUMPS:
+                result = self.operands.label(result_text)
+            else:
+                result = self.operand(result_text, op, 2)
+
+        # El índice escalado por el tamaño del elemento también lleva el
+        # temporal como `var`
+        if (op == OpCode.MUL and arg1 is not None and arg1.type == "temp"
+                and arg2 is not None and arg2.type == "const"):
+            arg1 = self.operands.var(arg1.value)
+        return Triplet(op, arg1, arg2, result)
+
+    def read(self, lines: Iterable[str]) -> TripletTable:
+        """Todos los tripletos de `lines` en una TripletTable"""
+        table = TripletTable()
+        for number, line in enumerate(lines, 1):
+            triplet = self.parse_line(line, number)
+            if triplet is not None:
+                table.add(triplet)
+        return table
+
+
+@dataclass
+class TacChunk:
+    """
+    Función o tramo de código global leído por iter_functions.
+
+    name es la etiqueta de la función (None para código global) y start el
+    índice del primer tripleto dentro del listado completo.
+    """
+    name: Optional[str]
+    start: int
+    table: TripletTable
+
+    @property
+    def is_function(self) -> bool:
+        return self.name is not None
+
+
+def parse_line(line: str) -> Optional[Triplet]:
+    """Tripleto de una línea de TAC (operandos sin internar entre llamadas)"""
+    return TacReader().parse_line(line)
+
+
+def read_tac(lines: Iterable[str]) -> TripletTable:
+    """
+    Reconstruye la tabla de tripletos de un listado.
+
+    Args:
+        lines: Líneas de TAC (lista, archivo abierto o un str completo)
+    """
+    if isinstance(lines, str):
+        lines = lines.splitlines()
+    return TacReader().read(lines)
+
+
+def load_tac(path: str) -> TripletTable:
+    """Lee un archivo de TAC en texto"""
+    with open(path, encoding='utf-8') as f:
+        return read_tac(f)
+
+
+def iter_functions(lines: Iterable[str]) -> Iterator[TacChunk]:
+    """
+    Lee el listado como stream y entrega un TacChunk por función.
+
+    Una función empieza en la etiqueta que precede a `BeginFunc` y termina
+    en su `EndFunc;` (las funciones anidadas quedan dentro de la que las
+    contiene); el código global entre funciones sale en chunks con
+    name=None. Cada chunk tiene su propio TacReader, así que la memoria
+    depende del tamaño de la función más grande y no del listado.
+    """
+    if isinstance(lines, str):
+        lines = lines.splitlines()
+
+    reader = TacReader()
+    chunk = TacChunk(None, 0, TripletTable())
+    pending_label: Optional[Triplet] = None
+    depth = 0
+    index = 0
+
+    for number, line in enumerate(lines, 1):
+        triplet = reader.parse_line(line, number)
+        if triplet is None:
+            continue
+
+        if triplet.op == OpCode.ENTER and depth == 0:
+            # La etiqueta pendiente es el nombre de la función
+            if len(chunk.table):
+                yield chunk
+            reader = TacReader()
+            if pending_label is None:
+                chunk = TacChunk("", index, TripletTable())
+            else:
+                name = pending_label.arg1.value
+                chunk = TacChunk(name, index - 1, TripletTable())
+                chunk.table.add(Triplet(OpCode.LABEL, reader.operands.label(name)))
+                pending_label = None
+        elif pending_label is not None:
+            chunk.table.add(pending_label)
+            pending_label = None
+
+        if triplet.op == OpCode.LABEL and depth == 0:
+            pending_label = triplet
+            index += 1
+            continue
+
+        chunk.table.add(triplet)
+        index += 1
+        if triplet.op == OpCode.ENTER:
+            depth += 1
+        elif triplet.op == OpCode.EXIT and depth > 0:
+            depth -= 1
+            if depth == 0:
+                yield chunk
+                reader = TacReader()
+                chunk = TacChunk(None, index, TripletTable())
+
+    if pending_label is not None:
+        chunk.table.add(pending_label)
+    if len(chunk.table):
+        yield chunk
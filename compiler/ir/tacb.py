@@ -0,0 +1,555 @@
+"""
+Formato binario .tacb para el TAC.
+
+Un archivo .tacb guarda los tripletos, la tabla de símbolos y el layout de
+memoria de una compilación, de modo que el backend MIPS (u otra
+herramienta) pueda trabajar sobre el IR guardado sin volver a compilar ni
+parsear texto.
+
+Estructura (little endian, secciones alineadas a 8 bytes):
+
+    cabecera    magic "TACB", versión u16, reservado u16, nº de secciones u32
+    directorio  por sección: id u32, reservado u32, offset u64, longitud u64
+
+    STRINGS     n u32, pad, offsets u32[n+1], bytes UTF-8 concatenados
+    OPCODES     nombres de OpCode (ids de string) en el orden del archivo
+    KINDS       tipos de operando ("temp", "var", ...) como ids de string
+    NUMBERS     constantes numéricas i64 (los float se guardan por sus bits)
+    OPERANDS    n u32, pad, tipo u8[n] (índice en KINDS), tag u8[n], ref u32[n]
+    CODE        n u32, pad, op u8[n], arg1 i32[n], arg2 i32[n], result i32[n]  (-1 = sin operando)
+    COMMENTS    pares u32 (índice de tripleto, id de string)
+    LABELS      pares u32 (id de operando de la etiqueta, índice del tripleto LABEL)
+    SYMBOLS     n u32, pad, registros i64[7n], dimensiones i64[...]
+    LAYOUT      layout de memoria en JSON
+
+load() mapea el archivo en memoria: las columnas se leen con memoryview
+sobre el mmap y los objetos Triplet/Operand sólo se crean al accederlos
+(cada operando una sola vez).
+"""
+import json
+import mmap
+import re
+import struct
+import sys
+from array import array
+from typing import Dict, Iterable, List, Optional
+
+from .triplet import OpCode, Operand, Triplet
+
+
+MAGIC = b"TACB"
+VERSION = 1
+
+SECTION_STRINGS = 1
+SECTION_OPCODES = 2
+SECTION_NUMBERS = 3
+SECTION_OPERANDS = 4
+SECTION_CODE = 5
+SECTION_COMMENTS = 6
+SECTION_LABELS = 7
+SECTION_SYMBOLS = 8
+SECTION_LAYOUT = 9
+SECTION_KINDS = 10
+
+# Tag de cada operando: cómo interpretar su ref
+TAG_STR = 0     # id de string
+TAG_INT = 1     # índice en NUMBERS
+TAG_FLOAT = 2   # índice en NUMBERS (bits del double)
+TAG_BOOL = 3    # 0 o 1
+TAG_NONE = 4
+TAG_BIGINT = 5  # entero fuera de i64, guardado como texto (id de string)
+TAG_TEMP = 6    # temporal "tN": ref = N, sin string
+
+NO_OPERAND = -1
+NO_STRING = -1
+
+_HEADER = struct.Struct("<4sHHI")
+_ENTRY = struct.Struct("<IIQQ")
+_COUNT = struct.Struct("<II")
+_DOUBLE = struct.Struct("<d")
+_INT64 = struct.Struct("<q")
+
+# Campos de cada registro de SYMBOLS
+_SYMBOL_FIELDS = 7
+
+_LITTLE_ENDIAN = sys.byteorder == "little"
+
+# Nombres de temporal que se reconstruyen exactamente desde su número
+_TEMP_NAME = re.compile(r"t(?:0|[1-9][0-9]{0,8})")
+
+
+class TacbFormatError(ValueError):
+    """El archivo no es un .tacb válido o es de otra versión"""
+
+
+def _pad(data: bytearray):
+    data.extend(b"\0" * (-len(data) % 8))
+
+
+def _pack(typecode: str, values) -> bytes:
+    column = array(typecode, values)
+    if not _LITTLE_ENDIAN:
+        column.byteswap()
+    return column.tobytes()
+
+
+# ========== ESCRITURA ==========
+
+class _Encoder:
+    """Interna strings, números, tipos y operandos en ids densos"""
+
+    def __init__(self):
+        self.strings: List[str] = []
+        self._string_ids: Dict[str, int] = {}
+        self.numbers: List[int] = []
+        self._number_ids: Dict[tuple, int] = {}
+        self.kinds: List[int] = []
+        self._kind_ids: Dict[str, int] = {}
+        self.operand_kinds: List[int] = []
+        self.operand_tags: List[int] = []
+        self.operand_refs: List[int] = []
+        self._operand_ids: Dict[tuple, int] = {}
+
+    def string(self, text: str) -> int:
+        sid = self._string_ids.get(text)
+        if sid is None:
+            sid = len(self.strings)
+            self.strings.append(text)
+            self._string_ids[text] = sid
+        return sid
+
+    def number(self, key: tuple, bits: int) -> int:
+        nid = self._number_ids.get(key)
+        if nid is None:
+            nid = len(self.numbers)
+            self.numbers.append(bits)
+            self._number_ids[key] = nid
+        return nid
+
+    def kind(self, operand_type: str) -> int:
+        kid = self._kind_ids.get(operand_type)
+        if kid is None:
+            kid = len(self.kinds)
+            if kid > 0xFF:
+                raise ValueError("Demasiados tipos de operando para .tacb")
+            self.kinds.append(self.string(operand_type))
+            self._kind_ids[operand_type] = kid
+        return kid
+
+    def value(self, value) -> tuple:
+        """(tag, ref) de un valor de operando"""
+        if isinstance(value, str):
+            if _TEMP_NAME.fullmatch(value):
+                return TAG_TEMP, int(value[1:])
+            return TAG_STR, self.string(value)
+        if isinstance(value, bool):
+            return TAG_BOOL, int(value)
+        if isinstance(value, int):
+            if -2**63 <= value < 2**63:
+                return TAG_INT, self.number((int, value), value)
+            return TAG_BIGINT, self.string(str(value))
+        if isinstance(value, float):
+            bits = _INT64.unpack(_DOUBLE.pack(value))[0]
+            return TAG_FLOAT, self.number((float, bits), bits)
+        if value is None:
+            return TAG_NONE, 0
+        raise TypeError(f"Valor de operando no serializable: {value!r}")
+
+    def operand(self, operand: Optional[Operand]) -> int:
+        if operand is None:
+            return NO_OPERAND
+        value = operand.value
+        key = (operand.type, value) if value.__class__ is str \
+            else (operand.type, value.__class__, value)
+        oid = self._operand_ids.get(key)
+        if oid is None:
+            tag, ref = self.value(value)
+            oid = len(self.operand_kinds)
+            self.operand_kinds.append(self.kind(operand.type))
+            self.operand_tags.append(tag)
+            self.operand_refs.append(ref)
+            self._operand_ids[key] = oid
+        return oid
+
+
+def encode(triplets: Iterable[Triplet],
+           symbols: Optional[Dict[str, object]] = None,
+           memory_layout: Optional[dict] = None) -> bytes:
+    """
+    Serializa tripletos (cualquier iterable: lista, TripletTable o
+    CompactTripletTable), símbolos ({nombre: SimpleSymbol}) y layout de
+    memoria al formato .tacb.
+    """
+    enc = _Encoder()
+    opcode_ids: Dict[OpCode, int] = {}
+    opcode_names: List[int] = []
+    ops, arg1s, arg2s, results = [], [], [], []
+    comments: List[int] = []
+    labels: List[int] = []
+
+    for index, triplet in enumerate(triplets):
+        op_id = opcode_ids.get(triplet.op)
+        if op_id is None:
+            op_id = opcode_ids[triplet.op] = len(opcode_names)
+            opcode_names.append(enc.string(triplet.op.value))
+        ops.append(op_id)
+        arg1 = enc.operand(triplet.arg1)
+        arg1s.append(arg1)
+        arg2s.append(enc.operand(triplet.arg2))
+        results.append(enc.operand(triplet.result))
+        if triplet.comment is not None:
+            comments.extend((index, enc.string(triplet.comment)))
+        if triplet.op == OpCode.LABEL and arg1 != NO_OPERAND:
+            labels.extend((arg1, index))
+
+    # Dirección y dimensiones de los símbolos se guardan como operandos
+    # constantes para reutilizar la codificación de valores
+    records: List[int] = []
+    dims: List[int] = []
+    for symbol in (symbols or {}).values():
+        temp = getattr(symbol, 'temp', None)
+        dimensions = list(getattr(symbol, 'array_dimensions', []) or [])
+        records.extend((
+            enc.string(symbol.name),
+            enc.string(symbol.sym_type),
+            enc.operand(Operand(symbol.address, "const")),
+            enc.string(temp) if temp is not None else NO_STRING,
+            int(bool(getattr(symbol, 'is_initialized', False))),
+            len(dims),
+            len(dimensions),
+        ))
+        dims.extend(enc.operand(Operand(d, "const")) for d in dimensions)
+
+    layout = json.dumps(memory_layout, default=str).encode('utf-8') \
+        if memory_layout is not None else b""
+
+    sections = []
+
+    code = bytearray(_COUNT.pack(len(ops), 0))
+    code += bytes(ops)
+    _pad(code)
+    for column in (arg1s, arg2s, results):
+        code += _pack('i', column)
+        _pad(code)
+    sections.append((SECTION_CODE, code))
+
+    operands = bytearray(_COUNT.pack(len(enc.operand_kinds), 0))
+    operands += bytes(enc.operand_kinds)
+    _pad(operands)
+    operands += bytes(enc.operand_tags)
+    _pad(operands)
+    operands += _pack('I', enc.operand_refs)
+    sections.append((SECTION_OPERANDS, operands))
+
+    sections.append((SECTION_NUMBERS, _pack('q', enc.numbers)))
+    sections.append((SECTION_KINDS, _pack('I', enc.kinds)))
+    sections.append((SECTION_OPCODES, _pack('I', opcode_names)))
+    sections.append((SECTION_COMMENTS, _pack('I', comments)))
+    sections.append((SECTION_LABELS, _pack('I', labels)))
+
+    symbol_data = bytearray(_COUNT.pack(len(records) // _SYMBOL_FIELDS, 0))
+    symbol_data += _pack('q', records)
+    symbol_data += _pack('q', dims)
+    sections.append((SECTION_SYMBOLS, symbol_data))
+    sections.append((SECTION_LAYOUT, layout))
+
+    # STRINGS se arma al final, cuando las demás secciones ya internaron sus
+    # strings, pero va primero en el archivo
+    encoded = [s.encode('utf-8') for s in enc.strings]
+    offsets = [0]
+    for data in encoded:
+        offsets.append(offsets[-1] + len(data))
+    strings = bytearray(_COUNT.pack(len(encoded), 0))
+    strings += _pack('I', offsets)
+    _pad(strings)
+    strings += b"".join(encoded)
+    sections.insert(0, (SECTION_STRINGS, strings))
+
+    out = bytearray(_HEADER.pack(MAGIC, VERSION, 0, len(sections)))
+    out += b"\0" * (_ENTRY.size * len(sections))
+    _pad(out)
+    directory = []
+    for section_id, data in sections:
+        directory.append(_ENTRY.pack(section_id, 0, len(out), len(data)))
+        out += data
+        _pad(out)
+    out[_HEADER.size:_HEADER.size + _ENTRY.size * len(sections)] = b"".join(directory)
+    return bytes(out)
+
+
+def save(path: str, triplets: Iterable[Triplet],
+         symbols: Optional[Dict[str, object]] = None,
+         memory_layout: Optional[dict] = None):
+    with open(path, "wb") as f:
+        f.write(encode(triplets, symbols, memory_layout))
+
+
+def save_visitor(path: str, visitor):
+    """Guarda el resultado de generate_tac (tripletos, símbolos y layout)"""
+    save(path, visitor.emitter.table, visitor.get_symbols(),
+         visitor.memory_manager.get_memory_layout())
+
+
+# ========== LECTURA ==========
+
+class TacbFile:
+    """
+    Archivo .tacb cargado (normalmente sobre un mmap).
+
+    `triplets` es una tabla de sólo lectura con la interfaz de TripletTable;
+    strings, valores y operandos se decodifican al primer acceso y se
+    reutilizan después.
+    """
+
+    def __init__(self, buffer, mapped: Optional[mmap.mmap] = None):
+        self._mmap = mapped
+        self._buffer = memoryview(buffer)
+        self._views: List[memoryview] = [self._buffer]
+        self._sections: Dict[int, memoryview] = {}
+        self._comments: Optional[Dict[int, str]] = None
+        try:
+            self._read()
+        except TacbFormatError:
+            self.close()
+            raise
+        except (struct.error, ValueError, IndexError) as e:
+            self.close()
+            raise TacbFormatError(f"Archivo .tacb corrupto: {e}")
+
+    def _read(self):
+        if len(self._buffer) < _HEADER.size:
+            raise TacbFormatError("Archivo .tacb truncado")
+        magic, version, _, count = _HEADER.unpack_from(self._buffer, 0)
+        if magic != MAGIC:
+            raise TacbFormatError("No es un archivo .tacb")
+        if version != VERSION:
+            raise TacbFormatError(f"Versión de .tacb no soportada: {version}")
+
+        for i in range(count):
+            section_id, _, offset, length = _ENTRY.unpack_from(self._buffer, _HEADER.size + i * _ENTRY.size)
+            if offset + length > len(self._buffer):
+                raise TacbFormatError("Sección fuera del archivo")
+            section = self._sections[section_id] = self._buffer[offset:offset + length]
+            self._views.append(section)
+
+        # STRINGS
+        strings = self._section(SECTION_STRINGS)
+        n, _ = _COUNT.unpack_from(strings, 0)
+        self._string_offsets = self._column(strings, 8, n + 1, 'I')
+        blob_start = 8 + (n + 1) * 4
+        self._string_blob = strings[blob_start + (-blob_start % 8):]
+        self._views.append(self._string_blob)
+        self._strings: List[Optional[str]] = [None] * n
+
+        numbers = self._section(SECTION_NUMBERS)
+        self._numbers = self._column(numbers, 0, len(numbers) // 8, 'q')
+        kinds = self._section(SECTION_KINDS)
+        self._kinds = [self.string(sid) for sid in self._column(kinds, 0, len(kinds) // 4, 'I')]
+
+        # OPERANDS
+        operands = self._section(SECTION_OPERANDS)
+        n, _ = _COUNT.unpack_from(operands, 0)
+        stride = n + (-n % 8)
+        self._operand_kinds = self._column(operands, 8, n, 'B')
+        self._operand_tags = self._column(operands, 8 + stride, n, 'B')
+        self._operand_refs = self._column(operands, 8 + 2 * stride, n, 'I')
+        self._operands: List[Optional[Operand]] = [None] * n
+
+        # OPCODES
+        opcodes = self._section(SECTION_OPCODES)
+        by_value = {op.value: op for op in OpCode}
+        names = self._column(opcodes, 0, len(opcodes) // 4, 'I')
+        try:
+            self._opcodes = [by_value[self.string(sid)] for sid in names]
+        except KeyError as e:
+            raise TacbFormatError(f"OpCode desconocido: {e}")
+
+        # CODE
+        code = self._section(SECTION_CODE)
+        n, _ = _COUNT.unpack_from(code, 0)
+        offset = 8 + n + (-n % 8)
+        stride = n * 4 + (-(n * 4) % 8)
+        self._ops = self._column(code, 8, n, 'B')
+        self._args = tuple(self._column(code, offset + k * stride, n, 'i') for k in range(3))
+        self.triplets = TacbTripletTable(self, n)
+
+    def _section(self, section_id: int) -> memoryview:
+        section = self._sections.get(section_id)
+        if section is None:
+            raise TacbFormatError(f"Falta la sección {section_id}")
+        return section
+
+    def _column(self, section: memoryview, offset: int, count: int, typecode: str):
+        """Columna de `count` enteros; sin copia salvo en hosts big endian"""
+        raw = section[offset:offset + count * array(typecode).itemsize]
+        if not _LITTLE_ENDIAN:
+            column = array(typecode, raw.tobytes())
+            column.byteswap()
+            return column
+        column = raw.cast(typecode)
+        self._views.extend((raw, column))
+        return column
+
+    # ========== DECODIFICACIÓN PEREZOSA ==========
+
+    def string(self, sid: int) -> str:
+        text = self._strings[sid]
+        if text is None:
+            start, end = self._string_offsets[sid], self._string_offsets[sid + 1]
+            text = self._strings[sid] = str(self._string_blob[start:end], 'utf-8')
+        return text
+
+    def _value(self, tag: int, ref: int):
+        if tag == TAG_TEMP:
+            return f"t{ref}"
+        if tag == TAG_STR:
+            return self.string(ref)
+        if tag == TAG_INT:
+            return self._numbers[ref]
+        if tag == TAG_FLOAT:
+            return _DOUBLE.unpack(_INT64.pack(self._numbers[ref]))[0]
+        if tag == TAG_BOOL:
+            return bool(ref)
+        if tag == TAG_NONE:
+            return None
+        if tag == TAG_BIGINT:
+            return int(self.string(ref))
+        raise TacbFormatError(f"Tag de valor desconocido: {tag}")
+
+    def operand(self, oid: int) -> Optional[Operand]:
+        if oid == NO_OPERAND:
+            return None
+        operand = self._operands[oid]
+        if operand is None:
+            operand = Operand(self._value(self._operand_tags[oid], self._operand_refs[oid]),
+                              self._kinds[self._operand_kinds[oid]])
+            operand.id = oid
+            self._operands[oid] = operand
+        return operand
+
+    def triplet(self, index: int) -> Triplet:
+        arg1, arg2, result = self._args
+        triplet = Triplet(self._opcodes[self._ops[index]],
+                          self.operand(arg1[index]),
+                          self.operand(arg2[index]),
+                          self.operand(result[index]),
+                          self.comments().get(index))
+        triplet.id = index
+        return triplet
+
+    def opcode(self, index: int) -> OpCode:
+        return self._opcodes[self._ops[index]]
+
+    # ========== SECCIONES AUXILIARES ==========
+
+    def comments(self) -> Dict[int, str]:
+        comments = self._comments
+        if comments is None:
+            section = self._section(SECTION_COMMENTS)
+            pairs = self._column(section, 0, len(section) // 4, 'I')
+            comments = self._comments = {pairs[i]: self.string(pairs[i + 1])
+                                         for i in range(0, len(pairs), 2)}
+        return comments
+
+    def labels(self) -> Dict[str, int]:
+        """{nombre de etiqueta: índice del tripleto LABEL}"""
+        section = self._section(SECTION_LABELS)
+        pairs = self._column(section, 0, len(section) // 4, 'I')
+        return {str(self.operand(pairs[i]).value): pairs[i + 1] for i in range(0, len(pairs), 2)}
+
+    def symbols(self) -> Dict[str, object]:
+        """{nombre: SimpleSymbol} como visitor.get_symbols()"""
+        from compiler.syntax_tree.visitors import SimpleSymbol
+
+        section = self._section(SECTION_SYMBOLS)
+        n, _ = _COUNT.unpack_from(section, 0)
+        records = self._column(section, 8, n * _SYMBOL_FIELDS, 'q')
+        dims_offset = 8 + n * _SYMBOL_FIELDS * 8
+        dims = self._column(section, dims_offset, (len(section) - dims_offset) // 8, 'q')
+
+        symbols = {}
+        for i in range(0, n * _SYMBOL_FIELDS, _SYMBOL_FIELDS):
+            name, sym_type, address, temp, initialized, dims_start, dims_count = records[i:i + _SYMBOL_FIELDS]
+            symbol = SimpleSymbol(self.string(name), self.string(sym_type), self.operand(address).value)
+            symbol.temp = self.string(temp) if temp != NO_STRING else None
+            symbol.is_initialized = bool(initialized)
+            symbol.array_dimensions = [self.operand(d).value for d in dims[dims_start:dims_start + dims_count]]
+            symbols[symbol.name] = symbol
+        return symbols
+
+    def memory_layout(self) -> Optional[dict]:
+        section = self._section(SECTION_LAYOUT)
+        return json.loads(str(section, 'utf-8')) if len(section) else None
+
+    # ========== CICLO DE VIDA ==========
+
+    def close(self):
+        """Libera las vistas y el mmap (los objetos ya materializados siguen válidos)"""
+        for view in reversed(self._views):
+            view.release()
+        self._views.clear()
+        self._sections.clear()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class TacbTripletTable:
+    """Vista de sólo lectura de los tripletos de un TacbFile (interfaz de TripletTable)"""
+
+    def __init__(self, tacb: TacbFile, count: int):
+        self._tacb = tacb
+        self._count = count
+
+    def get(self, index: int) -> Optional[Triplet]:
+        if 0 <= index < self._count:
+            return self._tacb.triplet(index)
+        return None
+
+    def opcode(self, index: int) -> OpCode:
+        return self._tacb.opcode(index)
+
+    def size(self) -> int:
+        return self._count
+
+    def to_list(self) -> List[dict]:
+        return [triplet.to_dict() for triplet in self]
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self):
+        triplet = self._tacb.triplet
+        for index in range(self._count):
+            yield triplet(index)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._tacb.triplet(i) for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("índice de tripleto fuera de rango")
+        return self._tacb.triplet(index)
+
+
+def load(path: str) -> TacbFile:
+    """Abre un .tacb con mmap; usar con `with` o llamar close()"""
+    with open(path, "rb") as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # mmap no acepta archivos vacíos
+            raise TacbFormatError("Archivo .tacb truncado")
+    return TacbFile(mapped, mapped)
+
+
+def loads(data: bytes) -> TacbFile:
+    """Carga un .tacb desde bytes en memoria"""
+    return TacbFile(data)
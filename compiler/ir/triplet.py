@@ -1,4 +1,4 @@
-from typing import Optional, Union, List
+from typing import Dict, Optional, Union, List
 from enum import Enum
 
 
@@ -61,13 +61,20 @@ class OpCode(Enum):
     NOP = "nop"          
     PRINT = "print"      
     CAST = "cast"        
+    
+    
+    PHI = "phi"          
 
 
 class Operand:
+    __slots__ = ('value', 'type', 'id')
+
     def __init__(self, value: Union[str, int, float, bool, None], 
                  operand_type: str = "temp"):
         self.value = value
         self.type = operand_type  
+        # Id entero asignado por OperandFactory (None si no está internado)
+        self.id = None
     
     def __str__(self) -> str:
         if self.value is None:
@@ -91,6 +98,8 @@ class Operand:
 
 
 class Triplet:
+    __slots__ = ('op', 'arg1', 'arg2', 'result', 'comment', 'id')
+
     def __init__(self, 
                  op: OpCode,
                  arg1: Optional[Operand] = None,
@@ -164,11 +173,24 @@ class Triplet:
                           OpCode.GT, OpCode.GE]
     
     def uses_operand(self, operand: Operand) -> bool:
-        return (self.arg1 and str(self.arg1) == str(operand)) or \
-               (self.arg2 and str(self.arg2) == str(operand))
+        return _same_operand(self.arg1, operand) or _same_operand(self.arg2, operand)
     
     def defines_operand(self, operand: Operand) -> bool:
-        return self.result and str(self.result) == str(operand)
+        return _same_operand(self.result, operand)
+
+
+def _same_operand(a: Optional[Operand], b: Operand) -> bool:
+    """
+    Igualdad por texto (como str(a) == str(b)); los operandos internados se
+    resuelven por identidad y los nombres se comparan sin formatear.
+    """
+    if a is b:
+        return True
+    if a is None:
+        return False
+    if a.value.__class__ is str and b.value.__class__ is str:
+        return a.value == b.value
+    return str(a) == str(b)
 
 
 class TripletTable:
@@ -187,6 +209,9 @@ class TripletTable:
             return self.triplets[index]
         return None
     
+    def set_result(self, index: int, operand: Optional[Operand]):
+        self.triplets[index].result = operand
+    
     def size(self) -> int:
         return len(self.triplets)
     
@@ -231,6 +256,68 @@ class TripletTable:
         return self.triplets[index]
 
 
+class OperandFactory:
+    """
+    Interna operandos por (tipo, valor): cada nombre, constante o etiqueta
+    tiene una sola instancia de Operand, con un id entero denso (0, 1, ...)
+    que sirve de índice en tablas y conjuntos de bits.
+
+    Las constantes se distinguen por clase además de valor, para que 1, 1.0
+    y True sigan siendo operandos distintos.
+    """
+
+    def __init__(self):
+        self._tables: Dict[str, dict] = {}
+        self.operands: List[Operand] = []
+
+    def get(self, value: Union[str, int, float, bool, None], operand_type: str) -> Operand:
+        table = self._tables.get(operand_type)
+        if table is None:
+            table = self._tables[operand_type] = {}
+        key = value if value.__class__ is str else (value.__class__, value)
+        operand = table.get(key)
+        if operand is None:
+            operand = Operand(value, operand_type)
+            operand.id = len(self.operands)
+            self.operands.append(operand)
+            table[key] = operand
+        return operand
+
+    def intern(self, operand: Operand) -> Operand:
+        """Retorna la instancia internada equivalente a `operand`"""
+        operand_id = operand.id
+        if operand_id is not None and operand_id < len(self.operands) \
+                and self.operands[operand_id] is operand:
+            return operand
+        return self.get(operand.value, operand.type)
+
+    def coerce(self, value: Union[str, int, float, bool, Operand]) -> Operand:
+        """Operando para un argumento de emit: números como constantes, el resto como variables"""
+        if isinstance(value, Operand):
+            return self.intern(value)
+        if isinstance(value, (int, float, bool)):
+            return self.get(value, "const")
+        return self.get(str(value), "var")
+
+    def temp(self, name: str) -> Operand:
+        return self.get(name, "temp")
+
+    def var(self, name: str) -> Operand:
+        return self.get(name, "var")
+
+    def const(self, value: Union[int, float, str, bool]) -> Operand:
+        return self.get(value, "const")
+
+    def label(self, name: str) -> Operand:
+        return self.get(name, "label")
+
+    def func(self, name: str) -> Operand:
+        return self.get(name, "func")
+
+    def __len__(self) -> int:
+        return len(self.operands)
+
+
 def temp_operand(name: str) -> Operand:
     """Crea un operando temporal"""
     return Operand(name, "temp")
@@ -0,0 +1,15 @@
+from .base import PassResult
+from .constant_folding import fold_constants
+from .copy_propagation import propagate_copies
+from .dead_code import eliminate_dead_code
+from .jump_threading import thread_jumps
+from .licm import hoist_loop_invariants
+from .loop_rotation import rotate_loops
+from .manager import OPT_LEVELS, OptimizationReport, PassManager, optimize
+from .strength_reduction import reduce_induction_variables
+from .value_numbering import eliminate_common_subexpressions
+
+__all__ = ['PassResult', 'fold_constants', 'propagate_copies', 'eliminate_dead_code',
+           'eliminate_common_subexpressions', 'hoist_loop_invariants', 'reduce_induction_variables',
+           'thread_jumps', 'rotate_loops', 'PassManager', 'OptimizationReport', 'optimize',
+           'OPT_LEVELS']
@@ -0,0 +1,76 @@
+"""
+Piezas comunes de las pasadas de optimización.
+
+Cada pasada es una función que recibe un listado de tripletos y retorna un
+PassResult con el listado nuevo (las pasadas no modifican la lista de
+entrada) y contadores de lo que hizo. Las constantes se manejan como las
+escribe el visitor: texto ("3", "true") en operandos `const`.
+"""
+from typing import Dict, List, Optional
+
+from ..ir.interpreter import constant_value, format_value
+from ..ir.triplet import Operand, Triplet
+
+
+class PassResult:
+    """
+    Resultado de una pasada.
+
+    Atributos:
+        name: Nombre de la pasada
+        triplets: Listado resultante
+        before: Tripletos que tenía la entrada
+        stats: Contadores propios de la pasada (p. ej. {"plegados": 3})
+    """
+
+    def __init__(self, name: str, triplets: List[Triplet], before: int,
+                 stats: Optional[Dict[str, int]] = None):
+        self.name = name
+        self.triplets = triplets
+        self.before = before
+        self.stats = stats or {}
+
+    @property
+    def after(self) -> int:
+        return len(self.triplets)
+
+    @property
+    def removed(self) -> int:
+        return self.before - self.after
+
+    @property
+    def changed(self) -> bool:
+        return self.removed != 0 or any(self.stats.values())
+
+    def __repr__(self) -> str:
+        return f"PassResult({self.name}: {self.before} -> {self.after}, {self.stats})"
+
+
+def integer_constant(operand: Optional[Operand]):
+    """
+    Valor entero o booleano de un operando constante, o None (cadenas,
+    flotantes y operandos que no son constantes no se pliegan)
+    """
+    if operand is None or operand.type != "const":
+        return None
+    value = constant_value(operand.value)
+    if value.__class__ is int or value.__class__ is bool:
+        return value
+    return None
+
+
+def constant_operand(value) -> Operand:
+    """Operando constante con el texto que usaría el visitor"""
+    return Operand(format_value(value), "const")
+
+
+def same_constant(a, b) -> bool:
+    """Igualdad que distingue True de 1"""
+    return a.__class__ is b.__class__ and a == b
+
+
+def copy_triplet(triplet: Triplet) -> Triplet:
+    """Copia superficial (los operandos se comparten)"""
+    copy = Triplet(triplet.op, triplet.arg1, triplet.arg2, triplet.result, triplet.comment)
+    copy.id = triplet.id
+    return copy
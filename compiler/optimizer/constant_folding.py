@@ -0,0 +1,369 @@
+"""
+Plegado y propagación de constantes.
+
+El visitor carga cada literal en un temporal antes de operar
+(`t0 = mov 2`, `t1 = mov 3`, `t2 = mul t0, t1`), así que una expresión
+constante se vuelve varios tripletos. Esta pasada:
+
+- propaga los valores constantes (enteros y booleanos) de temporales y
+  variables a sus usos, también entre bloques
+- pliega las operaciones cuyos operandos son constantes (`t2 = mov 6`) y
+  algunas identidades (`x * 1`, `x * 0`, `x / 1`, `x - 0`)
+- convierte en `jmp` los saltos condicionales que siempre se toman y
+  elimina los que nunca se toman
+- elimina los `tN = mov c` que quedaron sin lectores
+
+La propagación es condicional (al estilo de SCCP, pero sobre el listado
+sin SSA): resuelve un problema hacia adelante por región siguiendo sólo
+las aristas ejecutables, de modo que lo que está después de un salto
+constante no contamina el resto. Un bloque que nunca se alcanza se deja
+como está; eliminarlo le toca a la pasada de código muerto.
+
+No se pliegan cadenas ni flotantes, ni `add` con cero (el visitor usa
+`add` también para concatenar), ni una división entre cero (se deja para
+que falle en ejecución). Los resultados enteros deben caber en 32 bits,
+como en MIPS. Una llamada puede escribir las variables que comparten
+varias funciones, así que después de CALL dejan de ser constantes.
+"""
+from typing import Dict, List, Optional, Set
+
+from ..ir.analysis import FlowAnalysis
+from ..ir.cfg import ControlFlowGraph, FunctionCFG
+from ..ir.defuse import JUMP_OPS, defined_name, is_temp_name, is_variable, use_slots, used_names
+from ..ir.interpreter import BINARY_OPS, BRANCH_CONDITIONS
+from ..ir.ssa import shared_names
+from ..ir.triplet import OpCode, Operand, Triplet
+from .base import PassResult, constant_operand, integer_constant, same_constant
+
+
+INT_MIN = -2 ** 31
+INT_MAX = 2 ** 31 - 1
+
+_ARITHMETIC = (OpCode.ADD, OpCode.SUB, OpCode.MUL, OpCode.DIV, OpCode.MOD)
+_EQUALITY = (OpCode.EQ, OpCode.NE)
+_ORDER = (OpCode.LT, OpCode.LE, OpCode.GT, OpCode.GE)
+_LOGICAL = (OpCode.AND, OpCode.OR)
+_FOLDABLE = _ARITHMETIC + _EQUALITY + _ORDER + _LOGICAL + (OpCode.NEG, OpCode.NOT)
+_CONDITIONAL = tuple(op for op in JUMP_OPS if op is not OpCode.JMP)
+
+# Instrucciones en las que un operando puede pasar a ser constante
+_REWRITE_OPS = _FOLDABLE + _CONDITIONAL + (OpCode.MOV, OpCode.PRINT, OpCode.PARAM,
+                                           OpCode.RETURN)
+
+
+def _is_int(value) -> bool:
+    return value.__class__ is int
+
+
+def fold(op: OpCode, a, b=None):
+    """
+    Valor de `op a, b` con operandos constantes, o None si no se puede (o
+    no se debe) plegar
+    """
+    if a is None:
+        return None
+    if op is OpCode.NEG:
+        return _fit(-a) if _is_int(a) else None
+    if op is OpCode.NOT:
+        return (not a) if a.__class__ is bool else None
+    if b is None:
+        return None
+    if op in _ARITHMETIC:
+        if not (_is_int(a) and _is_int(b)):
+            return None
+        if (op is OpCode.DIV or op is OpCode.MOD) and b == 0:
+            return None
+        return _fit(BINARY_OPS[op](a, b))
+    if op in _EQUALITY:
+        return BINARY_OPS[op](a, b) if a.__class__ is b.__class__ else None
+    if op in _ORDER:
+        return BINARY_OPS[op](a, b) if _is_int(a) and _is_int(b) else None
+    if op in _LOGICAL:
+        both = a.__class__ is bool and b.__class__ is bool
+        return BINARY_OPS[op](a, b) if both else None
+    return None
+
+
+def _fit(value: int) -> Optional[int]:
+    return value if INT_MIN <= value <= INT_MAX else None
+
+
+def branch_taken(op: OpCode, a, b=None) -> Optional[bool]:
+    """True/False si el salto condicional se decide con constantes, o None"""
+    if a is None:
+        return None
+    if op is OpCode.BZ or op is OpCode.BNZ:
+        return BRANCH_CONDITIONS[op](a, None)
+    if b is None:
+        return None
+    if op is OpCode.BEQ or op is OpCode.BNE:
+        return BRANCH_CONDITIONS[op](a, b) if a.__class__ is b.__class__ else None
+    if _is_int(a) and _is_int(b):
+        return BRANCH_CONDITIONS[op](a, b)
+    return None
+
+
+def _identity(op: OpCode, a, b, left: Operand, right: Operand) -> Optional[Operand]:
+    """Operando al que se reduce `left op right` cuando uno es 0 o 1"""
+    if op is OpCode.MUL:
+        if (_is_int(a) and a == 0) or (_is_int(b) and b == 0):
+            return constant_operand(0)
+        if _is_int(b) and b == 1:
+            return left
+        if _is_int(a) and a == 1:
+            return right
+    elif op is OpCode.DIV or op is OpCode.SUB:
+        if _is_int(b) and b == (1 if op is OpCode.DIV else 0):
+            return left
+    return None
+
+
+def _meet(states: List[Dict[str, object]]) -> Dict[str, object]:
+    """Se quedan las variables con la misma constante en todos los estados"""
+    result = dict(states[0])
+    for state in states[1:]:
+        result = {name: value for name, value in result.items()
+                  if name in state and same_constant(state[name], value)}
+    return result
+
+
+def _same_state(a: Dict[str, object], b: Dict[str, object]) -> bool:
+    return len(a) == len(b) and all(name in b and same_constant(b[name], value)
+                                    for name, value in a.items())
+
+
+def _nonlocal_names(cfg: ControlFlowGraph) -> Set[str]:
+    """
+    Variables que se leen en un bloque antes de asignarse en él: las únicas
+    que hace falta llevar de un bloque a otro
+    """
+    names: Set[str] = set()
+    for block in cfg.blocks:
+        defined = set()
+        for triplet in block:
+            for name in used_names(triplet):
+                if name not in defined:
+                    names.add(name)
+            name = defined_name(triplet)
+            if name is not None:
+                defined.add(name)
+    return names
+
+
+class _Stats:
+    __slots__ = ('propagated', 'folded', 'simplified', 'branches')
+
+    def __init__(self):
+        self.propagated = self.folded = self.simplified = self.branches = 0
+
+
+class _Region:
+    """Propagación condicional de constantes en una región del CFG"""
+
+    def __init__(self, cfg: ControlFlowGraph, function: FunctionCFG,
+                 shared: Set[str], carried: Set[str]):
+        self.cfg = cfg
+        self.function = function
+        self.shared = shared
+        self.carried = carried
+        self.next_block: Dict[int, Optional[int]] = {}
+        region = function.blocks
+        for k, b in enumerate(region):
+            self.next_block[b] = region[k + 1] if k + 1 < len(region) else None
+        self.block_in: Dict[int, Dict[str, object]] = {}
+
+    # ========== ANÁLISIS ==========
+
+    def solve(self):
+        cfg = self.cfg
+        entry = self.function.entry
+        if entry is None:
+            return
+        out: Dict[int, Dict[str, object]] = {}
+        executable: Set[tuple] = set()
+        reached = {entry}
+        order = self.function.reverse_postorder
+
+        changed = True
+        while changed:
+            changed = False
+            for b in order:
+                if b not in reached:
+                    continue
+                incoming = [out[p] for p in cfg.blocks[b].preds
+                            if (p, b) in executable and p in out]
+                state = {} if b == entry or not incoming else _meet(incoming)
+                self.block_in[b] = state
+                state = dict(state)
+                self._walk(b, state)
+                state = {name: value for name, value in state.items() if name in self.carried}
+                for succ in self._successors(b, state):
+                    if (b, succ) not in executable:
+                        executable.add((b, succ))
+                        reached.add(succ)
+                        changed = True
+                if b not in out or not _same_state(out[b], state):
+                    out[b] = state
+                    changed = True
+
+    def _value(self, operand: Optional[Operand], state: Dict[str, object]):
+        if operand is None:
+            return None
+        if operand.type == "const":
+            return integer_constant(operand)
+        if is_variable(operand):
+            return state.get(operand.value)
+        return None
+
+    def _successors(self, b: int, state: Dict[str, object]) -> List[int]:
+        block = self.cfg.blocks[b]
+        last = block.last
+        if last.op in _CONDITIONAL and len(block.succs) == 2:
+            taken = branch_taken(last.op, self._value(last.arg1, state),
+                                 self._value(last.arg2, state))
+            if taken is not None:
+                target = self.cfg.label_block[str(last.result.value)]
+                succ = target if taken else self.next_block[b]
+                return [succ] if succ is not None else []
+        return block.succs
+
+    # ========== TRANSFORMACIÓN ==========
+
+    def _walk(self, b: int, state: Dict[str, object],
+              output: Optional[List[Triplet]] = None,
+              stats: Optional[_Stats] = None, propagated: Optional[Set[str]] = None):
+        """
+        Aplica los tripletos del bloque a `state`. Si recibe `output`, agrega
+        ahí los tripletos reescritos.
+        """
+        shared = self.shared
+        for triplet in self.cfg.blocks[b]:
+            op = triplet.op
+            if output is not None:
+                triplet = self._rewrite(triplet, state, stats, propagated)
+                if triplet is None:
+                    continue
+                output.append(triplet)
+                op = triplet.op
+
+            if op is OpCode.CALL:
+                for name in [name for name in state if name in shared]:
+                    del state[name]
+            name = defined_name(triplet)
+            if name is None:
+                continue
+            if op is OpCode.MOV:
+                value = self._value(triplet.arg1, state)
+            elif op in _FOLDABLE:
+                value = fold(op, self._value(triplet.arg1, state), self._value(triplet.arg2, state))
+            else:
+                value = None
+            if value is None:
+                state.pop(name, None)
+            else:
+                state[name] = value
+
+    def _rewrite(self, triplet: Triplet, state: Dict[str, object],
+                 stats: _Stats, propagated: Set[str]) -> Optional[Triplet]:
+        op = triplet.op
+        if op not in _REWRITE_OPS:
+            return triplet
+
+        operands = {}
+        for slot in use_slots(triplet):
+            operand = getattr(triplet, slot)
+            if is_variable(operand):
+                value = state.get(operand.value)
+                if value is not None:
+                    operands[slot] = constant_operand(value)
+                    propagated.add(operand.value)
+                    stats.propagated += 1
+        if operands:
+            copy = Triplet(op, operands.get('arg1', triplet.arg1), operands.get('arg2', triplet.arg2),
+                           operands.get('result', triplet.result), triplet.comment)
+            copy.id = triplet.id
+            triplet = copy
+
+        a, b = integer_constant(triplet.arg1), integer_constant(triplet.arg2)
+        if op in _CONDITIONAL:
+            target = self.cfg.label_block.get(str(triplet.result.value)) \
+                if triplet.result is not None else None
+            if target is None or self.cfg.blocks[target].function != self.function.index:
+                return triplet
+            taken = branch_taken(op, a, b)
+            if taken is None:
+                return triplet
+            stats.branches += 1
+            return Triplet(OpCode.JMP, result=triplet.result, comment=triplet.comment) if taken else None
+
+        if op in _FOLDABLE:
+            value = fold(op, a, b)
+            if value is not None:
+                stats.folded += 1
+                return Triplet(OpCode.MOV, constant_operand(value), None, triplet.result, triplet.comment)
+            if op in _ARITHMETIC and triplet.arg2 is not None:
+                operand = _identity(op, a, b, triplet.arg1, triplet.arg2)
+                if operand is not None:
+                    stats.simplified += 1
+                    return Triplet(OpCode.MOV, operand, None, triplet.result, triplet.comment)
+        return triplet
+
+
+def fold_constants(triplets, analysis: Optional[FlowAnalysis] = None) -> PassResult:
+    """
+    Propaga y pliega constantes en un listado de tripletos.
+
+    Args:
+        triplets: Lista de tripletos (no se modifica)
+        analysis: FlowAnalysis de ese listado, si ya existe
+
+    Returns:
+        PassResult con contadores "propagados", "plegados", "simplificados",
+        "saltos" (saltos condicionales resueltos) y "copias" (movs de
+        constante eliminados)
+    """
+    if analysis is None:
+        analysis = FlowAnalysis(triplets)
+    cfg = analysis.cfg
+    shared = shared_names(cfg)
+    carried = _nonlocal_names(cfg)
+
+    regions = []
+    for function in cfg.functions:
+        region = _Region(cfg, function, shared, carried)
+        region.solve()
+        regions.append(region)
+
+    stats = _Stats()
+    propagated: Set[str] = set()
+    output: List[Triplet] = []
+    for block in cfg.blocks:
+        region = regions[block.function]
+        state = region.block_in.get(block.index)
+        if state is None:
+            output.extend(block)
+        else:
+            region._walk(block.index, dict(state), output, stats, propagated)
+
+    # Los movs de constante cuyos lectores recibieron el valor ya no hacen falta
+    readers: Dict[str, int] = {}
+    for triplet in output:
+        for name in used_names(triplet):
+            readers[name] = readers.get(name, 0) + 1
+    result = []
+    copies = 0
+    for triplet in output:
+        if triplet.op is OpCode.MOV and triplet.arg1.type == "const":
+            name = defined_name(triplet)
+            if name in propagated and name not in readers and is_temp_name(name):
+                copies += 1
+                continue
+        result.append(triplet)
+
+    return PassResult("constant_folding", result, len(cfg.triplets), {
+        "propagados": stats.propagated,
+        "plegados": stats.folded,
+        "simplificados": stats.simplified,
+        "saltos": stats.branches,
+        "copias": copies,
+    })
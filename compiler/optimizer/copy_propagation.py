@@ -0,0 +1,218 @@
+"""
+Propagación de copias y eliminación de cadenas de MOV.
+
+El visitor llena el listado de copias: cada declaración calcula el valor en
+un temporal y lo copia a la variable (`t4 = add t2, t3` + `x = mov t4`),
+cada función copia sus parámetros a temporales (`t1 = mov n`), y una
+asignación encadena copias entre temporales. Cada copia es un
+`addu rX, rY, $zero` en MIPS. La pasada hace dos cosas:
+
+1. Fusión hacia atrás: si un temporal se define una vez y su único lector
+   es una copia más adelante en el mismo bloque, la instrucción que lo
+   define escribe directamente el destino de la copia
+   (`x = add t2, t3`) y la copia desaparece. Entre ambas no puede haber
+   lecturas ni escrituras del destino, ni una llamada si el destino vive
+   en memoria (la función llamada podría leerlo).
+
+2. Propagación hacia adelante (global): con las copias disponibles
+   (dataflow.AvailableCopies), cada lectura de `x` tras `x = mov y` pasa a
+   leer `y` (siguiendo cadenas). Después se eliminan las copias a
+   temporales que se quedaron sin lectores y las copias de una variable a
+   sí misma. Las copias a variables con nombre se conservan: viven en
+   memoria y otra función puede leerlas.
+"""
+from typing import Dict, List, Optional, Set
+
+from ..ir.analysis import FlowAnalysis
+from ..ir.cfg import ControlFlowGraph
+from ..ir.dataflow import AvailableCopies, copy_key
+from ..ir.defuse import defined_name, is_memory_name, is_temp_name, is_variable, use_slots, used_names
+from ..ir.triplet import OpCode, Operand, Triplet
+from .base import PassResult, copy_triplet
+
+
+# Instrucciones cuyo resultado puede escribirse directamente en otra variable
+_RETARGET_OPS = (OpCode.ADD, OpCode.SUB, OpCode.MUL, OpCode.DIV, OpCode.MOD, OpCode.NEG,
+                 OpCode.AND, OpCode.OR, OpCode.NOT,
+                 OpCode.EQ, OpCode.NE, OpCode.LT, OpCode.LE, OpCode.GT, OpCode.GE,
+                 OpCode.MOV, OpCode.CAST, OpCode.CALL, OpCode.LOAD, OpCode.ARRAY_GET)
+
+
+def _counts(triplets: List[Triplet]):
+    readers: Dict[str, int] = {}
+    definitions: Dict[str, int] = {}
+    for triplet in triplets:
+        for name in used_names(triplet):
+            readers[name] = readers.get(name, 0) + 1
+        name = defined_name(triplet)
+        if name is not None:
+            definitions[name] = definitions.get(name, 0) + 1
+    return readers, definitions
+
+
+def _touches(triplet: Triplet, name: str) -> bool:
+    return defined_name(triplet) == name or name in used_names(triplet)
+
+
+def _coalesce(cfg: ControlFlowGraph) -> (List[Triplet], int):
+    """Fusión hacia atrás de `tK = op ...; x = mov tK` dentro de cada bloque"""
+    readers, definitions = _counts(cfg.triplets)
+    output: List[Triplet] = []
+    coalesced = 0
+    for block in cfg.blocks:
+        code: List[Optional[Triplet]] = list(block)
+        # Temporal -> posición (en code) de su única definición
+        defined_at: Dict[str, int] = {}
+        for i, triplet in enumerate(code):
+            name = defined_name(triplet)
+            source = triplet.arg1
+            j = defined_at.get(source.value) if triplet.op is OpCode.MOV and is_variable(source) \
+                else None
+            if j is not None and name is not None and name != source.value \
+                    and readers.get(source.value) == 1 and code[j].op in _RETARGET_OPS:
+                memory = is_memory_name(name)
+                between = [t for t in code[j + 1:i] if t is not None]
+                if not any(_touches(t, name) or (memory and t.op is OpCode.CALL) for t in between):
+                    retargeted = copy_triplet(code[j])
+                    retargeted.result = triplet.result
+                    code[j] = retargeted
+                    code[i] = None
+                    del defined_at[source.value]
+                    if is_temp_name(name) and definitions.get(name) == 1:
+                        defined_at[name] = j
+                    coalesced += 1
+                    continue
+            if name is not None:
+                defined_at.pop(name, None)
+                if is_temp_name(name) and definitions.get(name) == 1:
+                    defined_at[name] = i
+        output.extend(t for t in code if t is not None)
+    return output, coalesced
+
+
+class _Copies:
+    """Copias disponibles en un punto: destino -> operando origen"""
+
+    def __init__(self):
+        self.source: Dict[str, Operand] = {}
+        # Origen -> destinos que lo copian
+        self.targets: Dict[str, Set[str]] = {}
+
+    def add(self, target: str, source: Operand):
+        self.kill(target)
+        self.source[target] = source
+        self.targets.setdefault(source.value, set()).add(target)
+
+    def _remove(self, target: str):
+        source = self.source.pop(target)
+        targets = self.targets[source.value]
+        targets.discard(target)
+        if not targets:
+            del self.targets[source.value]
+
+    def kill(self, name: str):
+        """`name` se reasignó: mueren las copias en que participa"""
+        if name in self.source:
+            self._remove(name)
+        for target in list(self.targets.get(name, ())):
+            self._remove(target)
+
+    def kill_memory(self):
+        for target in [target for target, source in self.source.items()
+                       if is_memory_name(target) or is_memory_name(source.value)]:
+            self._remove(target)
+
+    def resolve(self, name: str) -> Optional[Operand]:
+        """Origen final de la cadena de copias de `name`, o None"""
+        source = self.source.get(name)
+        seen = {name}
+        while source is not None and source.value in self.source and source.value not in seen:
+            seen.add(source.value)
+            source = self.source[source.value]
+        return source
+
+
+def _propagate(cfg: ControlFlowGraph) -> (List[Triplet], int):
+    """Reescribe las lecturas con las copias disponibles"""
+    code = cfg.triplets
+    rewritten: Dict[int, Triplet] = {}
+    propagated = 0
+    for function in cfg.functions:
+        if function.entry is None:
+            continue
+        result = AvailableCopies(cfg, function).solve()
+        # Operando origen de cada copia del universo
+        sources: Dict[tuple, Operand] = {}
+        for b in function.blocks:
+            for triplet in cfg.blocks[b]:
+                key = copy_key(triplet)
+                if key is not None:
+                    sources.setdefault(key, triplet.arg1)
+
+        for b in function.reverse_postorder:
+            block = cfg.blocks[b]
+            copies = _Copies()
+            for key in result.in_items(b):
+                copies.add(key[0], sources[key])
+
+            for i in range(block.start, block.end):
+                triplet = code[i]
+                replaced = None
+                for slot in use_slots(triplet):
+                    operand = getattr(triplet, slot)
+                    if not is_variable(operand):
+                        continue
+                    source = copies.resolve(operand.value)
+                    if source is not None:
+                        if replaced is None:
+                            replaced = rewritten[i] = copy_triplet(triplet)
+                        setattr(replaced, slot, source)
+                        propagated += 1
+
+                if triplet.op is OpCode.CALL:
+                    copies.kill_memory()
+                name = defined_name(triplet)
+                if name is not None:
+                    copies.kill(name)
+                # Con la copia original, como en AvailableCopies
+                key = copy_key(triplet)
+                if key is not None:
+                    copies.add(key[0], triplet.arg1)
+    return [rewritten.get(i, triplet) for i, triplet in enumerate(code)], propagated
+
+
+def propagate_copies(triplets, analysis: Optional[FlowAnalysis] = None) -> PassResult:
+    """
+    Fusiona y propaga copias en un listado de tripletos.
+
+    Args:
+        triplets: Lista de tripletos (no se modifica)
+        analysis: FlowAnalysis de ese listado, si ya existe
+
+    Returns:
+        PassResult con contadores "fusionadas" (copias absorbidas por la
+        instrucción que calcula el valor), "propagados" (lecturas
+        reescritas) y "copias" (copias eliminadas después)
+    """
+    if analysis is None:
+        analysis = FlowAnalysis(triplets)
+    before = len(analysis.triplets)
+    coalesced_code, coalesced = _coalesce(analysis.cfg)
+    output, propagated = _propagate(ControlFlowGraph(coalesced_code))
+
+    readers, _ = _counts(output)
+    result = []
+    for triplet in output:
+        key = copy_key(triplet)
+        if triplet.op is OpCode.MOV and is_variable(triplet.arg1) \
+                and triplet.arg1.value == triplet.result.value:
+            continue
+        if key is not None and is_temp_name(key[0]) and key[0] not in readers:
+            continue
+        result.append(triplet)
+
+    return PassResult("copy_propagation", result, before, {
+        "fusionadas": coalesced,
+        "propagados": propagated,
+        "copias": len(output) - len(result),
+    })
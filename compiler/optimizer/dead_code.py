@@ -0,0 +1,174 @@
+"""
+Eliminación de código muerto y de bloques inalcanzables.
+
+El visitor deja código que nunca se ejecuta (lo que sigue a un `return`, a
+un `break` o a un `continue`), etiquetas a las que nadie salta y
+temporales que se calculan y nunca se leen (los de respaldo de
+visitExpression, las copias de parámetros). La pasada repite hasta que no
+cambia nada:
+
+1. Quita los bloques que no se alcanzan desde la entrada de su región. Se
+   conservan BeginFunc/EndFunc (delimitan la función) y las etiquetas a las
+   que todavía salta alguien.
+2. Quita los saltos a la etiqueta que sigue inmediatamente (`L = jmp` o
+   `L = blt a, b` seguidos de `L:`).
+3. Quita las etiquetas sin saltos que las usen, salvo la que abre una
+   función.
+4. Con variables vivas (dataflow.Liveness), quita las instrucciones sin
+   efectos secundarios cuyo resultado no está vivo después. Las variables
+   con nombre siguen vivas al salir de la función y en cada llamada, así
+   que sólo desaparece una asignación a ellas si se vuelve a asignar antes
+   de cualquier lectura.
+
+Cada ronda cuesta dos CFG y un análisis de variables vivas por región
+(todo lineal); el listado del visitor suele quedar fijo en la segunda
+ronda.
+"""
+from typing import List, Optional, Set
+
+from ..ir.analysis import FlowAnalysis
+from ..ir.cfg import ControlFlowGraph
+from ..ir.defuse import JUMP_OPS, defined_name, has_side_effects
+from ..ir.triplet import OpCode, Triplet
+from .base import PassResult
+
+
+def _jump_targets(triplets: List[Triplet]) -> Set[str]:
+    """Etiquetas que usa algún salto (o alguna PHI)"""
+    targets: Set[str] = set()
+    for triplet in triplets:
+        op = triplet.op
+        if op in JUMP_OPS:
+            if triplet.result is not None:
+                targets.add(str(triplet.result.value))
+        elif op is OpCode.PHI:
+            targets.update(str(label.value) for label, _ in triplet.incoming)
+    return targets
+
+
+def _starts_function(triplets: List[Triplet], i: int) -> bool:
+    return i + 1 < len(triplets) and triplets[i + 1].op is OpCode.ENTER
+
+
+def _remove_unreachable(cfg: ControlFlowGraph) -> (List[Triplet], int):
+    reachable = [False] * len(cfg.blocks)
+    for function in cfg.functions:
+        for b in function.reverse_postorder:
+            reachable[b] = True
+    code = cfg.triplets
+    live_code = [t for block in cfg.blocks if reachable[block.index] for t in block]
+    targets = _jump_targets(live_code)
+
+    output: List[Triplet] = []
+    removed = 0
+    for block in cfg.blocks:
+        if reachable[block.index]:
+            output.extend(block)
+            continue
+        for i in range(block.start, block.end):
+            triplet = code[i]
+            op = triplet.op
+            if op is OpCode.ENTER or op is OpCode.EXIT \
+                    or (op is OpCode.LABEL and (str(triplet.arg1.value) in targets
+                                                or _starts_function(code, i))):
+                output.append(triplet)
+            else:
+                removed += 1
+    return output, removed
+
+
+def _remove_jumps_to_next(code: List[Triplet]) -> (List[Triplet], int):
+    """Saltos cuyo destino es una de las etiquetas que los siguen"""
+    output: List[Triplet] = []
+    removed = 0
+    n = len(code)
+    for i, triplet in enumerate(code):
+        if triplet.op in JUMP_OPS and triplet.result is not None:
+            target = str(triplet.result.value)
+            j = i + 1
+            while j < n and code[j].op is OpCode.LABEL and not _starts_function(code, j):
+                if str(code[j].arg1.value) == target:
+                    break
+                j += 1
+            if j < n and code[j].op is OpCode.LABEL and str(code[j].arg1.value) == target:
+                removed += 1
+                continue
+        output.append(triplet)
+    return output, removed
+
+
+def _remove_unused_labels(code: List[Triplet]) -> (List[Triplet], int):
+    targets = _jump_targets(code)
+    output: List[Triplet] = []
+    removed = 0
+    for i, triplet in enumerate(code):
+        if triplet.op is OpCode.LABEL and str(triplet.arg1.value) not in targets \
+                and not _starts_function(code, i):
+            removed += 1
+            continue
+        output.append(triplet)
+    return output, removed
+
+
+def _remove_dead(analysis: FlowAnalysis) -> (List[Triplet], int):
+    """Instrucciones sin efectos cuyo resultado no está vivo después"""
+    cfg = analysis.cfg
+    code = cfg.triplets
+    dead = bytearray(len(code))
+    removed = 0
+    for function in cfg.functions:
+        if function.entry is None:
+            continue
+        problem, result = analysis.liveness(function)
+        sets = problem.sets
+        index = problem.universe.index
+        for b in function.reverse_postorder:
+            block = cfg.blocks[b]
+            live = result.block_out[b]
+            for i in range(block.end - 1, block.start - 1, -1):
+                triplet = code[i]
+                name = defined_name(triplet)
+                if name is not None and not has_side_effects(triplet) \
+                        and not sets.contains(live, index[name]):
+                    dead[i] = 1
+                    removed += 1
+                    continue
+                live = problem.live_before(i, live)
+    if not removed:
+        return code, 0
+    return [t for i, t in enumerate(code) if not dead[i]], removed
+
+
+def eliminate_dead_code(triplets, analysis: Optional[FlowAnalysis] = None) -> PassResult:
+    """
+    Elimina código muerto e inalcanzable hasta un punto fijo.
+
+    Args:
+        triplets: Lista de tripletos (no se modifica)
+        analysis: FlowAnalysis de ese listado, si ya existe
+
+    Returns:
+        PassResult con contadores "inalcanzables", "saltos", "etiquetas",
+        "muertos" (tripletos eliminados por cada regla)
+    """
+    if analysis is None:
+        analysis = FlowAnalysis(triplets)
+    before = len(analysis.triplets)
+    stats = {"inalcanzables": 0, "saltos": 0, "etiquetas": 0, "muertos": 0}
+
+    while True:
+        code, unreachable = _remove_unreachable(analysis.cfg)
+        code, jumps = _remove_jumps_to_next(code)
+        code, labels = _remove_unused_labels(code)
+        if unreachable or jumps or labels:
+            analysis = FlowAnalysis(code)
+        code, dead = _remove_dead(analysis)
+        stats["inalcanzables"] += unreachable
+        stats["saltos"] += jumps
+        stats["etiquetas"] += labels
+        stats["muertos"] += dead
+        if not (unreachable or jumps or labels or dead):
+            break
+        analysis = FlowAnalysis(code)
+
+    return PassResult("dead_code", list(code), before, stats)
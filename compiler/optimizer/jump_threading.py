@@ -0,0 +1,248 @@
+"""
+Enhebrado de saltos y simplificación de cadenas de bloques.
+
+El código de control del visitor salta a etiquetas que vuelven a saltar:
+un `continue` salta a `LOOP_CONT_`, que sólo tiene `jmp LOOP_START_`; un
+if sin else o una expresión relacional emiten el salto condicional al
+bloque verdadero seguido de un `jmp` al falso, con la etiqueta verdadera
+justo después. La pasada repite hasta que no cambia nada:
+
+1. Enhebrado: un salto a una etiqueta cuyo bloque (y los bloques vacíos
+   que la siguen) sólo tiene `X = jmp` pasa a saltar directamente a X.
+2. Inversión: `L1 = blt a, b` + `L2 = jmp` + `L1:` queda como
+   `L2 = bge a, b` cayendo en L1. Si los dos saltos van a la misma
+   etiqueta, el condicional sobra.
+3. Se quitan los bloques que quedaron inalcanzables, los saltos a la
+   etiqueta siguiente y las etiquetas sin usar (las mismas reglas que
+   eliminate_dead_code).
+4. Fusión de cadenas: un bloque B al que sólo se llega con el `jmp` de
+   otro bloque A, y que termina con un salto incondicional o un return, se
+   mueve en lugar de ese salto. Así una cadena A -> B -> C de bloques
+   unidos por `jmp` queda en línea con un solo salto al final.
+
+Cambiar los predecesores de un bloque invalidaría las PHI que los
+nombran, así que un listado en forma SSA se deja como está: la pasada es
+para el listado que recibe MIPSTranslator (después de from_ssa).
+"""
+from typing import Dict, List, Optional, Set
+
+from ..ir.analysis import FlowAnalysis
+from ..ir.cfg import ControlFlowGraph
+from ..ir.triplet import OpCode, Triplet, label_operand
+from .base import PassResult, copy_triplet
+from .dead_code import (
+    _remove_jumps_to_next, _remove_unreachable, _remove_unused_labels, _starts_function
+)
+
+
+_CONDITIONAL_JUMPS = (OpCode.BEQ, OpCode.BNE, OpCode.BLT, OpCode.BLE,
+                      OpCode.BGT, OpCode.BGE, OpCode.BZ, OpCode.BNZ)
+_JUMPS = (OpCode.JMP,) + _CONDITIONAL_JUMPS
+_INVERTED = {
+    OpCode.BEQ: OpCode.BNE, OpCode.BNE: OpCode.BEQ,
+    OpCode.BLT: OpCode.BGE, OpCode.BGE: OpCode.BLT,
+    OpCode.BLE: OpCode.BGT, OpCode.BGT: OpCode.BLE,
+    OpCode.BZ: OpCode.BNZ, OpCode.BNZ: OpCode.BZ,
+}
+# Terminan el bloque sin caer en el siguiente
+_NO_FALLTHROUGH = (OpCode.JMP, OpCode.RETURN)
+
+
+def _target(triplet: Triplet) -> Optional[str]:
+    if triplet.op in _JUMPS and triplet.result is not None:
+        return str(triplet.result.value)
+    return None
+
+
+def _label_run(code: List[Triplet], i: int) -> int:
+    """Primer índice desde i que no es una etiqueta (sin entrar a otra función)"""
+    n = len(code)
+    while i < n and code[i].op is OpCode.LABEL and not _starts_function(code, i):
+        i += 1
+    return i
+
+
+class _Threader:
+    """Destino final de cada etiqueta siguiendo bloques que sólo saltan"""
+
+    def __init__(self, code: List[Triplet]):
+        self.code = code
+        self.position: Dict[str, int] = {}
+        for i, triplet in enumerate(code):
+            if triplet.op is OpCode.LABEL:
+                self.position[str(triplet.arg1.value)] = i
+        self._resolved: Dict[str, str] = {}
+
+    def _next(self, label: str) -> Optional[str]:
+        """Destino del `jmp` que sigue a la etiqueta, si sólo hay etiquetas antes"""
+        i = self.position.get(label)
+        if i is None or _starts_function(self.code, i):
+            return None
+        j = _label_run(self.code, i + 1)
+        if j < len(self.code) and self.code[j].op is OpCode.JMP:
+            target = _target(self.code[j])
+            if target is not None and target in self.position:
+                return target
+        return None
+
+    def resolve(self, label: str) -> str:
+        resolved = self._resolved.get(label)
+        if resolved is not None:
+            return resolved
+        chain = [label]
+        seen = {label}
+        while True:
+            target = self._next(chain[-1])
+            if target is None or target in seen:
+                break
+            if target in self._resolved:
+                chain.append(self._resolved[target])
+                break
+            chain.append(target)
+            seen.add(target)
+        final = chain[-1]
+        for name in chain:
+            self._resolved[name] = final
+        return final
+
+
+def _thread(code: List[Triplet]) -> (List[Triplet], int):
+    threader = _Threader(code)
+    output: List[Triplet] = []
+    threaded = 0
+    for triplet in code:
+        target = _target(triplet)
+        if target is not None and target in threader.position:
+            final = threader.resolve(target)
+            if final != target:
+                triplet = copy_triplet(triplet)
+                triplet.result = label_operand(final)
+                threaded += 1
+        output.append(triplet)
+    return output, threaded
+
+
+def _labels_at(code: List[Triplet], i: int) -> Set[str]:
+    return {str(code[k].arg1.value) for k in range(i, _label_run(code, i))}
+
+
+def _invert(code: List[Triplet]) -> (List[Triplet], int):
+    """Condicional + jmp sobre la etiqueta del condicional"""
+    output: List[Triplet] = []
+    inverted = 0
+    n = len(code)
+    i = 0
+    while i < n:
+        triplet = code[i]
+        if triplet.op in _CONDITIONAL_JUMPS and i + 1 < n and code[i + 1].op is OpCode.JMP:
+            target, other = _target(triplet), _target(code[i + 1])
+            if target is not None and other is not None:
+                if target == other:
+                    # Los dos caminos van al mismo lugar
+                    output.append(code[i + 1])
+                    inverted += 1
+                    i += 2
+                    continue
+                if target in _labels_at(code, i + 2):
+                    branch = copy_triplet(triplet)
+                    branch.op = _INVERTED[triplet.op]
+                    branch.result = code[i + 1].result
+                    output.append(branch)
+                    inverted += 1
+                    i += 2
+                    continue
+        output.append(triplet)
+        i += 1
+    return output, inverted
+
+
+def _merge_chains(cfg: ControlFlowGraph) -> (List[Triplet], int):
+    code = cfg.triplets
+    blocks = cfg.blocks
+    following: Dict[int, Optional[int]] = {}
+    merged: Dict[int, int] = {}
+    for function in cfg.functions:
+        region = function.blocks
+        for k, b in enumerate(region):
+            following[b] = region[k + 1] if k + 1 < len(region) else None
+        for b in function.reverse_postorder:
+            block = blocks[b]
+            if block.last.op is not OpCode.JMP or len(block.succs) != 1:
+                continue
+            successor = block.succs[0]
+            moved = blocks[successor]
+            if successor == b or successor == function.entry or moved.preds != [b] \
+                    or following[b] == successor:
+                continue
+            # Si cayera en su siguiente habría que agregarle un salto: no se gana nada
+            if moved.last.op not in _NO_FALLTHROUGH:
+                continue
+            if any(t.op is OpCode.ENTER or t.op is OpCode.EXIT for t in moved):
+                continue
+            merged[b] = successor
+    if not merged:
+        return code, 0
+
+    moved_blocks = set(merged.values())
+    output: List[Triplet] = []
+    for block in blocks:
+        b = block.index
+        if b in moved_blocks:
+            continue
+        seen = {b}
+        while True:
+            current = blocks[b]
+            if b in merged:
+                output.extend(code[current.start:current.end - 1])
+                b = merged[b]
+                if b in seen:
+                    break
+                seen.add(b)
+                continue
+            output.extend(current)
+            break
+    return output, len(merged)
+
+
+def thread_jumps(triplets, analysis: Optional[FlowAnalysis] = None) -> PassResult:
+    """
+    Enhebra saltos, invierte condicionales y fusiona cadenas de bloques
+    hasta un punto fijo.
+
+    Args:
+        triplets: Lista de tripletos (no se modifica)
+        analysis: FlowAnalysis de ese listado, si ya existe
+
+    Returns:
+        PassResult con contadores "enhebrados" (saltos redirigidos),
+        "invertidos" (condicionales invertidos o quitados), "fusionados"
+        (bloques movidos), "inalcanzables", "saltos" y "etiquetas"
+        (tripletos quitados)
+    """
+    if analysis is None:
+        analysis = FlowAnalysis(triplets)
+    before = len(analysis.triplets)
+    cfg = analysis.cfg
+    stats = {"enhebrados": 0, "invertidos": 0, "fusionados": 0,
+             "inalcanzables": 0, "saltos": 0, "etiquetas": 0}
+    if any(t.op is OpCode.PHI for t in cfg.triplets):
+        return PassResult("jump_threading", list(cfg.triplets), before, stats)
+
+    while True:
+        code, threaded = _thread(cfg.triplets)
+        code, inverted = _invert(code)
+        if threaded or inverted:
+            cfg = ControlFlowGraph(code)
+        code, unreachable = _remove_unreachable(cfg)
+        code, jumps = _remove_jumps_to_next(code)
+        code, labels = _remove_unused_labels(code)
+        cfg = ControlFlowGraph(code)
+        code, merged = _merge_chains(cfg)
+        counts = (threaded, inverted, merged, unreachable, jumps, labels)
+        for name, count in zip(stats, counts):
+            stats[name] += count
+        if not any(counts):
+            break
+        cfg = ControlFlowGraph(code)
+
+    return PassResult("jump_threading", list(code), before, stats)
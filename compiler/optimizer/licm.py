@@ -0,0 +1,229 @@
+"""
+Movimiento de código invariante fuera de los bucles (LICM).
+
+visitWhileStatement y visitForStatement vuelven a evaluar en cada vuelta
+todo lo que está dentro del bucle: las constantes de la condición
+(`t14 = mov 10`), las direcciones base de los arreglos y las expresiones
+sobre variables que el bucle no cambia. La pasada saca esos tripletos a un
+pre-encabezado: un bloque nuevo (`PRE_<cabecera>:`) justo antes de la
+cabecera del bucle, al que pasan a saltar las aristas que entran al bucle
+desde afuera. Las aristas de retorno siguen yendo a la cabecera.
+
+Un tripleto `x = op a, b` del bucle L es invariante si cada operando es
+constante o todas sus definiciones que lo alcanzan (ReachingDefinitions;
+una llamada cuenta como definición de las variables con nombre) están
+fuera de L, o es una sola y ya se sacó. Se saca si además:
+
+- x es un temporal de una sola definición y la operación no puede fallar
+  (aritmética sin división entre algo que no sea una constante distinta de
+  cero, lógica, comparaciones, copias): se puede calcular antes aunque el
+  bucle no llegue a ejecutarlo.
+- Si no (variables con nombre, temporales con varias definiciones,
+  divisiones, lecturas de memoria): el bloque domina todas las salidas
+  del bucle, es la única definición de x en L (sin llamadas en L si x
+  está en memoria) y x no está viva al entrar a la cabecera.
+- Las lecturas de memoria (array_get, load, get_field) sólo salen de
+  bucles sin escrituras ni llamadas.
+
+Los bucles se recorren de afuera hacia adentro, así que cada tripleto sale
+del bucle más externo del que es invariante. La cabecera necesita una
+etiqueta, y el bloque que cae en ella debe estar fuera del bucle; si no,
+el bucle se deja como está (ver LoopEditor).
+"""
+from typing import Dict, List, Optional, Set
+
+from ..ir.analysis import FlowAnalysis
+from ..ir.cfg import FunctionCFG
+from ..ir.dataflow import ReachingDefinitions
+from ..ir.defuse import (
+    PURE_OPS, STORE_OPS, defined_name, is_memory_name, is_temp_name, is_variable
+)
+from ..ir.dominators import Loop
+from ..ir.triplet import OpCode, Triplet
+from .base import PassResult, integer_constant
+from .loop_editor import LoopEditor
+
+
+# Lecturas de memoria
+_LOAD_OPS = (OpCode.ARRAY_GET, OpCode.LOAD, OpCode.GET_FIELD)
+_DIVISIONS = (OpCode.DIV, OpCode.MOD)
+# Instrucciones candidatas
+_HOISTABLE_OPS = PURE_OPS + (OpCode.MOV, OpCode.CAST) + _LOAD_OPS
+
+
+def _definition_counts(triplets: List[Triplet]) -> Dict[str, int]:
+    counts: Dict[str, int] = {}
+    for triplet in triplets:
+        name = defined_name(triplet)
+        if name is not None:
+            counts[name] = counts.get(name, 0) + 1
+    return counts
+
+
+def _cannot_fail(triplet: Triplet) -> bool:
+    """La operación se puede ejecutar aunque el programa no llegara a ella"""
+    op = triplet.op
+    if op in _LOAD_OPS:
+        return False
+    if op in _DIVISIONS:
+        divisor = integer_constant(triplet.arg2)
+        return divisor is not None and divisor.__class__ is int and divisor != 0
+    return True
+
+
+class _RegionLoops:
+    """Invariantes de los bucles de una región"""
+
+    def __init__(self, analysis: FlowAnalysis, function: FunctionCFG,
+                 definitions: Dict[str, int]):
+        self.analysis = analysis
+        self.cfg = analysis.cfg
+        self.function = function
+        self.tree = analysis.dominators(function)
+        self.definitions = definitions
+        self.reaching = ReachingDefinitions(self.cfg, function)
+        self.reaching_result = self.reaching.solve()
+        # Tripleto -> definiciones que alcanzan cada operando que lee
+        self._operand_defs: Dict[int, List[List[int]]] = {}
+        self._scanned: Set[int] = set()
+        self._position = {b: k for k, b in enumerate(function.reverse_postorder)}
+        # Tripletos sacados -> cabecera del bucle al que salieron
+        self.moved: Dict[int, int] = {}
+
+    def _live_in(self, block: int, name: str) -> bool:
+        problem, result = self.analysis.liveness(self.function)
+        index = problem.universe.index.get(name)
+        return index is not None and problem.sets.contains(result.block_in[block], index)
+
+    def _scan_block(self, b: int):
+        """Definiciones que alcanzan los operandos de cada tripleto del bloque"""
+        self._scanned.add(b)
+        code = self.cfg.triplets
+        block = self.cfg.blocks[b]
+        local: Dict[str, int] = {}
+        last_call: Optional[int] = None
+        for i in range(block.start, block.end):
+            triplet = code[i]
+            if triplet.op in _HOISTABLE_OPS:
+                operands = []
+                for operand in (triplet.arg1, triplet.arg2):
+                    if not is_variable(operand):
+                        continue
+                    name = operand.value
+                    if name in local:
+                        operands.append([local[name]])
+                    elif last_call is not None and is_memory_name(name):
+                        operands.append([last_call])
+                    else:
+                        operands.append(self.reaching.reaching(self.reaching_result, b, name))
+                self._operand_defs[i] = operands
+            if triplet.op is OpCode.CALL:
+                last_call = i
+                for name in [name for name in local if is_memory_name(name)]:
+                    del local[name]
+            name = defined_name(triplet)
+            if name is not None:
+                local[name] = i
+
+    def hoist(self, loop: Loop) -> List[int]:
+        """Marca los tripletos de `loop` que salen a su pre-encabezado (en orden)"""
+        cfg = self.cfg
+        code = cfg.triplets
+        blocks = cfg.blocks
+        position = self._position
+        body = sorted(loop.blocks, key=position.__getitem__)
+        for b in body:
+            if b not in self._scanned:
+                self._scan_block(b)
+
+        exiting = [b for b in body if any(s not in loop.blocks for s in blocks[b].succs)]
+        loop_defs: Dict[str, int] = {}
+        has_call = writes_memory = False
+        for b in body:
+            for i in range(blocks[b].start, blocks[b].end):
+                triplet = code[i]
+                if triplet.op is OpCode.CALL:
+                    has_call = writes_memory = True
+                elif triplet.op in STORE_OPS:
+                    writes_memory = True
+                name = defined_name(triplet)
+                if name is not None and i not in self.moved:
+                    loop_defs[name] = loop_defs.get(name, 0) + 1
+
+        def outside(i: int) -> bool:
+            return cfg.block_of(i).index not in loop.blocks or \
+                (i in self.moved and self.moved[i] != loop.header)
+
+        hoisted: List[int] = []
+        changed = True
+        while changed:
+            changed = False
+            for b in body:
+                dominates_exits = all(self.tree.dominates(b, e) for e in exiting)
+                for i in range(blocks[b].start, blocks[b].end):
+                    if i in self.moved:
+                        continue
+                    triplet = code[i]
+                    if triplet.op not in _HOISTABLE_OPS or not is_variable(triplet.result):
+                        continue
+                    if not all(all(outside(d) for d in defs)
+                               or (len(defs) == 1 and self.moved.get(defs[0]) == loop.header)
+                               for defs in self._operand_defs[i]):
+                        continue
+                    name = triplet.result.value
+                    if not (is_temp_name(name) and self.definitions.get(name) == 1
+                            and _cannot_fail(triplet)):
+                        if not dominates_exits or loop_defs.get(name) != 1 \
+                                or self._live_in(loop.header, name):
+                            continue
+                        if has_call and is_memory_name(name):
+                            continue
+                    if triplet.op in _LOAD_OPS and (writes_memory or not dominates_exits):
+                        continue
+                    self.moved[i] = loop.header
+                    hoisted.append(i)
+                    changed = True
+        # Cada definición antes de sus lecturas: orden de los bloques y del listado
+        return sorted(hoisted, key=lambda i: (position[cfg.block_of(i).index], i))
+
+
+def hoist_loop_invariants(triplets, analysis: Optional[FlowAnalysis] = None) -> PassResult:
+    """
+    Saca de los bucles los tripletos invariantes.
+
+    Args:
+        triplets: Lista de tripletos (no se modifica)
+        analysis: FlowAnalysis de ese listado, si ya existe
+
+    Returns:
+        PassResult con contadores "invariantes" (tripletos sacados) y
+        "preencabezados" (bloques creados)
+    """
+    if analysis is None:
+        analysis = FlowAnalysis(triplets)
+    cfg = analysis.cfg
+    code = cfg.triplets
+    definitions = _definition_counts(code)
+    editor = LoopEditor(cfg)
+    stats = {"invariantes": 0, "preencabezados": 0}
+
+    for function in cfg.functions:
+        if function.entry is None:
+            continue
+        forest = analysis.loops(function)
+        if not forest.loops:
+            continue
+        region = _RegionLoops(analysis, function, definitions)
+        for loop in sorted(forest.loops, key=lambda loop: loop.depth):
+            if not editor.can_create_preheader(function, loop):
+                continue
+            hoisted = region.hoist(loop)
+            if not hoisted:
+                continue
+            editor.add_to_preheader(loop, [code[i] for i in hoisted])
+            for i in hoisted:
+                editor.remove(i)
+            stats["invariantes"] += len(hoisted)
+            stats["preencabezados"] += 1
+
+    return PassResult("licm", editor.apply(), len(code), stats)
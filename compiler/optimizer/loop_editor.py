@@ -0,0 +1,167 @@
+"""
+Cambios a un listado alrededor de sus bucles.
+
+Las pasadas sobre bucles deciden todo con el CFG del listado original y
+después arman el listado nuevo de una vez. LoopEditor junta esos cambios
+por índice del listado original: pre-encabezados nuevos (con las entradas
+desde afuera del bucle redirigidas a ellos), tripletos insertados después
+de otro, reemplazados o quitados, etiquetas nuevas al inicio de un bloque
+y temporales nuevos que no chocan con los del listado.
+
+Un pre-encabezado es un bloque `PRE_<cabecera>:` justo antes de la
+cabecera: el bloque que caía en la cabecera cae ahora en él, y los saltos
+desde afuera del bucle pasan a saltar a su etiqueta. Sólo se puede crear
+si la cabecera tiene etiqueta y ningún bloque del bucle cae en ella.
+"""
+import re
+from typing import Dict, List, Optional
+
+from ..ir.cfg import ControlFlowGraph, FunctionCFG
+from ..ir.defuse import JUMP_OPS
+from ..ir.dominators import Loop
+from ..ir.triplet import OpCode, Triplet, label_operand, temp_operand
+from .base import copy_triplet
+
+_TEMP_NUMBER = re.compile(r"t(\d+)")
+
+
+class LoopEditor:
+    """
+    Cambios pendientes sobre el listado de un CFG.
+
+    Atributos:
+        cfg: CFG del listado original (no se modifica)
+        preheaders: Bloque cabecera -> etiqueta de su pre-encabezado
+    """
+
+    def __init__(self, cfg: ControlFlowGraph):
+        self.cfg = cfg
+        self.preheaders: Dict[int, str] = {}
+        self._labels = set(cfg.label_block)
+        self._block_labels: Dict[int, str] = {}
+        self._before: Dict[int, List[Triplet]] = {}
+        self._after: Dict[int, List[Triplet]] = {}
+        self._replaced: Dict[int, Optional[Triplet]] = {}
+        self._next_temp: Optional[int] = None
+
+    @property
+    def changed(self) -> bool:
+        return bool(self._before or self._after or self._replaced)
+
+    # ========== PRE-ENCABEZADOS ==========
+
+    def can_create_preheader(self, function: FunctionCFG, loop: Loop) -> bool:
+        """La cabecera tiene etiqueta (sin PHI) y ningún bloque del bucle cae en ella"""
+        cfg = self.cfg
+        header = cfg.blocks[loop.header]
+        if loop.header in self.preheaders:
+            return True
+        if header.label is None:
+            return False
+        if header.end > header.start + 1 and cfg.triplets[header.start + 1].op is OpCode.PHI:
+            return False
+        region = function.blocks
+        k = region.index(loop.header)
+        if k > 0:
+            previous = cfg.blocks[region[k - 1]]
+            if previous.index in loop.blocks and loop.header in previous.succs \
+                    and previous.last.op is not OpCode.JMP:
+                return False
+        return True
+
+    def preheader(self, loop: Loop) -> str:
+        """Etiqueta del pre-encabezado del bucle (lo crea la primera vez)"""
+        label = self.preheaders.get(loop.header)
+        if label is not None:
+            return label
+        cfg = self.cfg
+        header = cfg.blocks[loop.header]
+        label = self._unique_label(f"PRE_{header.label}")
+        self.preheaders[loop.header] = label
+        self._before.setdefault(header.start, []).append(Triplet(OpCode.LABEL, label_operand(label)))
+
+        # Las entradas desde afuera pasan por el pre-encabezado
+        for p in header.preds:
+            if p in loop.blocks:
+                continue
+            last_index = cfg.blocks[p].end - 1
+            last = self.current(last_index)
+            if last is not None and last.op in JUMP_OPS and last.result is not None \
+                    and str(last.result.value) == header.label:
+                jump = copy_triplet(last)
+                jump.result = label_operand(label)
+                self._replaced[last_index] = jump
+        return label
+
+    def add_to_preheader(self, loop: Loop, triplets: List[Triplet]):
+        """Agrega tripletos al final del pre-encabezado (lo crea si hace falta)"""
+        self.preheader(loop)
+        self._before[self.cfg.blocks[loop.header].start].extend(triplets)
+
+    # ========== ETIQUETAS ==========
+
+    def _unique_label(self, base: str) -> str:
+        label = base
+        n = 1
+        while label in self._labels:
+            label = f"{base}_{n}"
+            n += 1
+        self._labels.add(label)
+        return label
+
+    def block_label(self, b: int, base: str) -> str:
+        """Etiqueta del bloque b; si no tiene, le agrega una nueva (`base`, `base_1`, ...)"""
+        block = self.cfg.blocks[b]
+        if block.label is not None:
+            return block.label
+        label = self._block_labels.get(b)
+        if label is None:
+            label = self._block_labels[b] = self._unique_label(base)
+            self._before.setdefault(block.start, []).append(Triplet(OpCode.LABEL, label_operand(label)))
+        return label
+
+    # ========== TRIPLETOS ==========
+
+    def current(self, i: int) -> Optional[Triplet]:
+        """Tripleto i con los cambios hechos (None si se quitó)"""
+        return self._replaced[i] if i in self._replaced else self.cfg.triplets[i]
+
+    def replace(self, i: int, triplet: Optional[Triplet]):
+        """Cambia el tripleto i (None lo quita)"""
+        self._replaced[i] = triplet
+
+    def remove(self, i: int):
+        self._replaced[i] = None
+
+    def insert_after(self, i: int, triplets: List[Triplet]):
+        self._after.setdefault(i, []).extend(triplets)
+
+    def new_temp(self):
+        """Operando de un temporal que no aparece en el listado"""
+        if self._next_temp is None:
+            highest = -1
+            for triplet in self.cfg.triplets:
+                for operand in (triplet.arg1, triplet.arg2, triplet.result):
+                    if operand is not None and operand.value.__class__ is str:
+                        match = _TEMP_NUMBER.fullmatch(operand.value)
+                        if match is not None:
+                            highest = max(highest, int(match.group(1)))
+            self._next_temp = highest + 1
+        name = f"t{self._next_temp}"
+        self._next_temp += 1
+        return temp_operand(name)
+
+    def apply(self) -> List[Triplet]:
+        """Listado nuevo con todos los cambios"""
+        output: List[Triplet] = []
+        before, after, replaced = self._before, self._after, self._replaced
+        for i, triplet in enumerate(self.cfg.triplets):
+            if i in before:
+                output.extend(before[i])
+            if i in replaced:
+                triplet = replaced[i]
+            if triplet is not None:
+                output.append(triplet)
+            if i in after:
+                output.extend(after[i])
+        return output
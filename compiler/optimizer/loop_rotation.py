@@ -0,0 +1,201 @@
+"""
+Rotación de bucles: de probar arriba a probar abajo.
+
+visitWhileStatement y visitForStatement prueban la condición en la
+cabecera y vuelven a ella con un `jmp` desde el final del cuerpo:
+
+    LOOP_START_0:  cond; L1 = blt i, n; LOOP_END_2 = jmp
+    L1:            cuerpo (e incremento)
+                   LOOP_START_0 = jmp
+    LOOP_END_2:
+
+así que cada vuelta ejecuta el `jmp` de regreso y el salto condicional.
+La pasada deja la cabecera como guarda (se evalúa una vez al entrar) y
+reemplaza cada `jmp` de regreso por una copia de la cabecera cuyo salto
+vuelve al cuerpo:
+
+    LOOP_START_0:  cond; L1 = blt i, n; LOOP_END_2 = jmp
+    L1:            cuerpo
+                   cond'; L1 = blt i, n'
+    LOOP_END_2:
+
+Cada vuelta ejecuta un solo salto condicional. Si la cabecera ya cae en
+el cuerpo (`LOOP_END_2 = bge i, n`, después de thread_jumps), la copia
+lleva el salto invertido hacia el cuerpo. Detrás de la copia va un `jmp`
+a la salida, salvo que la salida sea el bloque siguiente.
+
+Se rota un bucle si su cabecera tiene etiqueta, termina con un salto
+condicional con un destino dentro del bucle y otro fuera, tiene a lo más
+_MAX_HEADER tripletos sin llamadas ni otros saltos, y todas las aristas
+de retorno son `jmp` a la cabecera. Los temporales que la cabecera
+calcula y sólo usa ella reciben nombres nuevos en cada copia, así que
+siguen teniendo una sola definición.
+"""
+from typing import Dict, List, Optional
+
+from ..ir.analysis import FlowAnalysis
+from ..ir.defuse import defined_name, is_temp_name, is_variable, used_names
+from ..ir.dominators import Loop
+from ..ir.triplet import OpCode, Triplet, label_operand
+from .base import PassResult, copy_triplet
+from .loop_editor import LoopEditor
+
+
+_CONDITIONAL_JUMPS = (OpCode.BEQ, OpCode.BNE, OpCode.BLT, OpCode.BLE,
+                      OpCode.BGT, OpCode.BGE, OpCode.BZ, OpCode.BNZ)
+_INVERTED = {
+    OpCode.BEQ: OpCode.BNE, OpCode.BNE: OpCode.BEQ,
+    OpCode.BLT: OpCode.BGE, OpCode.BGE: OpCode.BLT,
+    OpCode.BLE: OpCode.BGT, OpCode.BGT: OpCode.BLE,
+    OpCode.BZ: OpCode.BNZ, OpCode.BNZ: OpCode.BZ,
+}
+# No se copian
+_FIXED_OPS = (OpCode.LABEL, OpCode.PHI, OpCode.ENTER, OpCode.EXIT, OpCode.RETURN,
+              OpCode.CALL, OpCode.PARAM, OpCode.JMP) + _CONDITIONAL_JUMPS
+
+# Tripletos de la cabecera (sin la etiqueta) que se copian en cada retorno
+_MAX_HEADER = 8
+
+
+def _use_counts(code: List[Triplet]) -> Dict[str, int]:
+    counts: Dict[str, int] = {}
+    for triplet in code:
+        for name in used_names(triplet):
+            counts[name] = counts.get(name, 0) + 1
+    return counts
+
+
+class _Rotation:
+    """Lo que hace falta para rotar un bucle"""
+
+    def __init__(self, header_code: List[Triplet], branch: Triplet, stay: str,
+                 invert: bool, exit_label: str, exit_block: int, local_temps: List[str]):
+        self.header_code = header_code
+        self.branch = branch
+        self.stay = stay
+        self.invert = invert
+        self.exit_label = exit_label
+        self.exit_block = exit_block
+        self.local_temps = local_temps
+
+
+def _plan(cfg, editor: LoopEditor, loop: Loop, following: Dict[int, Optional[int]],
+          uses: Dict[str, int]) -> Optional[_Rotation]:
+    blocks = cfg.blocks
+    code = cfg.triplets
+    header = blocks[loop.header]
+    branch = header.last
+    if header.label is None or branch.op not in _CONDITIONAL_JUMPS or branch.result is None:
+        return None
+    header_code = code[header.start + 1:header.end - 1]
+    if len(header_code) + 1 > _MAX_HEADER or any(t.op in _FIXED_OPS for t in header_code):
+        return None
+
+    target = cfg.label_block.get(str(branch.result.value))
+    fallthrough = following[loop.header]
+    if target is None or fallthrough is None or target == fallthrough:
+        return None
+    if (target in loop.blocks) == (fallthrough in loop.blocks):
+        return None
+    for latch in loop.latches:
+        last = blocks[latch].last
+        if latch == loop.header or last.op is not OpCode.JMP or last.result is None \
+                or str(last.result.value) != header.label:
+            return None
+
+    if target in loop.blocks:
+        stay, invert, exit_block = str(branch.result.value), False, fallthrough
+    else:
+        if fallthrough == loop.header:
+            return None
+        stay = editor.block_label(fallthrough, f"ROT_{header.label}")
+        invert, exit_block = True, target
+    # Un bloque de salida que sólo salta: se sale directamente a su destino
+    leaving = blocks[exit_block]
+    if leaving.label is None and len(leaving) == 1 and leaving.last.op is OpCode.JMP \
+            and leaving.last.result is not None \
+            and str(leaving.last.result.value) in cfg.label_block:
+        exit_label = str(leaving.last.result.value)
+        exit_block = cfg.label_block[exit_label]
+    else:
+        exit_label = editor.block_label(exit_block, f"ROT_{header.label}_EXIT")
+
+    # Temporales que sólo vive la cabecera
+    header_uses: Dict[str, int] = {}
+    for triplet in header_code + [branch]:
+        for name in used_names(triplet):
+            header_uses[name] = header_uses.get(name, 0) + 1
+    local_temps = []
+    for triplet in header_code:
+        name = defined_name(triplet)
+        if name is not None and is_temp_name(name) and name not in local_temps \
+                and uses.get(name, 0) == header_uses.get(name, 0):
+            local_temps.append(name)
+    return _Rotation(header_code, branch, stay, invert, exit_label, exit_block, local_temps)
+
+
+def _bottom_test(rotation: _Rotation, editor: LoopEditor, falls_to_exit: bool) -> List[Triplet]:
+    """Copia de la cabecera que salta al cuerpo y si no, sale"""
+    renamed = {name: editor.new_temp() for name in rotation.local_temps}
+
+    def rename(triplet: Triplet) -> Triplet:
+        copy = copy_triplet(triplet)
+        for slot in ('arg1', 'arg2', 'result'):
+            operand = getattr(copy, slot)
+            if is_variable(operand) and operand.value in renamed:
+                setattr(copy, slot, renamed[operand.value])
+        return copy
+
+    test = [rename(t) for t in rotation.header_code]
+    branch = rename(rotation.branch)
+    if rotation.invert:
+        branch.op = _INVERTED[branch.op]
+    branch.result = label_operand(rotation.stay)
+    test.append(branch)
+    if not falls_to_exit:
+        test.append(Triplet(OpCode.JMP, None, None, label_operand(rotation.exit_label)))
+    return test
+
+
+def rotate_loops(triplets, analysis: Optional[FlowAnalysis] = None) -> PassResult:
+    """
+    Convierte los bucles que prueban la condición en la cabecera en bucles
+    con guarda que la prueban al final.
+
+    Args:
+        triplets: Lista de tripletos (no se modifica)
+        analysis: FlowAnalysis de ese listado, si ya existe
+
+    Returns:
+        PassResult con contadores "rotados" (bucles) y "copiados"
+        (tripletos que reemplazan a los `jmp` de regreso)
+    """
+    if analysis is None:
+        analysis = FlowAnalysis(triplets)
+    cfg = analysis.cfg
+    editor = LoopEditor(cfg)
+    uses = _use_counts(cfg.triplets)
+    stats = {"rotados": 0, "copiados": 0}
+
+    for function in cfg.functions:
+        if function.entry is None:
+            continue
+        forest = analysis.loops(function)
+        if not forest.loops:
+            continue
+        region = function.blocks
+        following = {b: region[k + 1] if k + 1 < len(region) else None
+                     for k, b in enumerate(region)}
+        for loop in forest.loops:
+            rotation = _plan(cfg, editor, loop, following, uses)
+            if rotation is None:
+                continue
+            for latch in loop.latches:
+                jump = cfg.blocks[latch].end - 1
+                test = _bottom_test(rotation, editor, following[latch] == rotation.exit_block)
+                editor.replace(jump, None)
+                editor.insert_after(jump, test)
+                stats["copiados"] += len(test)
+            stats["rotados"] += 1
+
+    return PassResult("loop_rotation", editor.apply(), len(cfg.triplets), stats)
@@ -0,0 +1,206 @@
+"""
+Administrador de pasadas entre el visitor y MIPSTranslator.
+
+Cada nivel de optimización es una secuencia de pasadas con nombre:
+
+    O0  ninguna
+    O1  pasadas escalares baratas: constantes, copias, código muerto, saltos
+    O2  además subexpresiones comunes y las pasadas sobre bucles
+        (invariantes, inducción y rotación)
+    Os  lo que no agranda el listado: O1 con subexpresiones comunes; no se
+        copian cabeceras ni se crean pre-encabezados
+
+PassManager reutiliza el FlowAnalysis (CFG, dominadores, bucles y
+variables vivas) entre pasadas mientras el listado no cambia: si una
+pasada no hace nada, la siguiente recibe el mismo análisis ya calculado;
+si cambia algo, se descarta y la siguiente lo construye sobre el listado
+nuevo. De cada pasada se registran el tiempo de pared, los tripletos de
+entrada y salida y sus contadores; el reporte se puede serializar como
+JSON. El pico de memoria asignada (tracemalloc) sólo se mide si se pide
+con track_memory: con tracemalloc activo las pasadas tardan varias veces
+más, así que los tiempos de ese reporte también salen inflados.
+"""
+import json
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+from ..ir.analysis import FlowAnalysis
+from ..ir.triplet import Triplet
+from .constant_folding import fold_constants
+from .copy_propagation import propagate_copies
+from .dead_code import eliminate_dead_code
+from .jump_threading import thread_jumps
+from .licm import hoist_loop_invariants
+from .loop_rotation import rotate_loops
+from .strength_reduction import reduce_induction_variables
+from .value_numbering import eliminate_common_subexpressions
+
+
+# Niveles de optimización (-O0, -O1, -O2, -Os)
+OPT_O0 = "O0"
+OPT_O1 = "O1"
+OPT_O2 = "O2"
+OPT_OS = "Os"
+OPT_LEVELS = (OPT_O0, OPT_O1, OPT_O2, OPT_OS)
+
+PASSES = {
+    "constantes": fold_constants,
+    "copias": propagate_copies,
+    "muerto": eliminate_dead_code,
+    "subexpr": eliminate_common_subexpressions,
+    "invariantes": hoist_loop_invariants,
+    "inducción": reduce_induction_variables,
+    "rotación": rotate_loops,
+    "saltos": thread_jumps,
+}
+
+PIPELINES = {
+    OPT_O0: (),
+    OPT_O1: ("constantes", "copias", "muerto", "saltos"),
+    # Las pasadas sobre bucles dejan copias y temporales sin leer: se
+    # limpian antes de rotar, y el enhebrado va al final
+    OPT_O2: ("constantes", "copias", "subexpr", "invariantes", "inducción", "copias", "muerto",
+             "rotación", "saltos"),
+    OPT_OS: ("constantes", "copias", "subexpr", "muerto", "saltos"),
+}
+
+
+@dataclass
+class PassRecord:
+    """Lo que costó y lo que hizo una pasada"""
+    name: str
+    time: float
+    triplets_in: int
+    triplets_out: int
+    peak_memory: int = 0
+    changed: bool = False
+    reused_analysis: bool = False
+    stats: Dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "time": self.time,
+            "triplets_in": self.triplets_in,
+            "triplets_out": self.triplets_out,
+            "peak_memory": self.peak_memory,
+            "changed": self.changed,
+            "reused_analysis": self.reused_analysis,
+            "stats": dict(self.stats)
+        }
+
+    def row(self, peak_memory: bool = True) -> str:
+        peak = f"{self.peak_memory / 1024:>10.1f} " if peak_memory else ""
+        return (f"{self.name:>12} {self.triplets_in:>9} {self.triplets_out:>9} "
+                f"{self.time:>10.4f} {peak} {'sí' if self.reused_analysis else 'no'}")
+
+    def __str__(self) -> str:
+        return self.row()
+
+
+@dataclass
+class OptimizationReport:
+    """Listado optimizado y registro de cada pasada, en orden"""
+    level: str
+    triplets: List[Triplet]
+    passes: List[PassRecord]
+    triplets_in: int
+    track_memory: bool = False
+
+    @property
+    def triplets_out(self) -> int:
+        return len(self.triplets)
+
+    @property
+    def total_time(self) -> float:
+        return sum(record.time for record in self.passes)
+
+    def to_dict(self) -> dict:
+        return {
+            "level": self.level,
+            "triplets_in": self.triplets_in,
+            "triplets_out": self.triplets_out,
+            "total_time": self.total_time,
+            "track_memory": self.track_memory,
+            "passes": [record.to_dict() for record in self.passes]
+        }
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        return json.dumps(self.to_dict(), indent=indent, ensure_ascii=False)
+
+    def table(self) -> str:
+        """Tabla de texto con una línea por pasada (sin el pico si no se midió)"""
+        peak = f"{'Pico (KB)':>10} " if self.track_memory else ""
+        lines = [f"{'Pasada':>12} {'Entrada':>9} {'Salida':>9} {'Tiempo (s)':>10} {peak} Caché"]
+        lines.extend(record.row(self.track_memory) for record in self.passes)
+        lines.append(f"-O{self.level[1:]}: {self.triplets_in} -> {self.triplets_out} tripletos "
+                     f"en {self.total_time:.4f}s")
+        return "\n".join(lines)
+
+
+class PassManager:
+    """
+    Ejecuta una secuencia de pasadas sobre un listado.
+
+    Args:
+        level: Uno de OPT_LEVELS; define la secuencia si no se da `passes`
+        passes: Nombres de PASSES en el orden en que se aplican
+        track_memory: Medir el pico de memoria de cada pasada con tracemalloc
+            (hace varias veces más lentas las pasadas, y sus tiempos, mientras
+            mide); sólo para reportes
+    """
+
+    def __init__(self, level: str = OPT_O2, passes: Optional[Sequence[str]] = None,
+                 track_memory: bool = False):
+        if level not in PIPELINES:
+            raise ValueError(f"Nivel de optimización desconocido: '{level}'")
+        if passes is None:
+            passes = PIPELINES[level]
+        for name in passes:
+            if name not in PASSES:
+                raise ValueError(f"Pasada desconocida: '{name}'")
+        self.level = level
+        self.passes = tuple(passes)
+        self.track_memory = track_memory
+
+    def run(self, triplets) -> OptimizationReport:
+        """Aplica las pasadas; la lista de entrada no se modifica"""
+        analysis = FlowAnalysis(triplets)
+        triplets = analysis.triplets
+        report = OptimizationReport(self.level, triplets, [], len(triplets), self.track_memory)
+        reused = False
+
+        started_tracing = self.track_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        try:
+            for name in self.passes:
+                if self.track_memory:
+                    tracemalloc.reset_peak()
+                    baseline = tracemalloc.get_traced_memory()[0]
+                start = time.perf_counter()
+                result = PASSES[name](triplets, analysis)
+                elapsed = time.perf_counter() - start
+                peak = tracemalloc.get_traced_memory()[1] - baseline if self.track_memory else 0
+
+                changed = result.changed
+                report.passes.append(PassRecord(name, elapsed, len(triplets), result.after, peak,
+                                                changed, reused, result.stats))
+                if changed:
+                    # El listado cambió: los análisis calculados ya no valen
+                    triplets = result.triplets
+                    analysis = FlowAnalysis(triplets)
+                reused = not changed
+        finally:
+            if started_tracing:
+                tracemalloc.stop()
+
+        report.triplets = triplets
+        return report
+
+
+def optimize(triplets, level: str = OPT_O2, track_memory: bool = False) -> OptimizationReport:
+    """Atajo: PassManager(level).run(triplets)"""
+    return PassManager(level, track_memory=track_memory).run(triplets)
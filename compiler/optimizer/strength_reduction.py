@@ -0,0 +1,475 @@
+"""
+Reducción de fuerza de las variables de inducción y reemplazo de la
+prueba del bucle (LFTR).
+
+ArrayCodeGen.gen_effective_address calcula cada acceso `a[i]` como
+`t1 = mul i, 4` y `t2 = add base, t1`, así que un bucle que recorre un
+arreglo multiplica en cada vuelta (mult/mflo en MIPS). La pasada trabaja
+sobre los bucles más internos:
+
+- Variables de inducción básicas: i tal que todas sus definiciones en el
+  bucle son `i = add i, c`, `i = sub i, c` o `i = mov tK` con
+  `tK = add i, c` justo antes, con c constante (o un temporal de una sola
+  definición `mov c`). Si i está en memoria, el bucle no tiene llamadas.
+- Derivadas: temporales de una sola definición en el bucle que valen
+  a * i + b, armados con mul por constante, add/sub de constantes o de
+  variables que el bucle no escribe, y copias. Si se arman a partir de
+  otra derivada, las dos están en el mismo bloque sin una definición de i
+  en medio.
+
+Cada derivada que pasa por una multiplicación y se usa fuera de su
+familia se reemplaza por un puntero: `p = mul i, a` (+ b) en el
+pre-encabezado, `p = add p, a * c` después de cada incremento de i, y la
+derivada pasa a ser `j = mov p`. Las derivadas iguales comparten puntero,
+y las definiciones que quedan sin uso se quitan.
+
+Después, si i sólo se usa para incrementarse y en saltos condicionales
+contra un valor invariante n, y no está viva al salir del bucle, los
+saltos comparan el puntero contra a * n + b (calculado en el
+pre-encabezado; a > 0 conserva el sentido de la comparación) y los
+incrementos de i se quitan.
+"""
+from typing import Dict, List, Optional, Set, Tuple
+
+from ..ir.analysis import FlowAnalysis
+from ..ir.cfg import ControlFlowGraph, FunctionCFG
+from ..ir.dataflow import Liveness
+from ..ir.defuse import defined_name, is_memory_name, is_temp_name, is_variable, used_names
+from ..ir.dominators import Loop
+from ..ir.ssa import shared_names
+from ..ir.triplet import OpCode, Operand, Triplet
+from .base import PassResult, constant_operand, copy_triplet, integer_constant
+from .loop_editor import LoopEditor
+
+
+# Saltos que comparan dos operandos
+_COMPARE_JUMPS = (OpCode.BEQ, OpCode.BNE, OpCode.BLT, OpCode.BLE, OpCode.BGT, OpCode.BGE)
+# Definiciones que se pueden quitar si su resultado deja de usarse
+_REMOVABLE_OPS = (OpCode.ADD, OpCode.SUB, OpCode.MUL, OpCode.MOV)
+
+
+def _name_operand(name: str) -> Operand:
+    return Operand(name, "temp" if is_temp_name(name) else "var")
+
+
+class _Family:
+    """Valor a * i + b (+ variables invariantes) de una derivada"""
+
+    __slots__ = ('basic', 'scale', 'offset', 'names', 'multiplied', 'block', 'index')
+
+    def __init__(self, basic: str, scale: int, offset: int, names: Tuple[str, ...],
+                 multiplied: bool, block: int, index: int):
+        self.basic = basic
+        self.scale = scale
+        self.offset = offset
+        self.names = names
+        self.multiplied = multiplied
+        self.block = block
+        self.index = index
+
+    @property
+    def key(self) -> Tuple:
+        return (self.basic, self.scale, self.offset, self.names)
+
+
+class _Program:
+    """Conteos de definiciones y usos del listado, y sus constantes"""
+
+    def __init__(self, cfg: ControlFlowGraph):
+        self.cfg = cfg
+        self.definitions: Dict[str, int] = {}
+        self.uses: Dict[str, int] = {}
+        self.constants: Dict[str, int] = {}
+        for triplet in cfg.triplets:
+            for name in used_names(triplet):
+                self.uses[name] = self.uses.get(name, 0) + 1
+            name = defined_name(triplet)
+            if name is not None:
+                self.definitions[name] = self.definitions.get(name, 0) + 1
+                if triplet.op is OpCode.MOV:
+                    value = integer_constant(triplet.arg1)
+                    if value.__class__ is int:
+                        self.constants[name] = value
+        for name in [name for name in self.constants if self.definitions[name] != 1]:
+            del self.constants[name]
+
+    def constant(self, operand: Optional[Operand]) -> Optional[int]:
+        """Entero constante, directo o en un temporal de una sola definición"""
+        value = integer_constant(operand)
+        if value is not None:
+            return value if value.__class__ is int else None
+        if is_variable(operand) and is_temp_name(operand.value):
+            return self.constants.get(operand.value)
+        return None
+
+    def single(self, name: str) -> bool:
+        return is_temp_name(name) and self.definitions.get(name) == 1
+
+
+class _ExitLiveness:
+    """Variables vivas al salir de los bucles de una región (se calcula al pedirse)"""
+
+    def __init__(self, cfg: ControlFlowGraph, function: FunctionCFG, memory: Set[str]):
+        self.cfg = cfg
+        self.function = function
+        self.memory = memory
+        self._solved = None
+
+    def live_out(self, loop: Loop, name: str) -> bool:
+        """
+        name está viva al entrar a algún bloque de salida del bucle, o al
+        salir de un bloque del bucle que sale de la región (un bucle al
+        final del listado sale cayendo y no tiene bloques de salida)
+        """
+        if self._solved is None:
+            problem = Liveness(self.cfg, self.function, memory=self.memory)
+            self._solved = (problem, problem.solve(), set(self.function.exits))
+        problem, result, region_exits = self._solved
+        index = problem.universe.index.get(name)
+        if index is None:
+            return False
+        contains = problem.sets.contains
+        return (any(contains(result.block_in[e], index) for e in loop.exits(self.cfg))
+                or any(contains(result.block_out[b], index)
+                       for b in loop.blocks if b in region_exits))
+
+
+class _LoopReducer:
+    """Reducción de fuerza y LFTR de un bucle interno"""
+
+    def __init__(self, program: _Program, editor: LoopEditor, position: Dict[int, int],
+                 loop: Loop, live_out):
+        self.program = program
+        self.editor = editor
+        self.cfg = program.cfg
+        self.loop = loop
+        self.live_out = live_out
+        self.body = sorted(loop.blocks, key=position.__getitem__)
+        self.loop_defs: Dict[str, List[int]] = {}
+        self.has_call = False
+        code = self.cfg.triplets
+        for b in self.body:
+            block = self.cfg.blocks[b]
+            for i in range(block.start, block.end):
+                if code[i].op is OpCode.CALL:
+                    self.has_call = True
+                name = defined_name(code[i])
+                if name is not None:
+                    self.loop_defs.setdefault(name, []).append(i)
+        # Variable básica -> [(índice de la definición, paso, tK del incremento)]
+        self.basics: Dict[str, List[Tuple[int, int, Optional[int]]]] = {}
+        self.families: Dict[str, _Family] = {}
+        self.pointers: Dict[Tuple, Operand] = {}
+        self.stats = {"reducidas": 0, "pruebas": 0, "incrementos": 0}
+
+    # ========== DETECCIÓN ==========
+
+    def _invariant(self, operand: Operand) -> bool:
+        name = operand.value
+        if name in self.loop_defs:
+            return False
+        return not (self.has_call and is_memory_name(name))
+
+    def _step(self, triplet: Triplet, name: str) -> Optional[int]:
+        """c si el tripleto es `add name, c`, `add c, name` o `sub name, c`"""
+        program = self.program
+        arg1, arg2 = triplet.arg1, triplet.arg2
+        if triplet.op is OpCode.ADD:
+            if is_variable(arg1) and arg1.value == name:
+                return program.constant(arg2)
+            if is_variable(arg2) and arg2.value == name:
+                return program.constant(arg1)
+        elif triplet.op is OpCode.SUB and is_variable(arg1) and arg1.value == name:
+            step = program.constant(arg2)
+            return -step if step is not None else None
+        return None
+
+    def _find_basics(self):
+        code = self.cfg.triplets
+        for name, indices in self.loop_defs.items():
+            if self.has_call and is_memory_name(name):
+                continue
+            steps = []
+            for i in indices:
+                triplet = code[i]
+                step = self._step(triplet, name)
+                increment = None
+                if step is None and triplet.op is OpCode.MOV and is_variable(triplet.arg1):
+                    # i = mov tK, con tK = add i, c en el mismo bloque y sin otra definición de i
+                    source = triplet.arg1.value
+                    source_defs = self.loop_defs.get(source, ())
+                    if self.program.single(source) and len(source_defs) == 1:
+                        k = source_defs[0]
+                        block = self.cfg.block_of(i)
+                        if self.cfg.block_of(k) is block and k < i and \
+                                not any(k < d < i for d in indices):
+                            step = self._step(code[k], name)
+                            increment = k
+                if step is None:
+                    break
+                steps.append((i, step, increment))
+            else:
+                self.basics[name] = steps
+
+    def _basic_defined_between(self, basic: str, start: int, end: int) -> bool:
+        return any(start < i < end for i, _, _ in self.basics[basic])
+
+    def _source(self, operand: Optional[Operand], b: int, i: int) -> Optional[_Family]:
+        """Familia de un operando leído en el tripleto i (bloque b)"""
+        if not is_variable(operand):
+            return None
+        name = operand.value
+        if name in self.basics:
+            return _Family(name, 1, 0, (), False, b, i)
+        family = self.families.get(name)
+        if family is None or family.block != b or family.index > i or \
+                self._basic_defined_between(family.basic, family.index, i):
+            return None
+        return family
+
+    def _derive(self, triplet: Triplet, b: int, i: int) -> Optional[_Family]:
+        program = self.program
+        op, arg1, arg2 = triplet.op, triplet.arg1, triplet.arg2
+        if op is OpCode.MOV:
+            source = self._source(arg1, b, i)
+            if source is None:
+                return None
+            return _Family(source.basic, source.scale, source.offset, source.names,
+                           source.multiplied, b, i)
+        if op is OpCode.MUL:
+            for a, c in ((arg1, arg2), (arg2, arg1)):
+                source = self._source(a, b, i)
+                factor = program.constant(c)
+                if source is not None and factor is not None and factor != 0 and not source.names:
+                    return _Family(source.basic, source.scale * factor, source.offset * factor,
+                                   (), True, b, i)
+            return None
+        if op is OpCode.ADD:
+            for a, c in ((arg1, arg2), (arg2, arg1)):
+                source = self._source(a, b, i)
+                if source is None:
+                    continue
+                value = program.constant(c)
+                if value is not None:
+                    return _Family(source.basic, source.scale, source.offset + value,
+                                   source.names, source.multiplied, b, i)
+                if is_variable(c) and self._invariant(c):
+                    names = tuple(sorted(source.names + (c.value,)))
+                    return _Family(source.basic, source.scale, source.offset, names,
+                                   source.multiplied, b, i)
+            return None
+        if op is OpCode.SUB:
+            source = self._source(arg1, b, i)
+            value = program.constant(arg2)
+            if source is not None and value is not None:
+                return _Family(source.basic, source.scale, source.offset - value,
+                               source.names, source.multiplied, b, i)
+        return None
+
+    def _find_families(self):
+        code = self.cfg.triplets
+        blocks = self.cfg.blocks
+        for b in self.body:
+            for i in range(blocks[b].start, blocks[b].end):
+                triplet = code[i]
+                name = defined_name(triplet)
+                if name is None or not self.program.single(name) or name in self.basics:
+                    continue
+                family = self._derive(triplet, b, i)
+                if family is not None:
+                    self.families[name] = family
+
+    # ========== REDUCCIÓN ==========
+
+    def _pointer(self, family: _Family) -> Operand:
+        """Puntero compartido de la familia (lo inicializa y lo incrementa)"""
+        key = family.key
+        pointer = self.pointers.get(key)
+        if pointer is not None:
+            return pointer
+        editor = self.editor
+        pointer = self.pointers[key] = editor.new_temp()
+        basic = self.basics[family.basic]
+        source = _name_operand(family.basic)
+        if family.scale == 1:
+            setup = [Triplet(OpCode.MOV, source, None, pointer)]
+        else:
+            setup = [Triplet(OpCode.MUL, source, constant_operand(family.scale), pointer)]
+        if family.offset:
+            setup.append(Triplet(OpCode.ADD, pointer, constant_operand(family.offset), pointer))
+        for name in family.names:
+            setup.append(Triplet(OpCode.ADD, pointer, _name_operand(name), pointer))
+        editor.add_to_preheader(self.loop, setup)
+        for i, step, _ in basic:
+            delta = family.scale * step
+            if delta >= 0:
+                update = Triplet(OpCode.ADD, pointer, constant_operand(delta), pointer)
+            else:
+                update = Triplet(OpCode.SUB, pointer, constant_operand(-delta), pointer)
+            editor.insert_after(i, [update])
+        return pointer
+
+    def reduce(self):
+        self._find_basics()
+        if not self.basics:
+            return
+        self._find_families()
+        code = self.cfg.triplets
+        # Usos de cada derivada por otras de su familia
+        family_uses: Dict[str, int] = {}
+        for name, family in self.families.items():
+            for used in used_names(code[family.index]):
+                if used in self.families:
+                    family_uses[used] = family_uses.get(used, 0) + 1
+
+        removed: List[int] = []
+        for name, family in self.families.items():
+            if not family.multiplied or family.scale == 0:
+                continue
+            if self.program.uses.get(name, 0) <= family_uses.get(name, 0):
+                continue
+            pointer = self._pointer(family)
+            self.editor.replace(family.index, Triplet(OpCode.MOV, pointer, None,
+                                                      code[family.index].result))
+            removed.append(family.index)
+            self.stats["reducidas"] += 1
+        if not removed:
+            return
+        self._release(removed, code)
+        for basic in self.basics:
+            self._replace_test(basic)
+
+    def _release(self, indices: List[int], code: List[Triplet]):
+        """Quita en el bucle las definiciones que quedaron sin uso"""
+        uses = self.program.uses
+        pending = []
+        for i in indices:
+            pending.extend(used_names(code[i]))
+        while pending:
+            name = pending.pop()
+            uses[name] -= 1
+            if uses[name] or not self.program.single(name) or name not in self.loop_defs:
+                continue
+            i = self.loop_defs[name][0]
+            triplet = self.editor.current(i)
+            if triplet is None or triplet.op not in _REMOVABLE_OPS:
+                continue
+            self.editor.remove(i)
+            pending.extend(used_names(triplet))
+
+    # ========== LFTR ==========
+
+    def _replace_test(self, basic: str):
+        """Compara el puntero en lugar de i y quita los incrementos de i"""
+        if self.live_out(self.loop, basic):
+            return
+        key = next((key for key in self.pointers if key[0] == basic and key[1] > 0), None)
+        if key is None:
+            return
+        pointer = self.pointers[key]
+        _, scale, offset, names = key
+
+        code = self.cfg.triplets
+        blocks = self.cfg.blocks
+        increments = [i for i, _, _ in self.basics[basic]]
+        chained = [k for _, _, k in self.basics[basic] if k is not None]
+        # tK = add i, c sólo puede desaparecer si nada más lo lee
+        if any(self.program.uses.get(defined_name(code[k])) != 1 for k in chained):
+            return
+        own = set(increments + chained)
+        tests: List[Tuple[int, Triplet, int]] = []
+        for b in self.body:
+            for i in range(blocks[b].start, blocks[b].end):
+                triplet = self.editor.current(i)
+                if triplet is None or i in own or basic not in used_names(triplet):
+                    continue
+                if triplet.op not in _COMPARE_JUMPS:
+                    return
+                arg1, arg2 = triplet.arg1, triplet.arg2
+                first = is_variable(arg1) and arg1.value == basic
+                second = is_variable(arg2) and arg2.value == basic
+                if first == second:
+                    return
+                slot, other = (0, arg2) if first else (1, arg1)
+                if self.program.constant(other) is None and \
+                        not (is_variable(other) and self._invariant(other)):
+                    return
+                tests.append((i, triplet, slot))
+
+        for i, triplet, slot in tests:
+            other = triplet.arg2 if slot == 0 else triplet.arg1
+            bound = self._bound(other, scale, offset, names)
+            test = copy_triplet(triplet)
+            if slot == 0:
+                test.arg1, test.arg2 = pointer, bound
+            else:
+                test.arg1, test.arg2 = bound, pointer
+            self.editor.replace(i, test)
+            self.stats["pruebas"] += 1
+        self._release([i for i, _, _ in tests], code)
+        for i in increments:
+            self.editor.remove(i)
+        self.stats["incrementos"] += len(increments)
+        self._release(increments, code)
+
+    def _bound(self, other: Operand, scale: int, offset: int, names: Tuple[str, ...]) -> Operand:
+        """a * n + b: constante si se puede, si no calculado en el pre-encabezado"""
+        value = self.program.constant(other)
+        if value is not None and not names:
+            return constant_operand(scale * value + offset)
+        bound = self.editor.new_temp()
+        if value is not None:
+            setup = [Triplet(OpCode.MOV, constant_operand(scale * value + offset), None, bound)]
+        else:
+            setup = [Triplet(OpCode.MUL, other, constant_operand(scale), bound)]
+            if offset:
+                setup.append(Triplet(OpCode.ADD, bound, constant_operand(offset), bound))
+        for name in names:
+            setup.append(Triplet(OpCode.ADD, bound, _name_operand(name), bound))
+        self.editor.add_to_preheader(self.loop, setup)
+        return bound
+
+
+def reduce_induction_variables(triplets, analysis: Optional[FlowAnalysis] = None) -> PassResult:
+    """
+    Reemplaza las multiplicaciones por la variable de inducción de los
+    bucles internos con punteros que se incrementan, y la prueba del bucle
+    por una sobre el puntero.
+
+    Args:
+        triplets: Lista de tripletos (no se modifica)
+        analysis: FlowAnalysis de ese listado, si ya existe
+
+    Returns:
+        PassResult con contadores "reducidas" (derivadas reemplazadas por
+        un puntero), "pruebas" (saltos que comparan el puntero) e
+        "incrementos" (incrementos de i quitados)
+    """
+    if analysis is None:
+        analysis = FlowAnalysis(triplets)
+    cfg = analysis.cfg
+    program = _Program(cfg)
+    editor = LoopEditor(cfg)
+    stats = {"reducidas": 0, "pruebas": 0, "incrementos": 0}
+    memory: Optional[Set[str]] = None
+
+    for function in cfg.functions:
+        if function.entry is None:
+            continue
+        exits = None
+        # Orden de los bloques (RPO) para recorrer cada cuerpo; uno por región
+        position = None
+        for loop in analysis.loops(function).loops:
+            if loop.children or not editor.can_create_preheader(function, loop):
+                continue
+            if exits is None:
+                if memory is None:
+                    memory = shared_names(cfg)
+                exits = _ExitLiveness(cfg, function, memory)
+                position = {b: k for k, b in enumerate(function.reverse_postorder)}
+            reducer = _LoopReducer(program, editor, position, loop, exits.live_out)
+            reducer.reduce()
+            for name, count in reducer.stats.items():
+                stats[name] += count
+
+    return PassResult("inducción", editor.apply(), len(cfg.triplets), stats)
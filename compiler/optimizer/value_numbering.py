@@ -0,0 +1,324 @@
+"""
+Numeración de valores y eliminación de subexpresiones comunes.
+
+ArrayCodeGen.gen_effective_address emite `t1 = mul i, 4` y
+`t2 = add G[0], t1` en cada acceso, así que `a[i] = a[i] + 1` calcula dos
+veces la misma dirección; lo mismo pasa con cualquier expresión repetida.
+La pasada numera los valores: dos variables tienen el mismo número si se
+sabe que guardan el mismo valor, y una operación cuyo (op, número, número)
+ya se calculó se cambia por una copia de la variable que lo guarda.
+
+- Local (dentro de cada bloque): las copias comparten número, las
+  operaciones conmutativas ordenan sus operandos (`add a, b` == `add b, a`)
+  y las comparaciones se invierten (`lt a, b` == `gt b, a`). Las lecturas
+  de memoria (array_get, load, get_field) también se numeran, con una
+  "época" de memoria que cambia en cada escritura o llamada. Una llamada
+  también cambia las variables con nombre.
+- Global (recorriendo el árbol de dominadores): un bloque hereda de sus
+  dominadores las expresiones que se escriben en un temporal de una sola
+  definición y que sólo leen constantes y temporales de una sola
+  definición. Si la definición de un temporal domina sus lecturas, su
+  valor es el mismo en todos los caminos, así que no hace falta SSA.
+
+Cuando la copia resultante va de un temporal de una sola definición a
+otro, las lecturas del primero pasan a leer el segundo y la copia
+desaparece; las demás copias quedan para propagate_copies.
+"""
+from typing import Dict, List, Optional, Tuple
+
+from ..ir.analysis import FlowAnalysis
+from ..ir.defuse import (
+    PURE_OPS, STORE_OPS, defined_name, is_memory_name, is_temp_name, is_variable,
+    use_slots, used_names
+)
+from ..ir.dominators import DominatorTree
+from ..ir.triplet import OpCode, Operand, Triplet
+from .base import PassResult, copy_triplet
+
+
+_COMMUTATIVE = (OpCode.ADD, OpCode.MUL, OpCode.AND, OpCode.OR, OpCode.EQ, OpCode.NE)
+_SWAPPED = {OpCode.LT: OpCode.GT, OpCode.GT: OpCode.LT, OpCode.LE: OpCode.GE, OpCode.GE: OpCode.LE}
+# Lecturas de memoria: se numeran junto con la época de memoria
+_LOAD_OPS = (OpCode.ARRAY_GET, OpCode.LOAD, OpCode.GET_FIELD)
+
+
+def _stable_temps(triplets: List[Triplet]) -> Dict[str, int]:
+    """Temporales con a lo sumo una definición -> número de definiciones"""
+    counts: Dict[str, int] = {}
+    for triplet in triplets:
+        for name in used_names(triplet):
+            if is_temp_name(name):
+                counts.setdefault(name, 0)
+        name = defined_name(triplet)
+        if name is not None and is_temp_name(name):
+            counts[name] = counts.get(name, 0) + 1
+    return {name: count for name, count in counts.items() if count <= 1}
+
+
+class _Numbering:
+    """
+    Números de valor durante el recorrido de una región. Lo que vale en los
+    bloques dominados (expresiones globales, portadores y números de
+    temporales estables) se deshace al salir de cada subárbol con un
+    registro de cambios; lo demás se descarta al empezar cada bloque.
+    """
+
+    def __init__(self, stable: Dict[str, int], local: bool):
+        self.stable = stable
+        self.local = local
+        self.counter = 0
+        self.constants: Dict[Tuple, int] = {}
+        # Temporales estables sin definición: valen lo mismo en toda la región
+        self.free: Dict[str, int] = {}
+        self.scoped_values: Dict[str, int] = {}
+        self.block_values: Dict[str, int] = {}
+        # Clave de la expresión -> (número, bloque donde se calculó)
+        self.scoped_expressions: Dict[Tuple, Tuple[int, int]] = {}
+        self.block_expressions: Dict[Tuple, Tuple[int, int]] = {}
+        # Número -> variables a las que se asignó
+        self.holders: Dict[int, List[Operand]] = {}
+        self.epoch = 0
+        self.log: List[Tuple] = []
+
+    def fresh(self) -> int:
+        self.counter += 1
+        return self.counter
+
+    def start_block(self):
+        self.block_values = {}
+        self.block_expressions = {}
+        self.epoch = self.fresh()
+
+    def mark(self) -> int:
+        return len(self.log)
+
+    def undo(self, mark: int):
+        log = self.log
+        while len(log) > mark:
+            table, key, previous = log.pop()
+            if table is self.holders:
+                previous.pop()
+                if not previous:
+                    del table[key]
+            elif previous is None:
+                del table[key]
+            else:
+                table[key] = previous
+
+    def _set(self, table: Dict, key, value):
+        self.log.append((table, key, table.get(key)))
+        table[key] = value
+
+    # ========== NÚMEROS ==========
+
+    def current(self, name: str) -> Optional[int]:
+        value = self.block_values.get(name)
+        if value is None:
+            value = self.scoped_values.get(name)
+            if value is None:
+                value = self.free.get(name)
+        return value
+
+    def number(self, operand: Optional[Operand]) -> Optional[int]:
+        if operand is None:
+            return None
+        if not is_variable(operand):
+            key = (operand.type, str(operand.value))
+            value = self.constants.get(key)
+            if value is None:
+                value = self.constants[key] = self.fresh()
+            return value
+        name = operand.value
+        value = self.current(name)
+        if value is None:
+            value = self.fresh()
+            if self.stable.get(name) == 0:
+                self.free[name] = value
+            else:
+                self.block_values[name] = value
+        return value
+
+    def define(self, operand: Operand, value: int):
+        name = operand.value
+        self.block_values.pop(name, None)
+        if name in self.stable:
+            self._set(self.scoped_values, name, value)
+        else:
+            self.block_values[name] = value
+        holders = self.holders.get(value)
+        if holders is None:
+            holders = self.holders[value] = []
+        self.log.append((self.holders, value, holders))
+        holders.append(operand)
+
+    def holder(self, value: int) -> Optional[Operand]:
+        """Variable que todavía guarda `value` (preferentemente un temporal estable)"""
+        found = None
+        for operand in reversed(self.holders.get(value, ())):
+            if self.current(operand.value) == value:
+                if operand.value in self.stable:
+                    return operand
+                if found is None:
+                    found = operand
+        return found
+
+    def kill_memory(self):
+        """Una llamada cambia la memoria y las variables con nombre"""
+        self.epoch = self.fresh()
+        for name in [name for name in self.block_values if is_memory_name(name)]:
+            del self.block_values[name]
+
+    # ========== EXPRESIONES ==========
+
+    def key(self, triplet: Triplet) -> Tuple:
+        op = triplet.op
+        a = self.number(triplet.arg1)
+        b = self.number(triplet.arg2)
+        if b is not None and a > b:
+            if op in _COMMUTATIVE:
+                a, b = b, a
+            elif op in _SWAPPED:
+                op = _SWAPPED[op]
+                a, b = b, a
+        if op in _LOAD_OPS:
+            return (op.value, a, b, self.epoch)
+        return (op.value, a, b)
+
+    def lookup(self, key: Tuple) -> Optional[Tuple[int, int]]:
+        known = self.block_expressions.get(key)
+        return known if known is not None else self.scoped_expressions.get(key)
+
+    def remember(self, triplet: Triplet, key: Tuple, value: int, block: int):
+        """Guarda la expresión para el resto del bloque o para sus dominados"""
+        if self.local or triplet.op in _LOAD_OPS or triplet.result.value not in self.stable \
+                or any(is_variable(operand) and operand.value not in self.stable
+                       for operand in (triplet.arg1, triplet.arg2)):
+            self.block_expressions[key] = (value, block)
+        else:
+            self._set(self.scoped_expressions, key, (value, block))
+
+
+def _number_region(code: List[Triplet], tree: DominatorTree, numbering: _Numbering,
+                   replaced: Dict[int, Optional[Triplet]], stats: Dict[str, int]):
+    """Recorre el árbol de dominadores en pre-orden (con una pila explícita)"""
+    blocks = tree.cfg.blocks
+    stack: List[Tuple[int, Optional[int]]] = [(tree.root, None)]
+    while stack:
+        b, mark = stack.pop()
+        if mark is not None:
+            numbering.undo(mark)
+            continue
+        stack.append((b, numbering.mark()))
+        numbering.start_block()
+
+        for i in range(blocks[b].start, blocks[b].end):
+            triplet = code[i]
+            op = triplet.op
+            result = triplet.result
+            if (op in PURE_OPS or op in _LOAD_OPS) and is_variable(result) \
+                    and triplet.arg1 is not None:
+                key = numbering.key(triplet)
+                known = numbering.lookup(key)
+                if known is not None and numbering.current(result.value) == known[0]:
+                    # El destino ya guarda ese valor
+                    replaced[i] = None
+                    stats["locales" if known[1] == b else "globales"] += 1
+                    continue
+                holder = numbering.holder(known[0]) if known is not None else None
+                if holder is not None:
+                    copy = copy_triplet(triplet)
+                    copy.op = OpCode.MOV
+                    copy.arg1 = holder
+                    copy.arg2 = None
+                    replaced[i] = copy
+                    stats["locales" if known[1] == b else "globales"] += 1
+                    numbering.define(result, known[0])
+                else:
+                    value = numbering.fresh()
+                    numbering.define(result, value)
+                    numbering.remember(triplet, key, value, b)
+            elif op is OpCode.MOV and is_variable(result) and triplet.arg1 is not None:
+                numbering.define(result, numbering.number(triplet.arg1))
+            else:
+                if op is OpCode.CALL:
+                    numbering.kill_memory()
+                elif op in STORE_OPS:
+                    numbering.epoch = numbering.fresh()
+                if defined_name(triplet) is not None:
+                    numbering.define(result, numbering.fresh())
+
+        for child in reversed(tree.children.get(b, ())):
+            stack.append((child, None))
+
+
+def _substitute(code: List[Triplet], replaced: Dict[int, Optional[Triplet]],
+                stable: Dict[str, int]) -> List[Triplet]:
+    """
+    Quita las copias entre temporales estables: las lecturas del destino
+    pasan a leer el origen (que ya guardaba el valor en su definición)
+    """
+    phi_reads = set()
+    for triplet in code:
+        if triplet.op is OpCode.PHI:
+            phi_reads.update(used_names(triplet))
+    aliases: Dict[str, Operand] = {}
+    for copy in replaced.values():
+        if copy is None:
+            continue
+        target = copy.result.value
+        if target in stable and copy.arg1.value in stable and target not in phi_reads:
+            aliases[target] = copy.arg1
+
+    def resolve(operand: Operand) -> Operand:
+        while operand.value in aliases:
+            operand = aliases[operand.value]
+        return operand
+
+    output: List[Triplet] = []
+    for i, triplet in enumerate(code):
+        if i in replaced:
+            triplet = replaced[i]
+            if triplet is None or triplet.result.value in aliases:
+                continue
+        rewritten = None
+        for slot in use_slots(triplet):
+            operand = getattr(triplet, slot)
+            if is_variable(operand) and operand.value in aliases:
+                if rewritten is None:
+                    rewritten = copy_triplet(triplet)
+                setattr(rewritten, slot, resolve(operand))
+        output.append(rewritten if rewritten is not None else triplet)
+    return output
+
+
+def eliminate_common_subexpressions(triplets, analysis: Optional[FlowAnalysis] = None,
+                                    local: bool = False) -> PassResult:
+    """
+    Elimina los cálculos repetidos numerando valores.
+
+    Args:
+        triplets: Lista de tripletos (no se modifica)
+        analysis: FlowAnalysis de ese listado, si ya existe
+        local: Si es True, sólo dentro de cada bloque (sin dominadores)
+
+    Returns:
+        PassResult con contadores "locales" y "globales" (cálculos
+        cambiados por una copia de un valor del mismo bloque o de un
+        dominador)
+    """
+    if analysis is None:
+        analysis = FlowAnalysis(triplets)
+    code = analysis.triplets
+    cfg = analysis.cfg
+    stable = _stable_temps(code)
+    replaced: Dict[int, Optional[Triplet]] = {}
+    stats = {"locales": 0, "globales": 0}
+
+    for function in cfg.functions:
+        if function.entry is None:
+            continue
+        _number_region(code, analysis.dominators(function), _Numbering(stable, local),
+                       replaced, stats)
+
+    output = _substitute(code, replaced, stable)
+    return PassResult("value_numbering", output, len(code), stats)
@@ -0,0 +1,322 @@
+"""
+Pipeline de compilación compartido por los puntos de entrada (Driver, IDE).
+
+Centraliza las fases léxica, sintáctica, de generación de TAC y de
+optimización para que todos los front-ends usen la misma estrategia de
+parsing y las mismas pasadas en cada nivel (-O0, -O1, -O2, -Os).
+"""
+import os
+import sys
+import time
+from dataclasses import dataclass
+from typing import Any, Dict
+
+from antlr4 import CommonTokenStream, InputStream
+from antlr4.atn.PredictionMode import PredictionMode
+from antlr4.error.ErrorListener import ConsoleErrorListener
+from antlr4.error.ErrorStrategy import BailErrorStrategy, DefaultErrorStrategy
+from antlr4.error.Errors import ParseCancellationException
+
+# Configurar rutas para importar la gramática generada
+current_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(current_dir)
+grammar_dir = os.path.join(root_dir, 'program', 'grammar', 'gen')
+
+if grammar_dir not in sys.path:
+    sys.path.insert(0, grammar_dir)
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+from CompiscriptLexer import CompiscriptLexer
+from CompiscriptParser import CompiscriptParser
+from program.grammar.CompiscriptVisitor import CompiscriptVisitor
+
+from compiler.syntax_tree.visitors import CompiscriptTACVisitor
+from compiler.syntax_tree.ast_visitor import CompiscriptASTVisitor
+from compiler.syntax_tree.lowering import lower_program
+from compiler.frontend.lexer import FastCompiscriptLexer
+from compiler.frontend.parser import PrattParser
+from compiler.syntax_tree import ast_nodes as ast
+from compiler.optimizer.manager import PassManager, OPT_LEVELS, OPT_O0
+
+
+# Lexers disponibles
+LEXER_ANTLR = "antlr"  # CompiscriptLexer generado (simulador ATN)
+LEXER_FAST = "fast"    # FastCompiscriptLexer: una expresión regular, mismos tokens
+LEXER_MODES = (LEXER_ANTLR, LEXER_FAST)
+
+# Modos de parsing disponibles
+PARSE_MODE_TWO_STAGE = "two-stage"  # SLL + BailErrorStrategy, luego LL si falla
+PARSE_MODE_LL = "ll"                # LL completo con recuperación de errores (ANTLR por defecto)
+PARSE_MODE_PRATT = "pratt"          # Parser propio sin ATN; produce directamente el AST compacto
+PARSE_MODES = (PARSE_MODE_TWO_STAGE, PARSE_MODE_LL, PARSE_MODE_PRATT)
+
+# Caminos efectivamente tomados por el parser
+PARSE_PATH_SLL = "sll"
+PARSE_PATH_LL = "ll"
+PARSE_PATH_PRATT = "pratt"
+
+# Árbol sobre el que se genera el TAC
+TREE_PARSE = "parse-tree"  # Visitor directamente sobre el árbol de parseo de ANTLR
+TREE_AST = "ast"           # Lowering al AST compacto; el árbol de parseo se libera antes del TAC
+TREE_MODES = (TREE_PARSE, TREE_AST)
+
+
+@dataclass
+class ParseStats:
+    """Estadísticas de la fase sintáctica: camino tomado y tiempos (segundos)"""
+    mode: str
+    path: str = PARSE_PATH_LL
+    sll_time: float = 0.0
+    ll_time: float = 0.0
+    pratt_time: float = 0.0
+
+    @property
+    def total_time(self) -> float:
+        return self.sll_time + self.ll_time + self.pratt_time
+
+    @property
+    def fell_back(self) -> bool:
+        """True si el intento SLL falló y hubo que re-parsear con LL"""
+        return self.mode == PARSE_MODE_TWO_STAGE and self.path == PARSE_PATH_LL
+
+    def to_dict(self) -> dict:
+        return {
+            "mode": self.mode,
+            "path": self.path,
+            "fell_back": self.fell_back,
+            "sll_time": self.sll_time,
+            "ll_time": self.ll_time,
+            "pratt_time": self.pratt_time,
+            "total_time": self.total_time
+        }
+
+    def __str__(self) -> str:
+        if self.fell_back:
+            return (f"SLL falló ({self.sll_time:.4f}s), re-parseo LL "
+                    f"({self.ll_time:.4f}s), total {self.total_time:.4f}s")
+        return f"{self.path.upper()} ({self.total_time:.4f}s)"
+
+
+@dataclass
+class ParseResult:
+    """
+    Resultado de la fase sintáctica. Con PARSE_MODE_PRATT, tree es un
+    ast.Program (o None si hubo errores) y parser un PrattParser.
+    """
+    tree: Any
+    parser: Any
+    tokens: CommonTokenStream
+    stats: ParseStats
+
+    @property
+    def syntax_errors(self) -> int:
+        return self.parser.getNumberOfSyntaxErrors()
+
+
+def lex(input_stream: InputStream, lexer_mode: str = LEXER_ANTLR) -> CommonTokenStream:
+    """
+    Fase léxica: retorna el stream de tokens ya llenado.
+
+    Ambos lexers producen los mismos tokens (y los mismos errores léxicos);
+    LEXER_FAST evita el simulador ATN de ANTLR.
+    """
+    if lexer_mode not in LEXER_MODES:
+        raise ValueError(f"Lexer desconocido: '{lexer_mode}'")
+
+    if lexer_mode == LEXER_FAST:
+        lexer = FastCompiscriptLexer(input_stream)
+    else:
+        lexer = CompiscriptLexer(input_stream)
+    stream = CommonTokenStream(lexer)
+    stream.fill()
+    return stream
+
+
+def parse_tokens(stream: CommonTokenStream,
+                 mode: str = PARSE_MODE_TWO_STAGE) -> ParseResult:
+    """
+    Fase sintáctica sobre un stream de tokens.
+
+    En modo two-stage se intenta primero predicción SLL con BailErrorStrategy,
+    que es mucho más barata que LL completo. Si SLL no puede decidir (o la
+    entrada tiene errores) se re-parsea desde el inicio con LL completo y la
+    estrategia de errores por defecto, de modo que los errores reportados son
+    los mismos que con el parser estándar.
+
+    En modo pratt no interviene ANTLR: PrattParser construye el AST compacto
+    directamente desde los tokens y se detiene en el primer error.
+
+    Args:
+        stream: Stream de tokens (se rebobina si hay re-parseo)
+        mode: PARSE_MODE_TWO_STAGE, PARSE_MODE_LL o PARSE_MODE_PRATT
+
+    Returns:
+        ParseResult con el árbol, el parser y las estadísticas
+    """
+    if mode not in PARSE_MODES:
+        raise ValueError(f"Modo de parsing desconocido: '{mode}'")
+
+    stats = ParseStats(mode)
+    if mode == PARSE_MODE_PRATT:
+        parser = PrattParser(stream.tokens)
+        start = time.perf_counter()
+        tree = parser.parse_program()
+        stats.pratt_time = time.perf_counter() - start
+        stats.path = PARSE_PATH_PRATT
+        return ParseResult(tree, parser, stream, stats)
+
+    parser = CompiscriptParser(stream)
+
+    if mode == PARSE_MODE_TWO_STAGE:
+        parser._interp.predictionMode = PredictionMode.SLL
+        parser._errHandler = BailErrorStrategy()
+        parser.removeErrorListeners()
+
+        start = time.perf_counter()
+        try:
+            tree = parser.program()
+            stats.sll_time = time.perf_counter() - start
+            stats.path = PARSE_PATH_SLL
+            # Restaurar configuración estándar para cualquier uso posterior
+            parser.addErrorListener(ConsoleErrorListener.INSTANCE)
+            parser._errHandler = DefaultErrorStrategy()
+            parser._interp.predictionMode = PredictionMode.LL
+            return ParseResult(tree, parser, stream, stats)
+        except ParseCancellationException:
+            stats.sll_time = time.perf_counter() - start
+
+        # Segunda etapa: LL completo desde el inicio del stream
+        parser.reset()
+        parser.addErrorListener(ConsoleErrorListener.INSTANCE)
+        parser._errHandler = DefaultErrorStrategy()
+        parser._interp.predictionMode = PredictionMode.LL
+
+    start = time.perf_counter()
+    tree = parser.program()
+    stats.ll_time = time.perf_counter() - start
+    stats.path = PARSE_PATH_LL
+
+    return ParseResult(tree, parser, stream, stats)
+
+
+def generate_tac(parse_result: ParseResult,
+                 tree_mode: str = TREE_PARSE,
+                 compact_ir: bool = False) -> CompiscriptTACVisitor:
+    """
+    Fase de generación de TAC.
+
+    Con TREE_AST el árbol de parseo se convierte al AST compacto y se va
+    liberando durante el lowering; parse_result.tree queda en None y el TAC
+    se genera sólo con el AST. El TAC producido es el mismo en ambos modos.
+    Si el parseo fue con PARSE_MODE_PRATT el árbol ya es el AST y se usa
+    directamente, sin importar tree_mode.
+
+    Con compact_ir los tripletos se guardan en una CompactTripletTable
+    (buffers paralelos) en lugar de una lista de objetos Triplet.
+
+    Returns:
+        El visitor con los tripletos, símbolos y layout de memoria
+    """
+    if tree_mode not in TREE_MODES:
+        raise ValueError(f"Modo de árbol desconocido: '{tree_mode}'")
+
+    if isinstance(parse_result.tree, ast.Program):
+        visitor = CompiscriptASTVisitor(compact_ir=compact_ir)
+        visitor.visit(parse_result.tree)
+    elif tree_mode == TREE_AST:
+        program = lower_program(parse_result.tree, release=True)
+        parse_result.tree = None
+        # El simulador de predicción conserva el último contexto visto
+        parse_result.parser._interp._outerContext = None
+        visitor = CompiscriptASTVisitor(compact_ir=compact_ir)
+        visitor.visit(program)
+    else:
+        visitor = CompiscriptTACVisitor(CompiscriptParser, CompiscriptVisitor, compact_ir=compact_ir)
+        visitor.visit(parse_result.tree)
+    return visitor
+
+
+def compile_source(source_code: str,
+                   parse_mode: str = PARSE_MODE_TWO_STAGE,
+                   tree_mode: str = TREE_PARSE,
+                   lexer_mode: str = LEXER_ANTLR,
+                   compact_ir: bool = False,
+                   opt_level: str = OPT_O0,
+                   track_memory: bool = False) -> Dict[str, Any]:
+    """
+    Compila código Compiscript y retorna los resultados en un diccionario.
+
+    Con opt_level distinto de OPT_O0 los tripletos del resultado son los
+    que deja el PassManager de ese nivel; con track_memory el reporte
+    incluye el pico de memoria de cada pasada (más lento, ver PassManager).
+
+    Returns:
+        Diccionario con success, errors, token_count, triplets, symbols,
+        memory, arrays, parse (estadísticas de la fase sintáctica) y
+        optimization (reporte de las pasadas, None con OPT_O0)
+    """
+    if opt_level not in OPT_LEVELS:
+        raise ValueError(f"Nivel de optimización desconocido: '{opt_level}'")
+
+    try:
+        # Fase 1: Análisis Léxico
+        stream = lex(InputStream(source_code), lexer_mode)
+        token_count = len(stream.tokens)
+
+        # Fase 2: Análisis Sintáctico
+        parse_result = parse_tokens(stream, parse_mode)
+
+        if parse_result.syntax_errors > 0:
+            return {
+                'success': False,
+                'errors': [f'Errores de sintaxis: {parse_result.syntax_errors}'],
+                'triplets': [],
+                'symbols': {},
+                'memory': {},
+                'arrays': {},
+                'parse': parse_result.stats.to_dict()
+            }
+
+        # Fase 3: Generación de TAC
+        visitor = generate_tac(parse_result, tree_mode, compact_ir)
+
+        # Fase 4: Optimización
+        triplets = visitor.get_triplets()
+        optimization = None
+        if opt_level != OPT_O0:
+            report = PassManager(opt_level, track_memory=track_memory).run(triplets)
+            triplets = report.triplets
+            optimization = report.to_dict()
+
+        # Obtener información de memoria
+        memory_layout = visitor.memory_manager.get_memory_layout()
+        memory_info = {
+            'global_size': memory_layout['global_segment']['total_size'],
+            'constant_size': memory_layout['const_segment']['total_size'],
+            'current_function': memory_layout['current_function'],
+            'stack_depth': memory_layout['activation_stack_depth']
+        }
+
+        return {
+            'success': True,
+            'errors': [],
+            'token_count': token_count,
+            'triplets': triplets,
+            'symbols': visitor.get_symbols(),
+            'memory': memory_info,
+            'arrays': visitor.array_codegen.get_all_arrays(),
+            'parse': parse_result.stats.to_dict(),
+            'optimization': optimization
+        }
+
+    except Exception as e:
+        return {
+            'success': False,
+            'errors': [f'{type(e).__name__}: {str(e)}'],
+            'triplets': [],
+            'symbols': {},
+            'memory': {},
+            'arrays': {},
+            'parse': None
+        }
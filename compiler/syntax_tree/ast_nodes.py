@@ -0,0 +1,410 @@
+"""
+AST compacto para Compiscript.
+
+Los nodos usan __slots__ y guardan sólo lo que la generación de TAC
+necesita: identificadores internados, literales ya decodificados y listas
+de hijos como tuplas. No existen nodos de paso para los niveles de
+precedencia de la gramática (expression -> assignmentExpr -> ... ->
+primaryExpr): una expresión es directamente su operador o su átomo.
+"""
+from typing import Any, Tuple
+
+
+class Node:
+    """Clase base de todos los nodos del AST"""
+    __slots__ = ('line',)
+
+    def _fields(self) -> Tuple[str, ...]:
+        fields = []
+        for klass in reversed(type(self).__mro__):
+            for slot in getattr(klass, '__slots__', ()):
+                if slot != 'line':
+                    fields.append(slot)
+        return tuple(fields)
+
+    def __eq__(self, other) -> bool:
+        if type(self) is not type(other):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in self._fields())
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        args = ", ".join(f"{f}={getattr(self, f)!r}" for f in self._fields())
+        return f"{type(self).__name__}({args})"
+
+
+# ========== SENTENCIAS ==========
+
+class Program(Node):
+    __slots__ = ('statements',)
+
+    def __init__(self, statements: tuple, line: int = 0):
+        self.statements = statements
+        self.line = line
+
+
+class Block(Node):
+    __slots__ = ('statements',)
+
+    def __init__(self, statements: tuple, line: int = 0):
+        self.statements = statements
+        self.line = line
+
+
+class VarDecl(Node):
+    """let/var: type_name es el tipo base y array_dims el número de []"""
+    __slots__ = ('name', 'type_name', 'array_dims', 'init')
+
+    def __init__(self, name: str, type_name: str = None, array_dims: int = 0,
+                 init: Node = None, line: int = 0):
+        self.name = name
+        self.type_name = type_name
+        self.array_dims = array_dims
+        self.init = init
+        self.line = line
+
+
+class ConstDecl(Node):
+    __slots__ = ('name', 'type_text', 'value')
+
+    def __init__(self, name: str, type_text: str = None, value: Node = None, line: int = 0):
+        self.name = name
+        self.type_text = type_text
+        self.value = value
+        self.line = line
+
+
+class Assign(Node):
+    """Sentencia `x = expr;`"""
+    __slots__ = ('name', 'value')
+
+    def __init__(self, name: str, value: Node, line: int = 0):
+        self.name = name
+        self.value = value
+        self.line = line
+
+
+class PropertyAssign(Node):
+    """Sentencia `obj.prop = expr;`"""
+    __slots__ = ('obj', 'name', 'value')
+
+    def __init__(self, obj: Node, name: str, value: Node, line: int = 0):
+        self.obj = obj
+        self.name = name
+        self.value = value
+        self.line = line
+
+
+class ExprStmt(Node):
+    __slots__ = ('expr',)
+
+    def __init__(self, expr: Node, line: int = 0):
+        self.expr = expr
+        self.line = line
+
+
+class Print(Node):
+    __slots__ = ('expr',)
+
+    def __init__(self, expr: Node, line: int = 0):
+        self.expr = expr
+        self.line = line
+
+
+class If(Node):
+    __slots__ = ('cond', 'then_block', 'else_block')
+
+    def __init__(self, cond: Node, then_block: Block, else_block: Block = None, line: int = 0):
+        self.cond = cond
+        self.then_block = then_block
+        self.else_block = else_block
+        self.line = line
+
+
+class While(Node):
+    __slots__ = ('cond', 'body')
+
+    def __init__(self, cond: Node, body: Block, line: int = 0):
+        self.cond = cond
+        self.body = body
+        self.line = line
+
+
+class DoWhile(Node):
+    __slots__ = ('body', 'cond')
+
+    def __init__(self, body: Block, cond: Node, line: int = 0):
+        self.body = body
+        self.cond = cond
+        self.line = line
+
+
+class For(Node):
+    """init es VarDecl, Assign o None; cond y update son opcionales"""
+    __slots__ = ('init', 'cond', 'update', 'body')
+
+    def __init__(self, init: Node, cond: Node, update: Node, body: Block, line: int = 0):
+        self.init = init
+        self.cond = cond
+        self.update = update
+        self.body = body
+        self.line = line
+
+
+class Foreach(Node):
+    __slots__ = ('name', 'iterable', 'body')
+
+    def __init__(self, name: str, iterable: Node, body: Block, line: int = 0):
+        self.name = name
+        self.iterable = iterable
+        self.body = body
+        self.line = line
+
+
+class Break(Node):
+    __slots__ = ()
+
+    def __init__(self, line: int = 0):
+        self.line = line
+
+
+class Continue(Node):
+    __slots__ = ()
+
+    def __init__(self, line: int = 0):
+        self.line = line
+
+
+class Return(Node):
+    __slots__ = ('value',)
+
+    def __init__(self, value: Node = None, line: int = 0):
+        self.value = value
+        self.line = line
+
+
+class TryCatch(Node):
+    __slots__ = ('try_block', 'error_name', 'catch_block')
+
+    def __init__(self, try_block: Block, error_name: str, catch_block: Block, line: int = 0):
+        self.try_block = try_block
+        self.error_name = error_name
+        self.catch_block = catch_block
+        self.line = line
+
+
+class SwitchCase(Node):
+    __slots__ = ('value', 'statements')
+
+    def __init__(self, value: Node, statements: tuple, line: int = 0):
+        self.value = value
+        self.statements = statements
+        self.line = line
+
+
+class Switch(Node):
+    """default es la tupla de sentencias del caso default o None"""
+    __slots__ = ('subject', 'cases', 'default')
+
+    def __init__(self, subject: Node, cases: tuple, default: tuple = None, line: int = 0):
+        self.subject = subject
+        self.cases = cases
+        self.default = default
+        self.line = line
+
+
+class Param(Node):
+    __slots__ = ('name', 'type_text')
+
+    def __init__(self, name: str, type_text: str = None, line: int = 0):
+        self.name = name
+        self.type_text = type_text
+        self.line = line
+
+
+class FunctionDecl(Node):
+    __slots__ = ('name', 'params', 'return_type', 'body')
+
+    def __init__(self, name: str, params: tuple, return_type: str = None,
+                 body: Block = None, line: int = 0):
+        self.name = name
+        self.params = params
+        self.return_type = return_type
+        self.body = body
+        self.line = line
+
+
+class ClassDecl(Node):
+    __slots__ = ('name', 'parent', 'members')
+
+    def __init__(self, name: str, parent: str, members: tuple, line: int = 0):
+        self.name = name
+        self.parent = parent
+        self.members = members
+        self.line = line
+
+
+# ========== EXPRESIONES ==========
+
+LITERAL_INT = "int"
+LITERAL_STRING = "string"
+LITERAL_TRUE = "true"
+LITERAL_FALSE = "false"
+LITERAL_NULL = "null"
+
+
+class Literal(Node):
+    """
+    Literal con su valor decodificado (int, str sin comillas, bool o None)
+    y el texto original, que es lo que se emite en el TAC.
+    """
+    __slots__ = ('kind', 'value', 'text')
+
+    def __init__(self, kind: str, value: Any, text: str, line: int = 0):
+        self.kind = kind
+        self.value = value
+        self.text = text
+        self.line = line
+
+
+class ArrayLiteral(Node):
+    __slots__ = ('elements',)
+
+    def __init__(self, elements: tuple, line: int = 0):
+        self.elements = elements
+        self.line = line
+
+
+class Name(Node):
+    __slots__ = ('name',)
+
+    def __init__(self, name: str, line: int = 0):
+        self.name = name
+        self.line = line
+
+
+class New(Node):
+    __slots__ = ('class_name', 'args')
+
+    def __init__(self, class_name: str, args: tuple, line: int = 0):
+        self.class_name = class_name
+        self.args = args
+        self.line = line
+
+
+class This(Node):
+    __slots__ = ()
+
+    def __init__(self, line: int = 0):
+        self.line = line
+
+
+class Call(Node):
+    """Sufijo de llamada: (args)"""
+    __slots__ = ('args',)
+
+    def __init__(self, args: tuple, line: int = 0):
+        self.args = args
+        self.line = line
+
+
+class Index(Node):
+    """Sufijo de indexación: [index]"""
+    __slots__ = ('index',)
+
+    def __init__(self, index: Node, line: int = 0):
+        self.index = index
+        self.line = line
+
+
+class Member(Node):
+    """Sufijo de acceso a propiedad: .name"""
+    __slots__ = ('name',)
+
+    def __init__(self, name: str, line: int = 0):
+        self.name = name
+        self.line = line
+
+
+class Access(Node):
+    """Átomo (Name, New o This) seguido de sufijos Call/Index/Member"""
+    __slots__ = ('atom', 'suffixes')
+
+    def __init__(self, atom: Node, suffixes: tuple, line: int = 0):
+        self.atom = atom
+        self.suffixes = suffixes
+        self.line = line
+
+
+class Unary(Node):
+    __slots__ = ('op', 'operand')
+
+    def __init__(self, op: str, operand: Node, line: int = 0):
+        self.op = op
+        self.operand = operand
+        self.line = line
+
+
+class Binary(Node):
+    """Operación aritmética: + - * / %"""
+    __slots__ = ('op', 'left', 'right')
+
+    def __init__(self, op: str, left: Node, right: Node, line: int = 0):
+        self.op = op
+        self.left = left
+        self.right = right
+        self.line = line
+
+
+class Compare(Node):
+    """Comparación: < <= > >= == !="""
+    __slots__ = ('op', 'left', 'right')
+
+    def __init__(self, op: str, left: Node, right: Node, line: int = 0):
+        self.op = op
+        self.left = left
+        self.right = right
+        self.line = line
+
+
+class Logical(Node):
+    """Operador lógico de corto circuito: && ||"""
+    __slots__ = ('op', 'left', 'right')
+
+    def __init__(self, op: str, left: Node, right: Node, line: int = 0):
+        self.op = op
+        self.left = left
+        self.right = right
+        self.line = line
+
+
+class Conditional(Node):
+    __slots__ = ('cond', 'then_expr', 'else_expr')
+
+    def __init__(self, cond: Node, then_expr: Node, else_expr: Node, line: int = 0):
+        self.cond = cond
+        self.then_expr = then_expr
+        self.else_expr = else_expr
+        self.line = line
+
+
+class AssignExpr(Node):
+    """Asignación como expresión: target = value"""
+    __slots__ = ('target', 'value')
+
+    def __init__(self, target: Node, value: Node, line: int = 0):
+        self.target = target
+        self.value = value
+        self.line = line
+
+
+class PropertyAssignExpr(Node):
+    """Asignación a propiedad como expresión: target.name = value"""
+    __slots__ = ('target', 'name', 'value')
+
+    def __init__(self, target: Node, name: str, value: Node, line: int = 0):
+        self.target = target
+        self.name = name
+        self.value = value
+        self.line = line
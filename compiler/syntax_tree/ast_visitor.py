@@ -0,0 +1,395 @@
+"""
+Generación de TAC sobre el AST compacto (ast_nodes).
+
+CompiscriptASTVisitor produce exactamente el mismo TAC que
+CompiscriptTACVisitor sobre el árbol de parseo: mismos temporales,
+etiquetas y orden de emisión. Reutiliza la tabla de símbolos, el emitter y
+los generadores de código de la clase base; sólo cambia cómo se recorre el
+árbol.
+"""
+from typing import Optional
+
+from compiler.ir.triplet import OpCode, const_operand, temp_operand, var_operand
+from compiler.syntax_tree import ast_nodes as ast
+from compiler.syntax_tree.visitors import CompiscriptTACVisitor, ExprResult, SimpleSymbol
+
+
+class CompiscriptASTVisitor(CompiscriptTACVisitor):
+    """
+    Visitor de TAC para ast.Program.
+
+    Los métodos visit<Nodo> se despachan con la misma tabla por clase que el
+    visitor del árbol de parseo. Las expresiones retornan ExprResult; sólo los
+    átomos (Name, This, New sin argumentos) pueden retornar None, y _value()
+    les asigna un temporal igual que unaryExpr en la gramática.
+    """
+
+    def __init__(self, parser_class=None, visitor_class=None, compact_ir: bool = False):
+        super().__init__(parser_class, visitor_class, compact_ir=compact_ir)
+
+    def _value(self, node) -> ExprResult:
+        """Evalúa una expresión en posición de operando"""
+        result = self.visit(node)
+        if not isinstance(result, ExprResult):
+            temp = self.emitter.new_temp()
+            if result is not None:
+                self.emitter.emit(OpCode.MOV, str(result), None, temp)
+            return ExprResult(temp)
+        return result
+
+    def _visit_statements(self, statements) -> None:
+        visit = self.visit
+        for stmt in statements:
+            visit(stmt)
+
+    # ========== SENTENCIAS ==========
+
+    def visitProgram(self, node: ast.Program):
+        self._visit_statements(node.statements)
+        return None
+
+    def visitBlock(self, node: ast.Block):
+        self.symbol_table.enter_scope()
+        self._visit_statements(node.statements)
+        self.symbol_table.exit_scope()
+        return None
+
+    def visitVarDecl(self, node: ast.VarDecl):
+        var_type = node.type_name or "integer"
+        is_array = node.array_dims > 0
+        symbol = self._declare_variable(node.name, var_type, is_array, [0] * node.array_dims)
+
+        if node.init is not None:
+            self._gen_variable_init(symbol, self._value(node.init))
+        else:
+            self._gen_default_init(symbol)
+        return None
+
+    def visitConstDecl(self, node: ast.ConstDecl):
+        var_type = node.type_text or "integer"
+        address = self.memory_model.allocate_global(4)
+        self.symbol_table.insert(node.name, SimpleSymbol(node.name, var_type, address))
+
+        expr_result = self._value(node.value)
+        self.emitter.emit(OpCode.MOV, expr_result.temp, None, node.name)
+        return None
+
+    def visitAssign(self, node: ast.Assign):
+        expr_result = self._value(node.value)
+        self.emitter.emit(OpCode.MOV, expr_result.temp, None, node.name)
+        return None
+
+    def visitPropertyAssign(self, node: ast.PropertyAssign):
+        obj_temp = self._value(node.obj).temp
+        value_temp = self._value(node.value).temp
+        self.emitter.emit(OpCode.SET_FIELD, obj_temp, node.name, value_temp)
+        return None
+
+    def visitExprStmt(self, node: ast.ExprStmt):
+        return self._value(node.expr)
+
+    def visitPrint(self, node: ast.Print):
+        expr_result = self._value(node.expr)
+        self.emitter.emit(OpCode.PRINT, temp_operand(expr_result.temp))
+        return None
+
+    def visitIf(self, node: ast.If):
+        emitter = self.emitter
+        cond_result = self._value(node.cond)
+
+        true_label = emitter.new_label('if_true')
+        emitter.backpatch(cond_result.true_list, true_label)
+        emitter.emit_label(true_label)
+
+        self.visit(node.then_block)
+
+        if node.else_block is not None:
+            then_jump_list = emitter.make_list(emitter.emit_jump(""))
+
+            false_label = emitter.new_label('if_false')
+            emitter.backpatch(cond_result.false_list, false_label)
+            emitter.emit_label(false_label)
+
+            self.visit(node.else_block)
+
+            end_label = emitter.new_label('if_end')
+            emitter.backpatch(then_jump_list, end_label)
+            emitter.emit_label(end_label)
+        else:
+            end_label = emitter.new_label('if_end')
+            emitter.backpatch(cond_result.false_list, end_label)
+            emitter.emit_label(end_label)
+        return None
+
+    def visitWhile(self, node: ast.While):
+        emitter = self.emitter
+        begin_label = emitter.new_label('loop_start')
+        emitter.emit_label(begin_label)
+
+        continue_label, break_label = emitter.enter_loop()
+
+        cond_result = self._value(node.cond)
+        body_label = emitter.new_label('loop_body')
+        emitter.backpatch(cond_result.true_list, body_label)
+        emitter.emit_label(body_label)
+
+        self.visit(node.body)
+
+        emitter.emit_label(continue_label)
+        emitter.emit_jump(begin_label)
+
+        emitter.emit_label(break_label)
+        emitter.backpatch(cond_result.false_list, break_label)
+
+        emitter.exit_loop(continue_label, break_label)
+        return None
+
+    def visitDoWhile(self, node: ast.DoWhile):
+        emitter = self.emitter
+        begin_label = emitter.new_label('loop_start')
+        emitter.emit_label(begin_label)
+
+        continue_label, break_label = emitter.enter_loop()
+
+        self.visit(node.body)
+
+        emitter.emit_label(continue_label)
+
+        cond_result = self._value(node.cond)
+        emitter.backpatch(cond_result.true_list, begin_label)
+        emitter.backpatch(cond_result.false_list, break_label)
+
+        emitter.emit_label(break_label)
+
+        emitter.exit_loop(continue_label, break_label)
+        return None
+
+    def visitFor(self, node: ast.For):
+        emitter = self.emitter
+        if node.init is not None:
+            self.visit(node.init)
+
+        begin_label = emitter.new_label('loop_start')
+        emitter.emit_label(begin_label)
+
+        continue_label, break_label = emitter.enter_loop()
+
+        cond_result = None
+        if node.cond is not None:
+            cond_result = self._value(node.cond)
+            body_label = emitter.new_label('loop_body')
+            emitter.backpatch(cond_result.true_list, body_label)
+            emitter.emit_label(body_label)
+
+        self.visit(node.body)
+
+        emitter.emit_label(continue_label)
+
+        if node.update is not None:
+            self._value(node.update)
+
+        emitter.emit_jump(begin_label)
+
+        emitter.emit_label(break_label)
+        if cond_result is not None:
+            emitter.backpatch(cond_result.false_list, break_label)
+
+        emitter.exit_loop(continue_label, break_label)
+        return None
+
+    def visitForeach(self, node: ast.Foreach):
+        self._value(node.iterable)
+        self.visit(node.body)
+        return None
+
+    def visitBreak(self, node: ast.Break):
+        self.emitter.emit_break()
+        return None
+
+    def visitContinue(self, node: ast.Continue):
+        self.emitter.emit_continue()
+        return None
+
+    def visitReturn(self, node: ast.Return):
+        if node.value is not None:
+            expr_result = self._value(node.value)
+            self.func_codegen.gen_return(var_operand(expr_result.temp))
+        else:
+            self.func_codegen.gen_return()
+        return None
+
+    def visitTryCatch(self, node: ast.TryCatch):
+        self.visit(node.try_block)
+        self.visit(node.catch_block)
+        return None
+
+    def visitSwitch(self, node: ast.Switch):
+        self._value(node.subject)
+        for case in node.cases:
+            self._value(case.value)
+            self._visit_statements(case.statements)
+        if node.default is not None:
+            self._visit_statements(node.default)
+        return None
+
+    def visitFunctionDecl(self, node: ast.FunctionDecl):
+        params = [param.name for param in node.params]
+        return_type = node.return_type or "void"
+
+        prev_scope = self._enter_function(node.name, params, return_type)
+        if node.body is not None:
+            self.visit(node.body)
+        self._exit_function(node.name, prev_scope)
+        return None
+
+    def visitClassDecl(self, node: ast.ClassDecl):
+        self._visit_statements(node.members)
+        return None
+
+    # ========== EXPRESIONES ==========
+
+    def visitLiteral(self, node: ast.Literal):
+        temp = self.emitter.new_temp()
+        self.emitter.emit(OpCode.MOV, const_operand(node.text), None, temp_operand(temp))
+        return ExprResult(temp)
+
+    def visitArrayLiteral(self, node: ast.ArrayLiteral):
+        array_temp = self.emitter.new_temp()
+
+        if node.elements:
+            self.array_codegen.gen_array_allocation(
+                array_temp,
+                "integer",
+                len(node.elements),
+                is_global=(self.current_scope == "global")
+            )
+            for i, element in enumerate(node.elements):
+                expr_temp = self._value(element).temp
+                self.array_codegen.gen_array_assignment(
+                    array_temp,
+                    const_operand(i),
+                    var_operand(expr_temp),
+                    check_bounds=False
+                )
+        else:
+            self.emitter.emit(
+                OpCode.ARRAY_ALLOC,
+                const_operand(0),
+                const_operand(4),
+                temp_operand(array_temp),
+                comment="Empty array literal"
+            )
+        return ExprResult(array_temp)
+
+    def visitName(self, node: ast.Name):
+        # La lectura de un identificador no emite código (ver _value)
+        return None
+
+    def visitThis(self, node: ast.This):
+        return None
+
+    def visitNew(self, node: ast.New):
+        # Se evalúan los argumentos; el resultado es el del último
+        result = None
+        for arg in node.args:
+            result = self._value(arg)
+        return result
+
+    def visitAccess(self, node: ast.Access):
+        atom = node.atom
+        current_result = self.visit(atom)
+
+        # Llamadas e indexación se resuelven por el nombre del átomo
+        atom_name: Optional[str] = None
+        if atom.__class__ is ast.Name:
+            atom_name = atom.name
+        elif atom.__class__ is ast.New:
+            atom_name = atom.class_name
+
+        for suffix in node.suffixes:
+            suffix_class = suffix.__class__
+            if suffix_class is ast.Call:
+                if atom_name:
+                    args = [self._value(arg).temp for arg in suffix.args]
+                    current_result = self._gen_call(atom_name, args)
+            elif suffix_class is ast.Index:
+                if atom_name:
+                    index_temp = self._value(suffix.index).temp
+                    current_result = self._gen_array_read(atom_name, index_temp)
+                else:
+                    current_result = ExprResult(self.emitter.new_temp())
+            # ast.Member: el acceso a propiedad no genera código
+
+        return current_result
+
+    def visitUnary(self, node: ast.Unary):
+        operand_temp = self._value(node.operand).temp
+        result_temp = self.emitter.new_temp()
+
+        if node.op == '-':
+            self.emitter.emit(OpCode.NEG, operand_temp, None, result_temp)
+        else:
+            self.emitter.emit(OpCode.NOT, operand_temp, None, result_temp)
+        return ExprResult(result_temp)
+
+    _ARITHMETIC_OPS = {'+': OpCode.ADD, '-': OpCode.SUB, '*': OpCode.MUL,
+                       '/': OpCode.DIV, '%': OpCode.MOD}
+
+    def visitBinary(self, node: ast.Binary):
+        left_temp = self._value(node.left).temp
+        right_temp = self._value(node.right).temp
+        result_temp = self.emitter.new_temp()
+
+        self.emitter.emit(self._ARITHMETIC_OPS[node.op], temp_operand(left_temp),
+                          temp_operand(right_temp), temp_operand(result_temp))
+        return ExprResult(result_temp)
+
+    _COMPARE_OPS = {'<': OpCode.BLT, '<=': OpCode.BLE, '>': OpCode.BGT,
+                    '>=': OpCode.BGE, '==': OpCode.BEQ, '!=': OpCode.BNE}
+
+    def visitCompare(self, node: ast.Compare):
+        left_temp = self._value(node.left).temp
+        right_temp = self._value(node.right).temp
+
+        result = ExprResult(self.emitter.new_temp())
+        true_jump = self.emitter.emit_conditional_jump(self._COMPARE_OPS[node.op], left_temp, right_temp)
+        false_jump = self.emitter.emit_jump("")
+
+        result.true_list.add(true_jump)
+        result.false_list.add(false_jump)
+        return result
+
+    def visitLogical(self, node: ast.Logical):
+        emitter = self.emitter
+        left_result = self._value(node.left)
+
+        if node.op == '&&':
+            m_label = emitter.new_label('and_next')
+            emitter.backpatch(left_result.true_list, m_label)
+            emitter.emit_label(m_label)
+
+            right_result = self._value(node.right)
+            left_result.true_list = right_result.true_list
+            left_result.false_list = emitter.merge_lists(left_result.false_list, right_result.false_list)
+        else:
+            m_label = emitter.new_label('or_next')
+            emitter.backpatch(left_result.false_list, m_label)
+            emitter.emit_label(m_label)
+
+            right_result = self._value(node.right)
+            left_result.true_list = emitter.merge_lists(left_result.true_list, right_result.true_list)
+            left_result.false_list = right_result.false_list
+        return left_result
+
+    def visitConditional(self, node: ast.Conditional):
+        # Igual que visitTernaryExpr: sólo se genera código para la condición
+        return self._value(node.cond)
+
+    def visitAssignExpr(self, node: ast.AssignExpr):
+        # El lado izquierdo se evalúa por sus efectos (llamadas, índices)
+        self.visit(node.target)
+        return self._value(node.value)
+
+    def visitPropertyAssignExpr(self, node: ast.PropertyAssignExpr):
+        self.visit(node.target)
+        return self._value(node.value)
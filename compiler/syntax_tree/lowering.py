@@ -0,0 +1,368 @@
+"""
+Lowering del árbol de parseo de ANTLR al AST compacto (ast_nodes).
+
+Se recorre el árbol una sola vez directamente sobre ctx.children, sin pasar
+por los accesores generados (que vuelven a filtrar la lista de hijos en
+cada llamada). Los niveles de precedencia con un solo hijo se colapsan, los
+identificadores se internan y los literales se decodifican.
+
+El árbol de ANTLR tiene ciclos (children <-> parentCtx), así que al soltar
+la raíz sólo lo libera el recolector de ciclos. Con release=True cada
+subárbol se desarma (children = None) en cuanto termina su lowering y la
+memoria se devuelve por conteo de referencias mientras se construye el AST.
+"""
+import sys
+from typing import Callable, Dict, Optional
+
+from antlr4.tree.Tree import TerminalNode
+
+from compiler.syntax_tree import ast_nodes as ast
+
+
+# Reglas que con un solo hijo no aportan nada al AST: el lowering baja
+# directamente a ese hijo sin despachar un método por nivel
+_SINGLE_CHILD_RULES = frozenset({
+    'StatementContext', 'ClassMemberContext', 'ExpressionContext',
+    'ExprNoAssignContext', 'TernaryExprContext', 'LogicalOrExprContext',
+    'LogicalAndExprContext', 'EqualityExprContext', 'RelationalExprContext',
+    'AdditiveExprContext', 'MultiplicativeExprContext', 'UnaryExprContext',
+    'PrimaryExprContext',
+})
+
+
+def _text(terminal) -> str:
+    return sys.intern(terminal.symbol.text)
+
+
+def _rules(ctx) -> list:
+    """Hijos no terminales de un contexto"""
+    children = ctx.children
+    if children is None:
+        return []
+    return [c for c in children if not isinstance(c, TerminalNode)]
+
+
+def _line(ctx) -> int:
+    return ctx.start.line if ctx.start is not None else 0
+
+
+def _release(ctx) -> None:
+    """Desarma el subárbol de ctx para que se libere sin el recolector de ciclos"""
+    stack = [ctx]
+    while stack:
+        node = stack.pop()
+        children = node.children
+        if children:
+            # Los subárboles ya liberados tienen children = None y se saltan
+            node.children = None
+            stack.extend(c for c in children if not isinstance(c, TerminalNode))
+
+
+class ParseTreeLowering:
+    """
+    Convierte un ProgramContext en un ast.Program.
+
+    Igual que en CompiscriptTACVisitor, el método para cada contexto se
+    resuelve por nombre (<Regla>Context -> _lower<Regla>) una sola vez por
+    clase de contexto.
+    """
+
+    _dispatch_table: Dict[type, Callable] = {}
+    _single_child_table: Dict[type, bool] = {}
+
+    def __init__(self, release: bool = False):
+        self.release = release
+
+    def lower(self, ctx) -> Optional[ast.Node]:
+        if ctx is None:
+            return None
+
+        top = ctx
+        single_child = self._single_child_table
+        while True:
+            try:
+                collapse = single_child[ctx.__class__]
+            except KeyError:
+                collapse = ctx.__class__.__name__ in _SINGLE_CHILD_RULES
+                single_child[ctx.__class__] = collapse
+            if not collapse or len(ctx.children) != 1:
+                break
+            ctx = ctx.children[0]
+
+        try:
+            method = self._dispatch_table[ctx.__class__]
+        except KeyError:
+            name = ctx.__class__.__name__
+            if name.endswith('Context'):
+                name = name[:-7]
+            method = getattr(type(self), f'_lower{name}', None)
+            if method is None:
+                raise NotImplementedError(f"No hay lowering para '{ctx.__class__.__name__}'")
+            self._dispatch_table[ctx.__class__] = method
+        node = method(self, ctx)
+        if self.release:
+            _release(top)
+        return node
+
+    def _lower_all(self, ctxs) -> tuple:
+        lower = self.lower
+        return tuple(lower(c) for c in ctxs)
+
+    # ========== SENTENCIAS ==========
+
+    def _lowerProgram(self, ctx) -> ast.Program:
+        return ast.Program(self._lower_all(_rules(ctx)), _line(ctx))
+
+    def _lowerStatement(self, ctx) -> ast.Node:
+        return self.lower(ctx.children[0])
+
+    def _lowerBlock(self, ctx) -> ast.Block:
+        return ast.Block(self._lower_all(_rules(ctx)), _line(ctx))
+
+    def _lowerVariableDeclaration(self, ctx) -> ast.VarDecl:
+        name = _text(ctx.Identifier())
+        type_name = None
+        array_dims = 0
+        annotation = ctx.typeAnnotation()
+        if annotation is not None:
+            type_ctx = annotation.type_()
+            type_name = sys.intern(type_ctx.baseType().getText())
+            # type: baseType ('[' ']')*
+            array_dims = len(type_ctx.children) // 2
+
+        init = None
+        initializer = ctx.initializer()
+        if initializer is not None:
+            init = self.lower(initializer.expression())
+        return ast.VarDecl(name, type_name, array_dims, init, _line(ctx))
+
+    def _lowerConstantDeclaration(self, ctx) -> ast.ConstDecl:
+        type_text = None
+        annotation = ctx.typeAnnotation()
+        if annotation is not None:
+            type_text = sys.intern(annotation.type_().getText())
+        return ast.ConstDecl(_text(ctx.Identifier()), type_text,
+                             self.lower(ctx.expression()), _line(ctx))
+
+    def _lowerAssignment(self, ctx) -> ast.Node:
+        exprs = ctx.expression()
+        name = _text(ctx.Identifier())
+        if len(exprs) == 1:
+            return ast.Assign(name, self.lower(exprs[0]), _line(ctx))
+        return ast.PropertyAssign(self.lower(exprs[0]), name, self.lower(exprs[1]), _line(ctx))
+
+    def _lowerExpressionStatement(self, ctx) -> ast.ExprStmt:
+        return ast.ExprStmt(self.lower(ctx.children[0]), _line(ctx))
+
+    def _lowerPrintStatement(self, ctx) -> ast.Print:
+        return ast.Print(self.lower(ctx.expression()), _line(ctx))
+
+    def _lowerIfStatement(self, ctx) -> ast.If:
+        blocks = ctx.block()
+        else_block = self.lower(blocks[1]) if len(blocks) > 1 else None
+        return ast.If(self.lower(ctx.expression()), self.lower(blocks[0]), else_block, _line(ctx))
+
+    def _lowerWhileStatement(self, ctx) -> ast.While:
+        return ast.While(self.lower(ctx.expression()), self.lower(ctx.block()), _line(ctx))
+
+    def _lowerDoWhileStatement(self, ctx) -> ast.DoWhile:
+        return ast.DoWhile(self.lower(ctx.block()), self.lower(ctx.expression()), _line(ctx))
+
+    def _lowerForStatement(self, ctx) -> ast.For:
+        # 'for' '(' (variableDeclaration | assignment | ';') expression? ';' expression? ')' block
+        # La declaración/asignación inicial incluye su propio ';'. La condición
+        # es la expresión antes del siguiente ';' y la actualización la de
+        # después, aunque alguna de las dos falte.
+        children = ctx.children
+        init_ctx = children[2]
+        init = None if isinstance(init_ctx, TerminalNode) else self.lower(init_ctx)
+        cond = update = None
+        seen_separator = False
+        for child in children[3:-2]:
+            if isinstance(child, TerminalNode):
+                seen_separator = True
+            elif seen_separator:
+                update = self.lower(child)
+            else:
+                cond = self.lower(child)
+        return ast.For(init, cond, update, self.lower(ctx.block()), _line(ctx))
+
+    def _lowerForeachStatement(self, ctx) -> ast.Foreach:
+        return ast.Foreach(_text(ctx.Identifier()), self.lower(ctx.expression()),
+                           self.lower(ctx.block()), _line(ctx))
+
+    def _lowerBreakStatement(self, ctx) -> ast.Break:
+        return ast.Break(_line(ctx))
+
+    def _lowerContinueStatement(self, ctx) -> ast.Continue:
+        return ast.Continue(_line(ctx))
+
+    def _lowerReturnStatement(self, ctx) -> ast.Return:
+        return ast.Return(self.lower(ctx.expression()), _line(ctx))
+
+    def _lowerTryCatchStatement(self, ctx) -> ast.TryCatch:
+        blocks = ctx.block()
+        return ast.TryCatch(self.lower(blocks[0]), _text(ctx.Identifier()),
+                            self.lower(blocks[1]), _line(ctx))
+
+    def _lowerSwitchStatement(self, ctx) -> ast.Switch:
+        cases = tuple(
+            ast.SwitchCase(self.lower(case.expression()),
+                           self._lower_all(case.statement()), _line(case))
+            for case in ctx.switchCase()
+        )
+        default = None
+        default_ctx = ctx.defaultCase()
+        if default_ctx is not None:
+            default = self._lower_all(default_ctx.statement())
+        return ast.Switch(self.lower(ctx.expression()), cases, default, _line(ctx))
+
+    def _lowerFunctionDeclaration(self, ctx) -> ast.FunctionDecl:
+        params = ()
+        params_ctx = ctx.parameters()
+        if params_ctx is not None:
+            params = tuple(
+                ast.Param(_text(p.Identifier()),
+                          sys.intern(p.type_().getText()) if p.type_() is not None else None,
+                          _line(p))
+                for p in params_ctx.parameter()
+            )
+        return_type = None
+        if ctx.type_() is not None:
+            return_type = sys.intern(ctx.type_().getText())
+        return ast.FunctionDecl(_text(ctx.Identifier()), params, return_type,
+                                self.lower(ctx.block()), _line(ctx))
+
+    def _lowerClassDeclaration(self, ctx) -> ast.ClassDecl:
+        identifiers = ctx.Identifier()
+        parent = _text(identifiers[1]) if len(identifiers) > 1 else None
+        members = tuple(self.lower(member.children[0]) for member in ctx.classMember())
+        return ast.ClassDecl(_text(identifiers[0]), parent, members, _line(ctx))
+
+    # ========== EXPRESIONES ==========
+
+    def _lowerExpression(self, ctx) -> ast.Node:
+        return self.lower(ctx.children[0])
+
+    def _lowerAssignExpr(self, ctx) -> ast.AssignExpr:
+        # lhs '=' assignmentExpr
+        children = ctx.children
+        return ast.AssignExpr(self.lower(children[0]), self.lower(children[2]), _line(ctx))
+
+    def _lowerPropertyAssignExpr(self, ctx) -> ast.PropertyAssignExpr:
+        # lhs '.' Identifier '=' assignmentExpr
+        children = ctx.children
+        return ast.PropertyAssignExpr(self.lower(children[0]), _text(children[2]),
+                                      self.lower(children[4]), _line(ctx))
+
+    def _lowerExprNoAssign(self, ctx) -> ast.Node:
+        return self.lower(ctx.children[0])
+
+    def _lowerTernaryExpr(self, ctx) -> ast.Node:
+        children = ctx.children
+        if len(children) == 1:
+            return self.lower(children[0])
+        # logicalOrExpr '?' expression ':' expression
+        return ast.Conditional(self.lower(children[0]), self.lower(children[2]),
+                               self.lower(children[4]), _line(ctx))
+
+    def _lower_chain(self, ctx, node_class) -> ast.Node:
+        """operando (op operando)* asociando a la izquierda"""
+        children = ctx.children
+        left = self.lower(children[0])
+        if len(children) == 1:
+            return left
+        line = _line(ctx)
+        for i in range(1, len(children), 2):
+            left = node_class(_text(children[i]), left, self.lower(children[i + 1]), line)
+        return left
+
+    def _lowerLogicalOrExpr(self, ctx) -> ast.Node:
+        return self._lower_chain(ctx, ast.Logical)
+
+    def _lowerLogicalAndExpr(self, ctx) -> ast.Node:
+        return self._lower_chain(ctx, ast.Logical)
+
+    def _lowerEqualityExpr(self, ctx) -> ast.Node:
+        return self._lower_chain(ctx, ast.Compare)
+
+    def _lowerRelationalExpr(self, ctx) -> ast.Node:
+        return self._lower_chain(ctx, ast.Compare)
+
+    def _lowerAdditiveExpr(self, ctx) -> ast.Node:
+        return self._lower_chain(ctx, ast.Binary)
+
+    def _lowerMultiplicativeExpr(self, ctx) -> ast.Node:
+        return self._lower_chain(ctx, ast.Binary)
+
+    def _lowerUnaryExpr(self, ctx) -> ast.Node:
+        children = ctx.children
+        if len(children) == 1:
+            return self.lower(children[0])
+        return ast.Unary(_text(children[0]), self.lower(children[1]), _line(ctx))
+
+    def _lowerPrimaryExpr(self, ctx) -> ast.Node:
+        children = ctx.children
+        if len(children) == 1:
+            return self.lower(children[0])
+        # '(' expression ')'
+        return self.lower(children[1])
+
+    def _lowerLiteralExpr(self, ctx) -> ast.Node:
+        child = ctx.children[0]
+        if not isinstance(child, TerminalNode):
+            return self.lower(child)  # arrayLiteral
+
+        text = child.symbol.text
+        line = child.symbol.line
+        if text == 'null':
+            return ast.Literal(ast.LITERAL_NULL, None, text, line)
+        if text == 'true':
+            return ast.Literal(ast.LITERAL_TRUE, True, text, line)
+        if text == 'false':
+            return ast.Literal(ast.LITERAL_FALSE, False, text, line)
+        if text.startswith('"'):
+            return ast.Literal(ast.LITERAL_STRING, text[1:-1], text, line)
+        return ast.Literal(ast.LITERAL_INT, int(text), text, line)
+
+    def _lowerArrayLiteral(self, ctx) -> ast.ArrayLiteral:
+        return ast.ArrayLiteral(self._lower_all(_rules(ctx)), _line(ctx))
+
+    def _lowerLeftHandSide(self, ctx) -> ast.Node:
+        children = ctx.children
+        atom = self.lower(children[0])
+        if len(children) == 1:
+            return atom
+        return ast.Access(atom, self._lower_all(children[1:]), _line(ctx))
+
+    def _lowerIdentifierExpr(self, ctx) -> ast.Name:
+        return ast.Name(_text(ctx.children[0]), _line(ctx))
+
+    def _lowerNewExpr(self, ctx) -> ast.New:
+        # 'new' Identifier '(' arguments? ')'
+        args_ctx = ctx.arguments()
+        args = self._lower_all(_rules(args_ctx)) if args_ctx is not None else ()
+        return ast.New(_text(ctx.children[1]), args, _line(ctx))
+
+    def _lowerThisExpr(self, ctx) -> ast.This:
+        return ast.This(_line(ctx))
+
+    def _lowerCallExpr(self, ctx) -> ast.Call:
+        args_ctx = ctx.arguments()
+        args = self._lower_all(_rules(args_ctx)) if args_ctx is not None else ()
+        return ast.Call(args, _line(ctx))
+
+    def _lowerIndexExpr(self, ctx) -> ast.Index:
+        return ast.Index(self.lower(ctx.children[1]), _line(ctx))
+
+    def _lowerPropertyAccessExpr(self, ctx) -> ast.Member:
+        return ast.Member(_text(ctx.children[1]), _line(ctx))
+
+
+def lower_program(tree, release: bool = False) -> ast.Program:
+    """
+    Convierte el árbol de parseo (ProgramContext) en un ast.Program.
+
+    Con release=True el árbol queda vacío tras el lowering (ver _release).
+    """
+    return ParseTreeLowering(release).lower(tree)
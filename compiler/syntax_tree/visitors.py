@@ -1,5 +1,6 @@
 from antlr4 import *
-from typing import Optional, Any, Dict, List
+from antlr4.tree.Tree import TerminalNode
+from typing import Optional, Any, Callable, Dict, List
 import sys
 import os
 
@@ -91,6 +92,30 @@ class SimpleMemoryModel:
         return self.segment_map.get(var_name, f"G[{var_name}]")
 
 
+# Reglas de la gramática que con un solo hijo se limitan a reenviar el
+# resultado de ese hijo. El valor indica qué hace el nivel cuando el
+# resultado no es un ExprResult (banderas combinables):
+_CHAIN_PASS = 0   # lo retorna tal cual
+_CHAIN_TEMP = 1   # None -> ExprResult con un temporal nuevo
+_CHAIN_MOV = 2    # además, cualquier otro valor -> MOV a un temporal nuevo
+
+_CHAIN_RULES = {
+    'Statement': _CHAIN_PASS,
+    'ClassMember': _CHAIN_PASS,
+    'Expression': _CHAIN_PASS,
+    'ExprNoAssign': _CHAIN_TEMP,
+    'TernaryExpr': _CHAIN_TEMP,
+    'LogicalOrExpr': _CHAIN_PASS,
+    'LogicalAndExpr': _CHAIN_PASS,
+    'EqualityExpr': _CHAIN_PASS,
+    'RelationalExpr': _CHAIN_PASS,
+    'AdditiveExpr': _CHAIN_PASS,
+    'MultiplicativeExpr': _CHAIN_PASS,
+    'UnaryExpr': _CHAIN_TEMP | _CHAIN_MOV,
+    'PrimaryExpr': _CHAIN_PASS,
+}
+
+
 class ExprResult:
     def __init__(self, temp: str, true_list: Optional[BackpatchList] = None, 
                  false_list: Optional[BackpatchList] = None):
@@ -105,13 +130,21 @@ class CompiscriptTACVisitor:
     Recibe las clases Parser y Visitor como parámetros en el constructor.
     """
     
-    def __init__(self, parser_class, visitor_class):
+    def __init__(self, parser_class, visitor_class, collapse_chains: bool = True,
+                 compact_ir: bool = False):
         # Guardamos las clases para poder acceder a sus contextos
         self.ParserClass = parser_class
         self.VisitorClass = visitor_class
+
+        # Tabla de despacho compartida por todas las instancias de esta clase.
+        # Con collapse_chains los niveles de precedencia de un solo hijo se
+        # atraviesan en _visit_chain sin despachar un método por nivel.
+        self._methods = type(self)._get_dispatch_table(parser_class)
+        self._dispatch = type(self)._chain_dispatch_table if collapse_chains else self._methods
         
         # Inicializamos las estructuras de datos
-        self.emitter = TripletEmitter()
+        # compact_ir: tripletos en buffers paralelos (CompactTripletTable)
+        self.emitter = TripletEmitter(compact=compact_ir)
         self.symbol_table = SimpleSymbolTable()
         self.memory_model = SimpleMemoryModel()
         self.current_scope = "global"
@@ -143,40 +176,128 @@ class CompiscriptTACVisitor:
 
         return default_values.get(base_type, 'undefined')
 
+    @classmethod
+    def _get_dispatch_table(cls, parser_class=None) -> Dict[type, Optional[Callable]]:
+        """
+        Retorna la tabla {clase de contexto: función visit} de esta clase de
+        visitor. Se construye una sola vez por clase; si se conoce la clase
+        del parser se precargan todos sus contextos.
+        """
+        table = cls.__dict__.get('_dispatch_table')
+        if table is None:
+            table = {}
+            cls._dispatch_table = table
+            cls._dispatch_parsers = set()
+            # Variante con _visit_chain para las reglas de _CHAIN_RULES
+            cls._chain_dispatch_table = {}
+            cls._chain_table = {}
+
+        if parser_class is not None and parser_class not in cls._dispatch_parsers:
+            cls._dispatch_parsers.add(parser_class)
+            for attr in vars(parser_class).values():
+                if isinstance(attr, type) and issubclass(attr, ParserRuleContext):
+                    cls._resolve_visit_method(attr)
+        return table
+
+    @classmethod
+    def _resolve_visit_method(cls, ctx_class: type) -> Optional[Callable]:
+        """Resuelve y cachea el método visit para una clase de contexto"""
+        if issubclass(ctx_class, TerminalNode):
+            # Los terminales no tienen visitor ni hijos: siempre retornan None
+            method = None
+        else:
+            # visit<Regla> a partir de <Regla>Context (o del nombre del nodo
+            # para árboles que no son de ANTLR, p. ej. el AST compacto)
+            class_name = ctx_class.__name__
+            if class_name.endswith('Context'):
+                class_name = class_name[:-7]
+            method = getattr(cls, f'visit{class_name}', None)
+            if method is None:
+                # Si no hay método específico, visitamos los hijos
+                method = cls.visitChildren
+        cls._get_dispatch_table()[ctx_class] = method
+
+        # Sólo se colapsa un nivel si su método no fue redefinido en una subclase
+        chain_kind = None
+        if method is not None and not issubclass(ctx_class, TerminalNode):
+            kind = _CHAIN_RULES.get(class_name)
+            base_method = getattr(CompiscriptTACVisitor, f'visit{class_name}', CompiscriptTACVisitor.visitChildren)
+            if kind is not None and method is base_method:
+                chain_kind = kind
+        if chain_kind is not None:
+            cls._chain_table[ctx_class] = chain_kind
+            cls._chain_dispatch_table[ctx_class] = cls._visit_chain
+        else:
+            cls._chain_dispatch_table[ctx_class] = method
+        return method
+
     def visit(self, ctx):
         """Método genérico de visita que delega al método específico"""
         if ctx is None:
             return None
 
-        # Obtenemos el nombre de la clase del contexto
-        class_name = ctx.__class__.__name__
+        try:
+            method = self._dispatch[ctx.__class__]
+        except KeyError:
+            self._resolve_visit_method(ctx.__class__)
+            method = self._dispatch[ctx.__class__]
 
-        # Construimos el nombre del método visitor
-        visitor_method_name = f'visit{class_name[:-7]}'  # Removemos 'Context'
+        if method is None:
+            return None
+        return method(self, ctx)
 
-        # Buscamos el método correspondiente
-        visitor = getattr(self, visitor_method_name, None)
-        if visitor:
-            return visitor(ctx)
-        else:
-            # Si no hay método específico, visitamos los hijos
-            return self.visitChildren(ctx)
+    def _visit_chain(self, ctx):
+        """
+        Baja por una cadena de niveles de precedencia con un solo hijo
+        (expression -> assignmentExpr -> ... -> unaryExpr -> primaryExpr) hasta
+        el primer nodo con operador o el átomo, y lo visita directamente. Lo
+        que los niveles saltados harían con el resultado se aplica una vez
+        al final, así que el TAC es el mismo que visitando nivel por nivel.
+        """
+        chain = self._chain_table
+        wrap = _CHAIN_PASS
+        kind = chain.get(ctx.__class__)
+        while kind is not None:
+            children = ctx.children
+            if children is None or len(children) != 1:
+                break
+            wrap |= kind
+            ctx = children[0]
+            kind = chain.get(ctx.__class__)
+
+        try:
+            method = self._methods[ctx.__class__]
+        except KeyError:
+            method = self._resolve_visit_method(ctx.__class__)
+        result = method(self, ctx) if method is not None else None
+
+        if wrap and not isinstance(result, ExprResult):
+            if result is None:
+                return ExprResult(self.emitter.new_temp())
+            if wrap & _CHAIN_MOV:
+                temp = self.emitter.new_temp()
+                self.emitter.emit(OpCode.MOV, str(result), None, temp)
+                return ExprResult(temp)
+        return result
     
     def visitChildren(self, ctx):
         """Visita todos los hijos de un nodo"""
         if ctx is None:
             return None
         
-        # Check if this is a terminal node (no children)
-        if not hasattr(ctx, 'children') or ctx.children is None:
+        # Los nodos terminales no tienen hijos
+        children = getattr(ctx, 'children', None)
+        if children is None:
             return None
         
         result = None
-        for child in ctx.children:
-            if hasattr(child, 'accept'):
-                child_result = self.visit(child)
-                if child_result is not None:
-                    result = child_result
+        visit = self.visit
+        for child in children:
+            if isinstance(child, TerminalNode):
+                continue
+            child_result = visit(child)
+            if child_result is not None:
+                result = child_result
         return result
         
     def get_triplets(self):
@@ -388,8 +509,21 @@ class CompiscriptTACVisitor:
         
         continue_label, break_label = self.emitter.enter_loop()
         
-        if ctx.expression(0):
-            cond_result = self.visit(ctx.expression(0))
+        # 'for' '(' (variableDeclaration | assignment | ';') expression? ';' expression? ')' block
+        # La condición es la expresión antes del ';' y la actualización la de
+        # después: en `for (;; i = i + 1)` la única expresión es la actualización
+        cond_ctx = update_ctx = None
+        seen_separator = False
+        for child in ctx.children[3:-2]:
+            if isinstance(child, TerminalNode):
+                seen_separator = True
+            elif seen_separator:
+                update_ctx = child
+            else:
+                cond_ctx = child
+        
+        if cond_ctx:
+            cond_result = self.visit(cond_ctx)
             
             if not isinstance(cond_result, ExprResult):
                 temp = cond_result if cond_result else self.emitter.new_temp()
@@ -407,13 +541,13 @@ class CompiscriptTACVisitor:
         
         self.emitter.emit_label(continue_label)
         
-        if ctx.expression(1):
-            self.visit(ctx.expression(1))
+        if update_ctx:
+            self.visit(update_ctx)
         
         self.emitter.emit_jump(begin_label)
         
         self.emitter.emit_label(break_label)
-        if ctx.expression(0):
+        if cond_ctx:
             self.emitter.backpatch(cond_result.false_list, break_label)
         
         self.emitter.exit_loop(continue_label, break_label)
@@ -667,10 +801,12 @@ class CompiscriptTACVisitor:
         current_result = primary_result
         for suffix in suffix_ops:
             # Determinar tipo de suffix
-            if suffix.arguments():  # Es una llamada: func()
+            # Cada tipo de suffixOp tiene accesores distintos: se identifica
+            # por su presencia (llamar a un accesor inexistente falla)
+            if hasattr(suffix, 'arguments'):  # Es una llamada: func()
                 # Obtener nombre de función
                 func_name = None
-                if ctx.primaryAtom().Identifier():
+                if hasattr(ctx.primaryAtom(), 'Identifier') and ctx.primaryAtom().Identifier():
                     func_name = ctx.primaryAtom().Identifier().getText()
                 
                 if func_name:
@@ -697,27 +833,15 @@ class CompiscriptTACVisitor:
                             
                             args.append(arg_temp)
                     
-                    # Emitir PARAM para cada argumento
-                    for arg_temp in args:
-                        self.emitter.emit(OpCode.PARAM, temp_operand(arg_temp), None, None)
-                    
-                    # Generar CALL con el nombre de la función
-                    result_temp = self.emitter.new_temp()
-                    self.emitter.emit(
-                        OpCode.CALL,
-                        var_operand(func_name),
-                        const_operand(len(args)),
-                        temp_operand(result_temp)
-                    )
-                    
-                    current_result = ExprResult(result_temp)
+                    # Emitir PARAM para cada argumento y CALL con el nombre de la función
+                    current_result = self._gen_call(func_name, args)
             
-            elif suffix.expression():  # Es indexación: arr[index]
+            elif hasattr(suffix, 'expression'):  # Es indexación: arr[index]
                 suffix_result = self.visit(suffix)
                 if isinstance(suffix_result, ExprResult):
                     current_result = suffix_result
             
-            elif suffix.Identifier():  # Es acceso a propiedad: obj.prop
+            elif hasattr(suffix, 'Identifier'):  # Es acceso a propiedad: obj.prop
                 suffix_result = self.visit(suffix)
                 if isinstance(suffix_result, ExprResult):
                     current_result = suffix_result
@@ -739,13 +863,13 @@ class CompiscriptTACVisitor:
             result = ExprResult(self.emitter.new_temp())
             
             if op_text == '<':
-                true_jump = self.emitter.emit(OpCode.BLT, left_temp, right_temp, "")
+                true_jump = self.emitter.emit_conditional_jump(OpCode.BLT, left_temp, right_temp)
             elif op_text == '<=':
-                true_jump = self.emitter.emit(OpCode.BLE, left_temp, right_temp, "")
+                true_jump = self.emitter.emit_conditional_jump(OpCode.BLE, left_temp, right_temp)
             elif op_text == '>':
-                true_jump = self.emitter.emit(OpCode.BGT, left_temp, right_temp, "")
+                true_jump = self.emitter.emit_conditional_jump(OpCode.BGT, left_temp, right_temp)
             elif op_text == '>=':
-                true_jump = self.emitter.emit(OpCode.BGE, left_temp, right_temp, "")
+                true_jump = self.emitter.emit_conditional_jump(OpCode.BGE, left_temp, right_temp)
             else:
                 continue
             
@@ -773,9 +897,9 @@ class CompiscriptTACVisitor:
             result = ExprResult(self.emitter.new_temp())
             
             if op_text == '==':
-                true_jump = self.emitter.emit(OpCode.BEQ, left_temp, right_temp, "")
+                true_jump = self.emitter.emit_conditional_jump(OpCode.BEQ, left_temp, right_temp)
             elif op_text == '!=':
-                true_jump = self.emitter.emit(OpCode.BNE, left_temp, right_temp, "")
+                true_jump = self.emitter.emit_conditional_jump(OpCode.BNE, left_temp, right_temp)
             else:
                 continue
             
@@ -917,6 +1041,16 @@ class CompiscriptTACVisitor:
         if ctx.type_():
             return_type = ctx.type_().getText()
 
+        prev_scope = self._enter_function(func_name, params, return_type)
+
+        if ctx.block():
+            self.visit(ctx.block())
+
+        self._exit_function(func_name, prev_scope)
+        return None
+
+    def _enter_function(self, func_name: str, params: List[str], return_type: str) -> str:
+        """Emite el prólogo y copia los parámetros a temporales; retorna el scope previo"""
         prev_scope = self.current_scope
         self.current_scope = func_name
 
@@ -939,9 +1073,10 @@ class CompiscriptTACVisitor:
             symbol.temp = temp
             self.symbol_table.insert(param, symbol)
 
-        if ctx.block():
-            self.visit(ctx.block())
+        return prev_scope
 
+    def _exit_function(self, func_name: str, prev_scope: str) -> None:
+        """Emite el epílogo y restaura el scope previo"""
         self.symbol_table.exit_scope()
         self.func_codegen.gen_function_epilog(func_name)
         self.memory_manager.exit_function()
@@ -949,7 +1084,6 @@ class CompiscriptTACVisitor:
         self.param_temps = {}
         
         self.current_scope = prev_scope
-        return None
 
     def visitReturnStatement(self, ctx):
         if ctx.expression():
@@ -1020,20 +1154,7 @@ class CompiscriptTACVisitor:
                     
                     args.append(arg_temp)
 
-        # Emitir PARAM para cada argumento
-        for arg_temp in args:
-            self.emitter.emit(OpCode.PARAM, temp_operand(arg_temp), None, None)
-
-        # Generar CALL
-        result_temp = self.emitter.new_temp()
-        self.emitter.emit(
-            OpCode.CALL,
-            var_operand(func_name),
-            const_operand(len(args)),
-            temp_operand(result_temp)
-        )
-
-        return ExprResult(result_temp)
+        return self._gen_call(func_name, args)
 
     def visitPostfixExpr(self, ctx):
         """
@@ -1080,6 +1201,24 @@ class CompiscriptTACVisitor:
         index_expr = self.visit(ctx.expression())
         index_temp = index_expr.temp if isinstance(index_expr, ExprResult) else str(index_expr)
 
+        return self._gen_array_read(array_name, index_temp)
+
+    def _gen_call(self, func_name: str, arg_temps: List[str]) -> ExprResult:
+        """Emite PARAM para cada argumento y el CALL; retorna el temporal del resultado"""
+        for arg_temp in arg_temps:
+            self.emitter.emit(OpCode.PARAM, temp_operand(arg_temp), None, None)
+
+        result_temp = self.emitter.new_temp()
+        self.emitter.emit(
+            OpCode.CALL,
+            var_operand(func_name),
+            const_operand(len(arg_temps)),
+            temp_operand(result_temp)
+        )
+        return ExprResult(result_temp)
+
+    def _gen_array_read(self, array_name: str, index_temp: str) -> ExprResult:
+        """Genera la lectura array_name[index_temp] con dirección efectiva"""
         # Generar acceso al arreglo con direcciones efectivas
         # Verificar si el arreglo está registrado en array_codegen
         array_info = self.array_codegen.get_array_info(array_name)
@@ -1207,6 +1346,19 @@ class CompiscriptTACVisitor:
                         # Contar dimensiones
                         array_dimensions = [0] * brackets.count('[')
 
+        symbol = self._declare_variable(var_name, var_type, is_array, array_dimensions)
+
+        # CAMBIO CRÍTICO: Procesar el inicializador O inicialización por defecto
+        if ctx.initializer():
+            self._gen_variable_init(symbol, self.visit(ctx.initializer().expression()))
+        else:
+            self._gen_default_init(symbol)
+
+        return None
+
+    def _declare_variable(self, var_name: str, var_type: str, is_array: bool = False,
+                          array_dimensions: Optional[List[int]] = None) -> SimpleSymbol:
+        """Reserva memoria para una variable let/var y la inserta en la tabla de símbolos"""
         is_global = (self.current_scope == "global")
 
         # Asignar memoria (para variables simples o arreglos)
@@ -1226,37 +1378,37 @@ class CompiscriptTACVisitor:
         if is_array:
             symbol.array_dimensions = array_dimensions
         self.symbol_table.insert(var_name, symbol)
+        return symbol
 
-        # CAMBIO CRÍTICO: Procesar el inicializador O inicialización por defecto
-        if ctx.initializer():
-            expr_result = self.visit(ctx.initializer().expression())
-
-            # CAMBIO AQUÍ: Asegurar que expr_result tiene un temporal válido
-            if isinstance(expr_result, ExprResult):
-                # Generar MOV desde el temporal al nombre de variable
-                self.emitter.emit(OpCode.MOV, temp_operand(expr_result.temp), None, var_operand(var_name))
-            elif expr_result is not None:
-                # Si no es ExprResult, crear temporal primero
-                temp = self.emitter.new_temp()
-                self.emitter.emit(OpCode.MOV, const_operand(str(expr_result)), None, temp_operand(temp))
-                self.emitter.emit(OpCode.MOV, temp_operand(temp), None, var_operand(var_name))
+    def _gen_variable_init(self, symbol: SimpleSymbol, expr_result) -> None:
+        """Asigna el resultado del inicializador a la variable"""
+        var_name = symbol.name
+        # CAMBIO AQUÍ: Asegurar que expr_result tiene un temporal válido
+        if isinstance(expr_result, ExprResult):
+            # Generar MOV desde el temporal al nombre de variable
+            self.emitter.emit(OpCode.MOV, temp_operand(expr_result.temp), None, var_operand(var_name))
+        elif expr_result is not None:
+            # Si no es ExprResult, crear temporal primero
+            temp = self.emitter.new_temp()
+            self.emitter.emit(OpCode.MOV, const_operand(str(expr_result)), None, temp_operand(temp))
+            self.emitter.emit(OpCode.MOV, temp_operand(temp), None, var_operand(var_name))
 
-            # Marcar como inicializada
-            symbol.is_initialized = True
-        else:
-            # Sin inicializador: Usar valor por defecto
-            default_value = self._get_default_value(var_type)
+        # Marcar como inicializada
+        symbol.is_initialized = True
 
-            # Emitir inicialización con valor por defecto
-            temp = self.emitter.new_temp()
-            if default_value == 'undefined':
-                # Para boolean sin inicializar, usar undefined (no inicializar)
-                pass
-            else:
-                # Inicializar con valor por defecto
-                self.emitter.emit(OpCode.MOV, const_operand(default_value), None, temp_operand(temp))
-                self.emitter.emit(OpCode.MOV, temp_operand(temp), None, var_operand(var_name))
-                # Marcar como inicializada con valor por defecto
-                symbol.is_initialized = True
+    def _gen_default_init(self, symbol: SimpleSymbol) -> None:
+        """Sin inicializador: usar el valor por defecto del tipo"""
+        var_name = symbol.name
+        default_value = self._get_default_value(symbol.sym_type)
 
-        return None
\ No newline at end of file
+        # Emitir inicialización con valor por defecto
+        temp = self.emitter.new_temp()
+        if default_value == 'undefined':
+            # Para boolean sin inicializar, usar undefined (no inicializar)
+            pass
+        else:
+            # Inicializar con valor por defecto
+            self.emitter.emit(OpCode.MOV, const_operand(default_value), None, temp_operand(temp))
+            self.emitter.emit(OpCode.MOV, temp_operand(temp), None, var_operand(var_name))
+            # Marcar como inicializada con valor por defecto
+            symbol.is_initialized = True
\ No newline at end of file
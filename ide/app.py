@@ -1,6 +1,7 @@
 import streamlit as st
 from datetime import datetime
 import io
+import json
 import sys
 import os
 from antlr4 import *
@@ -17,78 +18,15 @@ if grammar_dir not in sys.path:
 if parent_dir not in sys.path:
     sys.path.insert(0, parent_dir)
 
-# Imports de la gramática generada
-from CompiscriptLexer import CompiscriptLexer
-from CompiscriptParser import CompiscriptParser
-from program.grammar.CompiscriptVisitor import CompiscriptVisitor
+# Pipeline de compilación compartido con el Driver
+from compiler.pipeline import compile_source, LEXER_ANTLR, PARSE_MODE_TWO_STAGE, TREE_PARSE
+from compiler.optimizer.manager import OPT_LEVELS, OPT_O0
 
-# Import del visitor TAC
-from compiler.syntax_tree.visitors import CompiscriptTACVisitor
-
-def compile_code(source_code):
+def compile_code(source_code, parse_mode=PARSE_MODE_TWO_STAGE, tree_mode=TREE_PARSE,
+                 lexer_mode=LEXER_ANTLR, opt_level=OPT_O0, track_memory=False):
     """Compile Compiscript code and return results"""
-    try:
-        # Fase 1: Análisis Léxico
-        input_stream = InputStream(source_code)
-        lexer = CompiscriptLexer(input_stream)
-        stream = CommonTokenStream(lexer)
-        stream.fill()
-
-        token_count = len(stream.tokens)
-
-        # Fase 2: Análisis Sintáctico
-        parser = CompiscriptParser(stream)
-        tree = parser.program()
-
-        if parser.getNumberOfSyntaxErrors() > 0:
-            return {
-                'success': False,
-                'errors': [f'Errores de sintaxis: {parser.getNumberOfSyntaxErrors()}'],
-                'triplets': [],
-                'symbols': {},
-                'memory': {},
-                'arrays': {}
-            }
-
-        # Fase 3: Generación de TAC
-        visitor = CompiscriptTACVisitor(CompiscriptParser, CompiscriptVisitor)
-        visitor.visit(tree)
-
-        # Recolectar resultados
-        triplets = visitor.get_triplets()
-        symbols = visitor.get_symbols()
-
-        # Obtener información de memoria
-        memory_layout = visitor.memory_manager.get_memory_layout()
-        memory_info = {
-            'global_size': memory_layout['global_segment']['total_size'],
-            'constant_size': memory_layout['const_segment']['total_size'],
-            'current_function': memory_layout['current_function'],
-            'stack_depth': memory_layout['activation_stack_depth']
-        }
-
-        # Obtener información de arreglos
-        arrays = visitor.array_codegen.get_all_arrays()
-
-        return {
-            'success': True,
-            'errors': [],
-            'token_count': token_count,
-            'triplets': triplets,
-            'symbols': symbols,
-            'memory': memory_info,
-            'arrays': arrays
-        }
-
-    except Exception as e:
-        return {
-            'success': False,
-            'errors': [f'{type(e).__name__}: {str(e)}'],
-            'triplets': [],
-            'symbols': {},
-            'memory': {},
-            'arrays': {}
-        }
+    return compile_source(source_code, parse_mode=parse_mode, tree_mode=tree_mode,
+                          lexer_mode=lexer_mode, opt_level=opt_level, track_memory=track_memory)
 
 def init_session_state():
     """Initialize session state variables"""
@@ -137,6 +75,17 @@ def main():
         st.markdown("---")
 
         st.header("🔧 Controles")
+        opt_level = st.selectbox(
+            "Nivel de optimización",
+            OPT_LEVELS,
+            format_func=lambda level: f"-{level}",
+            help="-O0 sin optimizar, -O1 pasadas escalares, -O2 también bucles, -Os sin agrandar el TAC"
+        )
+        track_memory = st.checkbox(
+            "Medir memoria por pasada",
+            value=False,
+            help="Pico de memoria de cada pasada con tracemalloc; la optimización tarda varias veces más"
+        )
         compile_button = st.button("🚀 Compilar", type="primary", use_container_width=True)
 
         if st.button("🗑️ Limpiar", use_container_width=True):
@@ -188,12 +137,19 @@ fun factorial(n) {
     # Compilation trigger
     if compile_button and code.strip():
         with st.spinner("🔄 Compilando..."):
-            result = compile_code(code)
+            result = compile_code(code, opt_level=opt_level, track_memory=track_memory)
             st.session_state.compilation_result = result
             st.session_state.compiled = True
 
         if result['success']:
             st.success(f"✅ Compilación exitosa - {result.get('token_count', 0)} tokens reconocidos")
+            if result.get('parse'):
+                parse_info = result['parse']
+                st.caption(
+                    f"Parsing: {parse_info['path'].upper()} "
+                    f"({parse_info['total_time'] * 1000:.1f} ms"
+                    f"{', re-parseo LL tras fallo SLL' if parse_info['fell_back'] else ''})"
+                )
         else:
             st.error("❌ Error de compilación")
             for error in result['errors']:
@@ -210,7 +166,8 @@ fun factorial(n) {
         st.header("📊 Resultados de Compilación")
 
         # Tabs para organizar resultados
-        tab1, tab2, tab3, tab4 = st.tabs(["📝 Triplets TAC", "🔤 Tabla de Símbolos", "💾 Memoria", "📦 Arreglos"])
+        tab1, tab2, tab3, tab4, tab5 = st.tabs(["📝 Triplets TAC", "🔤 Tabla de Símbolos", "💾 Memoria",
+                                                "📦 Arreglos", "⚡ Optimización"])
 
         with tab1:
             st.subheader("Triplets de Código Intermedio (TAC)")
@@ -254,5 +211,35 @@ fun factorial(n) {
             else:
                 st.warning("No hay arreglos declarados")
 
+        with tab5:
+            st.subheader("Pasadas de Optimización")
+            optimization = result.get('optimization')
+            if optimization:
+                col1, col2, col3 = st.columns(3)
+                col1.metric("Tripletos antes", optimization['triplets_in'])
+                col2.metric("Tripletos después", optimization['triplets_out'])
+                col3.metric("Tiempo total", f"{optimization['total_time'] * 1000:.1f} ms")
+                rows = []
+                for record in optimization['passes']:
+                    row = {
+                        "Pasada": record['name'],
+                        "Entrada": record['triplets_in'],
+                        "Salida": record['triplets_out'],
+                        "Tiempo (ms)": round(record['time'] * 1000, 2),
+                    }
+                    if optimization['track_memory']:
+                        row["Pico (KB)"] = round(record['peak_memory'] / 1024, 1)
+                    row["Análisis reutilizado"] = record['reused_analysis']
+                    rows.append(row)
+                st.dataframe(rows, use_container_width=True)
+                st.download_button(
+                    "⬇️ Descargar reporte JSON",
+                    json.dumps(optimization, indent=2, ensure_ascii=False),
+                    file_name="pasadas.json",
+                    mime="application/json"
+                )
+            else:
+                st.info("Sin optimizar (-O0)")
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,3 +1,5 @@
+import argparse
+import json
 import sys
 import os
 from antlr4 import *
@@ -16,8 +18,15 @@ from CompiscriptLexer import CompiscriptLexer
 from CompiscriptParser import CompiscriptParser
 from grammar.CompiscriptVisitor import CompiscriptVisitor
 
-# Import del visitor TAC
-from compiler.syntax_tree.visitors import CompiscriptTACVisitor
+# Pipeline compartido (fases léxica, sintáctica y generación de TAC)
+from compiler.pipeline import (
+    lex, parse_tokens, generate_tac,
+    LEXER_MODES, LEXER_ANTLR, PARSE_MODES, PARSE_MODE_TWO_STAGE, TREE_MODES, TREE_PARSE
+)
+from compiler.daemon import DEFAULT_SOCKET, serve
+from compiler.batch import compile_batch
+from compiler.ir.tacb import save, save_visitor
+from compiler.optimizer.manager import PassManager, OPT_LEVELS, OPT_O0
 
 
 def print_separator(title=""):
@@ -29,12 +38,103 @@ def print_separator(title=""):
         print(f"{'='*60}\n")
 
 
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog="Driver.py", description="Compilador Compiscript - TAC generator")
+    parser.add_argument("source_file", help="Archivo fuente .cps")
+    parser.add_argument("--lexer", choices=LEXER_MODES, default=LEXER_ANTLR,
+                        help="Lexer: antlr (CompiscriptLexer) o fast (lexer por expresión regular)")
+    parser.add_argument("--parse-mode", choices=PARSE_MODES, default=PARSE_MODE_TWO_STAGE,
+                        help="Estrategia de parsing: two-stage (SLL y LL si falla), ll (LL completo) "
+                             "o pratt (parser propio sin ANTLR, produce el AST)")
+    parser.add_argument("--tree", choices=TREE_MODES, default=TREE_PARSE,
+                        help="Árbol para generar TAC: parse-tree (ANTLR) o ast (AST compacto)")
+    parser.add_argument("--compact-ir", action="store_true",
+                        help="Guardar los tripletos en buffers paralelos (CompactTripletTable)")
+    parser.add_argument("--emit-tacb", metavar="PATH", default=None,
+                        help="Guardar el TAC, símbolos y layout en formato binario .tacb")
+    parser.add_argument("-O", dest="opt_level", choices=[level[1:] for level in OPT_LEVELS],
+                        default=OPT_O0[1:],
+                        help="Nivel de optimización: 0 (ninguna), 1 (escalares), 2 (también bucles) "
+                             "o s (sin agrandar el TAC)")
+    parser.add_argument("--pass-report", metavar="PATH", default=None,
+                        help="Guardar en JSON el tiempo, tripletos y memoria de cada pasada "
+                             "(mide la memoria con tracemalloc: las pasadas tardan más)")
+    args = parser.parse_args(argv[1:])
+    if args.pass_report and args.opt_level == OPT_O0[1:]:
+        parser.error("--pass-report requiere un nivel de optimización (-O1, -O2 o -Os)")
+    return args
+
+
+def run_daemon(argv):
+    """
+    Modo daemon: mantiene este proceso (y las cachés DFA de ANTLR) vivo y
+    atiende peticiones de program/client.py, que imprime la misma salida
+    que main().
+    """
+    parser = argparse.ArgumentParser(prog="Driver.py --daemon",
+                                     description="Daemon de compilación sobre un socket Unix")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help="Ruta del socket Unix")
+    args = parser.parse_args(argv[2:])
+
+    print(f"Daemon de compilación escuchando en {args.socket}", flush=True)
+    serve(main, args.socket)
+    return 0
+
+
+def run_batch(argv):
+    """
+    Modo por lotes: compila muchos archivos (o directorios con .cps) en un
+    pool de procesos e imprime el tiempo de cada archivo en el orden dado.
+    """
+    parser = argparse.ArgumentParser(prog="Driver.py --batch",
+                                     description="Compilación por lotes con un pool de procesos")
+    parser.add_argument("sources", nargs="+", help="Archivos .cps o directorios")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="Número de procesos (por defecto, uno por CPU)")
+    parser.add_argument("--output-dir", default=None,
+                        help="Directorio donde escribir el TAC de cada archivo (<nombre>.tac)")
+    parser.add_argument("--lexer", choices=LEXER_MODES, default=LEXER_ANTLR)
+    parser.add_argument("--parse-mode", choices=PARSE_MODES, default=PARSE_MODE_TWO_STAGE)
+    parser.add_argument("--tree", choices=TREE_MODES, default=TREE_PARSE)
+    parser.add_argument("-O", dest="opt_level", choices=[level[1:] for level in OPT_LEVELS],
+                        default=OPT_O0[1:], help="Nivel de optimización de cada archivo")
+    parser.add_argument("--pass-report", metavar="PATH", default=None,
+                        help="Guardar en JSON el reporte de pasadas de cada archivo")
+    args = parser.parse_args(argv[2:])
+
+    opt_level = "O" + args.opt_level
+    if args.pass_report and opt_level == OPT_O0:
+        parser.error("--pass-report requiere un nivel de optimización (-O1, -O2 o -Os)")
+
+    try:
+        batch = compile_batch(args.sources, jobs=args.jobs, lexer_mode=args.lexer,
+                              parse_mode=args.parse_mode, tree_mode=args.tree,
+                              output_dir=args.output_dir, opt_level=opt_level,
+                              track_memory=bool(args.pass_report))
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    for result in batch.results:
+        print(result)
+    print(f"\n{batch.summary()}")
+
+    if args.pass_report:
+        reports = {result.path: result.optimization for result in batch.results}
+        with open(args.pass_report, "w", encoding="utf-8") as f:
+            f.write(json.dumps(reports, indent=2, ensure_ascii=False) + "\n")
+        print(f"Reporte de pasadas guardado en {args.pass_report}")
+    return 1 if batch.failures else 0
+
+
 def main(argv):
     if len(argv) < 2:
-        print("Usage: python Driver.py <source_file.cps>")
+        print("Usage: python Driver.py <source_file.cps> [--lexer {antlr,fast}] [--parse-mode {two-stage,ll,pratt}] [--tree {parse-tree,ast}] [--compact-ir] [--emit-tacb PATH] [-O {0,1,2,s}] [--pass-report PATH]")
+        print("       python Driver.py --daemon [--socket PATH]")
+        print("       python Driver.py --batch <archivos o directorios...> [-j N] [--output-dir DIR] [-O {0,1,2,s}] [--pass-report PATH]")
         sys.exit(1)
     
-    input_file = argv[1]
+    args = parse_args(argv)
+    input_file = args.source_file
     
     print_separator("COMPILADOR COMPISCRIPT - TAC GENERATOR")
     print(f"Archivo de entrada: {input_file}\n")
@@ -43,9 +143,7 @@ def main(argv):
         # Fase 1: Análisis Léxico
         print_separator("FASE 1: ANALISIS LEXICO")
         input_stream = FileStream(input_file, encoding='utf-8')
-        lexer = CompiscriptLexer(input_stream)
-        stream = CommonTokenStream(lexer)
-        stream.fill()
+        stream = lex(input_stream, args.lexer)
         
         token_count = len(stream.tokens)
         print(f"Tokens reconocidos: {token_count}")
@@ -53,11 +151,11 @@ def main(argv):
         
         # Fase 2: Análisis Sintáctico
         print_separator("FASE 2: ANALISIS SINTACTICO")
-        parser = CompiscriptParser(stream)
-        tree = parser.program()
+        parse_result = parse_tokens(stream, args.parse_mode)
+        print(f"Estrategia de parsing: {parse_result.stats}")
         
-        if parser.getNumberOfSyntaxErrors() > 0:
-            print(f"Errores de sintaxis: {parser.getNumberOfSyntaxErrors()}")
+        if parse_result.syntax_errors > 0:
+            print(f"Errores de sintaxis: {parse_result.syntax_errors}")
             return 1
         
         print("Árbol sintáctico generado exitosamente")
@@ -66,9 +164,7 @@ def main(argv):
         # Fase 3: Generación de TAC
         print_separator("FASE 3: GENERACION DE CODIGO INTERMEDIO (TAC)")
         
-        # Pasamos las clases Parser y Visitor como parámetros
-        visitor = CompiscriptTACVisitor(CompiscriptParser, CompiscriptVisitor)
-        visitor.visit(tree)
+        visitor = generate_tac(parse_result, args.tree, args.compact_ir)
         
         # Mostrar tripletos generados
         print("\n=== TRIPLETS GENERADOS ===")
@@ -95,6 +191,30 @@ def main(argv):
         else:
             print("No hay arreglos declarados")
 
+        # Fase 4: Optimización
+        opt_level = "O" + args.opt_level
+        if opt_level != OPT_O0:
+            print_separator(f"FASE 4: OPTIMIZACION (-{opt_level})")
+            report = PassManager(opt_level, track_memory=bool(args.pass_report)).run(triplets)
+            print(report.table())
+
+            print("\n=== TRIPLETS OPTIMIZADOS ===")
+            for i, triplet in enumerate(report.triplets):
+                print(f"{i:3}: {triplet}")
+
+            if args.pass_report:
+                with open(args.pass_report, "w", encoding="utf-8") as f:
+                    f.write(report.to_json() + "\n")
+                print(f"\nReporte de pasadas guardado en {args.pass_report}")
+
+        if args.emit_tacb:
+            if opt_level != OPT_O0:
+                save(args.emit_tacb, report.triplets, visitor.get_symbols(),
+                     visitor.memory_manager.get_memory_layout())
+            else:
+                save_visitor(args.emit_tacb, visitor)
+            print(f"\nTAC guardado en {args.emit_tacb}")
+
         print_separator("COMPILACION COMPLETADA")
         print("Compilación completada exitosamente!")
         
@@ -113,5 +233,10 @@ def main(argv):
 
 
 if __name__ == '__main__':
-    exit_code = main(sys.argv)
+    if len(sys.argv) > 1 and sys.argv[1] == '--daemon':
+        exit_code = run_daemon(sys.argv)
+    elif len(sys.argv) > 1 and sys.argv[1] == '--batch':
+        exit_code = run_batch(sys.argv)
+    else:
+        exit_code = main(sys.argv)
     sys.exit(exit_code)
\ No newline at end of file
@@ -0,0 +1,50 @@
+"""
+Cliente liviano del daemon de compilación.
+
+Envía los argumentos al daemon iniciado con `python Driver.py --daemon` y
+reproduce la salida (stdout, stderr y código de salida) que tendría
+`python Driver.py <argumentos>` en el directorio actual. No importa ANTLR
+ni el compilador, así que arranca en lo que tarda el intérprete.
+
+Uso:
+    python client.py <source_file.cps> [opciones de Driver.py] [--socket PATH]
+    python client.py --stop [--socket PATH]
+"""
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from compiler.daemon import DEFAULT_SOCKET, compile_remote, shutdown_remote
+
+
+def main(argv):
+    args = list(argv[1:])
+    socket_path = DEFAULT_SOCKET
+    if "--socket" in args:
+        i = args.index("--socket")
+        if i + 1 >= len(args):
+            print("Error: --socket requiere una ruta", file=sys.stderr)
+            return 2
+        socket_path = args[i + 1]
+        del args[i:i + 2]
+
+    try:
+        if args == ["--stop"]:
+            shutdown_remote(socket_path)
+            return 0
+        response = compile_remote(["Driver.py"] + args, socket_path)
+    except (FileNotFoundError, ConnectionRefusedError):
+        print(f"Error: no hay un daemon escuchando en {socket_path} "
+              f"(iniciarlo con: python program/Driver.py --daemon)", file=sys.stderr)
+        return 2
+
+    sys.stdout.write(response["stdout"])
+    sys.stderr.write(response["stderr"])
+    return response["exit_code"]
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
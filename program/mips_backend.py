@@ -0,0 +1,57 @@
+"""
+Backend MIPS sobre un TAC guardado.
+
+Lee un archivo .tacb generado con `python Driver.py <archivo.cps> --emit-tacb
+PATH`, o un listado de TAC en texto (los `.tac` de `--batch --output-dir`, con o
+sin los índices de línea), y lo traduce a MIPS sin volver a compilar el
+programa fuente.
+
+Uso:
+    python mips_backend.py <archivo.tacb|archivo.tac> [-o salida.s] [--saved-regs]
+"""
+import argparse
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from compiler.ir.tacb import load, MAGIC, TacbFormatError
+from compiler.ir.tac_reader import load_tac, TacSyntaxError
+from compiler.codegen.mips_translator import MIPSTranslator
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog="mips_backend.py", description="TAC (.tacb o texto) a MIPS")
+    parser.add_argument("tacb_file", help="Archivo .tacb o listado de TAC")
+    parser.add_argument("-o", "--output", default=None, help="Archivo de salida (por defecto, stdout)")
+    parser.add_argument("--saved-regs", action="store_true", help="Usar también los registros $s0-$s7")
+    args = parser.parse_args(argv[1:])
+
+    translator = MIPSTranslator(use_saved_regs=args.saved_regs)
+    try:
+        with open(args.tacb_file, "rb") as f:
+            binary = f.read(len(MAGIC)) == MAGIC
+        if binary:
+            with load(args.tacb_file) as tacb:
+                assembly = translator.translate_program(tacb.triplets)
+        else:
+            assembly = translator.translate_program(load_tac(args.tacb_file))
+    except FileNotFoundError:
+        print(f"Error: No se pudo encontrar el archivo '{args.tacb_file}'", file=sys.stderr)
+        return 1
+    except (TacbFormatError, TacSyntaxError, UnicodeDecodeError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(assembly + "\n")
+    else:
+        print(assembly)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
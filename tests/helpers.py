@@ -0,0 +1,17 @@
+"""
+Utilidades compartidas por los tests del TAC y de las pasadas.
+"""
+
+from antlr4 import InputStream
+
+from compiler.pipeline import lex, parse_tokens, generate_tac, TREE_PARSE
+
+
+def compile_triplets(source, tree_mode=TREE_PARSE):
+    """Tripletos que genera el visitor para el código fuente"""
+    return generate_tac(parse_tokens(lex(InputStream(source))), tree_mode).get_triplets()
+
+
+def listing_of(triplets):
+    """Cada tripleto como texto, para comparar listados"""
+    return [str(t) for t in triplets]
@@ -0,0 +1,264 @@
+"""
+Tests para el AST compacto.
+
+Prueba:
+- Lowering del árbol de parseo (colapso de niveles, literales, internado)
+- Nodos con __slots__
+- Equivalencia del TAC generado sobre el AST y sobre el árbol de parseo
+"""
+
+import os
+
+import pytest
+from antlr4 import InputStream
+
+from compiler.pipeline import (
+    lex, parse_tokens, generate_tac, compile_source, TREE_PARSE, TREE_AST
+)
+from compiler.syntax_tree import ast_nodes as ast
+from compiler.syntax_tree.lowering import lower_program
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cubre todas las sentencias y expresiones de la gramática
+FULL_PROGRAM = """
+const LIMIT: integer = 10;
+let a: integer = 5;
+let b: integer;
+let flag: boolean;
+let s: string = "hola";
+let arr: integer[] = [1, 2, 3];
+let empty: integer[] = [];
+let m: integer[][];
+var x = -a + !flag * (a % 3);
+
+function add(p: integer, q: integer): integer {
+    return p + q;
+}
+
+function noop() {
+    return;
+}
+
+class Animal {
+    let name: string;
+    function speak(): string {
+        return this.name + " hace ruido";
+    }
+}
+
+class Dog : Animal {
+    const legs: integer = 4;
+}
+
+let d = new Dog("Rex", 3);
+d.name = "Toby";
+x = d.speak();
+print(arr[1] + add(a, b));
+noop();
+let z = flag ? a : b;
+
+if (a < b && b <= LIMIT || a == 3) {
+    print(a);
+} else {
+    print(b);
+}
+if (a != b) { print(1); }
+
+while (a > 0) {
+    a = a - 1;
+    if (a >= 3) { continue; }
+    break;
+}
+
+do {
+    b = b + 1;
+} while (b < 20);
+
+for (let i: integer = 0; i < 10; i = i + 1) {
+    print(i);
+}
+for (a = 0; a < 3;) { a = a + 1; }
+for (;;) { break; }
+
+foreach (item in arr) {
+    print(item);
+}
+
+try {
+    print(arr[5]);
+} catch (err) {
+    print("error");
+}
+
+switch (a) {
+    case 1:
+        print("uno");
+    case 2:
+        print("dos");
+    default:
+        print("otro");
+}
+
+x = arr[a] = 7;
+print(x);
+"""
+
+# for con la condición o la actualización ausentes: cada expresión se
+# ubica por su posición respecto al ';'
+FOR_VARIANTS = [
+    "let i: integer = 0;\nfor (;; i = i + 1) { if (i > 3) { break; } }",
+    "for (let i: integer = 0;; i = i + 1) { if (i > 3) { break; } }",
+    "let i: integer = 0;\nfor (; i < 3;) { i = i + 1; }",
+]
+FOR_VARIANT_IDS = ["solo-actualizacion", "init-actualizacion", "solo-condicion"]
+
+
+def _parse(source):
+    result = parse_tokens(lex(InputStream(source)))
+    assert result.syntax_errors == 0
+    return result
+
+
+def _tac(source, tree_mode):
+    visitor = generate_tac(_parse(source), tree_mode)
+    return [
+        (str(t), t.op, [(o.value, o.type) if o is not None else None
+                        for o in (t.arg1, t.arg2, t.result)])
+        for t in visitor.get_triplets()
+    ]
+
+
+def _lower(source):
+    return lower_program(_parse(source).tree)
+
+
+class TestLowering:
+    """Tests para la conversión del árbol de parseo al AST"""
+
+    def test_precedence_levels_collapsed(self):
+        """Un literal no queda envuelto en los niveles de precedencia"""
+        program = _lower("print(5);")
+
+        assert program == ast.Program((ast.Print(ast.Literal(ast.LITERAL_INT, 5, "5")),))
+
+    def test_left_associative_chain(self):
+        """a - b + c se asocia a la izquierda"""
+        expr = _lower("x = a - b + c;").statements[0].value
+
+        assert expr == ast.Binary('+', ast.Binary('-', ast.Name('a'), ast.Name('b')), ast.Name('c'))
+
+    def test_literals_decoded(self):
+        """Los literales guardan valor decodificado y texto original"""
+        stmts = _lower('print("hola"); print(true); print(null);').statements
+        literals = [stmt.expr for stmt in stmts]
+
+        assert [(lit.kind, lit.value, lit.text) for lit in literals] == [
+            (ast.LITERAL_STRING, "hola", '"hola"'),
+            (ast.LITERAL_TRUE, True, "true"),
+            (ast.LITERAL_NULL, None, "null"),
+        ]
+
+    def test_identifiers_interned(self):
+        """Los identificadores repetidos son el mismo objeto"""
+        stmts = _lower("let counter = 1; counter = counter + 1;").statements
+
+        assert stmts[0].name is stmts[1].name
+        assert stmts[1].value.left.name is stmts[0].name
+
+    def test_array_type(self):
+        """El tipo de arreglo se separa en tipo base y dimensiones"""
+        decl = _lower("let m: integer[][];").statements[0]
+
+        assert (decl.type_name, decl.array_dims, decl.init) == ("integer", 2, None)
+
+    def test_access_suffixes(self):
+        """Llamadas, índices y propiedades quedan como sufijos del átomo"""
+        expr = _lower("obj.items[0](1);").statements[0].expr
+
+        assert expr == ast.Access(ast.Name('obj'), (
+            ast.Member('items'),
+            ast.Index(ast.Literal(ast.LITERAL_INT, 0, "0")),
+            ast.Call((ast.Literal(ast.LITERAL_INT, 1, "1"),)),
+        ))
+
+    def test_for_parts(self):
+        """Condición y actualización se identifican por su posición"""
+        loop = _lower("for (;; i = i + 1) { }").statements[0]
+
+        assert loop.init is None and loop.cond is None
+        assert isinstance(loop.update, ast.AssignExpr)
+
+    def test_release_tree(self):
+        """Con release=True el árbol de parseo queda desarmado"""
+        tree = _parse("let a: integer = 1 + 2;").tree
+        program = lower_program(tree, release=True)
+
+        assert tree.children is None
+        assert program == _lower("let a: integer = 1 + 2;")
+
+    def test_nodes_use_slots(self):
+        """Los nodos no tienen __dict__"""
+        program = _lower(FULL_PROGRAM)
+
+        stack = [program]
+        while stack:
+            node = stack.pop()
+            assert not hasattr(node, '__dict__')
+            for field in node._fields():
+                value = getattr(node, field)
+                if isinstance(value, ast.Node):
+                    stack.append(value)
+                elif isinstance(value, tuple):
+                    stack.extend(v for v in value if isinstance(v, ast.Node))
+
+
+class TestASTCodegen:
+    """El TAC generado sobre el AST es idéntico al del árbol de parseo"""
+
+    def test_full_program(self):
+        """Mismo TAC (texto y tipos de operandos) para todas las construcciones"""
+        assert _tac(FULL_PROGRAM, TREE_AST) == _tac(FULL_PROGRAM, TREE_PARSE)
+
+    @pytest.mark.parametrize("path", [
+        os.path.join("program", "program.cps"),
+        "test_const.cps",
+    ])
+    def test_sample_programs(self, path):
+        """Mismo TAC para los programas de ejemplo del repositorio"""
+        with open(os.path.join(ROOT_DIR, path), encoding='utf-8') as f:
+            source = f.read()
+
+        assert _tac(source, TREE_AST) == _tac(source, TREE_PARSE)
+
+    @pytest.mark.parametrize("source", FOR_VARIANTS, ids=FOR_VARIANT_IDS)
+    def test_for_variants(self, source):
+        """La actualización va después de LOOP_CONT aunque falte la condición"""
+        tac = _tac(source, TREE_AST)
+        listing = [text for text, _, _ in tac]
+
+        assert tac == _tac(source, TREE_PARSE)
+        if "i = i + 1)" in source:
+            assert listing.index("LOOP_CONT_1:") < listing.index("t5 = mov 1")
+
+    def test_parse_tree_released(self):
+        """El pipeline suelta el árbol de parseo tras el lowering"""
+        parse_result = _parse("let a: integer = 1;")
+        generate_tac(parse_result, TREE_AST)
+
+        assert parse_result.tree is None
+
+    def test_compile_source(self):
+        """compile_source acepta el modo AST con los mismos símbolos"""
+        fast = compile_source(FULL_PROGRAM, tree_mode=TREE_AST)
+        full = compile_source(FULL_PROGRAM, tree_mode=TREE_PARSE)
+
+        assert fast['success'] is True
+        assert [str(t) for t in fast['triplets']] == [str(t) for t in full['triplets']]
+        assert fast['symbols'].keys() == full['symbols'].keys()
+
+    def test_unknown_tree_mode(self):
+        """Un modo de árbol desconocido lanza ValueError"""
+        with pytest.raises(ValueError):
+            generate_tac(_parse("print(1);"), "cst")
@@ -0,0 +1,216 @@
+"""
+Tests para la compilación por lotes.
+
+Prueba:
+- Expansión de directorios y orden determinista de resultados
+- Reporte de errores por archivo
+- Mismo resultado con pool de procesos que en un solo proceso
+- Nivel de optimización en cada worker
+- Modo --batch del Driver
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from compiler.batch import collect_sources, compile_batch
+from compiler.optimizer.manager import OPT_O2, PIPELINES
+from compiler.pipeline import compile_source
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _program(n):
+    return f"let a: integer = {n};\n" + "print(a + 1);\n" * (n % 5 + 1)
+
+
+def _loop_program(n):
+    return (f"let s: integer = 0;\nlet k: integer = 2 * {n};\n"
+            "while (s < 10) { s = s + k; }\nprint(s);\n")
+
+
+@pytest.fixture
+def sources(tmp_path):
+    """Directorio con programas válidos (uno en un subdirectorio) y uno con errores"""
+    (tmp_path / "sub").mkdir()
+    for name, n in [("b.cps", 1), ("a.cps", 2), ("sub/c.cps", 3)]:
+        (tmp_path / name).write_text(_program(n))
+    (tmp_path / "bad.cps").write_text("let = ;\n")
+    (tmp_path / "notes.txt").write_text("no es código")
+    return tmp_path
+
+
+class TestCollectSources:
+    """Tests para la expansión de rutas"""
+
+    def test_directory_sorted(self, sources):
+        """Un directorio se expande a sus .cps en orden alfabético, recursivo"""
+        names = [os.path.relpath(p, sources) for p in collect_sources([str(sources)])]
+
+        assert names == ["a.cps", "b.cps", "bad.cps", os.path.join("sub", "c.cps")]
+
+    def test_files_keep_order(self, sources):
+        """Los archivos explícitos conservan el orden dado"""
+        paths = [str(sources / "b.cps"), str(sources / "a.cps")]
+
+        assert collect_sources(paths) == paths
+
+
+class TestCompileBatch:
+    """Tests para compile_batch"""
+
+    def test_results_in_input_order(self, sources):
+        """Un resultado por archivo, en el orden de entrada, con su tiempo"""
+        batch = compile_batch([str(sources)], jobs=1)
+
+        assert [r.path for r in batch.results] == collect_sources([str(sources)])
+        assert all(r.elapsed > 0 for r in batch.results)
+        assert batch.files_per_second > 0
+
+    def test_failures_reported(self, sources):
+        """Errores de sintaxis y archivos inexistentes no detienen el lote"""
+        missing = str(sources / "missing.cps")
+        batch = compile_batch([str(sources / "bad.cps"), missing, str(sources / "a.cps")], jobs=1)
+
+        assert [r.success for r in batch.results] == [False, False, True]
+        assert batch.results[0].errors == ["Errores de sintaxis: 2"]
+        assert "FileNotFoundError" in batch.results[1].errors[0]
+        assert batch.failures == batch.results[:2]
+
+    def test_counts_match_compile_source(self, sources):
+        """Las cuentas de tokens y tripletos son las de compile_source"""
+        result = compile_batch([str(sources / "a.cps")], jobs=1).results[0]
+        expected = compile_source(_program(2))
+
+        assert result.token_count == expected['token_count']
+        assert result.triplet_count == len(expected['triplets'])
+
+    def test_pool_same_as_serial(self, tmp_path):
+        """Con varios procesos los resultados son los mismos y en el mismo orden"""
+        paths = []
+        for n in range(12):
+            path = tmp_path / f"p{11 - n:02}.cps"
+            path.write_text(_program(n))
+            paths.append(str(path))
+
+        serial = compile_batch(paths, jobs=1)
+        pooled = compile_batch(paths, jobs=3, chunksize=1)
+
+        def summary(batch):
+            return [(r.path, r.success, r.token_count, r.triplet_count) for r in batch.results]
+
+        assert pooled.jobs == 3
+        assert summary(pooled) == summary(serial)
+
+    def test_output_dir(self, sources, tmp_path):
+        """Con output_dir se escribe el TAC de cada archivo compilado"""
+        out = tmp_path / "tac"
+        batch = compile_batch([str(sources / "a.cps"), str(sources / "bad.cps")],
+                              jobs=1, output_dir=str(out))
+
+        assert batch.results[0].output_path == str(out / "a.tac")
+        assert batch.results[1].output_path is None
+        lines = (out / "a.tac").read_text().splitlines()
+        expected = [str(t) for t in compile_source(_program(2))['triplets']]
+        assert [line.split(": ", 1)[1] for line in lines] == expected
+
+    def test_output_dir_keeps_subdirectories(self, tmp_path):
+        """Dos archivos con el mismo nombre en subdirectorios distintos no se pisan"""
+        src = tmp_path / "src"
+        for sub, n in [("a", 1), ("b", 2)]:
+            (src / sub).mkdir(parents=True)
+            (src / sub / "x.cps").write_text(_program(n))
+        out = tmp_path / "tac"
+        batch = compile_batch([str(src)], jobs=2, output_dir=str(out), chunksize=1)
+
+        assert [r.output_path for r in batch.results] == [str(out / "a" / "x.tac"),
+                                                          str(out / "b" / "x.tac")]
+        for sub, n in [("a", 1), ("b", 2)]:
+            lines = (out / sub / "x.tac").read_text().splitlines()
+            expected = [str(t) for t in compile_source(_program(n))['triplets']]
+            assert [line.split(": ", 1)[1] for line in lines] == expected
+
+    def test_output_dir_duplicate_names(self, tmp_path):
+        """Dos archivos dados con el mismo nombre terminarían en el mismo .tac"""
+        for sub in ("a", "b"):
+            (tmp_path / sub).mkdir()
+            (tmp_path / sub / "x.cps").write_text(_program(1))
+        paths = [str(tmp_path / "a" / "x.cps"), str(tmp_path / "b" / "x.cps")]
+
+        with pytest.raises(ValueError):
+            compile_batch(paths, jobs=1, output_dir=str(tmp_path / "tac"))
+        assert not (tmp_path / "tac").exists()
+        assert len(compile_batch(paths, jobs=1).results) == 2
+
+
+    def test_opt_level(self, tmp_path):
+        """Cada worker optimiza con el nivel dado, igual que compile_source"""
+        for n in range(1, 4):
+            (tmp_path / f"p{n}.cps").write_text(_loop_program(n))
+        out = tmp_path / "tac"
+        plain = compile_batch([str(tmp_path)], jobs=1)
+        batch = compile_batch([str(tmp_path)], jobs=2, output_dir=str(out), chunksize=1,
+                              opt_level=OPT_O2)
+
+        for n, result, unoptimized in zip(range(1, 4), batch.results, plain.results):
+            expected = compile_source(_loop_program(n), opt_level=OPT_O2)
+            assert result.triplet_count == len(expected['triplets']) < unoptimized.triplet_count
+            assert result.optimization['level'] == OPT_O2
+            assert not result.optimization['track_memory']
+            assert unoptimized.optimization is None
+            lines = (out / f"p{n}.tac").read_text().splitlines()
+            assert [line.split(": ", 1)[1] for line in lines] == [str(t) for t in expected['triplets']]
+
+    def test_unknown_opt_level(self, sources):
+        with pytest.raises(ValueError):
+            compile_batch([str(sources)], jobs=1, opt_level="O9")
+
+
+class TestDriverBatch:
+    """Modo --batch de program/Driver.py"""
+
+    def test_driver_batch(self, sources):
+        proc = subprocess.run(
+            [sys.executable, os.path.join(ROOT_DIR, "program", "Driver.py"),
+             "--batch", str(sources), "-j", "2"],
+            capture_output=True, text=True,
+        )
+
+        lines = proc.stdout.splitlines()
+        assert proc.returncode == 1
+        assert [line.split()[0] for line in lines[:4]] == ["OK", "OK", "ERROR", "OK"]
+        assert "4 archivos, 1 con errores" in lines[-1]
+
+    def test_driver_batch_opt_level(self, tmp_path):
+        source = tmp_path / "loop.cps"
+        source.write_text(_loop_program(1))
+        report_path = tmp_path / "pasadas.json"
+        proc = subprocess.run(
+            [sys.executable, os.path.join(ROOT_DIR, "program", "Driver.py"),
+             "--batch", str(source), "-j", "1", "-O2", "--pass-report", str(report_path)],
+            capture_output=True, text=True,
+        )
+
+        assert proc.returncode == 0
+        expected = len(compile_source(_loop_program(1), opt_level=OPT_O2)['triplets'])
+        assert f"({expected} tripletos)" in proc.stdout
+        data = json.loads(report_path.read_text(encoding="utf-8"))
+        assert [p["name"] for p in data[str(source)]["passes"]] == list(PIPELINES[OPT_O2])
+        assert data[str(source)]["track_memory"]
+
+    def test_driver_pass_report_needs_level(self, tmp_path):
+        source = tmp_path / "loop.cps"
+        source.write_text(_loop_program(1))
+        proc = subprocess.run(
+            [sys.executable, os.path.join(ROOT_DIR, "program", "Driver.py"),
+             "--batch", str(source), "--pass-report", str(tmp_path / "pasadas.json")],
+            capture_output=True, text=True,
+        )
+
+        assert proc.returncode == 2
+        assert "--pass-report" in proc.stderr
+        assert not (tmp_path / "pasadas.json").exists()
@@ -0,0 +1,287 @@
+"""
+Tests para los bloques básicos y el CFG.
+
+Prueba:
+- Cortes de bloque en etiquetas, saltos, RETURN y funciones
+- Aristas de if/else, bucles y saltos sin destino
+- Regiones de funciones y código global
+- Orden inverso de post-orden
+- Backpatch de break/continue y de las comparaciones del visitor
+- CFG de los programas del corpus
+"""
+
+import os
+
+import pytest
+from antlr4 import InputStream
+
+from benchmarks.synthetic import generate_function_program, generate_program
+from compiler.ir.cfg import build_cfg
+from compiler.ir.compact_table import CompactTripletTable
+from compiler.ir.emitter import TripletEmitter
+from compiler.ir.tac_reader import read_tac
+from compiler.ir.triplet import OpCode
+from compiler.pipeline import lex, parse_tokens, generate_tac, TREE_AST, TREE_PARSE
+from tests.helpers import compile_triplets
+from tests.test_ast import FULL_PROGRAM
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _edges(cfg):
+    return {(b.label or b.start): [cfg.blocks[s].label or cfg.blocks[s].start for s in b.succs]
+            for b in cfg.blocks}
+
+
+DIAMOND = """
+t0 = mov 1
+L1 = blt t0, t1
+L2 = jmp
+L1:
+print t0
+L3 = jmp
+L2:
+print t1
+L3:
+x = mov t0
+"""
+
+LOOP = """
+i = mov 0
+LOOP_START_0:
+LOOP_END_2 = bge i, n
+t0 = add i, 1
+i = mov t0
+LOOP_START_0 = jmp
+LOOP_END_2:
+print i
+"""
+
+FUNCTIONS = """
+t0 = mov 1
+FUNC_0:
+BeginFunc 8;
+L5 = bz p
+return p
+L5:
+return 0
+EndFunc;
+FUNC_END_1:
+t1 = call f, 1
+"""
+
+
+class TestBlocks:
+    """Tests para el corte en bloques básicos"""
+
+    def test_leaders(self):
+        cfg = build_cfg(read_tac(DIAMOND))
+
+        assert [(b.start, b.end) for b in cfg.blocks] == [(0, 2), (2, 3), (3, 6), (6, 8), (8, 10)]
+        assert [b.label for b in cfg.blocks] == [None, None, "L1", "L2", "L3"]
+        assert cfg.label_block == {"L1": 2, "L2": 3, "L3": 4}
+
+    def test_block_of(self):
+        cfg = build_cfg(read_tac(DIAMOND))
+
+        for block in cfg.blocks:
+            for i in range(block.start, block.end):
+                assert cfg.block_of(i) is block
+        assert str(cfg.blocks[2].last) == "L3 = jmp"
+        assert [str(t) for t in cfg.blocks[2]] == ["L1:", "print t0", "L3 = jmp"]
+
+    def test_consecutive_labels(self):
+        """Cada etiqueta abre un bloque aunque el anterior esté vacío"""
+        cfg = build_cfg(read_tac("L0:\nL1:\nprint x\n"))
+
+        assert [len(b) for b in cfg.blocks] == [1, 2]
+        assert cfg.blocks[0].succs == [1]
+
+    def test_return_ends_block(self):
+        cfg = build_cfg(read_tac(FUNCTIONS))
+        function = cfg.function_named("FUNC_0")
+
+        blocks = [cfg.blocks[b] for b in function.blocks]
+        assert [[str(t) for t in b] for b in blocks] == [
+            ["FUNC_0:", "BeginFunc 8;", "L5 = bz p"], ["return p"], ["L5:", "return 0"], ["EndFunc;"]
+        ]
+
+    def test_empty(self):
+        cfg = build_cfg([])
+
+        assert len(cfg) == 0
+        assert cfg.main.entry is None and cfg.main.reverse_postorder == []
+
+
+class TestEdges:
+    """Tests para sucesores y predecesores"""
+
+    def test_diamond(self):
+        cfg = build_cfg(read_tac(DIAMOND))
+
+        assert _edges(cfg) == {0: ["L1", 2], 2: ["L2"], "L1": ["L3"], "L2": ["L3"], "L3": []}
+        assert sorted(cfg.blocks[cfg.label_block["L3"]].preds) == [2, 3]
+
+    def test_loop_back_edge(self):
+        cfg = build_cfg(read_tac(LOOP))
+
+        assert _edges(cfg) == {0: ["LOOP_START_0"], "LOOP_START_0": ["LOOP_END_2", 3],
+                               3: ["LOOP_START_0"], "LOOP_END_2": []}
+
+    def test_preds_match_succs(self):
+        cfg = build_cfg(compile_triplets(FULL_PROGRAM))
+
+        for block in cfg.blocks:
+            for succ in block.succs:
+                assert block.index in cfg.blocks[succ].preds
+            for pred in block.preds:
+                assert block.index in cfg.blocks[pred].succs
+
+    def test_branch_to_next_block(self):
+        """Un salto condicional al bloque siguiente da una sola arista"""
+        cfg = build_cfg(read_tac("L0 = bnz x\nL0:\nprint x\n"))
+
+        assert cfg.blocks[0].succs == [1]
+        assert cfg.blocks[1].preds == [0]
+
+    def test_unresolved_jump_falls_through(self):
+        """Un salto sin destino no deja inalcanzable el código siguiente"""
+        cfg = build_cfg(read_tac("jmp\nprint x\nL9 = jmp\nprint y\n"))
+
+        assert cfg.unresolved == [0, 2]
+        assert cfg.blocks[0].succs == [1]
+        assert len(cfg.main.reverse_postorder) == len(cfg.blocks)
+
+
+class TestFunctions:
+    """Tests para las regiones de funciones"""
+
+    def test_regions(self):
+        cfg = build_cfg(read_tac(FUNCTIONS))
+
+        assert [f.name for f in cfg.functions] == [None, "FUNC_0"]
+        assert [cfg.blocks[b].start for b in cfg.main.blocks] == [0, 8]
+        # El código global salta por encima del cuerpo de la función
+        assert cfg.blocks[cfg.main.entry].succs == [cfg.label_block["FUNC_END_1"]]
+        assert cfg.function_named("FUNC_0").exits == [2, 3, 4]
+
+    def test_conditional_at_end_is_exit(self):
+        """Un salto condicional al final de la región también sale de ella"""
+        cfg = build_cfg(read_tac("i = mov 0\nL0:\ni = add i, 1\nL0 = blt i, 3\n"))
+
+        assert cfg.blocks[1].succs == [1]
+        assert cfg.main.exits == [1]
+
+    def test_no_edges_between_regions(self):
+        cfg = build_cfg(compile_triplets(open(os.path.join(ROOT_DIR, "program", "program.cps"),
+                                              encoding="utf-8").read()))
+
+        for block in cfg.blocks:
+            assert all(cfg.blocks[s].function == block.function for s in block.succs)
+        assert len(cfg.functions) == 1 + sum(t.op == OpCode.ENTER for t in cfg.triplets)
+
+    def test_nested_function(self):
+        """El código de la función externa continúa después de la interna"""
+        listing = ("FUNC_0:\nBeginFunc 8;\nt0 = mov 1\nFUNC_2:\nBeginFunc 4;\n"
+                   "return 2\nEndFunc;\nFUNC_END_3:\nreturn t0\nEndFunc;\nFUNC_END_1:\n")
+        cfg = build_cfg(read_tac(listing))
+        outer, inner = cfg.function_named("FUNC_0"), cfg.function_named("FUNC_2")
+
+        assert cfg.blocks[outer.entry].succs == [cfg.label_block["FUNC_END_3"]]
+        assert [cfg.blocks[b].start for b in inner.blocks] == [3, 6]
+        assert cfg.blocks[cfg.main.entry].start == 10
+
+
+class TestReversePostorder:
+    """Tests para el orden inverso de post-orden"""
+
+    def test_acyclic_order(self):
+        """En un grafo sin ciclos toda arista va hacia adelante"""
+        cfg = build_cfg(read_tac(DIAMOND))
+        rpo = cfg.main.reverse_postorder
+        position = {b: i for i, b in enumerate(rpo)}
+
+        assert rpo[0] == cfg.main.entry
+        for block in cfg.blocks:
+            for succ in block.succs:
+                assert position[block.index] < position[succ]
+
+    def test_unreachable_excluded(self):
+        cfg = build_cfg(read_tac("L1 = jmp\nprint x\nL1:\nprint y\n"))
+
+        assert cfg.main.reverse_postorder == [0, 2]
+        assert cfg.main.reachable()[:3] == [True, False, True]
+
+    def test_large_function(self):
+        """Sin recursión: una función con miles de bloques"""
+        cfg = build_cfg(compile_triplets(generate_function_program(6000), TREE_AST))
+        function = cfg.function_named("FUNC_0")
+
+        assert len(function.blocks) > 5000
+        assert len(function.reverse_postorder) == len(function.blocks) - 1   # EndFunc tras return
+
+
+class TestVisitorBackpatch:
+    """Los saltos del visitor llegan al CFG con su etiqueta"""
+
+    @pytest.mark.parametrize("tree_mode", [TREE_PARSE, TREE_AST])
+    def test_comparisons_patched(self, tree_mode):
+        triplets = compile_triplets("let x: integer = 1;\nif (x < 2) { print(x); } else { print(2); }\n",
+                                    tree_mode)
+        jumps = [t for t in triplets if t.is_jump()]
+
+        assert [str(t.result) for t in jumps] == ["IF_TRUE_0", "IF_FALSE_1", "IF_END_2"]
+
+    def test_break_continue_patched(self):
+        source = ("let i: integer = 0;\n"
+                  "while (i < 10) { i = i + 1; if (i == 3) { continue; } if (i == 5) { break; } }\n")
+        triplets = compile_triplets(source)
+        cfg = build_cfg(triplets)
+
+        assert cfg.unresolved == []
+        targets = [str(t.result) for t in triplets if t.op == OpCode.JMP]
+        assert any(label.startswith("LOOP_CONT_") for label in targets)
+        assert any(label.startswith("LOOP_END_") for label in targets)
+
+    def test_emit_jump_pending(self):
+        """emit_jump("") deja el destino pendiente y backpatch lo completa"""
+        emitter = TripletEmitter()
+        jump = emitter.emit_jump("")
+        assert emitter.table.get(jump).result is None
+
+        emitter.backpatch(emitter.make_list(jump), "L7")
+        assert str(emitter.table.get(jump)) == "L7 = jmp"
+
+
+class TestCorpus:
+    """CFG de programas completos"""
+
+    @pytest.mark.parametrize("source", [
+        FULL_PROGRAM,
+        open(os.path.join(ROOT_DIR, "program", "program.cps"), encoding="utf-8").read(),
+        generate_program(300),
+    ], ids=["full", "program", "synthetic"])
+    def test_blocks_cover_listing(self, source):
+        triplets = compile_triplets(source)
+        cfg = build_cfg(triplets)
+
+        assert cfg.blocks[0].start == 0 and cfg.blocks[-1].end == len(triplets)
+        for block, next_block in zip(cfg.blocks, cfg.blocks[1:]):
+            assert block.end == next_block.start
+        for block in cfg.blocks:
+            last = block.last
+            if last.is_jump() and block.end - 1 not in cfg.unresolved:
+                target = cfg.blocks[block.succs[0]]
+                assert target.label == str(last.result.value)
+
+    def test_table_inputs(self):
+        """Lista, TripletTable y CompactTripletTable dan el mismo CFG"""
+        visitor = generate_tac(parse_tokens(lex(InputStream(FULL_PROGRAM))), TREE_PARSE)
+        compact = CompactTripletTable()
+        for triplet in visitor.emitter.table:
+            compact.add(triplet)
+
+        expected = str(build_cfg(visitor.get_triplets()))
+        assert str(build_cfg(visitor.emitter.table)) == expected
+        assert str(build_cfg(compact)) == expected
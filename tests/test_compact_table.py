@@ -0,0 +1,123 @@
+"""
+Tests para CompactTripletTable.
+
+Prueba:
+- Misma interfaz que TripletTable (add, get, iteración, to_list)
+- Backpatch con set_result
+- Internado de valores sin confundir 1, 1.0 y True
+- Mismo TAC con compact_ir en el pipeline
+"""
+
+from antlr4 import InputStream
+
+from compiler.ir.compact_table import CompactTripletTable
+from compiler.ir.emitter import TripletEmitter
+from compiler.ir.triplet import (
+    OpCode, Triplet, TripletTable, temp_operand, var_operand, const_operand, label_operand
+)
+from compiler.pipeline import lex, parse_tokens, generate_tac, compile_source, TREE_PARSE, TREE_AST
+from tests.test_ast import FULL_PROGRAM
+
+
+def _fill(table):
+    table.add(Triplet(OpCode.ADD, var_operand("a"), const_operand(1), temp_operand("t0")))
+    table.add(Triplet(OpCode.LABEL, label_operand("L0")))
+    table.add(Triplet(OpCode.MOV, temp_operand("t0"), None, var_operand("a"), "copia"))
+    table.add(Triplet(OpCode.JMP, None, None, label_operand("L0")))
+    return table
+
+
+def _operands(triplet):
+    return [(o.value, o.type) if o is not None else None
+            for o in (triplet.arg1, triplet.arg2, triplet.result)]
+
+
+def _tac(triplets):
+    return [(str(t), t.op, _operands(t)) for t in triplets]
+
+
+class TestCompactTable:
+    """Tests para la interfaz de la tabla"""
+
+    def test_same_as_triplet_table(self):
+        """Iteración, get, índices y to_list coinciden con TripletTable"""
+        compact = _fill(CompactTripletTable())
+        table = _fill(TripletTable())
+
+        assert len(compact) == compact.size() == 4
+        assert _tac(compact) == _tac(table)
+        assert compact.to_list() == table.to_list()
+        assert _tac([compact.get(2)]) == _tac([table.get(2)])
+        assert _tac(compact[1:3]) == _tac(table[1:3])
+        assert str(compact[-1]) == str(table[-1])
+        assert compact.get(4) is None
+
+    def test_ids_and_comments(self):
+        """add retorna el índice y los comentarios se conservan"""
+        compact = CompactTripletTable()
+        triplet = Triplet(OpCode.NOP, comment="nada")
+
+        assert compact.add(triplet) == 0
+        assert triplet.id == 0
+        assert compact.get(0).comment == "nada"
+        assert compact.get(0).id == 0
+
+    def test_values_interned(self):
+        """Valores repetidos se guardan una vez; 1, 1.0 y True se distinguen"""
+        compact = CompactTripletTable()
+        compact.add(Triplet(OpCode.ADD, const_operand(1), const_operand(True), temp_operand("t0")))
+        compact.add(Triplet(OpCode.ADD, const_operand(1.0), const_operand(1), temp_operand("t0")))
+
+        assert len(compact.values) == 4
+        values = [(o.value, type(o.value)) for t in compact for o in (t.arg1, t.arg2)]
+        assert values == [(1, int), (True, bool), (1.0, float), (1, int)]
+
+    def test_set_result(self):
+        """set_result cambia el resultado guardado, no sólo la copia"""
+        compact = _fill(CompactTripletTable())
+        compact.set_result(3, label_operand("L9"))
+        compact.set_result(0, None)
+
+        assert str(compact.get(3)) == "L9 = jmp"
+        assert compact.get(0).result is None
+
+    def test_clear(self):
+        compact = _fill(CompactTripletTable())
+        compact.clear()
+
+        assert len(compact) == 0 and compact.values == []
+        assert compact.add(Triplet(OpCode.NOP)) == 0
+
+
+class TestCompactEmitter:
+    """El emitter y el pipeline funcionan igual con la tabla compacta"""
+
+    def test_backpatch(self):
+        """Un salto pendiente se parchea sobre la tabla compacta"""
+        results = []
+        for compact in (False, True):
+            emitter = TripletEmitter(compact=compact)
+            jump = emitter.emit_conditional_jump(OpCode.BZ, "c")
+            emitter.emit_label("L5")
+            emitter.backpatch(emitter.make_list(jump), "L5")
+            results.append(_tac(emitter.table))
+
+        assert results[0] == results[1]
+        assert results[1][0][2][2] == ("L5", "label")
+
+    def test_pipeline_same_tac(self):
+        """Mismo TAC (texto, opcode y tipos) con compact_ir en ambos árboles"""
+        for tree_mode in (TREE_PARSE, TREE_AST):
+            full = generate_tac(parse_tokens(lex(InputStream(FULL_PROGRAM))), tree_mode)
+            compact = generate_tac(parse_tokens(lex(InputStream(FULL_PROGRAM))), tree_mode,
+                                   compact_ir=True)
+
+            assert isinstance(compact.emitter.table, CompactTripletTable)
+            assert _tac(compact.get_triplets()) == _tac(full.get_triplets())
+
+    def test_compile_source(self):
+        result = compile_source(FULL_PROGRAM, compact_ir=True)
+
+        assert result['success'] is True
+        assert [str(t) for t in result['triplets']] == \
+            [str(t) for t in compile_source(FULL_PROGRAM)['triplets']]
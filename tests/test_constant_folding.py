@@ -0,0 +1,156 @@
+"""
+Tests para el plegado y la propagación de constantes.
+
+Prueba:
+- Plegado de expresiones constantes del visitor
+- Propagación entre bloques y a través de bucles
+- Saltos condicionales constantes (a jmp o eliminados)
+- Lo que no se debe plegar (división entre cero, desborde, cadenas, llamadas)
+- Misma salida al ejecutar el listado optimizado
+"""
+
+import pytest
+
+from benchmarks.synthetic import generate_program
+from compiler.ir.interpreter import run_tac
+from compiler.ir.tac_reader import read_tac
+from compiler.optimizer import fold_constants
+from tests.helpers import compile_triplets, listing_of
+
+
+def _fold(text):
+    return fold_constants(read_tac(text))
+
+
+class TestFolding:
+    """Tests para el plegado de operaciones"""
+
+    def test_visitor_expression(self):
+        result = fold_constants(compile_triplets("let x: integer = 2 * 3 + 4;"))
+
+        assert listing_of(result.triplets) == ["x = mov 10"]
+        assert result.before == 6 and result.removed == 5
+        assert result.stats["plegados"] == 2
+
+    def test_comparisons_and_logic(self):
+        result = _fold("t0 = lt 2, 3\nt1 = not t0\nt2 = or t0, t1\nprint t2\nt3 = neg 4\nprint t3\n")
+
+        assert listing_of(result.triplets) == ["print true", "print -4"]
+
+    def test_identities(self):
+        result = _fold("t0 = mul x, 1\nt1 = mul 0, y\nt2 = sub x, 0\nt3 = div x, 1\n")
+
+        assert listing_of(result.triplets) == ["t0 = mov x", "t1 = mov 0", "t2 = mov x", "t3 = mov x"]
+        assert result.stats["simplificados"] == 4
+
+    @pytest.mark.parametrize("text", [
+        "t0 = div 1, 0\nprint t0\n",
+        "t0 = mul 65536, 65536\nprint t0\n",
+        't0 = add "a", 1\nprint t0\n',
+        "t0 = add 1.5, 1\nprint t0\n",
+        "t0 = eq true, 1\nprint t0\n",
+        "t0 = add x, 0\nprint t0\n",
+    ], ids=["div0", "overflow", "string", "float", "mixed", "add_zero"])
+    def test_not_folded(self, text):
+        triplets = read_tac(text)
+
+        assert listing_of(fold_constants(triplets).triplets) == listing_of(triplets)
+
+    def test_input_not_modified(self):
+        triplets = compile_triplets("let x: integer = 2 * 3 + 4;\nprint(x);")
+        before = listing_of(triplets)
+        fold_constants(triplets)
+
+        assert listing_of(triplets) == before
+
+
+class TestPropagation:
+    """Tests para la propagación entre bloques"""
+
+    def test_across_blocks(self):
+        result = _fold("k = mov 3\nL0 = bnz c\nt0 = mul k, 2\nprint t0\nL0:\nt1 = add k, 1\nprint t1\n")
+
+        assert "print 6" in listing_of(result.triplets)
+        assert "print 4" in listing_of(result.triplets)
+
+    def test_loop_variables_not_constant(self):
+        result = _fold("i = mov 0\nk = mov 5\nL0:\ni = add i, 1\nt0 = mul k, 2\n"
+                       "L0 = blt i, t0\nprint i\n")
+        listing = listing_of(result.triplets)
+
+        assert "i = add i, 1" in listing
+        assert "L0 = blt i, 10" in listing
+
+    def test_merge_different_values(self):
+        result = _fold("x = mov 1\nL0 = bnz c\nx = mov 2\nL0:\nprint x\n")
+
+        assert "print x" in listing_of(result.triplets)
+
+    def test_dead_path_ignored(self):
+        """El camino que nunca se toma no cuenta al juntar valores"""
+        result = _fold("x = mov 1\nL0 = beq x, 1\nx = mov 2\nL0:\nprint x\n")
+        listing = listing_of(result.triplets)
+
+        assert "L0 = jmp" in listing
+        assert listing[-1] == "print 1"
+
+    def test_call_clobbers_shared(self):
+        text = ("g = mov 1\nFUNC_0:\nBeginFunc 0;\ng = mov 2\nreturn g\nEndFunc;\nFUNC_END_1:\n"
+                "t0 = call FUNC_0, 0\nprint g\nt1 = mov 7\nprint t1\n")
+        listing = listing_of(_fold(text).triplets)
+
+        assert "print g" in listing
+        assert "print 7" in listing
+
+    def test_function_starts_unknown(self):
+        text = "FUNC_0:\nBeginFunc 0;\nt0 = add p, 1\nreturn t0\nEndFunc;\np = mov 1\n"
+
+        assert "t0 = add p, 1" in listing_of(_fold(text).triplets)
+
+
+class TestBranches:
+    """Tests para los saltos condicionales constantes"""
+
+    def test_visitor_if(self):
+        source = "if (2 < 3) { print(1); } else { print(2); }"
+        triplets = compile_triplets(source)
+        listing = listing_of(fold_constants(triplets).triplets)
+
+        assert listing[0] == "IF_TRUE_0 = jmp"
+        assert fold_constants(triplets).stats["saltos"] == 1
+
+    def test_never_taken_removed(self):
+        result = _fold("t0 = mov 5\nL0 = blt t0, 2\nprint 1\nL0:\nprint 2\n")
+
+        assert listing_of(result.triplets) == ["print 1", "L0:", "print 2"]
+
+    def test_bz(self):
+        result = _fold("t0 = eq 1, 1\nL0 = bz t0\nprint 1\nL0:\n")
+
+        assert listing_of(result.triplets) == ["print 1", "L0:"]
+
+
+class TestSemantics:
+    """El listado optimizado imprime lo mismo"""
+
+    @pytest.mark.parametrize("text", [
+        "i = mov 0\ns = mov 0\nk = mov 3\nL0:\nt1 = mul k, 2\ns = add s, t1\ni = add i, 1\n"
+        "L0 = blt i, 4\nt2 = eq k, 3\nL9 = bz t2\nprint s\nL9:\nprint k\n",
+        "x = mov 1\nL0 = beq x, 1\nx = mov 2\nL0:\nt0 = mod -7, 2\nt1 = div -7, 2\nprint x\n"
+        "print t0\nprint t1\n",
+        "a = mov 10\nb = mov 0\nL1:\nL2 = ble a, 0\nt0 = sub a, 3\na = mov t0\nb = add b, 1\n"
+        "L1 = jmp\nL2:\nprint a\nprint b\nt9 = mul 2, 3\nprint t9\n",
+    ])
+    def test_same_output(self, text):
+        triplets = read_tac(text)
+        result = fold_constants(triplets)
+
+        assert result.changed
+        assert run_tac(result.triplets).output == run_tac(triplets).output
+
+    def test_idempotent(self):
+        first = fold_constants(compile_triplets(generate_program(200)))
+        second = fold_constants(first.triplets)
+
+        assert first.changed and not second.changed
+        assert listing_of(second.triplets) == listing_of(first.triplets)
@@ -0,0 +1,139 @@
+"""
+Tests para la propagación de copias y la fusión de cadenas de MOV.
+
+Prueba:
+- Fusión de `tK = op ...; x = mov tK` en el código del visitor
+- Propagación de copias entre bloques y cadenas de copias
+- Copias que mueren al reasignar origen o destino, o en una llamada
+- Eliminación de copias sin lectores
+- Misma salida al ejecutar y menos copias en MIPS
+"""
+
+import pytest
+
+from benchmarks.bench_optimizer import mips_count
+from benchmarks.synthetic import generate_program
+from compiler.ir.interpreter import run_tac
+from compiler.ir.tac_reader import read_tac
+from compiler.optimizer import fold_constants, propagate_copies
+from tests.helpers import compile_triplets, listing_of
+
+
+def _propagate(text):
+    return propagate_copies(read_tac(text))
+
+
+class TestCoalescing:
+    """Tests para la fusión hacia atrás"""
+
+    def test_declaration(self):
+        result = propagate_copies(compile_triplets("let x: integer = 2 * 3 + 4;"))
+        listing = listing_of(result.triplets)
+
+        assert listing[-1] == "x = add t2, t3"
+        assert "x = mov t4" not in listing
+        assert result.stats["fusionadas"] == 1
+
+    def test_chain(self):
+        result = _propagate("t0 = add a, 1\nt1 = mov t0\nt2 = mov t1\nx = mov t2\n")
+
+        assert listing_of(result.triplets) == ["x = add a, 1"]
+        assert result.removed == 3
+
+    def test_target_used_between(self):
+        """x se lee entre la definición y la copia: no se adelanta la escritura"""
+        text = "t0 = add a, 1\nprint x\nx = mov t0\n"
+
+        assert listing_of(_propagate(text).triplets) == listing_of(read_tac(text))
+
+    def test_call_between_memory_target(self):
+        text = "t0 = add a, 1\nt1 = call f, 0\nx = mov t0\nprint t1\n"
+
+        assert "x = mov t0" in listing_of(_propagate(text).triplets)
+
+    def test_temp_with_other_readers(self):
+        text = "t0 = add a, 1\nx = mov t0\nprint t0\n"
+
+        assert listing_of(_propagate(text).triplets) == ["t0 = add a, 1", "x = mov t0", "print t0"]
+
+    def test_not_across_blocks(self):
+        text = "t0 = add a, 1\nL1:\nx = mov t0\n"
+
+        assert "x = mov t0" in listing_of(_propagate(text).triplets)
+
+
+class TestPropagation:
+    """Tests para la propagación hacia adelante"""
+
+    def test_chain_of_copies(self):
+        result = _propagate("a = mov b\nc = mov a\nt0 = mov c\nprint t0\n")
+
+        assert listing_of(result.triplets) == ["a = mov b", "c = mov b", "print b"]
+
+    def test_across_blocks(self):
+        result = _propagate("t0 = mov x\nL1 = bnz c\nprint t0\nL1:\nt1 = add t0, 1\nprint t1\n")
+        listing = listing_of(result.triplets)
+
+        assert "print x" in listing and "t1 = add x, 1" in listing
+        assert "t0 = mov x" not in listing
+
+    def test_source_redefined(self):
+        result = _propagate("t0 = mov x\nx = mov 5\nprint t0\n")
+
+        assert listing_of(result.triplets) == ["t0 = mov x", "x = mov 5", "print t0"]
+
+    def test_merge_requires_all_paths(self):
+        text = "t0 = mov x\nL1 = bnz c\nt0 = mov y\nL1:\nprint t0\n"
+
+        assert "print t0" in listing_of(_propagate(text).triplets)
+
+    def test_call_kills_memory_copies(self):
+        result = _propagate("t0 = mov x\nt1 = call f, 0\nprint t0\nt2 = mov t1\nprint t2\n")
+        listing = listing_of(result.triplets)
+
+        # El resultado de la llamada se escribe directamente en t2
+        assert listing == ["t0 = mov x", "t2 = call f, 0", "print t0", "print t2"]
+
+    def test_self_copy_removed(self):
+        assert listing_of(_propagate("x = mov x\nprint x\n").triplets) == ["print x"]
+
+    def test_function_parameter_copy(self):
+        """El visitor copia cada parámetro a un temporal que nadie lee"""
+        source = "function f(n: integer): integer { return n; }\nprint(f(2));"
+        triplets = compile_triplets(source)
+        listing = listing_of(propagate_copies(triplets).triplets)
+
+        assert "t0 = mov n" in listing_of(triplets)
+        assert "t0 = mov n" not in listing
+
+
+class TestSemantics:
+    """El listado optimizado imprime lo mismo"""
+
+    @pytest.mark.parametrize("text", [
+        "a = mov 1\nb = mov a\ni = mov 0\nL0:\nt0 = add b, i\nt1 = mov t0\nb = mov t1\nt2 = mov i\n"
+        "i = add t2, 1\nL0 = blt i, 4\nt3 = mov b\nprint t3\nprint a\n",
+        "x = mov 3\nt0 = mov x\nL1 = bgt t0, 2\nx = mov 9\nL1:\nt1 = mul t0, x\nprint t1\n",
+        "a = mov 2\nb = mov 3\nc = mov 0\nL0:\nt0 = mov a\na = mov b\nb = mov t0\nt1 = add c, 1\n"
+        "c = mov t1\nL0 = blt c, 5\nprint a\nprint b\n",
+    ], ids=["loop", "diamond", "swap"])
+    def test_same_output(self, text):
+        triplets = read_tac(text)
+        result = propagate_copies(triplets)
+
+        assert result.changed
+        assert run_tac(result.triplets).output == run_tac(triplets).output
+
+    def test_idempotent(self):
+        first = propagate_copies(compile_triplets(generate_program(200)))
+        second = propagate_copies(first.triplets)
+
+        assert first.changed and not second.changed
+
+    def test_fewer_mips_moves(self):
+        triplets = fold_constants(compile_triplets(generate_program(200))).triplets
+        instructions, moves = mips_count(triplets)
+        instructions_after, moves_after = mips_count(propagate_copies(triplets).triplets)
+
+        assert instructions_after < instructions
+        assert moves_after * 3 < moves
@@ -0,0 +1,165 @@
+"""
+Tests para el daemon de compilación.
+
+Prueba:
+- Captura de salida y código de salida por petición
+- Apagado y limpieza del socket
+- Misma salida con program/client.py que con program/Driver.py
+"""
+
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from compiler.daemon import (
+    serve, compile_remote, shutdown_remote, send_request, _remove_stale_socket
+)
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROGRAM_DIR = os.path.join(ROOT_DIR, "program")
+
+
+def _handler(argv):
+    if argv[1] == "exit":
+        sys.exit(3)
+    if argv[1] == "fail":
+        raise RuntimeError("boom")
+    print("cwd:", os.getcwd())
+    print("args:", " ".join(argv[1:]), file=sys.stderr)
+    return 0
+
+
+def _wait_for(path, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while not os.path.exists(path):
+        assert time.monotonic() < deadline, f"no se creó {path}"
+        time.sleep(0.02)
+
+
+@pytest.fixture
+def server(tmp_path):
+    """Daemon en un hilo con un handler de prueba"""
+    socket_path = str(tmp_path / "test.sock")
+    thread = threading.Thread(target=serve, args=(_handler, socket_path), daemon=True)
+    thread.start()
+    _wait_for(socket_path)
+    yield socket_path
+    if thread.is_alive():
+        shutdown_remote(socket_path)
+        thread.join(timeout=5)
+
+
+class TestDaemonServer:
+    """Tests para el servidor y el protocolo"""
+
+    def test_captures_output(self, server, tmp_path):
+        """stdout, stderr y cwd son los de la petición"""
+        os.chdir(tmp_path)
+        try:
+            response = compile_remote(["Driver.py", "a.cps", "--tree", "ast"], server)
+        finally:
+            os.chdir(ROOT_DIR)
+
+        assert response == {
+            "exit_code": 0,
+            "stdout": f"cwd: {tmp_path}\n",
+            "stderr": "args: a.cps --tree ast\n",
+        }
+
+    def test_system_exit_code(self, server):
+        """sys.exit dentro del handler se convierte en el código de salida"""
+        assert compile_remote(["Driver.py", "exit"], server)["exit_code"] == 3
+
+    def test_exception_keeps_serving(self, server):
+        """Una excepción se reporta en stderr y el daemon sigue atendiendo"""
+        response = compile_remote(["Driver.py", "fail"], server)
+
+        assert response["exit_code"] == 1
+        assert "RuntimeError: boom" in response["stderr"]
+        assert compile_remote(["Driver.py", "ok"], server)["exit_code"] == 0
+
+    def test_invalid_request(self, server):
+        """Una petición sin argv no tumba el daemon"""
+        import socket
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(server)
+            sock.sendall(b"no es json")
+            sock.shutdown(socket.SHUT_WR)
+            assert b"exit_code" in sock.recv(4096)
+
+        assert send_request({"argv": ["Driver.py", "ok"]}, server)["exit_code"] == 0
+
+    def test_shutdown_removes_socket(self, tmp_path):
+        """Tras el apagado el socket se borra"""
+        socket_path = str(tmp_path / "stop.sock")
+        thread = threading.Thread(target=serve, args=(_handler, socket_path), daemon=True)
+        thread.start()
+        _wait_for(socket_path)
+
+        shutdown_remote(socket_path)
+        thread.join(timeout=5)
+
+        assert not thread.is_alive()
+        assert not os.path.exists(socket_path)
+
+    def test_stale_socket_removed(self, tmp_path):
+        """Un socket sin daemon detrás se borra al iniciar"""
+        stale = tmp_path / "stale.sock"
+        stale.write_text("")
+
+        _remove_stale_socket(str(stale))
+
+        assert not stale.exists()
+
+    def test_running_daemon_not_replaced(self, server):
+        """No se puede iniciar un segundo daemon en el mismo socket"""
+        with pytest.raises(RuntimeError):
+            _remove_stale_socket(server)
+
+
+class TestDaemonClient:
+    """program/client.py imprime lo mismo que program/Driver.py"""
+
+    def test_same_output_as_driver(self, tmp_path):
+        socket_path = str(tmp_path / "driver.sock")
+        daemon = subprocess.Popen(
+            [sys.executable, "Driver.py", "--daemon", "--socket", socket_path],
+            cwd=PROGRAM_DIR, stdout=subprocess.DEVNULL,
+        )
+        try:
+            _wait_for(socket_path)
+            for args in (["program.cps"], ["program.cps", "--parse-mode", "pratt"], ["missing.cps"]):
+                client = subprocess.run(
+                    [sys.executable, "client.py", *args, "--socket", socket_path],
+                    cwd=PROGRAM_DIR, capture_output=True, text=True,
+                )
+                driver = subprocess.run(
+                    [sys.executable, "Driver.py", *args],
+                    cwd=PROGRAM_DIR, capture_output=True, text=True,
+                )
+
+                # Los tiempos de parseo son lo único que cambia
+                def strip_timing(text):
+                    return [line for line in text.splitlines() if "Estrategia de parsing" not in line]
+
+                assert client.returncode == driver.returncode
+                assert strip_timing(client.stdout) == strip_timing(driver.stdout)
+        finally:
+            subprocess.run([sys.executable, "client.py", "--stop", "--socket", socket_path],
+                           cwd=PROGRAM_DIR)
+            daemon.wait(timeout=10)
+
+    def test_no_daemon(self, tmp_path):
+        """Sin daemon el cliente falla con código 2"""
+        client = subprocess.run(
+            [sys.executable, "client.py", "program.cps", "--socket", str(tmp_path / "none.sock")],
+            cwd=PROGRAM_DIR, capture_output=True, text=True,
+        )
+
+        assert client.returncode == 2
+        assert "no hay un daemon" in client.stderr
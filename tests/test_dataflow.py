@@ -0,0 +1,319 @@
+"""
+Tests para el análisis de flujo de datos.
+
+Prueba:
+- Usos y definiciones de cada tripleto
+- Operaciones de los backends de bitsets (int y NumPy)
+- Variables vivas, definiciones que alcanzan y expresiones disponibles
+- Mismo resultado con ambos backends
+- Convergencia en funciones grandes
+"""
+
+import pytest
+
+from benchmarks.synthetic import generate_function_program
+from compiler.ir.cfg import build_cfg
+from compiler.ir.dataflow import (
+    IntBitsets, NumpyBitsets, Liveness, ReachingDefinitions, AvailableExpressions, AvailableCopies,
+    liveness, reaching_definitions, available_expressions, available_copies, make_bitsets
+)
+from compiler.ir.defuse import defined_name, has_side_effects, used_names
+from compiler.ir.tac_reader import parse_line, read_tac
+from compiler.pipeline import TREE_AST
+from tests.helpers import compile_triplets
+from tests.test_ast import FULL_PROGRAM
+
+
+LOOP = """
+i = mov 0
+LOOP_START_0:
+LOOP_END_2 = bge i, n
+t0 = add i, 1
+i = mov t0
+LOOP_START_0 = jmp
+LOOP_END_2:
+print i
+"""
+
+DIAMOND = """
+t0 = add a, b
+L1 = blt t0, c
+a = mov 1
+t1 = add a, b
+L2 = jmp
+L1:
+t1 = add a, b
+L2:
+t2 = add a, b
+print t2
+"""
+
+CALLS = """
+FUNC_0:
+BeginFunc 8;
+t0 = mul x, 2
+t1 = mov 5
+t2 = call g, 0
+t3 = mul x, 2
+t4 = add t1, t3
+return t4
+EndFunc;
+"""
+
+
+def _block(cfg, label):
+    return cfg.label_block[label]
+
+
+class TestDefUse:
+    """Tests para los usos y definiciones de los tripletos"""
+
+    @pytest.mark.parametrize("line, uses, definition", [
+        ("t2 = add t0, x", ["t0", "x"], "t2"),
+        ("t1 = mov 5", [], "t1"),
+        ("L3 = blt i, n", ["i", "n"], None),
+        ("t4 = call f, 2", [], "t4"),
+        ("t1 = get_field obj, nombre", ["obj"], "t1"),
+        ("t9 = set_field obj, nombre", ["obj", "t9"], None),
+        ("t3 = array_set arr, i", ["arr", "i", "t3"], None),
+        ("print t5", ["t5"], None),
+        ("return x", ["x"], None),
+    ])
+    def test_uses_and_definitions(self, line, uses, definition):
+        triplet = parse_line(line)
+
+        assert used_names(triplet) == uses
+        assert defined_name(triplet) == definition
+
+    def test_side_effects(self):
+        assert has_side_effects(parse_line("t0 = call f, 0"))
+        assert has_side_effects(parse_line("print x"))
+        assert not has_side_effects(parse_line("t0 = add a, b"))
+        assert not has_side_effects(parse_line("t0 = mov 1"))
+
+
+class TestBitsets:
+    """Tests para las operaciones de los backends"""
+
+    @pytest.fixture(params=["int", "numpy"])
+    def sets(self, request):
+        if request.param == "numpy":
+            pytest.importorskip("numpy")
+        return make_bitsets(130, request.param)
+
+    def test_set_operations(self, sets):
+        a = sets.from_indices([0, 64, 129])
+        b = sets.from_indices([64, 100])
+
+        assert list(sets.members(sets.union(a, b))) == [0, 64, 100, 129]
+        assert list(sets.members(sets.intersection(a, b))) == [64]
+        assert list(sets.members(sets.difference(a, b))) == [0, 129]
+        assert sets.contains(a, 129) and not sets.contains(a, 100)
+        assert sets.count(sets.full()) == 130
+        assert sets.equal(sets.from_indices([]), sets.empty())
+
+    def test_transfer(self, sets):
+        gen = sets.from_indices([1])
+        kill = sets.from_indices([2, 3])
+        value = sets.from_indices([2, 5])
+
+        assert list(sets.members(sets.transfer(gen, kill, value))) == [1, 5]
+
+    def test_operations_do_not_mutate(self, sets):
+        a = sets.from_indices([3])
+        sets.union(a, sets.full())
+
+        assert list(sets.members(a)) == [3]
+        assert sets.count(sets.empty()) == 0
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            make_bitsets(8, "bitarray")
+
+    def test_int_is_default(self):
+        assert isinstance(make_bitsets(8), IntBitsets)
+
+
+class TestLiveness:
+    """Tests para variables vivas"""
+
+    def test_loop(self):
+        cfg = build_cfg(read_tac(LOOP))
+        result = liveness(cfg)
+
+        header = _block(cfg, "LOOP_START_0")
+        assert result.in_items(cfg.main.entry) == ["n"]
+        assert sorted(result.in_items(header)) == ["i", "n"]
+        # El temporal sólo vive entre su definición y la copia
+        assert all("t0" not in result.in_items(b) for b in cfg.main.blocks)
+
+    def test_named_variables_live_at_exit(self):
+        cfg = build_cfg(read_tac("t0 = mov 1\nx = mov t0\n"))
+        result = liveness(cfg)
+
+        assert result.out_items(0) == ["x"]
+
+    def test_loop_at_end_of_region(self):
+        """El salto de regreso es lo último: si no salta, sale de la región"""
+        cfg = build_cfg(read_tac("k = mov 0\nL0:\nk = add t1, 1\nL0 = blt t8, 5\n"))
+        result = liveness(cfg)
+
+        latch = _block(cfg, "L0")
+        assert cfg.main.exits == [latch]
+        assert sorted(result.out_items(latch)) == ["k", "t1", "t8"]
+        assert "k" not in result.in_items(latch)
+
+    def test_call_reads_memory(self):
+        cfg = build_cfg(read_tac(CALLS))
+        function = cfg.function_named("FUNC_0")
+        problem = Liveness(cfg, function)
+        result = problem.solve()
+
+        live = problem.live_after(result, function.entry)
+        names = [sorted(result.items(value)) for value in live]
+        call = [str(t) for t in cfg.blocks[function.entry]].index("t2 = call g, 0")
+        # x sigue viva durante la llamada y t1 la cruza
+        assert names[call - 1] == ["t1", "x"]
+        assert names[-1] == ["x"]
+
+    def test_per_triplet_matches_block(self):
+        cfg = build_cfg(read_tac(DIAMOND))
+        problem = Liveness(cfg)
+        result = problem.solve()
+
+        for b in cfg.main.reverse_postorder:
+            block = cfg.blocks[b]
+            live = problem.live_after(result, b)
+            assert live[-1] == result.block_out[b]
+            defined, used = problem.effects(cfg.triplets[block.start])
+            first_in = (live[0] & ~problem.sets.from_indices(defined)) | problem.sets.from_indices(used)
+            assert first_in == result.block_in[b]
+
+
+class TestReachingDefinitions:
+    """Tests para definiciones que alcanzan"""
+
+    def test_loop(self):
+        cfg = build_cfg(read_tac(LOOP))
+        problem = ReachingDefinitions(cfg)
+        result = problem.solve()
+
+        header = _block(cfg, "LOOP_START_0")
+        # i = mov 0 (0) y la copia del cuerpo (4) llegan a la cabecera
+        assert problem.reaching(result, header, "i") == [0, 4]
+        assert problem.reaching(result, header, "t0") == [3]
+        assert problem.reaching(result, cfg.main.entry, "i") == []
+
+    def test_redefinition_kills(self):
+        cfg = build_cfg(read_tac(DIAMOND))
+        problem = ReachingDefinitions(cfg)
+        result = problem.solve()
+
+        join = _block(cfg, "L2")
+        assert problem.reaching(result, join, "t1") == [3, 6]
+        assert problem.reaching(result, join, "a") == [2]
+
+    def test_call_clobbers_memory(self):
+        cfg = build_cfg(read_tac("x = mov 1\nt0 = call f, 0\nL1:\nprint x\n"))
+        problem = ReachingDefinitions(cfg)
+        result = problem.solve()
+
+        assert problem.reaching(result, _block(cfg, "L1"), "x") == [1]
+
+
+class TestAvailableExpressions:
+    """Tests para expresiones disponibles"""
+
+    def test_must_hold_on_every_path(self):
+        cfg = build_cfg(read_tac(DIAMOND))
+        result = available_expressions(cfg)
+
+        join = _block(cfg, "L2")
+        # El camino que asigna a la recalcula antes de unirse
+        assert ("add", "a", "b") in result.in_items(join)
+        assert ("add", "a", "b") in result.in_items(_block(cfg, "L1"))
+
+    def test_assignment_kills(self):
+        cfg = build_cfg(read_tac("t0 = add a, b\na = mov 1\nL1:\nprint t0\n"))
+        result = available_expressions(cfg)
+
+        assert result.in_items(_block(cfg, "L1")) == []
+
+    def test_call_kills_memory_expressions(self):
+        cfg = build_cfg(read_tac(CALLS))
+        function = cfg.function_named("FUNC_0")
+        problem = AvailableExpressions(cfg, function)
+        result = problem.solve()
+
+        assert result.out_items(function.entry) == [("mul", "x", "2"), ("add", "t1", "t3")]
+        assert problem.readers["x"] == {problem.universe.index[("mul", "x", "2")]}
+
+    def test_entry_starts_empty(self):
+        cfg = build_cfg(read_tac(LOOP))
+        result = available_expressions(cfg)
+
+        assert result.in_items(cfg.main.entry) == []
+        header = _block(cfg, "LOOP_START_0")
+        assert result.in_items(header) == []
+
+
+class TestAvailableCopies:
+    """Tests para copias disponibles"""
+
+    def test_killed_by_source_or_target(self):
+        cfg = build_cfg(read_tac("a = mov b\nc = mov d\nd = mov 1\nL1:\nprint a\n"))
+        result = available_copies(cfg)
+
+        assert result.in_items(_block(cfg, "L1")) == [("a", "b")]
+
+    def test_must_hold_on_every_path(self):
+        cfg = build_cfg(read_tac("a = mov b\nL1 = bnz c\na = mov d\nL1:\nprint a\n"))
+        result = available_copies(cfg)
+
+        assert result.in_items(_block(cfg, "L1")) == []
+
+    def test_call_kills_memory_copies(self):
+        cfg = build_cfg(read_tac("t0 = mov t1\nx = mov t2\nt3 = call g, 0\nL1:\nprint t0\n"))
+        problem = AvailableCopies(cfg)
+        result = problem.solve()
+
+        assert result.in_items(_block(cfg, "L1")) == [("t0", "t1")]
+        assert problem.involving["t2"] == {problem.universe.index[("x", "t2")]}
+
+
+class TestBackends:
+    """Los dos backends dan el mismo resultado"""
+
+    @pytest.mark.parametrize("analysis", [liveness, reaching_definitions, available_expressions,
+                                          available_copies])
+    def test_same_result(self, analysis):
+        pytest.importorskip("numpy")
+        triplets = compile_triplets(FULL_PROGRAM, TREE_AST)
+        cfg = build_cfg(triplets)
+
+        for function in cfg.functions:
+            expected = analysis(cfg, function)
+            result = analysis(cfg, function, backend="numpy")
+            assert expected.iterations == result.iterations
+            for b in function.reverse_postorder:
+                assert result.in_items(b) == expected.in_items(b)
+                assert result.out_items(b) == expected.out_items(b)
+
+    def test_numpy_backend_class(self):
+        pytest.importorskip("numpy")
+        assert isinstance(make_bitsets(8, "numpy"), NumpyBitsets)
+
+
+class TestLargeFunction:
+    """Convergencia en una función con miles de bloques y temporales"""
+
+    def test_rpo_converges_quickly(self):
+        triplets = compile_triplets(generate_function_program(1500), TREE_AST)
+        cfg = build_cfg(triplets)
+        function = cfg.function_named("FUNC_0")
+        blocks = len(function.reverse_postorder)
+
+        for analysis in (liveness, reaching_definitions, available_expressions):
+            result = analysis(cfg, function)
+            # Los bucles son de un nivel: unas pocas visitas por bloque
+            assert result.iterations <= 3 * blocks
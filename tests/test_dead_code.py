@@ -0,0 +1,191 @@
+"""
+Tests para la eliminación de código muerto y de bloques inalcanzables.
+
+Prueba:
+- Código después de return, break y continue
+- Etiquetas sin usar y saltos a la etiqueta siguiente
+- Instrucciones cuyo resultado nadie lee (también en cadena)
+- Lo que no se debe quitar (variables con nombre, llamadas, escrituras)
+- Misma salida al ejecutar y punto fijo
+"""
+
+import pytest
+
+from benchmarks.synthetic import generate_function_program, generate_program
+from compiler.ir.interpreter import run_tac
+from compiler.ir.tac_reader import read_tac
+from compiler.optimizer import eliminate_dead_code, fold_constants, propagate_copies
+from compiler.optimizer.manager import OPT_O1
+from compiler.pipeline import compile_source
+from tests.helpers import compile_triplets, listing_of
+
+
+def _eliminate(text):
+    return eliminate_dead_code(read_tac(text))
+
+
+class TestUnreachable:
+    """Tests para los bloques que no se alcanzan"""
+
+    def test_after_return(self):
+        source = "function f(n: integer): integer { return n; print(n); }\nprint(f(2));"
+        triplets = compile_triplets(source)
+        result = eliminate_dead_code(triplets)
+        listing = listing_of(result.triplets)
+
+        # El print(n) después del return
+        assert "print t2" in listing_of(triplets) and "print t2" not in listing
+        assert "EndFunc;" in listing and listing[1].startswith("BeginFunc")
+        assert result.stats["inalcanzables"] >= 1
+
+    def test_after_break_and_continue(self):
+        source = ("let i: integer = 0;\n"
+                  "while (i < 3) { if (i == 1) { break; print(7); } i = i + 1; continue; print(9); }")
+        triplets = compile_triplets(source)
+        listing = listing_of(eliminate_dead_code(triplets).triplets)
+
+        assert "t7 = mov 7" in listing_of(triplets) and "t11 = mov 9" in listing_of(triplets)
+        assert not any(line.startswith("print") for line in listing)
+
+    def test_targeted_label_kept(self):
+        """Una etiqueta inalcanzable a la que todavía salta alguien se conserva"""
+        result = _eliminate("L0 = jmp\nprint 1\nL1:\nprint 2\nL0:\nL1 = jmp\n")
+        listing = listing_of(result.triplets)
+
+        assert "print 1" not in listing
+        assert "L1:" in listing
+
+    def test_function_kept(self):
+        text = "FUNC_0:\nBeginFunc 0;\nreturn 1\nEndFunc;\nFUNC_END_1:\nt0 = call FUNC_0, 0\nprint t0\n"
+
+        assert listing_of(_eliminate(text).triplets)[:4] == ["FUNC_0:", "BeginFunc 0;", "return 1", "EndFunc;"]
+
+
+class TestLabelsAndJumps:
+    """Tests para etiquetas y saltos redundantes"""
+
+    def test_unused_label(self):
+        result = _eliminate("print 1\nL0:\nprint 2\n")
+
+        assert listing_of(result.triplets) == ["print 1", "print 2"]
+        assert result.stats["etiquetas"] == 1
+
+    def test_jump_to_next(self):
+        result = _eliminate("print 1\nL0 = blt a, b\nL0:\nprint 2\nL1 = jmp\nL2:\nL1:\nprint 3\nL2 = jmp\n")
+        listing = listing_of(result.triplets)
+
+        assert "L0 = blt a, b" not in listing
+        assert "L1 = jmp" not in listing
+        assert result.stats["saltos"] == 2
+
+    def test_backward_jump_kept(self):
+        text = "i = mov 0\nL0:\ni = add i, 1\nL0 = blt i, 3\nprint i\n"
+
+        assert listing_of(_eliminate(text).triplets) == listing_of(read_tac(text))
+
+
+class TestDeadInstructions:
+    """Tests para las instrucciones cuyo resultado no se lee"""
+
+    def test_unused_temp(self):
+        result = _eliminate("t0 = add a, 1\nt1 = mul a, 2\nprint t1\n")
+
+        assert listing_of(result.triplets) == ["t1 = mul a, 2", "print t1"]
+        assert result.stats["muertos"] == 1
+
+    def test_chain_across_blocks(self):
+        """t1 sólo lo lee t2, que nadie lee: caen los dos"""
+        text = "t0 = add a, 1\nt1 = mul t0, 2\nL0 = bnz c\nt2 = add t1, 3\nL0:\nprint a\nL0 = jmp\n"
+        listing = listing_of(_eliminate(text).triplets)
+
+        assert not any(line.startswith(("t0", "t1", "t2")) for line in listing)
+
+    def test_named_variable_kept(self):
+        """Las variables con nombre están vivas al salir"""
+        text = "x = add a, 1\nprint a\n"
+
+        assert listing_of(_eliminate(text).triplets) == listing_of(read_tac(text))
+
+    def test_named_variable_overwritten(self):
+        result = _eliminate("x = add a, 1\nx = mov 2\nprint x\n")
+
+        assert listing_of(result.triplets) == ["x = mov 2", "print x"]
+
+    def test_named_variable_read_by_call(self):
+        text = "x = mov 1\nt0 = call f, 0\nx = mov 2\nprint t0\n"
+
+        assert "x = mov 1" in listing_of(_eliminate(text).triplets)
+
+    def test_named_variable_in_loop_at_end(self):
+        """Un bucle al final del listado sale cayendo: lo que escribe sigue vivo"""
+        result = _eliminate("k = mov 0\nL0:\nk = add t1, 1\nL0 = blt t8, 5\n")
+
+        assert listing_of(result.triplets) == ["L0:", "k = add t1, 1", "L0 = blt t8, 5"]
+        assert result.stats["muertos"] == 1
+
+    def test_visitor_do_while_at_end(self):
+        source = ("let k: integer = 0;\n"
+                  "do { k = k + 1; if (k == 2) { continue; } print(k); } while (k < 5);")
+        result = compile_source(source, opt_level=OPT_O1)
+
+        assert result['success']
+        assert any(t.startswith("k = ") for t in listing_of(result['triplets']))
+
+    @pytest.mark.parametrize("text", [
+        "t0 = call f, 0\n",
+        "t0 = mov 1\nstore t0, p\n",
+        "t0 = add a, 1\nG[0] = array_set 0, t0\n",
+    ], ids=["call", "store", "array_set"])
+    def test_side_effects_kept(self, text):
+        triplets = read_tac(text)
+
+        assert listing_of(eliminate_dead_code(triplets).triplets) == listing_of(triplets)
+
+    def test_visitor_parameter_copy(self):
+        source = "function f(n: integer): integer { return n; }\nprint(f(2));"
+        triplets = compile_triplets(source)
+
+        assert "t0 = mov n" in listing_of(triplets)
+        assert "t0 = mov n" not in listing_of(eliminate_dead_code(triplets).triplets)
+
+
+class TestSemantics:
+    """El listado optimizado imprime lo mismo"""
+
+    @pytest.mark.parametrize("text", [
+        "i = mov 0\nL0:\nt0 = mul i, 2\ni = add i, 1\nL1 = bge i, 3\nprint i\nL0 = jmp\nprint 99\n"
+        "L1:\nL2:\nprint i\n",
+        "x = mov 3\nt0 = add x, 1\nL1 = bgt x, 2\nx = mov 9\nL2 = jmp\nL1:\nt1 = mul x, 2\nprint t1\n"
+        "L2:\nprint x\n",
+    ], ids=["loop", "diamond"])
+    def test_same_output(self, text):
+        triplets = read_tac(text)
+        result = eliminate_dead_code(triplets)
+
+        assert result.changed
+        assert run_tac(result.triplets).output == run_tac(triplets).output
+
+    def test_after_other_passes(self):
+        text = ("i = mov 0\ns = mov 0\nk = mov 2\nL0:\nt0 = add i, 1\ni = mov t0\nL1 = bne i, 2\n"
+                "L0 = jmp\nt1 = mov 7\nprint t1\nL1:\nt2 = mul i, k\nt3 = add s, t2\ns = mov t3\n"
+                "t4 = mov s\nL2 = beq i, 5\nL0 = jmp\nprint 9\nL2:\nprint s\n")
+        triplets = propagate_copies(fold_constants(read_tac(text)).triplets).triplets
+        result = eliminate_dead_code(triplets)
+
+        assert result.changed
+        assert run_tac(result.triplets).output == run_tac(triplets).output
+
+    @pytest.mark.parametrize("generate", [generate_program, generate_function_program])
+    def test_fixed_point(self, generate):
+        first = eliminate_dead_code(compile_triplets(generate(200)))
+        second = eliminate_dead_code(first.triplets)
+
+        assert first.changed and not second.changed
+        assert listing_of(second.triplets) == listing_of(first.triplets)
+
+    def test_input_not_modified(self):
+        triplets = compile_triplets("function f(): integer { return 1; print(2); }\nprint(f());")
+        before = listing_of(triplets)
+        eliminate_dead_code(triplets)
+
+        assert listing_of(triplets) == before
@@ -0,0 +1,273 @@
+"""
+Tests para dominadores, fronteras de dominancia y bucles.
+
+Prueba:
+- Dominadores inmediatos contra la definición (conjuntos por punto fijo)
+- Fronteras de dominancia
+- Bucles naturales, anidamiento y flujo irreducible
+- Profundidad de bucle por tripleto y caché de FlowAnalysis
+"""
+
+import os
+
+import pytest
+
+from benchmarks.synthetic import generate_function_program, generate_program
+from compiler.ir.analysis import FlowAnalysis
+from compiler.ir.cfg import build_cfg
+from compiler.ir.dominators import DominatorTree, LoopForest, dominator_tree, loop_forest
+from compiler.ir.tac_reader import read_tac
+from compiler.pipeline import TREE_AST
+from tests.helpers import compile_triplets
+from tests.test_ast import FULL_PROGRAM
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _dominator_sets(cfg, function):
+    """Dominadores por la definición: Dom(b) = {b} ∪ ∩ Dom(p)"""
+    order = function.reverse_postorder
+    reachable = set(order)
+    dom = {b: set(order) for b in order}
+    dom[order[0]] = {order[0]}
+    changed = True
+    while changed:
+        changed = False
+        for b in order[1:]:
+            preds = [p for p in cfg.blocks[b].preds if p in reachable]
+            new = set.intersection(*(dom[p] for p in preds)) | {b}
+            if new != dom[b]:
+                dom[b] = new
+                changed = True
+    return dom
+
+
+DIAMOND = """
+L1 = bnz c
+print 1
+L2 = jmp
+L1:
+print 2
+L2:
+print 3
+"""
+
+NESTED = """
+let i: integer = 0;
+while (i < 3) {
+  let j: integer = 0;
+  while (j < 2) { j = j + 1; }
+  i = i + 1;
+}
+do {
+  i = i - 1;
+} while (i > 0);
+print(i);
+"""
+
+# Dos entradas al ciclo L1 <-> L2: ninguna cabecera lo domina
+IRREDUCIBLE = """
+L2 = bnz c
+L1:
+print 1
+L2:
+print 2
+L1 = jmp
+"""
+
+
+class TestDominatorTree:
+    """Tests para los dominadores inmediatos"""
+
+    def test_diamond(self):
+        cfg = build_cfg(read_tac(DIAMOND))
+        tree = dominator_tree(cfg)
+        join = cfg.label_block["L2"]
+
+        assert tree.root == 0
+        assert tree.immediate_dominator(0) is None
+        assert tree.immediate_dominator(join) == 0
+        assert tree.immediate_dominator(cfg.label_block["L1"]) == 0
+        assert tree.dominators(join) == [join, 0]
+        assert not tree.dominates(1, join)
+
+    @pytest.mark.parametrize("source", [
+        FULL_PROGRAM,
+        NESTED,
+        open(os.path.join(ROOT_DIR, "program", "program.cps"), encoding="utf-8").read(),
+        generate_program(200),
+    ], ids=["full", "nested", "program", "synthetic"])
+    def test_matches_definition(self, source):
+        cfg = build_cfg(compile_triplets(source))
+
+        for function in cfg.functions:
+            if function.entry is None:
+                continue
+            tree = DominatorTree(cfg, function)
+            expected = _dominator_sets(cfg, function)
+            for b in function.reverse_postorder:
+                assert set(tree.dominators(b)) == expected[b]
+                for a in function.reverse_postorder:
+                    assert tree.dominates(a, b) == (a in expected[b])
+
+    def test_unreachable(self):
+        cfg = build_cfg(read_tac("L1 = jmp\nprint x\nL1:\nprint y\n"))
+        tree = dominator_tree(cfg)
+
+        assert not tree.is_reachable(1)
+        assert tree.immediate_dominator(1) is None
+        assert tree.dominators(1) == []
+        assert not tree.dominates(0, 1)
+
+    def test_preorder(self):
+        cfg = build_cfg(compile_triplets(FULL_PROGRAM))
+        tree = dominator_tree(cfg)
+        seen = set()
+
+        for b in tree.preorder():
+            idom = tree.immediate_dominator(b)
+            assert idom is None or idom in seen
+            seen.add(b)
+
+
+class TestFrontiers:
+    """Tests para las fronteras de dominancia"""
+
+    def test_diamond(self):
+        cfg = build_cfg(read_tac(DIAMOND))
+        tree = dominator_tree(cfg)
+        join = cfg.label_block["L2"]
+
+        assert tree.frontier(1) == {join}
+        assert tree.frontier(cfg.label_block["L1"]) == {join}
+        assert tree.frontier(0) == set()
+
+    def test_loop_header_in_own_frontier(self):
+        cfg = build_cfg(read_tac("L0:\nt0 = add t0, 1\nL0 = blt t0, n\nprint t0\n"))
+        tree = dominator_tree(cfg)
+
+        # La entrada es la cabecera: la arista de retorno la pone en su frontera
+        assert tree.frontier(0) == {0}
+
+    def test_matches_definition(self):
+        """b ∈ DF(a) sii a domina a un predecesor de b y no domina estrictamente a b"""
+        cfg = build_cfg(compile_triplets(NESTED))
+        tree = dominator_tree(cfg)
+        order = cfg.main.reverse_postorder
+
+        for a in order:
+            expected = {b for b in order
+                        if any(tree.dominates(a, p) for p in cfg.blocks[b].preds)
+                        and not tree.strictly_dominates(a, b)}
+            assert tree.frontier(a) == expected
+
+
+class TestLoops:
+    """Tests para los bucles naturales"""
+
+    def test_nesting(self):
+        cfg = build_cfg(compile_triplets(NESTED))
+        forest = loop_forest(cfg)
+        labels = [cfg.blocks[loop.header].label for loop in forest]
+
+        assert len(forest) == 3
+        assert all(label.startswith("LOOP_START_") or label.startswith("DO_") for label in labels)
+        by_label = dict(zip(labels, forest.loops))
+        outer, inner = by_label["LOOP_START_0"], by_label["LOOP_START_4"]
+        assert inner.parent is outer and outer.children == [inner]
+        assert sorted(loop.depth for loop in forest) == [1, 1, 2]
+        assert len(forest.roots) == 2 and outer in forest.roots
+        assert inner.blocks < outer.blocks
+
+    def test_body_and_exits(self):
+        cfg = build_cfg(read_tac("""
+i = mov 0
+LOOP_START_0:
+LOOP_END_2 = bge i, n
+i = add i, 1
+LOOP_START_0 = jmp
+LOOP_END_2:
+print i
+"""))
+        forest = loop_forest(cfg)
+        loop = forest.loops[0]
+        header = cfg.label_block["LOOP_START_0"]
+
+        assert loop.header == header and loop.latches == [header + 1]
+        assert loop.blocks == {header, header + 1}
+        assert loop.exits(cfg) == [cfg.label_block["LOOP_END_2"]]
+        assert forest.is_header(header) and not forest.is_header(header + 1)
+        assert forest.depth(0) == 0 and forest.loop_of(0) is None
+
+    def test_irreducible(self):
+        cfg = build_cfg(read_tac(IRREDUCIBLE))
+        forest = loop_forest(cfg)
+
+        cycle = {cfg.label_block["L1"], cfg.label_block["L2"]}
+        assert len(forest) == 0
+        assert len(forest.irreducible) == 1 and set(forest.irreducible[0]) == cycle
+
+    def test_functions_have_own_forest(self):
+        source = ("function f(n: integer): integer {\n"
+                  "  let s: integer = 0;\n"
+                  "  while (s < n) { s = s + 1; }\n"
+                  "  return s;\n"
+                  "}\n"
+                  "print(f(3));\n")
+        cfg = build_cfg(compile_triplets(source))
+        function = cfg.function_named("FUNC_0")
+
+        assert len(loop_forest(cfg)) == 0
+        assert len(LoopForest(DominatorTree(cfg, function))) == 1
+
+    def test_large_function(self):
+        """Sin recursión: miles de bucles en una función"""
+        cfg = build_cfg(compile_triplets(generate_function_program(4000), TREE_AST))
+        forest = loop_forest(cfg, cfg.function_named("FUNC_0"))
+
+        assert len(forest) > 500
+        assert all(loop.depth == 1 for loop in forest)
+
+
+class TestFlowAnalysis:
+    """Tests para la caché de análisis y la profundidad por tripleto"""
+
+    def test_loop_depth_per_triplet(self):
+        triplets = compile_triplets(NESTED)
+        analysis = FlowAnalysis(triplets)
+
+        depths = {str(t): analysis.loop_depth(i) for i, t in enumerate(triplets) if t.is_label()}
+        assert depths["LOOP_START_0:"] == 1
+        assert depths["LOOP_START_4:"] == 2
+        assert depths["LOOP_END_2:"] == 0
+        assert analysis.spill_weight(0) == 1
+
+        inner = [i for i, t in enumerate(triplets) if str(t) == "LOOP_START_4:"][0]
+        assert analysis.loop_of(inner).depth == 2
+        assert analysis.spill_weight(inner) == 100
+
+    def test_cached(self):
+        analysis = FlowAnalysis(compile_triplets(NESTED))
+
+        assert analysis.dominators() is analysis.dominators()
+        assert analysis.loops() is analysis.loops()
+        assert analysis.loops().dominators is analysis.dominators()
+        assert analysis.liveness() is analysis.liveness()
+
+    def test_invalidate(self):
+        triplets = compile_triplets(NESTED)
+        analysis = FlowAnalysis(triplets)
+        cfg, loops, liveness = analysis.cfg, analysis.loops(), analysis.liveness()
+
+        analysis.invalidate()
+        assert analysis.cfg is not cfg
+        assert analysis.loops() is not loops
+        assert analysis.liveness() is not liveness
+        assert analysis.loop_depth(0) == 0
+
+    def test_from_cfg(self):
+        cfg = build_cfg(compile_triplets(NESTED))
+        analysis = FlowAnalysis(cfg=cfg)
+
+        assert analysis.cfg is cfg and analysis.triplets is cfg.triplets
@@ -0,0 +1,59 @@
+"""
+Tests para el intérprete de tripletos.
+
+Prueba:
+- Aritmética entera (división truncada), cadenas y comparaciones
+- Saltos y bucles
+- Límite de pasos y operaciones no soportadas
+"""
+
+import pytest
+
+from compiler.ir.interpreter import TacRuntimeError, run_tac
+from compiler.ir.tac_reader import read_tac
+
+
+class TestInterpreter:
+    """Tests para TacInterpreter"""
+
+    def test_arithmetic(self):
+        result = run_tac(read_tac("""
+t0 = div -7, 2
+t1 = mod -7, 2
+t2 = add "a", 3
+t3 = lt t0, t1
+print t0
+print t1
+print t2
+print t3
+"""))
+
+        assert result.output == ["-3", "-1", "a3", "true"]
+        assert result.values["t0"] == -3
+
+    def test_loop_counts(self):
+        result = run_tac(read_tac("""
+i = mov 0
+L0:
+i = add i, 1
+L0 = blt i, n
+print i
+"""), values={"n": 4})
+
+        assert result.output == ["4"]
+        assert result.counts["add"] == 4
+        assert result.steps == 1 + 4 * 2 + 1
+        # La última vuelta no salta
+        assert result.taken == 3
+
+    def test_step_limit(self):
+        with pytest.raises(TacRuntimeError):
+            run_tac(read_tac("L0:\nL0 = jmp\n"), max_steps=100)
+
+    def test_division_by_zero(self):
+        with pytest.raises(TacRuntimeError):
+            run_tac(read_tac("t0 = div 1, 0\n"))
+
+    def test_unsupported(self):
+        with pytest.raises(TacRuntimeError):
+            run_tac(read_tac("t0 = call FUNC_0, 0\n"))
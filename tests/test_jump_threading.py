@@ -0,0 +1,171 @@
+"""
+Tests para el enhebrado de saltos.
+
+Prueba:
+- Saltos a bloques que sólo saltan (continue, LOOP_CONT_)
+- Condicionales invertidos para caer en el bloque verdadero
+- Cadenas de bloques fusionadas
+- Lo que no cambia (PHI, ciclos de saltos)
+- Misma salida y menos saltos tomados
+"""
+
+import pytest
+
+from benchmarks.synthetic import generate_program
+from compiler.ir.interpreter import run_tac
+from compiler.ir.ssa import to_ssa
+from compiler.ir.tac_reader import read_tac
+from compiler.optimizer import thread_jumps
+from tests.helpers import compile_triplets, listing_of
+
+
+# while (i < 6) { if (i == 3) { i = i + 1; continue; } s = s + i; i = i + 1; }
+CONTINUE_LOOP = ("i = mov 0\ns = mov 0\nLOOP_START_0:\nL1 = blt i, 6\nLOOP_END_2 = jmp\nL1:\n"
+                 "IF_TRUE_3 = beq i, 3\nIF_END_4 = jmp\nIF_TRUE_3:\ni = add i, 1\nLOOP_CONT_5 = jmp\n"
+                 "IF_END_4:\ns = add s, i\ni = add i, 1\nLOOP_CONT_5:\nLOOP_START_0 = jmp\n"
+                 "LOOP_END_2:\nprint s\n")
+
+
+def _thread(text):
+    return thread_jumps(read_tac(text))
+
+
+class TestThreading:
+    """Tests para los saltos redirigidos"""
+
+    def test_jump_to_jump(self):
+        result = _thread("L0 = bz c\nprint 1\nL9 = jmp\nL0:\nL5 = jmp\nprint 2\nL5:\nprint 3\nL9:\n")
+        listing = listing_of(result.triplets)
+
+        assert listing[0] == "L5 = bz c"
+        assert result.stats["enhebrados"] == 1
+
+    def test_chain_through_labels(self):
+        """Bloques vacíos (sólo etiquetas) entre el salto y su destino final"""
+        text = ("L0 = bz c\nprint 1\nL9 = jmp\nL0:\nL1:\nL2 = jmp\nL2:\nL3 = jmp\nprint 3\nL3:\nprint 4\n"
+                "L9:\n")
+
+        assert listing_of(_thread(text).triplets)[0] == "L3 = bz c"
+
+    def test_continue(self):
+        listing = listing_of(_thread(CONTINUE_LOOP).triplets)
+
+        assert "LOOP_CONT_5 = jmp" not in listing
+        assert "LOOP_CONT_5:" not in listing
+        assert listing.count("LOOP_START_0 = jmp") == 2
+
+    def test_visitor_continue(self):
+        source = ("let s: integer = 0;\n"
+                  "while (s < 10) { if (s == 4) { continue; } s = s + 1; }")
+        listing = listing_of(thread_jumps(compile_triplets(source)).triplets)
+
+        assert not any(t.startswith("LOOP_CONT_") for t in listing)
+        assert not any(t.startswith("IF_TRUE_") for t in listing)
+
+
+class TestInversion:
+    """Tests para los condicionales invertidos"""
+
+    @pytest.mark.parametrize("op, inverted", [
+        ("blt", "bge"), ("ble", "bgt"), ("beq", "bne"), ("bgt", "ble"),
+    ])
+    def test_inverted(self, op, inverted):
+        text = f"L1 = {op} a, b\nL2 = jmp\nL1:\nprint 1\nL2:\nprint 2\n"
+
+        assert listing_of(_thread(text).triplets) == [f"L2 = {inverted} a, b", "print 1", "L2:", "print 2"]
+
+    def test_zero_test(self):
+        text = "L1 = bz c\nL2 = jmp\nL1:\nprint 1\nL2:\n"
+
+        assert listing_of(_thread(text).triplets)[0] == "L2 = bnz c"
+
+    def test_visitor_if(self):
+        source = "let a: integer = 1;\nif (a < 3) { print(a); }"
+        listing = listing_of(thread_jumps(compile_triplets(source)).triplets)
+
+        branch = next(t for t in listing if " = b" in t)
+        assert branch.startswith("IF_END_") and " bge " in branch
+        assert not any(t.endswith(" = jmp") for t in listing)
+
+    def test_same_target(self):
+        text = "L1 = blt a, b\nL1 = jmp\nprint 1\nL1:\nprint 2\n"
+
+        assert listing_of(_thread(text).triplets) == ["print 2"]
+
+    def test_label_not_next(self):
+        """El verdadero no está justo después: no se invierte"""
+        text = "L3 = bz c\nL1 = blt a, b\nL2 = jmp\nL3:\nprint 0\nL1:\nprint 1\nL2:\nprint 2\n"
+
+        assert listing_of(_thread(text).triplets)[1:3] == ["L1 = blt a, b", "L2 = jmp"]
+
+
+class TestMerge:
+    """Tests para las cadenas de bloques"""
+
+    def test_block_moved(self):
+        text = "print 0\nL5 = jmp\nL9:\nprint 9\nL7 = jmp\nL5:\nprint 5\nL9 = jmp\nL7:\n"
+        result = _thread(text)
+
+        assert listing_of(result.triplets) == ["print 0", "print 5", "print 9"]
+        assert result.stats["fusionados"] >= 1
+
+    def test_falls_through(self):
+        """B cae en su siguiente: moverlo necesitaría otro salto"""
+        text = "L3 = bz c\nprint 0\nL5 = jmp\nL3:\nprint 3\nL9 = jmp\nL5:\nprint 5\nL9:\nprint 9\n"
+
+        assert _thread(text).stats["fusionados"] == 0
+
+    def test_two_predecessors(self):
+        text = "L1 = bz c\nL5 = jmp\nL1:\nprint 1\nL9 = jmp\nprint 2\nL5:\nprint 5\nL9:\n"
+        listing = listing_of(_thread(text).triplets)
+
+        assert listing.index("print 5") > listing.index("print 1")
+
+
+class TestUnchanged:
+    """Tests para lo que se deja como está"""
+
+    def test_ssa_form(self):
+        """Las PHI nombran a sus predecesores: el listado SSA no cambia"""
+        ssa = list(to_ssa(read_tac("x = mov 0\nL0 = bnz c\nx = mov 1\nL9 = jmp\nL0:\nL9 = jmp\nL9:\n"
+                                   "print x\n")))
+
+        assert not thread_jumps(ssa).changed
+
+    def test_jump_cycle(self):
+        text = "L0 = bnz c\nL1:\nL2 = jmp\nL2:\nL1 = jmp\nL0:\nprint 1\n"
+        result = _thread(text)
+
+        assert run_tac(result.triplets, values={"c": 1}).output == ["1"]
+
+    def test_idempotent(self):
+        first = thread_jumps(compile_triplets(generate_program(200)))
+        second = thread_jumps(first.triplets)
+
+        assert first.changed and not second.changed
+
+
+class TestSemantics:
+    """El listado optimizado imprime lo mismo con menos saltos tomados"""
+
+    @pytest.mark.parametrize("text", [
+        CONTINUE_LOOP,
+        "i = mov 0\nL0:\nL1 = blt i, 5\nL2 = jmp\nL1:\nprint i\ni = add i, 1\nL0 = jmp\nL2:\nprint 9\n",
+        "i = mov 0\ns = mov 0\nL0:\nL1 = blt i, 8\nL9 = jmp\nL1:\nt0 = mod i, 2\nL3 = beq t0, 0\nL4 = jmp\n"
+        "L3:\ns = add s, i\nL5 = jmp\nL4:\ns = sub s, 1\nL5:\ni = add i, 1\nL0 = jmp\nL9:\nprint s\n",
+    ], ids=["continue", "while", "if_else"])
+    def test_fewer_taken(self, text):
+        triplets = read_tac(text)
+        result = thread_jumps(triplets)
+        before = run_tac(triplets)
+        after = run_tac(result.triplets)
+
+        assert after.output == before.output
+        assert after.taken < before.taken
+
+    def test_input_not_modified(self):
+        triplets = read_tac(CONTINUE_LOOP)
+        before = listing_of(triplets)
+        thread_jumps(triplets)
+
+        assert listing_of(triplets) == before
@@ -0,0 +1,126 @@
+"""
+Tests para el lexer rápido.
+
+Prueba:
+- Conformidad con CompiscriptLexer sobre todo el corpus de pruebas
+  (programas .cps y todas las cadenas de los tests)
+- Errores léxicos iguales a los de ANTLR
+- Selección del lexer en el pipeline
+"""
+
+import ast
+import glob
+import os
+
+import pytest
+from antlr4 import CommonTokenStream, InputStream
+from antlr4.error.ErrorListener import ErrorListener
+
+from compiler.pipeline import (
+    lex, parse_tokens, compile_source, CompiscriptLexer, LEXER_ANTLR, LEXER_FAST
+)
+from compiler.frontend.lexer import FastCompiscriptLexer
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class CollectingListener(ErrorListener):
+    """Guarda los errores léxicos en lugar de imprimirlos"""
+
+    def __init__(self):
+        self.errors = []
+
+    def syntaxError(self, recognizer, offendingSymbol, line, column, msg, e):
+        self.errors.append((line, column, msg))
+
+
+def _corpus():
+    """Programas .cps del repositorio y cada literal de cadena de los tests"""
+    sources = []
+    for path in sorted(glob.glob(os.path.join(ROOT_DIR, "**", "*.cps"), recursive=True)):
+        with open(path, encoding='utf-8') as f:
+            sources.append(f.read())
+    for path in sorted(glob.glob(os.path.join(ROOT_DIR, "tests", "*.py"))):
+        with open(path, encoding='utf-8') as f:
+            module = ast.parse(f.read())
+        for node in ast.walk(module):
+            if isinstance(node, ast.Constant) and isinstance(node.value, str):
+                sources.append(node.value)
+    return sources
+
+
+def _tokens(lexer_class, source):
+    lexer = lexer_class(InputStream(source))
+    listener = CollectingListener()
+    lexer.removeErrorListeners()
+    lexer.addErrorListener(listener)
+    stream = CommonTokenStream(lexer)
+    stream.fill()
+    tokens = [
+        (t.type, t.text, t.line, t.column, t.start, t.stop, t.channel, t.tokenIndex)
+        for t in stream.tokens
+    ]
+    return tokens, listener.errors
+
+
+class TestConformance:
+    """El lexer rápido produce exactamente los tokens de CompiscriptLexer"""
+
+    def test_whole_corpus(self):
+        """Mismos tokens y errores para todo el corpus"""
+        corpus = _corpus()
+        assert len(corpus) > 100
+
+        for source in corpus:
+            assert _tokens(FastCompiscriptLexer, source) == _tokens(CompiscriptLexer, source), source
+
+    @pytest.mark.parametrize("source", [
+        'let s = "sin cerrar\nx = 1;',
+        'let s = "sin cerrar',
+        'a | b & c',
+        'x = 1 # 2 @ 3;',
+        '/* sin cerrar\nlet a = 1;',
+        'a /* uno */ b // dos\r\n c /* tres\n cuatro */ d',
+        'letter let1 _x 12abc "a//b" "/*"',
+        'ñ = 1;',
+        '',
+    ])
+    def test_edge_cases(self, source):
+        """Errores léxicos, comentarios y prefijos de palabras clave"""
+        assert _tokens(FastCompiscriptLexer, source) == _tokens(CompiscriptLexer, source)
+
+    def test_reports_recognition_error(self):
+        """El error léxico tiene el mismo formato que el de ANTLR"""
+        _, errors = _tokens(FastCompiscriptLexer, "let x = 1;\nx = #;")
+
+        assert errors == [(2, 4, "token recognition error at: '#'")]
+
+
+class TestPipelineLexer:
+    """Tests para la opción de lexer del pipeline"""
+
+    def test_parser_consumes_fast_tokens(self):
+        """CompiscriptParser acepta el stream del lexer rápido"""
+        source = "function f(a: integer): integer { return a * 2; } print(f(3));"
+        result = parse_tokens(lex(InputStream(source), LEXER_FAST))
+
+        assert result.syntax_errors == 0
+        assert result.tree.getText() == parse_tokens(lex(InputStream(source))).tree.getText()
+
+    def test_compile_source_same_tac(self):
+        """compile_source genera el mismo TAC con ambos lexers"""
+        with open(os.path.join(ROOT_DIR, "program", "program.cps"), encoding='utf-8') as f:
+            source = f.read()
+
+        fast = compile_source(source, lexer_mode=LEXER_FAST)
+        full = compile_source(source, lexer_mode=LEXER_ANTLR)
+
+        assert fast['success'] is True
+        assert fast['token_count'] == full['token_count']
+        assert [str(t) for t in fast['triplets']] == [str(t) for t in full['triplets']]
+
+    def test_unknown_lexer(self):
+        """Un lexer desconocido lanza ValueError"""
+        with pytest.raises(ValueError):
+            lex(InputStream("print(1);"), "re")
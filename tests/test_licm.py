@@ -0,0 +1,181 @@
+"""
+Tests para el movimiento de código invariante fuera de los bucles.
+
+Prueba:
+- Constantes y expresiones invariantes de while/for/do-while
+- Pre-encabezado creado y entradas redirigidas
+- Lo que no sale (operandos que cambian, llamadas, escrituras, variables
+  vivas, divisiones)
+- Bucles anidados
+- Misma salida y menos instrucciones ejecutadas
+"""
+
+import pytest
+
+from compiler.ir.interpreter import run_tac
+from compiler.ir.tac_reader import read_tac
+from compiler.optimizer import hoist_loop_invariants
+from tests.helpers import compile_triplets, listing_of
+
+
+# while (i < 10) { s = s + (base + n * 4) + i * 4; i = i + 1; }
+WHILE_LOOP = ("n = mov 5\nbase = mov 100\ni = mov 0\ns = mov 0\nLOOP_START_0:\nt0 = mov 10\n"
+              "L1 = blt i, t0\nLOOP_END_2 = jmp\nL1:\nt1 = mul n, 4\nt2 = add base, t1\n"
+              "t3 = mul i, 4\nt4 = add t2, t3\ns = add s, t4\ni = add i, 1\nLOOP_START_0 = jmp\n"
+              "LOOP_END_2:\nprint s\n")
+
+# for i, for j: s = s + i * 8 + j
+NESTED_LOOPS = ("i = mov 0\ns = mov 0\nL0:\nt0 = mov 4\nL9 = bge i, t0\nj = mov 0\nL1:\nt1 = mov 3\n"
+                "L8 = bge j, t1\nt2 = mov 8\nt3 = mul i, t2\nt4 = add t3, j\ns = add s, t4\n"
+                "j = add j, 1\nL1 = jmp\nL8:\ni = add i, 1\nL0 = jmp\nL9:\nprint s\n")
+
+
+def _hoist(text):
+    return hoist_loop_invariants(read_tac(text))
+
+
+def _preheader(listing, label):
+    """Tripletos entre `PRE_<label>:` y `<label>:`"""
+    start = listing.index(f"PRE_{label}:")
+    return listing[start + 1:listing.index(f"{label}:")]
+
+
+class TestHoisting:
+    """Tests para lo que sale del bucle"""
+
+    def test_while_invariants(self):
+        result = _hoist(WHILE_LOOP)
+        listing = listing_of(result.triplets)
+
+        assert _preheader(listing, "LOOP_START_0") == ["t0 = mov 10", "t1 = mul n, 4", "t2 = add base, t1"]
+        assert "t3 = mul i, 4" in listing[listing.index("L1:"):]
+        assert result.stats == {"invariantes": 3, "preencabezados": 1}
+
+    def test_visitor_for(self):
+        source = ("let n: integer = 5;\nlet s: integer = 0;\n"
+                  "for (let i: integer = 0; i < 10; i = i + 1) { s = s + n * 4; }")
+        listing = listing_of(hoist_loop_invariants(compile_triplets(source)).triplets)
+        preheader = _preheader(listing, "LOOP_START_0")
+
+        # La constante de la condición y n * 4
+        assert "t4 = mov 10" in preheader
+        assert "t9 = mul t7, t8" in preheader
+
+    def test_outside_entry_redirected(self):
+        text = ("i = mov 0\nL5 = jmp\nprint 1\nL5:\nL0:\nt0 = mov 3\nL9 = bge i, t0\ni = add i, 1\n"
+                "L0 = jmp\nL9:\nprint i\n")
+        listing = listing_of(_hoist(text).triplets)
+
+        assert "L5 = jmp" in listing
+        assert _preheader(listing, "L0") == ["t0 = mov 3"]
+
+    def test_jump_into_header_redirected(self):
+        text = "i = mov 0\nL0 = jmp\nprint 1\nL0:\nt0 = mov 3\ni = add i, 1\nL0 = blt i, t0\nprint i\n"
+        listing = listing_of(_hoist(text).triplets)
+
+        assert listing[1] == "PRE_L0 = jmp"
+        assert listing[-2] == "L0 = blt i, t0"
+
+    def test_named_variable_dominating_exits(self):
+        """do-while: el cuerpo domina la salida"""
+        text = "k = mov 2\ni = mov 0\nL0:\nx = mul k, 3\ni = add i, x\nL0 = blt i, 20\nprint i\nprint x\n"
+        listing = listing_of(_hoist(text).triplets)
+
+        assert _preheader(listing, "L0") == ["x = mul k, 3"]
+
+
+class TestNotHoisted:
+    """Tests para lo que se queda en el bucle"""
+
+    def _assert_not_hoisted(self, text):
+        triplets = read_tac(text)
+        result = hoist_loop_invariants(triplets)
+
+        assert not result.changed
+        assert listing_of(result.triplets) == listing_of(triplets)
+
+    def test_operand_changes(self):
+        self._assert_not_hoisted("i = mov 0\nL0:\nt0 = mul i, 4\nprint t0\ni = add i, 1\nL0 = blt i, 3\n")
+
+    def test_call_clobbers_named_operand(self):
+        self._assert_not_hoisted("k = mov 2\ni = mov 0\nL0:\nt9 = call f, 0\nt0 = mul k, 4\nprint t0\n"
+                                 "i = add i, 1\nL0 = blt i, 3\n")
+
+    def test_load_with_store(self):
+        self._assert_not_hoisted("i = mov 0\nL0:\nt0 = array_get p\nprint t0\nG[0] = array_set i, t0\n"
+                                 "i = add i, 1\nL0 = blt i, 3\n")
+
+    def test_load_not_dominating_exit(self):
+        """En un while el cuerpo puede no ejecutarse: la lectura se queda"""
+        self._assert_not_hoisted("i = mov 0\nL0:\nL9 = bge i, 3\nt0 = array_get p\nprint t0\n"
+                                 "i = add i, 1\nL0 = jmp\nL9:\n")
+
+    def test_division_by_variable(self):
+        self._assert_not_hoisted("i = mov 0\nL0:\nL9 = bge i, 3\nt0 = div k, d\nprint t0\n"
+                                 "i = add i, 1\nL0 = jmp\nL9:\n")
+
+    def test_named_variable_live_in_header(self):
+        """x se lee antes de asignarse en la vuelta: su valor anterior importa"""
+        self._assert_not_hoisted("x = mov 1\ni = mov 0\nL0:\nprint x\nx = mul k, 3\ni = add i, 1\n"
+                                 "L0 = blt i, 3\n")
+
+    def test_named_variable_not_dominating_exit(self):
+        self._assert_not_hoisted("x = mov 1\ni = mov 0\nL0:\nL9 = bge i, 3\nx = mul k, 3\ni = add i, 1\n"
+                                 "L0 = jmp\nL9:\nprint x\n")
+
+    def test_two_definitions_reaching(self):
+        self._assert_not_hoisted("i = mov 0\nL0:\nL1 = bz c\ny = mov 1\nL1:\nt0 = add y, 1\nprint t0\n"
+                                 "y = mov 2\ni = add i, 1\nL0 = blt i, 3\n")
+
+
+class TestNested:
+    """Tests para bucles anidados"""
+
+    def test_hoisted_to_outermost(self):
+        result = _hoist(NESTED_LOOPS)
+        listing = listing_of(result.triplets)
+
+        # Las constantes salen de los dos bucles; i * 8 sólo del interno
+        assert _preheader(listing, "L0") == ["t0 = mov 4", "t1 = mov 3", "t2 = mov 8"]
+        assert _preheader(listing, "L1") == ["t3 = mul i, t2"]
+        assert result.stats["preencabezados"] == 2
+
+
+class TestSemantics:
+    """El listado optimizado imprime lo mismo con menos instrucciones"""
+
+    @pytest.mark.parametrize("text", [
+        WHILE_LOOP,
+        NESTED_LOOPS,
+        "k = mov 2\ni = mov 0\nL0:\nx = mul k, 3\ni = add i, x\nL0 = blt i, 20\nprint i\nprint x\n",
+        "i = mov 0\ns = mov 0\nL0:\nt0 = mov 6\nL9 = bge i, t0\nL2 = bz c\nt1 = mul c, 5\ns = add s, t1\n"
+        "L2:\ni = add i, 1\nL0 = jmp\nL9:\nprint s\n",
+    ], ids=["while", "nested", "do_while", "conditional"])
+    def test_fewer_steps(self, text):
+        triplets = read_tac(text)
+        result = hoist_loop_invariants(triplets)
+        before = run_tac(triplets, values={"c": 1})
+        after = run_tac(result.triplets, values={"c": 1})
+
+        assert result.changed
+        assert after.output == before.output
+        assert after.steps < before.steps
+
+    def test_zero_iterations(self):
+        text = "i = mov 5\nL0:\nt0 = mov 3\nL9 = bge i, t0\nt1 = mul i, 2\nprint t1\ni = add i, 1\nL0 = jmp\nL9:\nprint i\n"
+        triplets = read_tac(text)
+
+        assert run_tac(hoist_loop_invariants(triplets).triplets).output == run_tac(triplets).output
+
+    def test_idempotent(self):
+        first = _hoist(NESTED_LOOPS)
+        second = hoist_loop_invariants(first.triplets)
+
+        assert first.changed and not second.changed
+
+    def test_input_not_modified(self):
+        triplets = read_tac(WHILE_LOOP)
+        before = listing_of(triplets)
+        hoist_loop_invariants(triplets)
+
+        assert listing_of(triplets) == before
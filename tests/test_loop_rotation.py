@@ -0,0 +1,162 @@
+"""
+Tests para la rotación de bucles.
+
+Prueba:
+- La prueba copiada al final del cuerpo en lugar del `jmp` de regreso
+- Cabeceras que ya caen en el cuerpo (salto invertido)
+- Varias aristas de retorno (continue)
+- Lo que no se rota
+- Misma salida y menos saltos tomados
+"""
+
+import pytest
+
+from compiler.ir.interpreter import run_tac
+from compiler.ir.tac_reader import read_tac
+from compiler.optimizer import rotate_loops, thread_jumps
+from tests.helpers import compile_triplets, listing_of
+
+
+# while (i < 5) { print i; i = i + 1; } con la constante de la condición en la cabecera
+WHILE_LOOP = ("i = mov 0\nLOOP_START_0:\nt0 = mov 5\nL1 = blt i, t0\nLOOP_END_2 = jmp\nL1:\nprint i\n"
+              "i = add i, 1\nLOOP_START_0 = jmp\nLOOP_END_2:\nprint 9\n")
+
+# while (i < 6) { if (i == 3) { i = i + 1; continue; } s = s + i; i = i + 1; }
+CONTINUE_LOOP = ("i = mov 0\ns = mov 0\nLOOP_START_0:\nL1 = blt i, 6\nLOOP_END_2 = jmp\nL1:\n"
+                 "IF_TRUE_3 = beq i, 3\nIF_END_4 = jmp\nIF_TRUE_3:\ni = add i, 1\nLOOP_START_0 = jmp\n"
+                 "IF_END_4:\ns = add s, i\ni = add i, 1\nLOOP_START_0 = jmp\nLOOP_END_2:\nprint s\n")
+
+
+def _rotate(text):
+    return rotate_loops(read_tac(text))
+
+
+class TestRotation:
+    """Tests para la prueba al final del cuerpo"""
+
+    def test_while(self):
+        result = _rotate(WHILE_LOOP)
+
+        assert listing_of(result.triplets) == [
+            "i = mov 0", "LOOP_START_0:", "t0 = mov 5", "L1 = blt i, t0", "LOOP_END_2 = jmp",
+            "L1:", "print i", "i = add i, 1", "t1 = mov 5", "L1 = blt i, t1",
+            "LOOP_END_2:", "print 9",
+        ]
+        assert result.stats == {"rotados": 1, "copiados": 2}
+
+    def test_inverted_header(self):
+        """Después de thread_jumps la cabecera sale con el salto y cae en el cuerpo"""
+        threaded = thread_jumps(read_tac(WHILE_LOOP)).triplets
+        listing = listing_of(rotate_loops(threaded).triplets)
+
+        assert "LOOP_END_2 = bge i, t0" in listing
+        assert "ROT_LOOP_START_0 = blt i, t1" in listing
+        assert listing.index("ROT_LOOP_START_0:") < listing.index("print i")
+
+    def test_exit_not_next(self):
+        """La salida no sigue al bucle: la copia termina con un `jmp` a ella"""
+        text = ("i = mov 0\nL0:\nL1 = blt i, 3\nL9 = jmp\nL1:\nprint i\ni = add i, 1\nL0 = jmp\n"
+                "L8:\nprint 8\nL9:\nprint 9\n")
+        listing = listing_of(_rotate(text).triplets)
+
+        k = listing.index("L1 = blt i, 3", 4)
+        assert listing[k + 1] == "L9 = jmp"
+
+    def test_continue(self):
+        result = _rotate(CONTINUE_LOOP)
+        listing = listing_of(result.triplets)
+
+        assert "LOOP_START_0 = jmp" not in listing
+        assert listing.count("L1 = blt i, 6") == 3
+        # El primer retorno necesita un `jmp` a la salida; el segundo cae en ella
+        assert result.stats["copiados"] == 3
+
+    def test_visitor_loops(self):
+        source = ("let s: integer = 0;\n"
+                  "while (s < 10) { s = s + 1; }\n"
+                  "for (let i: integer = 0; i < 5; i = i + 1) { print(s); }")
+        result = rotate_loops(compile_triplets(source))
+        listing = listing_of(result.triplets)
+
+        assert result.stats["rotados"] == 2
+        assert not any(t.startswith("LOOP_START_") and t.endswith(" = jmp") for t in listing)
+
+    def test_local_temps_renamed(self):
+        """Cada copia define temporales nuevos: siguen con una sola definición"""
+        result = _rotate(CONTINUE_LOOP.replace("L1 = blt i, 6", "t0 = add i, 1\nL1 = blt t0, 7"))
+        defined = [t.split(" = ")[0] for t in listing_of(result.triplets) if t.startswith("t")]
+
+        assert len(defined) == 3 and len(set(defined)) == 3
+
+
+class TestNotRotated:
+    """Tests para lo que no se rota"""
+
+    def _assert_unchanged(self, text):
+        triplets = read_tac(text)
+        result = rotate_loops(triplets)
+
+        assert not result.changed
+        assert listing_of(result.triplets) == listing_of(triplets)
+
+    def test_do_while(self):
+        self._assert_unchanged("i = mov 0\nL0:\nprint i\ni = add i, 1\nL0 = blt i, 5\nprint 9\n")
+
+    def test_call_in_header(self):
+        self._assert_unchanged("i = mov 0\nL0:\nt1 = call f, 0\nL1 = blt i, t1\nL9 = jmp\nL1:\n"
+                               "i = add i, 1\nL0 = jmp\nL9:\n")
+
+    def test_big_header(self):
+        header = "".join(f"t{k} = add i, {k}\n" for k in range(1, 9))
+        self._assert_unchanged(f"i = mov 0\nL0:\n{header}L1 = blt i, t8\nL9 = jmp\nL1:\n"
+                               "i = add i, 1\nL0 = jmp\nL9:\n")
+
+    def test_both_targets_in_loop(self):
+        """Una cabecera que no sale del bucle (el bucle sale por otro lado)"""
+        self._assert_unchanged("i = mov 0\nL0:\nL1 = bz c\nL2 = jmp\nL1:\nprint 1\nL2:\n"
+                               "i = add i, 1\nL9 = bge i, 3\nL0 = jmp\nL9:\n")
+
+    def test_idempotent(self):
+        first = _rotate(CONTINUE_LOOP)
+        second = rotate_loops(first.triplets)
+
+        assert first.changed and not second.changed
+
+
+class TestSemantics:
+    """El listado rotado imprime lo mismo con menos saltos tomados"""
+
+    @pytest.mark.parametrize("text", [
+        WHILE_LOOP,
+        CONTINUE_LOOP,
+        "i = mov 0\ns = mov 0\nL0:\nL1 = blt i, 4\nL9 = jmp\nL1:\nj = mov 0\nL2:\nL3 = blt j, 3\n"
+        "L8 = jmp\nL3:\ns = add s, j\nj = add j, 1\nL2 = jmp\nL8:\ni = add i, 1\nL0 = jmp\nL9:\nprint s\n",
+    ], ids=["while", "continue", "nested"])
+    def test_fewer_taken(self, text):
+        triplets = read_tac(text)
+        before = run_tac(triplets)
+        after = run_tac(rotate_loops(triplets).triplets)
+
+        assert after.output == before.output
+        assert after.taken < before.taken
+
+    def test_after_threading(self):
+        threaded = thread_jumps(read_tac(CONTINUE_LOOP)).triplets
+        before = run_tac(threaded)
+        after = run_tac(rotate_loops(threaded).triplets)
+
+        assert after.output == before.output
+        assert after.taken < before.taken
+
+    def test_zero_iterations(self):
+        text = WHILE_LOOP.replace("i = mov 0", "i = mov 7")
+        triplets = read_tac(text)
+
+        assert run_tac(rotate_loops(triplets).triplets).output == ["9"]
+
+    def test_input_not_modified(self):
+        triplets = read_tac(CONTINUE_LOOP)
+        before = listing_of(triplets)
+        rotate_loops(triplets)
+
+        assert listing_of(triplets) == before
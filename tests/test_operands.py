@@ -0,0 +1,132 @@
+"""
+Tests para los operandos internados.
+
+Prueba:
+- OperandFactory: una instancia por (tipo, valor) con ids densos
+- El emitter comparte operandos entre tripletos
+- Operand y Triplet con __slots__
+- uses_operand/defines_operand equivalentes a comparar str()
+"""
+
+import pytest
+
+from compiler.ir.emitter import TripletEmitter
+from compiler.ir.triplet import (
+    OpCode, Operand, OperandFactory, Triplet, const_operand, temp_operand, var_operand
+)
+from compiler.pipeline import compile_source
+from tests.test_ast import FULL_PROGRAM
+
+
+class TestOperandFactory:
+    """Tests para el internado de operandos"""
+
+    def test_same_instance(self):
+        """El mismo (tipo, valor) retorna la misma instancia"""
+        factory = OperandFactory()
+
+        assert factory.var("x") is factory.var("x")
+        assert factory.temp("t0") is factory.get("t0", "temp")
+        assert factory.var("x") is not factory.temp("x")
+
+    def test_dense_ids(self):
+        """Los ids son 0, 1, 2... en orden de creación"""
+        factory = OperandFactory()
+        operands = [factory.var("a"), factory.const(1), factory.label("L0"), factory.var("a")]
+
+        assert [o.id for o in operands] == [0, 1, 2, 0]
+        assert factory.operands[1] is operands[1]
+        assert len(factory) == 3
+
+    def test_constants_by_class(self):
+        """1, 1.0 y True son constantes distintas"""
+        factory = OperandFactory()
+        values = [factory.const(1).value, factory.const(1.0).value, factory.const(True).value]
+
+        assert [type(v) for v in values] == [int, float, bool]
+        assert len(factory) == 3
+
+    def test_intern_foreign(self):
+        """Un operando creado fuera (o en otra fábrica) se cambia por el internado"""
+        factory = OperandFactory()
+        other = OperandFactory()
+        local = factory.var("x")
+
+        assert factory.intern(var_operand("x")) is local
+        assert factory.intern(other.var("x")) is local
+        assert factory.intern(local) is local
+
+    def test_coerce(self):
+        """Los argumentos crudos de emit se convierten igual que antes"""
+        factory = OperandFactory()
+
+        assert (factory.coerce(3).type, factory.coerce("a").type) == ("const", "var")
+        assert factory.coerce(True).value is True
+
+
+class TestInternedEmitter:
+    """El emitter guarda operandos internados"""
+
+    def test_operands_shared(self):
+        emitter = TripletEmitter()
+        emitter.emit(OpCode.ADD, "a", 1, temp_operand("t0"))
+        emitter.emit(OpCode.MOV, temp_operand("t0"), None, "a")
+        first, second = emitter.table.triplets
+
+        assert first.arg1 is second.result
+        assert first.result is second.arg1
+        assert first.arg2 is emitter.operands.const(1)
+
+    def test_same_tac(self):
+        """El TAC de compile_source no cambia y no hay operandos repetidos"""
+        result = compile_source(FULL_PROGRAM)
+        seen = {}
+        for t in result['triplets']:
+            for o in (t.arg1, t.arg2, t.result):
+                if o is not None:
+                    key = (o.type, type(o.value), o.value)
+                    assert seen.setdefault(key, o) is o
+
+    def test_clear_resets_factory(self):
+        emitter = TripletEmitter()
+        emitter.emit_label("L0")
+        emitter.clear()
+
+        assert len(emitter.operands) == 0
+
+
+class TestSlots:
+    """Operand y Triplet no tienen __dict__"""
+
+    def test_no_dict(self):
+        triplet = Triplet(OpCode.NOP, var_operand("a"))
+
+        assert not hasattr(triplet, '__dict__')
+        assert not hasattr(triplet.arg1, '__dict__')
+        with pytest.raises(AttributeError):
+            triplet.extra = 1
+
+
+class TestOperandComparison:
+    """uses_operand y defines_operand comparan como str()"""
+
+    @pytest.mark.parametrize("a, b, expected", [
+        (var_operand("x"), var_operand("x"), True),
+        (var_operand("x"), temp_operand("x"), True),
+        (var_operand("x"), var_operand("y"), False),
+        (const_operand(1), var_operand("1"), True),
+        (const_operand(True), const_operand(1), False),
+        (Operand(None), var_operand("-"), True),
+    ])
+    def test_same_as_str(self, a, b, expected):
+        triplet = Triplet(OpCode.ADD, a, None, a)
+
+        assert triplet.uses_operand(b) is expected
+        assert triplet.defines_operand(b) is expected
+        assert (str(a) == str(b)) is expected
+
+    def test_missing_operand(self):
+        triplet = Triplet(OpCode.NOP)
+
+        assert not triplet.uses_operand(var_operand("x"))
+        assert not triplet.defines_operand(var_operand("x"))
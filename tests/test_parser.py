@@ -0,0 +1,190 @@
+"""
+Tests para el parser Pratt.
+
+Prueba:
+- Mismo AST (incluidas las líneas) que el lowering del árbol de ANTLR
+- Ambigüedades de la gramática resueltas igual que ANTLR
+- Mismo TAC que el pipeline con CompiscriptParser
+- Errores de sintaxis
+"""
+
+import os
+
+import pytest
+from antlr4 import InputStream
+
+from compiler.pipeline import (
+    lex, parse_tokens, generate_tac, compile_source,
+    LEXER_FAST, PARSE_MODE_PRATT, PARSE_PATH_PRATT, TREE_PARSE, TREE_AST
+)
+from compiler.frontend.parser import PrattParser
+from compiler.syntax_tree import ast_nodes as ast
+from compiler.syntax_tree.lowering import lower_program
+from tests.test_ast import FOR_VARIANT_IDS, FOR_VARIANTS, FULL_PROGRAM
+from tests.test_lexer import CollectingListener, _corpus
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _pratt(source):
+    parser = PrattParser(lex(InputStream(source), LEXER_FAST).tokens)
+    parser.removeErrorListeners()
+    return parser, parser.parse_program()
+
+
+def _antlr(source):
+    result = parse_tokens(lex(InputStream(source)))
+    result.parser.removeErrorListeners()
+    return result
+
+
+def _lines(node, out):
+    """(clase, línea) de cada nodo en preorden; __eq__ ignora las líneas"""
+    out.append((type(node).__name__, node.line))
+    for field in node._fields():
+        value = getattr(node, field)
+        values = value if isinstance(value, tuple) else (value,)
+        for v in values:
+            if isinstance(v, ast.Node):
+                _lines(v, out)
+    return out
+
+
+def _assert_same_ast(source):
+    expected = lower_program(_antlr(source).tree)
+    _, program = _pratt(source)
+
+    assert program == expected
+    assert _lines(program, []) == _lines(expected, [])
+
+
+def _tac(source, parse_mode, tree_mode=TREE_PARSE):
+    visitor = generate_tac(parse_tokens(lex(InputStream(source)), parse_mode), tree_mode)
+    return [
+        (str(t), [(o.value, o.type) if o is not None else None
+                  for o in (t.arg1, t.arg2, t.result)])
+        for t in visitor.get_triplets()
+    ]
+
+
+class TestPrattAST:
+    """El parser Pratt produce el AST del lowering"""
+
+    def test_full_program(self):
+        """Todas las construcciones de la gramática"""
+        _assert_same_ast(FULL_PROGRAM)
+
+    def test_whole_corpus(self):
+        """Mismo AST para cada entrada del corpus que ANTLR acepta"""
+        checked = 0
+        for source in _corpus():
+            result = _antlr(source)
+            if result.syntax_errors == 0:
+                _assert_same_ast(source)
+                checked += 1
+        assert checked > 50
+
+    @pytest.mark.parametrize("source", [
+        "a * b + c * d - e / f % g;",
+        "x = !-!a * -b < c == d && e || f;",
+        "a ? b : c ? d : e;",
+        "obj.items[0](1).name;",
+        "let m: integer[][] = [[1], [2, 3]];",
+    ])
+    def test_precedence_and_lines(self, source):
+        """Precedencia, asociatividad y líneas de cada nodo"""
+        _assert_same_ast(source.replace(" ", "\n"))
+
+    @pytest.mark.parametrize("source", [
+        "x = y = 3;",
+        "obj.x = 5;",
+        "a.b = c.d = e;",
+        "a.b = c = d;",
+        "c ? a : b.x = 5;",
+        "(a).b = (c) ;",
+        "a.b = (c).d = e;",
+        "a.b = c ? d : e.f = g;",
+        "x = a.b = c.d = e;",
+        "print(a.b = c);",
+        "a[0] = 1;",
+        "for (obj.i = 0; i < 1;) { }",
+        "for (c ? a : b.x = 0;;) { }",
+    ])
+    def test_ambiguities_resolved_like_antlr(self, source):
+        """Asignación vs. expresión y el corte de la asignación a propiedad"""
+        _assert_same_ast(source)
+
+
+class TestPrattCodegen:
+    """El TAC generado desde el parser Pratt es idéntico"""
+
+    def test_full_program(self):
+        """Mismo TAC (texto y operandos) que con el árbol de ANTLR"""
+        assert _tac(FULL_PROGRAM, PARSE_MODE_PRATT) == _tac(FULL_PROGRAM, "two-stage")
+
+    @pytest.mark.parametrize("path", [
+        os.path.join("program", "program.cps"),
+        "test_const.cps",
+    ])
+    def test_sample_programs(self, path):
+        """Mismo TAC para los programas de ejemplo del repositorio"""
+        with open(os.path.join(ROOT_DIR, path), encoding='utf-8') as f:
+            source = f.read()
+
+        assert _tac(source, PARSE_MODE_PRATT) == _tac(source, "two-stage")
+        assert _tac(source, PARSE_MODE_PRATT, TREE_AST) == _tac(source, "two-stage")
+
+    @pytest.mark.parametrize("source", FOR_VARIANTS, ids=FOR_VARIANT_IDS)
+    def test_for_variants(self, source):
+        """Mismo TAC para for sin condición o sin actualización"""
+        _assert_same_ast(source)
+        assert _tac(source, PARSE_MODE_PRATT) == _tac(source, "two-stage")
+        assert _tac(source, PARSE_MODE_PRATT, TREE_AST) == _tac(source, "two-stage")
+
+    def test_compile_source(self):
+        """compile_source acepta el modo pratt"""
+        result = compile_source(FULL_PROGRAM, parse_mode=PARSE_MODE_PRATT, lexer_mode=LEXER_FAST)
+        full = compile_source(FULL_PROGRAM)
+
+        assert result['success'] is True
+        assert result['parse']['path'] == PARSE_PATH_PRATT
+        assert [str(t) for t in result['triplets']] == [str(t) for t in full['triplets']]
+
+
+class TestPrattErrors:
+    """Tests para los errores de sintaxis"""
+
+    @pytest.mark.parametrize("source", [
+        "let x = ;",
+        "x = 1",
+        "for (a[0] = 1;;) { }",
+        "(a) = 1;",
+        "class A { print(1); }",
+        "switch (a) { default: case 1: }",
+        "if (a) print(1);",
+    ])
+    def test_rejects_invalid(self, source):
+        """Lo que ANTLR rechaza también es un error aquí"""
+        parser, program = _pratt(source)
+
+        assert _antlr(source).syntax_errors > 0
+        assert program is None
+        assert parser.getNumberOfSyntaxErrors() == 1
+
+    def test_error_position(self):
+        """El error se reporta en el token inesperado"""
+        parser = PrattParser(lex(InputStream("let a = 1;\nlet b = ;")).tokens)
+        listener = CollectingListener()
+        parser.removeErrorListeners()
+        parser.addErrorListener(listener)
+        parser.parse_program()
+
+        assert listener.errors == [(2, 8, "no viable alternative at input ';'")]
+
+    def test_compile_source_reports_errors(self):
+        """compile_source no genera TAC si hay errores"""
+        result = compile_source("let a = ;", parse_mode=PARSE_MODE_PRATT)
+
+        assert result['success'] is False
+        assert result['triplets'] == []
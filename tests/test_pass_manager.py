@@ -0,0 +1,244 @@
+"""
+Tests para el administrador de pasadas.
+
+Prueba:
+- Secuencia de cada nivel (-O0, -O1, -O2, -Os)
+- Registro por pasada (tripletos, tiempo, memoria) y reporte JSON
+- Análisis reutilizado mientras el listado no cambia
+- Misma salida en todos los niveles
+- Niveles en compile_source y en el Driver
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks.bench_loops import KERNELS
+from compiler.ir.interpreter import run_tac
+from compiler.ir.tac_reader import read_tac
+from compiler.optimizer import manager
+from compiler.optimizer.base import PassResult
+from compiler.optimizer.manager import (
+    OPT_LEVELS, OPT_O0, OPT_O1, OPT_O2, OPT_OS, PASSES, PIPELINES, PassManager, optimize
+)
+from compiler.pipeline import compile_source
+from tests.helpers import listing_of
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+WHILE_LOOP = ("i = mov 0\ns = mov 0\nLOOP_START_0:\nt0 = mov 5\nL1 = blt i, t0\nLOOP_END_2 = jmp\nL1:\n"
+              "t1 = mul i, 4\ns = add s, t1\nt2 = mov 1\nt3 = add i, t2\ni = mov t3\n"
+              "LOOP_START_0 = jmp\nLOOP_END_2:\nprint s\n")
+
+PROGRAM = """
+let s: integer = 0;
+let k: integer = 2 * 3;
+while (s < 10) {
+    s = s + k;
+}
+print(s);
+"""
+
+
+class TestLevels:
+    """Tests para las secuencias de cada nivel"""
+
+    def test_levels(self):
+        assert OPT_LEVELS == (OPT_O0, OPT_O1, OPT_O2, OPT_OS)
+        assert set(PIPELINES) == set(OPT_LEVELS)
+        assert all(name in PASSES for names in PIPELINES.values() for name in names)
+
+    def test_o0(self):
+        triplets = read_tac(WHILE_LOOP)
+        report = optimize(triplets, OPT_O0)
+
+        assert report.passes == []
+        assert listing_of(report.triplets) == listing_of(triplets)
+
+    def test_size_level_does_not_grow(self):
+        """-Os no copia cabeceras ni crea pre-encabezados"""
+        assert "rotación" not in PIPELINES[OPT_OS] and "invariantes" not in PIPELINES[OPT_OS]
+        for _, kernel in KERNELS:
+            report = optimize(read_tac(kernel(10)), OPT_OS)
+            assert report.triplets_out <= report.triplets_in
+
+    def test_unknown_level(self):
+        with pytest.raises(ValueError):
+            PassManager("O3")
+
+    def test_unknown_pass(self):
+        with pytest.raises(ValueError):
+            PassManager(OPT_O1, passes=["constantes", "vectorizar"])
+
+    def test_custom_sequence(self):
+        report = PassManager(OPT_O2, passes=["constantes", "muerto"]).run(read_tac(WHILE_LOOP))
+
+        assert [record.name for record in report.passes] == ["constantes", "muerto"]
+
+
+class TestReport:
+    """Tests para el registro de cada pasada"""
+
+    def test_records(self):
+        triplets = read_tac(WHILE_LOOP)
+        report = optimize(triplets, OPT_O2)
+
+        assert [record.name for record in report.passes] == list(PIPELINES[OPT_O2])
+        assert report.passes[0].triplets_in == report.triplets_in == len(triplets)
+        for previous, record in zip(report.passes, report.passes[1:]):
+            assert record.triplets_in == previous.triplets_out
+        assert report.passes[-1].triplets_out == report.triplets_out
+        assert all(record.time >= 0 for record in report.passes)
+        assert report.total_time == pytest.approx(sum(r.time for r in report.passes))
+
+    def test_peak_memory(self):
+        tracked = optimize(read_tac(WHILE_LOOP), OPT_O1, track_memory=True)
+        untracked = optimize(read_tac(WHILE_LOOP), OPT_O1)
+
+        assert all(record.peak_memory > 0 for record in tracked.passes)
+        assert all(record.peak_memory == 0 for record in untracked.passes)
+        assert tracked.to_dict()["track_memory"] and not untracked.to_dict()["track_memory"]
+
+    def test_not_tracing_by_default(self, monkeypatch):
+        """Sin reporte pedido no se activa tracemalloc"""
+        started = []
+        monkeypatch.setattr(manager.tracemalloc, "start", lambda: started.append(True))
+        optimize(read_tac(WHILE_LOOP), OPT_O2)
+        result = compile_source(PROGRAM, opt_level=OPT_O2)
+
+        assert started == []
+        assert not result['optimization']['track_memory']
+
+    def test_json(self):
+        report = optimize(read_tac(WHILE_LOOP), OPT_O1)
+        data = json.loads(report.to_json())
+
+        assert data["level"] == OPT_O1
+        assert data["triplets_out"] == report.triplets_out
+        assert [p["name"] for p in data["passes"]] == list(PIPELINES[OPT_O1])
+        assert set(data["passes"][0]) == {"name", "time", "triplets_in", "triplets_out", "peak_memory",
+                                          "changed", "reused_analysis", "stats"}
+
+    def test_table(self):
+        table = optimize(read_tac(WHILE_LOOP), OPT_O1).table()
+
+        assert len(table.splitlines()) == len(PIPELINES[OPT_O1]) + 2
+        assert table.splitlines()[-1].startswith("-O1:")
+        assert "Pico" not in table
+        assert "Pico" in optimize(read_tac(WHILE_LOOP), OPT_O1, track_memory=True).table()
+
+
+class TestAnalysisCache:
+    """El análisis se reutiliza sólo mientras el listado no cambia"""
+
+    def _spy(self, monkeypatch, changes):
+        seen = []
+
+        def spy(triplets, analysis=None):
+            seen.append(analysis)
+            analysis.liveness()
+            triplets = list(triplets)
+            stats = {"cambios": 0}
+            if changes:
+                triplets = triplets[:-1]
+                stats["cambios"] = 1
+            return PassResult("espía", triplets, len(analysis.triplets), stats)
+
+        monkeypatch.setitem(manager.PASSES, "espía", spy)
+        return seen
+
+    def test_reused_when_unchanged(self, monkeypatch):
+        seen = self._spy(monkeypatch, changes=False)
+        report = PassManager(OPT_O2, passes=["espía", "espía"]).run(read_tac(WHILE_LOOP))
+
+        assert seen[0] is seen[1]
+        assert [record.reused_analysis for record in report.passes] == [False, True]
+
+    def test_invalidated_when_changed(self, monkeypatch):
+        seen = self._spy(monkeypatch, changes=True)
+        triplets = read_tac(WHILE_LOOP)
+        report = PassManager(OPT_O2, passes=["espía", "espía"]).run(triplets)
+
+        assert seen[0] is not seen[1]
+        assert len(seen[1].triplets) == len(triplets) - 1
+        assert not report.passes[1].reused_analysis
+        assert report.triplets_out == len(triplets) - 2
+
+
+class TestSemantics:
+    """Todos los niveles imprimen lo mismo"""
+
+    @pytest.mark.parametrize("level", OPT_LEVELS)
+    @pytest.mark.parametrize("name, kernel", KERNELS, ids=[name for name, _ in KERNELS])
+    def test_same_output(self, name, kernel, level):
+        triplets = read_tac(kernel(20))
+        report = optimize(triplets, level, track_memory=False)
+
+        assert run_tac(report.triplets).output == run_tac(triplets).output
+
+    def test_o2_executes_less(self):
+        triplets = read_tac(WHILE_LOOP)
+        o1 = run_tac(optimize(triplets, OPT_O1).triplets)
+        o2 = run_tac(optimize(triplets, OPT_O2).triplets)
+
+        assert o2.steps < o1.steps < run_tac(triplets).steps
+
+    def test_input_not_modified(self):
+        triplets = read_tac(WHILE_LOOP)
+        before = listing_of(triplets)
+        optimize(triplets, OPT_O2)
+
+        assert listing_of(triplets) == before
+
+
+class TestEntryPoints:
+    """Niveles en compile_source y en program/Driver.py"""
+
+    def test_compile_source(self):
+        plain = compile_source(PROGRAM)
+        optimized = compile_source(PROGRAM, opt_level=OPT_O2)
+
+        assert plain['optimization'] is None
+        assert optimized['success']
+        assert optimized['optimization']['level'] == OPT_O2
+        assert len(optimized['triplets']) == optimized['optimization']['triplets_out']
+        assert len(optimized['triplets']) < len(plain['triplets'])
+
+    def test_compile_source_unknown_level(self):
+        with pytest.raises(ValueError):
+            compile_source(PROGRAM, opt_level="O9")
+
+    def test_driver(self, tmp_path):
+        source = tmp_path / "prog.cps"
+        source.write_text(PROGRAM, encoding="utf-8")
+        report_path = tmp_path / "pasadas.json"
+        proc = subprocess.run(
+            [sys.executable, os.path.join(ROOT_DIR, "program", "Driver.py"), str(source),
+             "-O2", "--pass-report", str(report_path)],
+            capture_output=True, text=True,
+        )
+
+        assert proc.returncode == 0
+        assert "FASE 4: OPTIMIZACION (-O2)" in proc.stdout
+        data = json.loads(report_path.read_text(encoding="utf-8"))
+        assert [p["name"] for p in data["passes"]] == list(PIPELINES[OPT_O2])
+        assert data["track_memory"] and all(p["peak_memory"] > 0 for p in data["passes"])
+
+    def test_driver_pass_report_needs_level(self, tmp_path):
+        """Igual que en --batch: sin -O no hay pasadas que reportar"""
+        source = tmp_path / "prog.cps"
+        source.write_text(PROGRAM, encoding="utf-8")
+        report_path = tmp_path / "pasadas.json"
+        proc = subprocess.run(
+            [sys.executable, os.path.join(ROOT_DIR, "program", "Driver.py"), str(source),
+             "--pass-report", str(report_path)],
+            capture_output=True, text=True,
+        )
+
+        assert proc.returncode == 2
+        assert "--pass-report" in proc.stderr
+        assert not report_path.exists()
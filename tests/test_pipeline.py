@@ -0,0 +1,115 @@
+"""
+Tests para el pipeline de compilación compartido.
+
+Prueba:
+- Parsing en dos etapas (SLL y re-parseo LL)
+- Reporte del camino tomado en el resultado de compilación
+- Equivalencia de errores entre modos
+"""
+
+import pytest
+from antlr4 import InputStream
+
+from compiler.pipeline import (
+    lex, parse_tokens, compile_source,
+    PARSE_MODE_TWO_STAGE, PARSE_MODE_LL, PARSE_PATH_SLL, PARSE_PATH_LL
+)
+
+
+SIMPLE_PROGRAM = """
+let a: integer = 5;
+let b: integer = a + 2 * 3;
+if (b > 5) {
+    print(b);
+}
+function f(x: integer): integer {
+    return x + 1;
+}
+"""
+
+# La sentencia de asignación a propiedad es ambigua con expressionStatement
+# y requiere predicción LL completa.
+PROPERTY_ASSIGN_PROGRAM = "x.name = 5;\n"
+
+
+def _parse(source, mode=PARSE_MODE_TWO_STAGE):
+    return parse_tokens(lex(InputStream(source)), mode)
+
+
+class TestTwoStageParsing:
+    """Tests para la estrategia SLL y luego LL"""
+
+    def test_sll_fast_path(self):
+        """Un programa sin ambigüedades se resuelve con SLL"""
+        result = _parse(SIMPLE_PROGRAM)
+
+        assert result.syntax_errors == 0
+        assert result.stats.path == PARSE_PATH_SLL
+        assert result.stats.fell_back is False
+        assert result.stats.ll_time == 0.0
+
+    def test_fallback_to_ll(self):
+        """Si SLL falla se re-parsea con LL y no se reportan errores"""
+        result = _parse(PROPERTY_ASSIGN_PROGRAM)
+
+        assert result.syntax_errors == 0
+        assert result.stats.path == PARSE_PATH_LL
+        assert result.stats.fell_back is True
+
+    def test_same_tree_as_ll(self):
+        """El árbol producido es el mismo que con LL completo"""
+        fast = _parse(SIMPLE_PROGRAM)
+        full = _parse(SIMPLE_PROGRAM, PARSE_MODE_LL)
+
+        assert fast.tree.toStringTree(recog=fast.parser) == \
+            full.tree.toStringTree(recog=full.parser)
+
+    def test_syntax_errors_match_ll(self):
+        """Los errores de sintaxis son los mismos que con LL"""
+        source = "let x: integer = ;\nprint(1);\n"
+        fast = _parse(source)
+        full = _parse(source, PARSE_MODE_LL)
+
+        assert fast.stats.fell_back is True
+        assert fast.syntax_errors == full.syntax_errors > 0
+
+    def test_ll_mode(self):
+        """El modo LL no intenta SLL"""
+        result = _parse(SIMPLE_PROGRAM, PARSE_MODE_LL)
+
+        assert result.stats.path == PARSE_PATH_LL
+        assert result.stats.fell_back is False
+        assert result.stats.sll_time == 0.0
+
+    def test_unknown_mode(self):
+        """Un modo desconocido lanza ValueError"""
+        with pytest.raises(ValueError):
+            _parse(SIMPLE_PROGRAM, "lalr")
+
+
+class TestCompileSource:
+    """Tests para compile_source"""
+
+    def test_reports_parse_stats(self):
+        """El resultado incluye el camino de parsing y su tiempo"""
+        result = compile_source(SIMPLE_PROGRAM)
+
+        assert result['success'] is True
+        assert result['parse']['path'] == PARSE_PATH_SLL
+        assert result['parse']['total_time'] >= 0.0
+        assert len(result['triplets']) > 0
+
+    def test_syntax_error_result(self):
+        """Un error de sintaxis también reporta estadísticas de parsing"""
+        result = compile_source("let x: integer = ;")
+
+        assert result['success'] is False
+        assert result['parse']['fell_back'] is True
+
+    def test_exception_result(self):
+        """Una excepción durante la compilación también trae la clave parse"""
+        result = compile_source(SIMPLE_PROGRAM, tree_mode="desconocido")
+
+        assert result['success'] is False
+        assert result['errors'][0].startswith("ValueError")
+        assert result['parse'] is None
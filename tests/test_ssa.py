@@ -0,0 +1,317 @@
+"""
+Tests para la construcción y destrucción de la forma SSA.
+
+Prueba:
+- Colocación de PHI (podada) y nombres de versiones
+- Asignación única y dominancia de las definiciones
+- Variables compartidas entre funciones (sin versiones)
+- Ida y vuelta exacta sobre los programas de prueba
+- Destrucción tras romper la forma convencional (swap, copia perdida)
+- Salida traducible por el MIPSTranslator
+"""
+
+import os
+
+import pytest
+
+from benchmarks.synthetic import generate_function_program, generate_program
+from compiler.codegen.mips_translator import MIPSTranslator
+from compiler.ir.cfg import build_cfg
+from compiler.ir.defuse import defined_name, is_variable, use_slots
+from compiler.ir.dominators import DominatorTree
+from compiler.ir.interpreter import run_tac
+from compiler.ir.ssa import Phi, base_name, from_ssa, to_ssa, version_name
+from compiler.ir.tac_reader import read_tac
+from compiler.ir.triplet import OpCode
+from compiler.pipeline import TREE_AST, TREE_PARSE
+from tests.helpers import compile_triplets, listing_of
+from tests.test_ast import FULL_PROGRAM
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _propagate_copies(triplets):
+    """
+    Propagación de copias sobre SSA sin más cuidado: deja versiones de una
+    misma variable vivas a la vez, como haría una pasada de optimización
+    """
+    copies = {t.result.value: t.arg1 for t in triplets
+              if t.op == OpCode.MOV and base_name(t.result.value) != t.result.value
+              and is_variable(t.arg1)}
+
+    def resolve(operand):
+        while is_variable(operand) and operand.value in copies:
+            operand = copies[operand.value]
+        return operand
+
+    output = []
+    for triplet in triplets:
+        if triplet.op == OpCode.MOV and triplet.result.value in copies:
+            continue
+        if isinstance(triplet, Phi):
+            triplet.incoming = [(label, resolve(value)) for label, value in triplet.incoming]
+        else:
+            for slot in use_slots(triplet):
+                setattr(triplet, slot, resolve(getattr(triplet, slot)))
+        output.append(triplet)
+    return output
+
+
+LOOP = """
+i = mov 0
+s = mov 0
+LOOP_START_0:
+LOOP_END_2 = bge i, 5
+t0 = add s, i
+s = mov t0
+t1 = add i, 1
+i = mov t1
+LOOP_START_0 = jmp
+LOOP_END_2:
+print s
+print i
+"""
+
+DIAMOND = """
+x = mov 1
+L1 = blt c, 3
+x = mov 2
+y = mov 5
+L2 = jmp
+L1:
+x = mov 3
+L2:
+print x
+"""
+
+NESTED = """
+i = mov 0
+t = mov 0
+OUTER:
+j = mov 0
+INNER:
+t9 = mul i, j
+t = add t, t9
+j = add j, 1
+INNER = blt j, 3
+i = add i, 1
+OUTER = blt i, 4
+print t
+print i
+"""
+
+SWAP = """
+a = mov 1
+b = mov 2
+i = mov 0
+L1:
+t = mov a
+a = mov b
+b = mov t
+i = add i, 1
+L1 = blt i, 3
+print a
+print b
+"""
+
+LOST_COPY = """
+x = mov 1
+L1:
+y = mov x
+x = add x, 1
+L1 = blt x, 5
+print y
+"""
+
+FUNCTIONS = """
+g = mov 10
+FUNC_0:
+BeginFunc 8;
+s = mov 0
+LOOP:
+s = add s, g
+p = sub p, 1
+LOOP = bgt p, 0
+return s
+EndFunc;
+FUNC_END_1:
+g = add g, 1
+print g
+"""
+
+
+class TestConstruction:
+    """Tests para la colocación de PHI y el renombrado"""
+
+    def test_loop_phis(self):
+        ssa = to_ssa(read_tac(LOOP))
+        listing = listing_of(ssa)
+        header = listing.index("LOOP_START_0:")
+
+        assert ssa.phi_count == 2
+        assert listing[header + 1].startswith("i.2 = phi [i.1, ")
+        assert listing[header + 2].startswith("s.2 = phi [s.1, ")
+        assert "print s.2" in listing and "print i.2" in listing
+
+    def test_pruned(self):
+        """Sin PHI para lo que no está vivo en la unión (y sólo se usa en una rama)"""
+        ssa = to_ssa(read_tac(DIAMOND))
+        phis = [t for t in ssa if isinstance(t, Phi)]
+
+        assert [base_name(phi.result.value) for phi in phis] == ["x"]
+        assert sorted(str(value) for _, value in phis[0].incoming) == ["x.2", "x.3"]
+
+    def test_unlabeled_predecessors_get_labels(self):
+        ssa = to_ssa(read_tac(LOOP))
+        labels = {str(t.arg1) for t in ssa if t.op == OpCode.LABEL}
+
+        for phi in (t for t in ssa if isinstance(t, Phi)):
+            assert {str(label) for label, _ in phi.incoming} <= labels
+
+    @pytest.mark.parametrize("listing", [LOOP, DIAMOND, NESTED, SWAP, LOST_COPY, FUNCTIONS],
+                             ids=["loop", "diamond", "nested", "swap", "lost_copy", "functions"])
+    def test_single_assignment_and_dominance(self, listing):
+        ssa = to_ssa(read_tac(listing))
+        cfg = build_cfg(ssa.triplets)
+        definitions = {}
+        for i, triplet in enumerate(cfg.triplets):
+            name = defined_name(triplet)
+            if name is not None and name not in ssa.shared:
+                assert name not in definitions, f"{name} asignada dos veces"
+                definitions[name] = i
+
+        for function in cfg.functions:
+            tree = DominatorTree(cfg, function)
+            for b in function.reverse_postorder:
+                block = cfg.blocks[b]
+                for i in range(block.start, block.end):
+                    triplet = cfg.triplets[i]
+                    if isinstance(triplet, Phi):
+                        for label, value in triplet.incoming:
+                            if value.value in definitions:
+                                pred = cfg.label_block[label.value]
+                                assert tree.dominates(cfg.block_of(definitions[value.value]).index, pred)
+                        continue
+                    for slot in use_slots(triplet):
+                        operand = getattr(triplet, slot)
+                        if is_variable(operand) and operand.value in definitions:
+                            d = definitions[operand.value]
+                            assert tree.dominates(cfg.block_of(d).index, b)
+                            assert cfg.block_of(d).index != b or d < i
+
+    def test_shared_variables_keep_name(self):
+        """g aparece en la función y en el código global: queda en memoria"""
+        ssa = to_ssa(read_tac(FUNCTIONS))
+        listing = listing_of(ssa)
+
+        assert ssa.shared == {"g"}
+        assert "g = add g, 1" in listing
+        assert "s.3 = add s.2, g" in listing
+        # p entra como parámetro: la versión 0 es el nombre original
+        assert any(line.startswith("p.1 = phi [p, ") for line in listing)
+
+    def test_version_names(self):
+        assert version_name("x", 0) == "x"
+        assert version_name("t5", 2) == "t5.2"
+        assert base_name("t5.2") == "t5"
+        assert base_name("x") == "x"
+
+    def test_rejects_ssa_input(self):
+        ssa = to_ssa(read_tac(LOOP))
+
+        with pytest.raises(ValueError):
+            to_ssa(ssa.triplets)
+
+    def test_original_not_modified(self):
+        triplets = read_tac(LOOP)
+        before = listing_of(triplets)
+        to_ssa(triplets)
+
+        assert listing_of(triplets) == before
+
+
+class TestRoundTrip:
+    """from_ssa(to_ssa(t)) devuelve el listado original"""
+
+    @pytest.mark.parametrize("tree_mode", [TREE_PARSE, TREE_AST])
+    @pytest.mark.parametrize("source", [
+        FULL_PROGRAM,
+        open(os.path.join(ROOT_DIR, "program", "program.cps"), encoding="utf-8").read(),
+        generate_program(300),
+    ], ids=["full", "program", "synthetic"])
+    def test_programs(self, source, tree_mode):
+        triplets = compile_triplets(source, tree_mode)
+
+        assert listing_of(from_ssa(to_ssa(triplets))) == listing_of(triplets)
+
+    @pytest.mark.parametrize("listing", [LOOP, DIAMOND, NESTED, SWAP, LOST_COPY, FUNCTIONS],
+                             ids=["loop", "diamond", "nested", "swap", "lost_copy", "functions"])
+    def test_listings(self, listing):
+        triplets = read_tac(listing)
+
+        assert listing_of(from_ssa(to_ssa(triplets))) == listing_of(triplets)
+
+    @pytest.mark.parametrize("listing", [LOOP, DIAMOND, NESTED, SWAP])
+    def test_same_output(self, listing):
+        triplets = read_tac(listing)
+        ssa = to_ssa(triplets)
+        expected = run_tac(triplets).output
+
+        assert run_tac(ssa.triplets).output == expected
+        assert run_tac(from_ssa(ssa)).output == expected
+
+    def test_large_function(self):
+        triplets = compile_triplets(generate_function_program(3000), TREE_AST)
+
+        assert listing_of(from_ssa(to_ssa(triplets))) == listing_of(triplets)
+
+
+class TestDestruction:
+    """Tests para salir de SSA después de mover código"""
+
+    def test_swap_cycle(self):
+        """Las PHI de a y b se leen entre sí: hace falta un temporal"""
+        triplets = read_tac(SWAP)
+        optimized = _propagate_copies(to_ssa(triplets).triplets)
+        phis = [t for t in optimized if isinstance(t, Phi)]
+        assert {str(v) for phi in phis for _, v in phi.incoming} >= {"a.2", "b.2"}
+
+        result = from_ssa(optimized)
+        assert not any(t.op == OpCode.PHI for t in result)
+        assert run_tac(result).output == run_tac(triplets).output == ["2", "1"]
+
+    def test_lost_copy(self):
+        """y = x se propaga: la versión vieja de x sigue viva y no se fusiona"""
+        triplets = read_tac(LOST_COPY)
+        optimized = _propagate_copies(to_ssa(triplets).triplets)
+
+        result = from_ssa(optimized)
+        assert run_tac(result).output == run_tac(triplets).output == ["4"]
+        assert any(base_name(str(t.result)) == "x" and str(t.result) != "x"
+                   for t in result if t.op == OpCode.MOV)
+
+    def test_conditional_edge_gets_own_block(self):
+        triplets = read_tac(LOST_COPY)
+        result = listing_of(from_ssa(_propagate_copies(to_ssa(triplets).triplets)))
+
+        # El salto de vuelta pasa por un bloque nuevo con la copia
+        branch = next(line for line in result if " = blt " in line)
+        split = branch.split(" = ")[0]
+        assert split.startswith("SSA_") and f"{split}:" in result
+
+    def test_mips_translation(self):
+        triplets = read_tac(SWAP)
+        result = from_ssa(_propagate_copies(to_ssa(triplets).triplets))
+        translator = MIPSTranslator()
+
+        instructions = [i for t in result for i in translator.translate(t)]
+        assert instructions
+        # print tampoco se traduce fuera de SSA; lo que importa es que no queden PHI
+        assert not any("Unsupported: phi" in str(i) for i in instructions)
+
+    def test_plain_listing(self):
+        """Sin PHI, from_ssa no cambia nada"""
+        triplets = read_tac(NESTED)
+
+        assert listing_of(from_ssa(triplets)) == listing_of(triplets)
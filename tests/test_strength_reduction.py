@@ -0,0 +1,208 @@
+"""
+Tests para la reducción de fuerza de las variables de inducción.
+
+Prueba:
+- Direcciones `base + i * tamaño` reemplazadas por punteros
+- Punteros compartidos y decrementos
+- Reemplazo de la prueba del bucle (LFTR) y cuándo no se hace
+- Lo que no se reduce
+- Misma salida y ninguna multiplicación dentro del bucle
+"""
+
+import pytest
+
+from compiler.ir.interpreter import run_tac
+from compiler.ir.tac_reader import read_tac
+from compiler.optimizer import reduce_induction_variables
+from tests.helpers import listing_of
+
+
+# for (i = 0; i < 10; i = i + 1) s = s + &a[i], con el incremento del visitor
+ARRAY_LOOP = ("i = mov 0\ns = mov 0\nLOOP_START_0:\nt0 = mov 10\nL1 = blt i, t0\nLOOP_END_2 = jmp\n"
+              "L1:\nt1 = mul i, 4\nt2 = add 100, t1\ns = add s, t2\nt3 = mov 1\nt4 = add i, t3\n"
+              "i = mov t4\nLOOP_START_0 = jmp\nLOOP_END_2:\nprint s\n")
+
+# Dos accesos con la misma dirección y uno con otra base
+SHARED_LOOP = ("i = mov 0\ns = mov 0\nL0:\nL9 = bge i, 8\nt1 = mul i, 4\nt2 = add 100, t1\n"
+               "t3 = mul i, 4\nt4 = add 100, t3\nt5 = mul 4, i\nt6 = add 500, t5\nt7 = add t2, t4\n"
+               "t8 = add t7, t6\ns = add s, t8\ni = add i, 1\nL0 = jmp\nL9:\nprint s\n")
+
+
+def _reduce(text):
+    return reduce_induction_variables(read_tac(text))
+
+
+def _body(listing, start, end):
+    return listing[listing.index(f"{start}:") + 1:listing.index(f"{end}:")]
+
+
+def _preheader(listing, label):
+    return _body(listing, f"PRE_{label}", label)
+
+
+class TestReduction:
+    """Tests para los punteros"""
+
+    def test_array_loop(self):
+        result = _reduce(ARRAY_LOOP)
+        listing = listing_of(result.triplets)
+
+        assert _preheader(listing, "LOOP_START_0") == ["t5 = mul i, 4", "t5 = add t5, 100"]
+        assert _body(listing, "L1", "LOOP_END_2") == [
+            "t2 = mov t5", "s = add s, t2", "t5 = add t5, 4", "LOOP_START_0 = jmp",
+        ]
+        assert result.stats == {"reducidas": 1, "pruebas": 1, "incrementos": 1}
+
+    def test_shared_pointer(self):
+        result = _reduce(SHARED_LOOP)
+        listing = listing_of(result.triplets)
+
+        # t2 y t4 comparten puntero; t6 tiene otra base
+        assert result.stats["reducidas"] == 3
+        assert len([t for t in _preheader(listing, "L0") if t.endswith("mul i, 4")]) == 2
+        assert not any(" mul " in t for t in listing[listing.index("L0:"):])
+
+    def test_decrement(self):
+        text = ("i = mov 9\ns = mov 0\nL0:\nt1 = mul i, 8\nt2 = add 40, t1\ns = add s, t2\n"
+                "i = sub i, 1\nL0 = bge i, 0\nprint s\n")
+        listing = listing_of(_reduce(text).triplets)
+
+        assert "t3 = sub t3, 8" in listing
+        assert "L0 = bge t3, 40" in listing
+
+    def test_step_in_temporary(self):
+        text = ("i = mov 0\ns = mov 0\nt9 = mov 2\nL0:\nt1 = mul i, 4\ns = add s, t1\ni = add i, t9\n"
+                "L0 = blt i, 10\nprint s\n")
+        listing = listing_of(_reduce(text).triplets)
+
+        assert "t10 = add t10, 8" in listing
+
+    def test_invariant_base(self):
+        """La base es una variable que el bucle no escribe"""
+        text = ("base = mov 300\ni = mov 0\ns = mov 0\nL0:\nt1 = mul i, 4\nt2 = add base, t1\n"
+                "s = add s, t2\ni = add i, 1\nL0 = blt i, 5\nprint s\n")
+        listing = listing_of(_reduce(text).triplets)
+
+        assert _preheader(listing, "L0") == ["t3 = mul i, 4", "t3 = add t3, base", "t4 = mov 20",
+                                             "t4 = add t4, base"]
+        assert "L0 = blt t3, t4" in listing
+
+
+class TestTestReplacement:
+    """Tests para la prueba del bucle"""
+
+    def test_variable_bound(self):
+        text = ("n = mov 6\ni = mov 0\ns = mov 0\nL0:\nL9 = bge i, n\nt1 = mul i, 4\ns = add s, t1\n"
+                "i = add i, 1\nL0 = jmp\nL9:\nprint s\n")
+        listing = listing_of(_reduce(text).triplets)
+
+        assert _preheader(listing, "L0") == ["t2 = mul i, 4", "t3 = mul n, 4"]
+        assert "L9 = bge t2, t3" in listing
+        assert "i = add i, 1" not in listing
+
+    def test_index_used_after_loop(self):
+        text = ARRAY_LOOP + "print i\n"
+        result = _reduce(text)
+
+        assert result.stats == {"reducidas": 1, "pruebas": 0, "incrementos": 0}
+        assert "L1 = blt i, t0" in listing_of(result.triplets)
+
+    def test_shared_index_at_end(self):
+        """El bucle sale cayendo al final del listado e i la lee otra función"""
+        text = ("FUNC_0:\nBeginFunc 0;\nprint i\nEndFunc;\nFUNC_END_1:\n"
+                "i = mov 0\ns = mov 0\nL0:\nt1 = mul i, 4\ns = add s, t1\ni = add i, 1\nL0 = blt i, 5\n")
+        result = _reduce(text)
+
+        assert result.stats == {"reducidas": 1, "pruebas": 0, "incrementos": 0}
+        assert "i = add i, 1" in listing_of(result.triplets)
+
+    def test_index_used_in_body(self):
+        text = ("i = mov 0\ns = mov 0\nL0:\nt1 = mul i, 4\ns = add s, t1\ns = add s, i\ni = add i, 1\n"
+                "L0 = blt i, 5\nprint s\n")
+        result = _reduce(text)
+
+        assert result.stats["pruebas"] == 0
+        assert "i = add i, 1" in listing_of(result.triplets)
+
+    def test_bound_changes_in_loop(self):
+        text = ("n = mov 9\ni = mov 0\ns = mov 0\nL0:\nt1 = mul i, 4\ns = add s, t1\nn = sub n, 1\n"
+                "i = add i, 1\nL0 = blt i, n\nprint s\n")
+
+        assert _reduce(text).stats["pruebas"] == 0
+
+
+class TestNotReduced:
+    """Tests para lo que no se reduce"""
+
+    def _assert_unchanged(self, text):
+        triplets = read_tac(text)
+        result = reduce_induction_variables(triplets)
+
+        assert not result.changed
+        assert listing_of(result.triplets) == listing_of(triplets)
+
+    def test_multiplied_step(self):
+        self._assert_unchanged("i = mov 1\nL0:\nt1 = mul i, 4\nprint t1\ni = mul i, 2\nL0 = blt i, 50\n")
+
+    def test_variable_step(self):
+        self._assert_unchanged("i = mov 0\nL0:\nt1 = mul i, 4\nprint t1\ni = add i, k\nL0 = blt i, 50\n")
+
+    def test_call_in_loop(self):
+        self._assert_unchanged("i = mov 0\nL0:\nt1 = mul i, 4\nprint t1\nt9 = call f, 0\ni = add i, 1\n"
+                               "L0 = blt i, 5\n")
+
+    def test_no_multiplication(self):
+        self._assert_unchanged("i = mov 0\nL0:\nt1 = add i, 4\nprint t1\ni = add i, 1\nL0 = blt i, 5\n")
+
+    def test_increment_between(self):
+        """t2 se arma con el valor de i de antes del incremento: sólo t1 es derivada"""
+        text = "i = mov 0\nL0:\nt1 = mul i, 4\ni = add i, 1\nt2 = mul t1, 2\nprint t2\nL0 = blt i, 5\n"
+        triplets = read_tac(text)
+        result = reduce_induction_variables(triplets)
+
+        assert result.stats["reducidas"] == 1
+        assert "t2 = mul t1, 2" in listing_of(result.triplets)
+        assert run_tac(result.triplets).output == run_tac(triplets).output
+
+
+class TestSemantics:
+    """El listado optimizado imprime lo mismo sin multiplicar en el bucle"""
+
+    @pytest.mark.parametrize("text", [
+        ARRAY_LOOP,
+        SHARED_LOOP,
+        "i = mov 9\ns = mov 0\nL0:\nt1 = mul i, 8\nt2 = add 40, t1\ns = add s, t2\ni = sub i, 1\n"
+        "L0 = bge i, 0\nprint s\n",
+        "n = mov 6\nbase = mov 7\ni = mov 0\ns = mov 0\nL0:\nL9 = bge i, n\nt1 = mul i, 4\n"
+        "t2 = add base, t1\nt3 = sub t2, 3\ns = add s, t3\ni = add i, 1\nL0 = jmp\nL9:\nprint s\n",
+        "i = mov 0\ns = mov 0\nL0:\nt0 = mov 10\nL9 = bge i, t0\nL2 = bz c\nt1 = mul i, 4\ns = add s, t1\n"
+        "i = add i, 1\nL0 = jmp\nL2:\nt2 = mul i, 4\ns = sub s, t2\ni = add i, 2\nL0 = jmp\nL9:\nprint s\n",
+    ], ids=["array", "shared", "decrement", "variable_bound", "two_increments"])
+    def test_no_multiplication_executed(self, text):
+        triplets = read_tac(text)
+        result = reduce_induction_variables(triplets)
+        before = run_tac(triplets, values={"c": 1})
+        after = run_tac(result.triplets, values={"c": 1})
+
+        assert result.changed
+        assert after.output == before.output
+        assert after.counts["mul"] <= 3 < before.counts["mul"]
+
+    def test_zero_iterations(self):
+        text = ARRAY_LOOP.replace("i = mov 0", "i = mov 20")
+        triplets = read_tac(text)
+
+        assert run_tac(reduce_induction_variables(triplets).triplets).output == run_tac(triplets).output
+
+    def test_idempotent(self):
+        first = _reduce(SHARED_LOOP)
+        second = reduce_induction_variables(first.triplets)
+
+        assert first.changed and not second.changed
+
+    def test_input_not_modified(self):
+        triplets = read_tac(ARRAY_LOOP)
+        before = listing_of(triplets)
+        reduce_induction_variables(triplets)
+
+        assert listing_of(triplets) == before
@@ -0,0 +1,243 @@
+"""
+Tests para el lector del TAC en texto.
+
+Prueba:
+- Cada forma de Triplet.__str__ se lee de vuelta (con y sin índices)
+- El listado del corpus vuelve al mismo texto
+- Tipos inferidos de los operandos
+- MIPS desde el listado igual que desde los tripletos
+- Lectura por funciones
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks.synthetic import generate_program
+from compiler.codegen.mips_translator import MIPSTranslator
+from compiler.ir.tac_reader import (
+    TacReader, TacSyntaxError, iter_functions, load_tac, parse_line, read_tac
+)
+from compiler.ir.triplet import (
+    OpCode, Operand, Triplet, const_operand, label_operand, temp_operand, var_operand
+)
+from tests.helpers import compile_triplets
+from tests.test_ast import FULL_PROGRAM
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _listing(triplets):
+    return "".join(f"{i:3}: {t}\n" for i, t in enumerate(triplets))
+
+
+def _types(triplet):
+    return [(o.value, o.type) if o is not None else None
+            for o in (triplet.arg1, triplet.arg2, triplet.result)]
+
+
+class TestParseLine:
+    """Tests para cada forma del listado"""
+
+    def test_binary_op(self):
+        triplet = parse_line("t3 = add t1, x")
+
+        assert triplet.op == OpCode.ADD
+        assert _types(triplet) == [("t1", "temp"), ("x", "var"), ("t3", "temp")]
+
+    def test_function_markers(self):
+        assert _types(parse_line("FUNC_0:")) == [("FUNC_0", "label"), None, None]
+        assert _types(parse_line("BeginFunc 36;")) == [(36, "const"), None, None]
+        assert _types(parse_line("BeginFunc f;")) == [("f", "func"), None, None]
+        assert parse_line("EndFunc;").op == OpCode.EXIT
+
+    def test_index_prefix(self):
+        """Las líneas del Driver llevan el índice del tripleto"""
+        assert str(parse_line(" 12: t0 = mov 5")) == "t0 = mov 5"
+        assert str(parse_line("1234: L1:")) == "L1:"
+        assert parse_line("   \n") is None
+
+    def test_constants(self):
+        reader = TacReader()
+        triplet = reader.parse_line("t0 = add 3, -2.5")
+        assert _types(triplet)[:2] == [(3, "const"), (-2.5, "const")]
+        assert type(triplet.arg1.value) is int
+
+        assert _types(reader.parse_line("x = mov true"))[0] == ("true", "const")
+        assert _types(reader.parse_line("x = mov True"))[0] == (True, "const")
+        assert _types(reader.parse_line("x = mov null"))[0] == ("null", "const")
+
+    def test_string_with_separators(self):
+        """Las comas y el " = " dentro de un string no separan argumentos"""
+        triplet = parse_line('t1 = add "a, b = c", "d \\", e"')
+
+        assert _types(triplet) == [('"a, b = c"', "const"), ('"d \\", e"', "const"), ("t1", "temp")]
+        assert str(parse_line('print "x = 1"')) == 'print "x = 1"'
+
+    def test_jumps(self):
+        """El destino de un salto es una etiqueta, aunque esté vacío"""
+        assert _types(parse_line("L2 = jmp")) == [None, None, ("L2", "label")]
+        assert _types(parse_line(" = jmp")) == [None, None, ("", "label")]
+        assert _types(parse_line("L1 = blt t0, t1")) == [("t0", "var"), ("t1", "var"), ("L1", "label")]
+
+    def test_call(self):
+        assert _types(parse_line("t1 = call f, 2")) == [("f", "func"), (2, "const"), ("t1", "temp")]
+
+    def test_unknown_opcode(self):
+        with pytest.raises(TacSyntaxError, match="línea 2"):
+            read_tac("t0 = mov 1\nt1 = frobnicate t0\n")
+
+    def test_operands_interned(self):
+        """Los operandos de una lectura se comparten, como en el emitter"""
+        table = read_tac("t0 = add x, 1\nx = mov t0\n")
+
+        assert table[0].arg1 is table[1].result
+        assert table[0].result is table[1].arg1
+
+
+class TestReadListing:
+    """Tests sobre listados completos"""
+
+    @pytest.mark.parametrize("source", [
+        FULL_PROGRAM,
+        open(os.path.join(ROOT_DIR, "program", "program.cps"), encoding="utf-8").read(),
+        generate_program(200),
+    ], ids=["full", "program", "synthetic"])
+    def test_same_text(self, source):
+        triplets = compile_triplets(source)
+        table = read_tac(_listing(triplets))
+
+        assert [str(t) for t in table] == [str(t) for t in triplets]
+        assert [t.id for t in table] == list(range(len(triplets)))
+
+    def test_visitor_types(self):
+        """
+        Los tipos coinciden con los del visitor salvo la copia `x = mov tN`,
+        los destinos de los saltos y el nombre de la función en CALL; las
+        constantes numéricas que el visitor guarda como str se leen como int.
+        """
+        triplets = compile_triplets(FULL_PROGRAM)
+        table = read_tac(_listing(triplets))
+
+        for original, read in zip(triplets, table):
+            for slot, (a, b) in enumerate(zip(_types(original), _types(read))):
+                if a is None or a[1] == b[1]:
+                    assert a == b or str(a[0]) == str(b[0]) and type(b[0]) is int
+                    continue
+                assert a[0] == b[0]
+                assert (original.op == OpCode.MOV and slot == 0
+                        or original.is_jump() and slot == 2 and b[1] == "label"
+                        or original.op == OpCode.CALL and slot == 0 and b[1] == "func"
+                        or original.op == OpCode.ARRAY_ALLOC and slot == 2), str(original)
+
+    def test_load_file(self, tmp_path):
+        triplets = compile_triplets(FULL_PROGRAM)
+        path = tmp_path / "prog.tac"
+        path.write_text(_listing(triplets), encoding="utf-8")
+
+        assert [str(t) for t in load_tac(str(path))] == [str(t) for t in triplets]
+
+
+class TestMipsFromListing:
+    """El backend MIPS sobre el listado produce lo mismo que en proceso"""
+
+    def test_same_assembly(self):
+        """Tripletos con los tipos que genera el emitter"""
+        triplets = [
+            Triplet(OpCode.LABEL, label_operand("FUNC_0")),
+            Triplet(OpCode.ENTER, Operand("f", "func")),
+            Triplet(OpCode.MUL, var_operand("t1"), const_operand(4), temp_operand("t2")),
+            Triplet(OpCode.ARRAY_GET, var_operand("arr"), temp_operand("t2"), temp_operand("t3")),
+            Triplet(OpCode.ADD, temp_operand("t3"), var_operand("x"), temp_operand("t4")),
+            Triplet(OpCode.RETURN, var_operand("t4")),
+            Triplet(OpCode.EXIT),
+            Triplet(OpCode.MOV, const_operand(3), None, temp_operand("t0")),
+            Triplet(OpCode.BLT, var_operand("t0"), var_operand("t5"), label_operand("L1")),
+            Triplet(OpCode.PARAM, temp_operand("t0")),
+            Triplet(OpCode.CALL, Operand("f", "func"), const_operand(1), temp_operand("t6")),
+            Triplet(OpCode.PRINT, temp_operand("t6")),
+            Triplet(OpCode.LABEL, label_operand("L1")),
+        ]
+        listing = "\n".join(str(t) for t in triplets)
+
+        assert [_types(t) for t in read_tac(listing)] == [_types(t) for t in triplets]
+        assert (MIPSTranslator().translate_program(read_tac(listing))
+                == MIPSTranslator().translate_program(triplets))
+
+    def test_backend_script(self, tmp_path):
+        """`--batch --output-dir` seguido de program/mips_backend.py"""
+        program_dir = os.path.join(ROOT_DIR, "program")
+        subprocess.run([sys.executable, "Driver.py", "--batch", "../test_const.cps",
+                        "-j", "1", "--output-dir", str(tmp_path)],
+                       cwd=program_dir, check=True, capture_output=True)
+        listing = str(tmp_path / "test_const.tac")
+        backend = subprocess.run([sys.executable, "mips_backend.py", listing],
+                                 cwd=program_dir, capture_output=True, text=True)
+
+        assert backend.returncode == 0
+        assert backend.stdout == MIPSTranslator().translate_program(load_tac(listing)) + "\n"
+
+    def test_backend_bad_listing(self, tmp_path):
+        path = tmp_path / "bad.tac"
+        path.write_text("t0 = mov 1\nt1 = frobnicate t0\n", encoding="utf-8")
+        backend = subprocess.run([sys.executable, "mips_backend.py", str(path)],
+                                 cwd=os.path.join(ROOT_DIR, "program"),
+                                 capture_output=True, text=True)
+
+        assert backend.returncode == 1
+        assert "línea 2" in backend.stderr
+
+
+class TestIterFunctions:
+    """Tests para la lectura por funciones"""
+
+    def test_chunks(self):
+        listing = ("t0 = mov 1\n"
+                   "FUNC_0:\n"
+                   "BeginFunc 8;\n"
+                   "return x\n"
+                   "EndFunc;\n"
+                   "FUNC_END_1:\n"
+                   "x = mov t0\n")
+        chunks = list(iter_functions(listing))
+
+        assert [(c.name, c.start, len(c.table)) for c in chunks] == [
+            (None, 0, 1), ("FUNC_0", 1, 4), (None, 5, 2)
+        ]
+        assert chunks[1].is_function and not chunks[0].is_function
+        assert str(chunks[1].table[0]) == "FUNC_0:"
+
+    def test_same_triplets(self):
+        """Concatenar los chunks da el listado completo"""
+        triplets = compile_triplets(generate_program(200))
+        chunks = list(iter_functions(_listing(triplets).splitlines()))
+
+        assert [str(t) for c in chunks for t in c.table] == [str(t) for t in triplets]
+        assert all(str(c.table[0]) == str(triplets[c.start]) for c in chunks)
+        functions = [c for c in chunks if c.is_function]
+        assert len(functions) == sum(t.op == OpCode.ENTER for t in triplets)
+        assert all(c.table[1].op == OpCode.ENTER and c.table[-1].op == OpCode.EXIT
+                   for c in functions)
+
+    def test_streams_file(self, tmp_path):
+        """Las líneas se consumen a medida que se piden los chunks"""
+        triplets = compile_triplets(FULL_PROGRAM)
+        path = tmp_path / "prog.tac"
+        path.write_text(_listing(triplets), encoding="utf-8")
+        consumed = []
+
+        def lines(f):
+            for line in f:
+                consumed.append(line)
+                yield line
+
+        with open(path, encoding="utf-8") as f:
+            chunks = iter_functions(lines(f))
+            first = next(chunks)
+            assert len(consumed) < len(triplets)
+            rest = list(chunks)
+
+        assert len(first.table) + sum(len(c.table) for c in rest) == len(triplets)
@@ -0,0 +1,207 @@
+"""
+Tests para el formato binario .tacb.
+
+Prueba:
+- Ida y vuelta de tripletos, operandos, símbolos y layout de memoria
+- Carga perezosa sobre mmap
+- Mismo MIPS desde un .tacb que desde la compilación en proceso
+- Errores de formato
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+from antlr4 import InputStream
+
+from benchmarks.synthetic import generate_program
+from compiler.codegen.mips_translator import MIPSTranslator
+from compiler.ir import tacb
+from compiler.ir.compact_table import CompactTripletTable
+from compiler.ir.triplet import (
+    OpCode, Operand, Triplet, const_operand, label_operand, temp_operand, var_operand
+)
+from compiler.pipeline import lex, parse_tokens, generate_tac, TREE_PARSE
+from tests.test_ast import FULL_PROGRAM
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _visitor(source, compact_ir=False):
+    return generate_tac(parse_tokens(lex(InputStream(source))), TREE_PARSE, compact_ir)
+
+
+def _tac(triplets):
+    return [
+        (str(t), t.op, t.comment, [(o.value, type(o.value), o.type) if o is not None else None
+                                   for o in (t.arg1, t.arg2, t.result)])
+        for t in triplets
+    ]
+
+
+def _mips(triplets):
+    return MIPSTranslator().translate_program(triplets)
+
+
+class TestRoundTrip:
+    """encode/load conservan todo el TAC"""
+
+    def test_operand_values(self):
+        """Cada clase de valor vuelve con su tipo exacto"""
+        triplets = [
+            Triplet(OpCode.ADD, const_operand(1), const_operand(True), temp_operand("t0")),
+            Triplet(OpCode.MUL, const_operand(2.5), const_operand(2**70), temp_operand("t12")),
+            Triplet(OpCode.MOV, const_operand(-3), None, var_operand("t007")),
+            Triplet(OpCode.PRINT, const_operand("hola ñ"), Operand(None, "const")),
+            Triplet(OpCode.LABEL, label_operand("L0"), comment="inicio"),
+            Triplet(OpCode.JMP, None, None, label_operand("L0")),
+        ]
+        loaded = tacb.loads(tacb.encode(triplets))
+
+        assert _tac(loaded.triplets) == _tac(triplets)
+        assert loaded.labels() == {"L0": 4}
+
+    def test_full_program(self, tmp_path):
+        """Tripletos, símbolos y layout de una compilación completa"""
+        visitor = _visitor(FULL_PROGRAM)
+        path = str(tmp_path / "full.tacb")
+        tacb.save_visitor(path, visitor)
+
+        with tacb.load(path) as loaded:
+            assert _tac(loaded.triplets) == _tac(visitor.get_triplets())
+            assert loaded.triplets.to_list() == visitor.emitter.table.to_list()
+            symbols = loaded.symbols()
+            assert loaded.memory_layout() == visitor.memory_manager.get_memory_layout()
+
+        expected = visitor.get_symbols()
+        assert symbols.keys() == expected.keys()
+        for name, symbol in symbols.items():
+            original = expected[name]
+            assert (symbol.sym_type, symbol.address, symbol.temp, symbol.array_dimensions,
+                    symbol.is_initialized) == \
+                (original.sym_type, original.address, original.temp, original.array_dimensions,
+                 original.is_initialized)
+
+    def test_compact_table_source(self):
+        """Una CompactTripletTable se serializa igual que la lista"""
+        compact = _visitor(FULL_PROGRAM, compact_ir=True)
+
+        assert isinstance(compact.emitter.table, CompactTripletTable)
+        assert tacb.encode(compact.emitter.table) == tacb.encode(_visitor(FULL_PROGRAM).get_triplets())
+
+    def test_table_interface(self):
+        """La tabla cargada tiene la interfaz de sólo lectura de TripletTable"""
+        triplets = _visitor(FULL_PROGRAM).get_triplets()
+        table = tacb.loads(tacb.encode(triplets)).triplets
+
+        assert len(table) == table.size() == len(triplets)
+        assert str(table[-1]) == str(triplets[-1])
+        assert [str(t) for t in table[2:5]] == [str(t) for t in triplets[2:5]]
+        assert table.get(len(triplets)) is None
+        assert table.opcode(0) == triplets[0].op
+        with pytest.raises(IndexError):
+            table[len(triplets)]
+
+
+class TestLazyLoading:
+    """Los objetos se crean al accederlos"""
+
+    def test_operands_on_demand(self, tmp_path):
+        path = str(tmp_path / "lazy.tacb")
+        tacb.save(path, _visitor(FULL_PROGRAM).get_triplets())
+
+        with tacb.load(path) as loaded:
+            assert all(o is None for o in loaded._operands)
+            first = loaded.triplets[10]
+            second = loaded.triplets[10]
+            created = [o for o in loaded._operands if o is not None]
+
+            assert 0 < len(created) <= 3
+            assert first.arg1 is second.arg1
+
+    def test_objects_survive_close(self, tmp_path):
+        """Los tripletos materializados siguen válidos tras cerrar el mmap"""
+        path = str(tmp_path / "close.tacb")
+        tacb.save(path, _visitor(FULL_PROGRAM).get_triplets())
+
+        loaded = tacb.load(path)
+        triplets = list(loaded.triplets)
+        loaded.close()
+
+        assert _tac(triplets) == _tac(_visitor(FULL_PROGRAM).get_triplets())
+
+
+class TestMipsFromTacb:
+    """El backend MIPS sobre un .tacb produce lo mismo que en proceso"""
+
+    @pytest.mark.parametrize("source", [
+        generate_program(200),
+        open(os.path.join(ROOT_DIR, "test_const.cps"), encoding="utf-8").read(),
+    ], ids=["synthetic", "test_const"])
+    def test_same_assembly(self, source, tmp_path):
+        triplets = _visitor(source).get_triplets()
+        path = str(tmp_path / "prog.tacb")
+        tacb.save(path, triplets)
+
+        with tacb.load(path) as loaded:
+            assert _mips(loaded.triplets) == _mips(triplets)
+
+    def test_arrays_and_calls(self):
+        """Tripletos de arreglos y llamadas construidos a mano"""
+        triplets = [
+            Triplet(OpCode.ARRAY_ALLOC, const_operand(10), const_operand(4), var_operand("arr")),
+            Triplet(OpCode.ARRAY_SET, var_operand("arr"), const_operand(0), const_operand(7)),
+            Triplet(OpCode.ARRAY_GET, var_operand("arr"), const_operand(0), temp_operand("t0")),
+            Triplet(OpCode.PARAM, temp_operand("t0")),
+            Triplet(OpCode.CALL, Operand("f", "func"), const_operand(1), temp_operand("t1")),
+            Triplet(OpCode.BNZ, temp_operand("t1"), None, label_operand("L1")),
+            Triplet(OpCode.LABEL, label_operand("L1")),
+        ]
+
+        assert _mips(tacb.loads(tacb.encode(triplets)).triplets) == _mips(triplets)
+
+    def test_backend_script(self, tmp_path):
+        """Driver --emit-tacb seguido de program/mips_backend.py"""
+        path = str(tmp_path / "const.tacb")
+        program_dir = os.path.join(ROOT_DIR, "program")
+        subprocess.run([sys.executable, "Driver.py", "../test_const.cps", "--emit-tacb", path],
+                       cwd=program_dir, check=True, capture_output=True)
+        backend = subprocess.run([sys.executable, "mips_backend.py", path],
+                                 cwd=program_dir, capture_output=True, text=True)
+
+        with open(os.path.join(ROOT_DIR, "test_const.cps"), encoding="utf-8") as f:
+            expected = _mips(_visitor(f.read()).get_triplets())
+        assert backend.returncode == 0
+        assert backend.stdout == expected + "\n"
+
+
+class TestFormatErrors:
+    """Archivos inválidos lanzan TacbFormatError"""
+
+    def test_bad_magic(self):
+        with pytest.raises(tacb.TacbFormatError):
+            tacb.loads(b"NOPE" + bytes(32))
+
+    def test_unsupported_version(self):
+        data = bytearray(tacb.encode([]))
+        data[4] = 99
+
+        with pytest.raises(tacb.TacbFormatError):
+            tacb.loads(bytes(data))
+
+    def test_truncated(self, tmp_path):
+        data = tacb.encode(_visitor(FULL_PROGRAM).get_triplets())
+        path = tmp_path / "cut.tacb"
+        path.write_bytes(data[:len(data) // 2])
+
+        with pytest.raises(tacb.TacbFormatError):
+            tacb.load(str(path))
+
+    def test_empty_file(self, tmp_path):
+        path = tmp_path / "empty.tacb"
+        path.write_bytes(b"")
+
+        with pytest.raises(tacb.TacbFormatError):
+            tacb.load(str(path))
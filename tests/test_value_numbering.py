@@ -0,0 +1,164 @@
+"""
+Tests para la numeración de valores (subexpresiones comunes).
+
+Prueba:
+- Direcciones de arreglo recalculadas (`a[i] = a[i] + 1`)
+- Operaciones conmutativas y comparaciones invertidas
+- Lecturas de memoria entre escrituras y llamadas
+- Expresiones heredadas de un dominador (y las que no se heredan)
+- Misma salida al ejecutar y menos instrucciones MIPS
+"""
+
+import pytest
+
+from benchmarks.bench_optimizer import mips_count
+from benchmarks.synthetic import generate_program
+from compiler.ir.interpreter import run_tac
+from compiler.ir.tac_reader import read_tac
+from compiler.optimizer import eliminate_common_subexpressions
+from tests.helpers import compile_triplets, listing_of
+
+
+# a[i] = a[i] + 1 con las direcciones de ArrayCodeGen.gen_effective_address
+ARRAY_INCREMENT = ("t1 = mul i, 4\nt2 = add G[0], t1\nt3 = array_get t2\nt4 = add t3, 1\n"
+                   "t5 = mul i, 4\nt6 = add G[0], t5\narray_set t6, t4\n")
+
+
+def _number(text, **kwargs):
+    return eliminate_common_subexpressions(read_tac(text), **kwargs)
+
+
+class TestLocal:
+    """Tests para la numeración dentro de un bloque"""
+
+    def test_array_address(self):
+        result = _number(ARRAY_INCREMENT)
+
+        assert listing_of(result.triplets) == [
+            "t1 = mul i, 4", "t2 = add G[0], t1", "t3 = array_get t2", "t4 = add t3, 1",
+            "array_set t2, t4",
+        ]
+        assert result.stats["locales"] == 2
+
+    def test_commutative_and_swapped(self):
+        result = _number("t0 = add a, b\nt1 = add b, a\nt2 = lt a, b\nt3 = gt b, a\nprint t1\nprint t3\n")
+
+        assert listing_of(result.triplets) == ["t0 = add a, b", "t2 = lt a, b", "print t0", "print t2"]
+
+    def test_not_commutative(self):
+        text = "t0 = sub a, b\nt1 = sub b, a\nt2 = lt a, b\nt3 = lt b, a\nprint t1\nprint t3\n"
+
+        assert listing_of(_number(text).triplets) == listing_of(read_tac(text))
+
+    def test_copies_share_number(self):
+        result = _number("t0 = mov 4\nt1 = mul i, t0\nt2 = mul i, 4\nprint t2\n")
+
+        assert listing_of(result.triplets)[-1] == "print t1"
+
+    def test_operand_redefined(self):
+        result = _number("t0 = add a, b\na = mov 1\nt1 = add a, b\nprint t0\nprint t1\n")
+
+        assert "t1 = add a, b" in listing_of(result.triplets)
+
+    def test_named_target(self):
+        """El resultado en una variable con nombre queda como copia"""
+        result = _number("x = add a, 1\ny = add a, 1\nx = add a, 1\nprint x\nprint y\n")
+
+        assert listing_of(result.triplets) == ["x = add a, 1", "y = mov x", "print x", "print y"]
+
+
+class TestMemory:
+    """Tests para lecturas de memoria y llamadas"""
+
+    def test_load_reused(self):
+        result = _number("t0 = array_get p\nt1 = array_get p\nt2 = add t0, t1\nprint t2\n")
+
+        assert listing_of(result.triplets) == ["t0 = array_get p", "t2 = add t0, t0", "print t2"]
+
+    @pytest.mark.parametrize("barrier", [
+        "G[0] = array_set 0, v", "store v, q", "t9 = call f, 0",
+    ], ids=["array_set", "store", "call"])
+    def test_write_between_loads(self, barrier):
+        text = f"t0 = array_get p\n{barrier}\nt1 = array_get p\nprint t1\n"
+
+        assert "t1 = array_get p" in listing_of(_number(text).triplets)
+
+    def test_call_changes_named_variables(self):
+        text = "t0 = add a, 1\nt9 = call f, 0\nt1 = add a, 1\nt2 = add t0, t1\nprint t2\n"
+
+        assert "t1 = add a, 1" in listing_of(_number(text).triplets)
+
+
+class TestGlobal:
+    """Tests para las expresiones de los dominadores"""
+
+    def test_dominated_block(self):
+        text = "t9 = mov k\nt0 = mul t9, 4\nL0 = bnz c\nt1 = mul 4, t9\nprint t1\nL0:\nt2 = mul t9, 4\nprint t2\n"
+        result = _number(text)
+
+        assert listing_of(result.triplets)[-3:] == ["print t0", "L0:", "print t0"]
+        assert result.stats["globales"] == 2
+
+    def test_local_only(self):
+        text = "t9 = mov k\nt0 = mul t9, 4\nL0 = bnz c\nt1 = mul 4, t9\nprint t1\nL0:\n"
+
+        assert not _number(text, local=True).changed
+
+    def test_sibling_not_reused(self):
+        """Lo calculado en una rama no vale en la otra ni después de juntarse"""
+        text = ("t9 = mov k\nL0 = bnz c\nt0 = mul t9, 4\nprint t0\nL1 = jmp\nL0:\nt1 = mul t9, 4\n"
+                "print t1\nL1:\nt2 = mul t9, 4\nprint t2\n")
+
+        assert listing_of(_number(text).triplets) == listing_of(read_tac(text))
+
+    def test_named_operand_not_global(self):
+        text = "t0 = mul k, 4\nL0 = bnz c\nk = mov 2\nL0:\nt1 = mul k, 4\nprint t1\n"
+
+        assert "t1 = mul k, 4" in listing_of(_number(text).triplets)
+
+    def test_loop_body(self):
+        """El valor calculado antes del bucle se reutiliza dentro"""
+        text = ("t9 = mov n\nt0 = mul t9, 4\ni = mov 0\nL0:\nt1 = mul t9, 4\ns = add s, t1\n"
+                "i = add i, 1\nL0 = blt i, 3\nprint s\n")
+        listing = listing_of(_number(text).triplets)
+
+        assert "s = add s, t0" in listing and "t1 = mul t9, 4" not in listing
+
+
+class TestSemantics:
+    """El listado optimizado imprime lo mismo"""
+
+    @pytest.mark.parametrize("text", [
+        "p = mov 5\nt0 = add p, 2\nt1 = add 2, p\nt2 = mul t0, t1\nprint t2\np = mov 6\nt3 = add p, 2\n"
+        "print t3\n",
+        "t9 = mov 7\nt0 = mul t9, 4\nL0 = bgt t9, 3\nt1 = mul 4, t9\nprint t1\nL0:\nt2 = mul t9, 4\n"
+        "t3 = sub t2, t0\nprint t3\n",
+        "i = mov 0\ns = mov 0\nt9 = mov 3\nL0:\nt0 = mul t9, 4\nt1 = add t0, i\ns = add s, t1\n"
+        "t2 = mul 4, t9\ns = add s, t2\ni = add i, 1\nL0 = blt i, 5\nprint s\n",
+    ], ids=["straight", "diamond", "loop"])
+    def test_same_output(self, text):
+        triplets = read_tac(text)
+        result = eliminate_common_subexpressions(triplets)
+
+        assert result.changed
+        assert run_tac(result.triplets).output == run_tac(triplets).output
+
+    def test_idempotent(self):
+        first = eliminate_common_subexpressions(compile_triplets(generate_program(200)))
+        second = eliminate_common_subexpressions(first.triplets)
+
+        assert first.changed and not second.changed
+
+    def test_fewer_mips_instructions(self):
+        triplets = read_tac(ARRAY_INCREMENT)
+        instructions, _ = mips_count(triplets)
+        instructions_after, _ = mips_count(eliminate_common_subexpressions(triplets).triplets)
+
+        assert instructions_after < instructions
+
+    def test_input_not_modified(self):
+        triplets = read_tac(ARRAY_INCREMENT)
+        before = listing_of(triplets)
+        eliminate_common_subexpressions(triplets)
+
+        assert listing_of(triplets) == before
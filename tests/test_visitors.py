@@ -0,0 +1,149 @@
+"""
+Tests para CompiscriptTACVisitor.
+
+Prueba:
+- Tabla de despacho por clase de contexto
+- Fast path para nodos terminales
+- Colapso de cadenas de precedencia de un solo hijo
+"""
+
+import os
+
+import pytest
+from antlr4 import InputStream
+
+from compiler.pipeline import (
+    lex, parse_tokens, CompiscriptParser, CompiscriptVisitor, CompiscriptTACVisitor
+)
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _tree(source):
+    return parse_tokens(lex(InputStream(source))).tree
+
+
+def _tac(source, collapse_chains, visitor_class=CompiscriptTACVisitor):
+    visitor = visitor_class(CompiscriptParser, CompiscriptVisitor, collapse_chains)
+    visitor.visit(_tree(source))
+    return [
+        (str(t), [(o.value, o.type) if o is not None else None
+                  for o in (t.arg1, t.arg2, t.result)])
+        for t in visitor.get_triplets()
+    ]
+
+
+class TestDispatchTable:
+    """Tests para el despacho basado en tabla"""
+
+    def test_table_shared_per_class(self):
+        """Todas las instancias comparten la misma tabla"""
+        v1 = CompiscriptTACVisitor(CompiscriptParser, CompiscriptVisitor)
+        v2 = CompiscriptTACVisitor(CompiscriptParser, CompiscriptVisitor)
+
+        assert v1._dispatch is v2._dispatch
+
+    def test_table_preloaded_from_parser(self):
+        """Los contextos del parser se resuelven al construir el visitor"""
+        visitor = CompiscriptTACVisitor(CompiscriptParser, CompiscriptVisitor)
+
+        assert visitor._dispatch[CompiscriptParser.ProgramContext] is \
+            CompiscriptTACVisitor.visitProgram
+        # Sin método específico se visitan los hijos
+        assert visitor._dispatch[CompiscriptParser.TypeContext] is \
+            CompiscriptTACVisitor.visitChildren
+
+    def test_subclass_has_own_table(self):
+        """Una subclase resuelve sus propios métodos"""
+        class CustomVisitor(CompiscriptTACVisitor):
+            def visitPrintStatement(self, ctx):
+                return "custom"
+
+        visitor = CustomVisitor(CompiscriptParser, CompiscriptVisitor)
+        base = CompiscriptTACVisitor(CompiscriptParser, CompiscriptVisitor)
+
+        assert visitor._dispatch is not base._dispatch
+        assert visitor._dispatch[CompiscriptParser.PrintStatementContext] is \
+            CustomVisitor.visitPrintStatement
+        assert base._dispatch[CompiscriptParser.PrintStatementContext] is \
+            CompiscriptTACVisitor.visitPrintStatement
+
+    def test_terminal_fast_path(self):
+        """Visitar un nodo terminal retorna None sin despachar"""
+        tree = _tree("print(1);")
+        visitor = CompiscriptTACVisitor(CompiscriptParser, CompiscriptVisitor)
+        eof = tree.EOF()
+
+        assert visitor.visit(eof) is None
+        assert visitor.get_triplets() == []
+
+    def test_generates_triplets(self):
+        """El despacho por tabla genera el TAC esperado"""
+        tree = _tree("let x: integer = 2 * 3;")
+        visitor = CompiscriptTACVisitor(CompiscriptParser, CompiscriptVisitor)
+        visitor.visit(tree)
+
+        lines = [str(t) for t in visitor.get_triplets()]
+        assert lines == [
+            "t0 = mov 2",
+            "t1 = mov 3",
+            "t2 = mul t0, t1",
+            "x = mov t2",
+        ]
+
+
+class TestChainCollapse:
+    """Tests para el recorrido que salta los niveles de precedencia de paso"""
+
+    def test_chain_levels_use_visit_chain(self):
+        """Los niveles de paso despachan a _visit_chain sólo en modo colapsado"""
+        collapsed = CompiscriptTACVisitor(CompiscriptParser, CompiscriptVisitor)
+        full = CompiscriptTACVisitor(CompiscriptParser, CompiscriptVisitor, collapse_chains=False)
+
+        assert collapsed._dispatch[CompiscriptParser.AdditiveExprContext] is \
+            CompiscriptTACVisitor._visit_chain
+        assert full._dispatch[CompiscriptParser.AdditiveExprContext] is \
+            CompiscriptTACVisitor.visitAdditiveExpr
+        # Los nodos con semántica propia no se colapsan
+        assert collapsed._dispatch[CompiscriptParser.LiteralExprContext] is \
+            CompiscriptTACVisitor.visitLiteralExpr
+
+    @pytest.mark.parametrize("source", [
+        "let x: integer = 1 + 2 * (3 - 4) % 5;",
+        "let a: integer = 1; let b: boolean = a < 2 && !(a == 3) || a >= 4;",
+        "let a: integer = 1; let c = a > 0 ? a : -a; print(c);",
+        "let arr: integer[] = [1, 2]; let y = arr[0] + arr[1]; y = arr[1] = 3;",
+        "function f(p: integer): integer { return p; } print(f(1) + f(2));",
+        "let a: integer; a = a;",
+    ])
+    def test_same_tac(self, source):
+        """El TAC (texto y operandos) no cambia al colapsar"""
+        assert _tac(source, True) == _tac(source, False)
+
+    @pytest.mark.parametrize("path", [
+        os.path.join("program", "program.cps"),
+        "test_const.cps",
+    ])
+    def test_sample_programs(self, path):
+        """Mismo TAC para los programas de ejemplo del repositorio"""
+        with open(os.path.join(ROOT_DIR, path), encoding='utf-8') as f:
+            source = f.read()
+
+        assert _tac(source, True) == _tac(source, False)
+
+    def test_overridden_level_not_skipped(self):
+        """Un nivel redefinido en una subclase se sigue visitando"""
+        class CountingVisitor(CompiscriptTACVisitor):
+            calls = 0
+
+            def visitAdditiveExpr(self, ctx):
+                CountingVisitor.calls += 1
+                return super().visitAdditiveExpr(ctx)
+
+        visitor = CountingVisitor(CompiscriptParser, CompiscriptVisitor)
+        visitor.visit(_tree("print(7);"))
+
+        assert CountingVisitor.calls == 1
+        assert visitor._dispatch[CompiscriptParser.MultiplicativeExprContext] is \
+            CompiscriptTACVisitor._visit_chain